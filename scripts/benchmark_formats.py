@@ -0,0 +1,97 @@
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+import numpy as np
+from faker import Faker
+from common_logger import logger
+from oltp_batch_engine import build_value_pools, build_products, generate_batch, row_count
+from oltp_data_generator import get_initial_state
+from raw_formats import FORMATS, encoder_for
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+DEFAULT_CUSTOMERS = 20000
+DEFAULT_ORDERS = 200000
+DEFAULT_REPEATS = 3
+
+BENCHMARK_CATALOG = [
+    ("Product A", "Electronics", "Brand A", 1199.00),
+    ("Product B", "Home", "Brand B", 179.00),
+    ("Product C", "Sports", "Brand C", 139.00),
+    ("Product D", "Fashion", "Brand D", 189.00),
+]
+
+# ==========================================
+# HELPER FUNCTIONS
+# ==========================================
+
+def measure(columns, file_format, repeats):
+    """Encodes a table `repeats` times in memory. Returns (bytes written, best encode time in seconds)."""
+    best = None
+    size = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        size = sum(len(chunk) for chunk in encoder_for(columns, file_format)())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return size, best
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compares raw file formats: bytes written and encode time per table.")
+    parser.add_argument("--customers", type=int, default=DEFAULT_CUSTOMERS)
+    parser.add_argument("--orders", type=int, default=DEFAULT_ORDERS)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--formats", nargs="+", choices=sorted(FORMATS), default=list(FORMATS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Optional path of a JSON file with the results")
+    return parser.parse_args(argv)
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    pools = build_value_pools(Faker())
+    products = build_products(BENCHMARK_CATALOG, datetime(2024, 1, 1))
+    batch, _ = generate_batch(rng, pools, products, get_initial_state(), datetime(2025, 1, 1), args.customers, args.orders)
+
+    logger.info(f"Benchmark batch: {args.customers} customers, {args.orders} orders "
+                f"({sum(row_count(t) for t in batch.values())} rows in {len(batch)} tables)")
+
+    results = []
+    for file_format in args.formats:
+        total_bytes = 0
+        total_seconds = 0.0
+        try:
+            for table, columns in batch.items():
+                size, seconds = measure(columns, file_format, args.repeats)
+                total_bytes += size
+                total_seconds += seconds
+                results.append({"format": file_format, "table": table, "rows": row_count(columns),
+                                "bytes": size, "encode_seconds": round(seconds, 4)})
+        except ImportError as e:
+            logger.warning(f"Skipping {file_format}: {e}")
+            continue
+
+        rows = sum(row_count(t) for t in batch.values())
+        logger.info(f"{file_format:<11} {total_bytes / 1024 / 1024:>9.1f} MB  {total_seconds:>7.2f} s  "
+                    f"{rows / total_seconds:>12,.0f} rows/s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"customers": args.customers, "orders": args.orders, "results": results}, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,391 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from common_logger import logger, metrics, span
+from oltp_data_generator import (
+    BATCHES, CUSTOMERS_PER_BATCH, ORDERS_PER_BATCH, REMOTE_ROOT_FOLDER, RUN_MANIFEST_FOLDER, STATE_FILE_PATH, WORKLOAD_PROFILE,
+    main as run_generator
+)
+from raw_formats import DEFAULT_FORMAT, FORMATS
+from storage_backends import create_backend
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+DEFAULT_SCALES = [1, 10]          # multiples of CUSTOMERS_PER_BATCH / ORDERS_PER_BATCH
+DEFAULT_SEED = 42
+BASE_DATE = datetime(2025, 1, 15, 12, 0)
+
+# Core tables of the local transform (the ones the Gold sales model is built from)
+CORE_TABLES = ["products", "customers", "addresses", "orders", "order_items"]
+
+# Seed of COMMON.DQ_RULES, the validation rules of the SILVER.LOAD_* procedures
+DQ_RULES_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                            "snowflake_sql", "01_SETUP_INFRASTRUCTURE.sql")
+
+def load_dq_rules(path=DQ_RULES_SQL):
+    """{table: [(predicate, rule code)]} in RULE_ORDER, read from the DQ_RULES insert of the setup script."""
+    with open(path, encoding="utf-8") as f:
+        sql = f.read()
+    seed = sql[sql.index("INSERT OVERWRITE INTO ECOMMERCE.COMMON.DQ_RULES"):]
+    seed = seed[:seed.index(";\n")]
+    rules = {}
+    for table, order, code, predicate in re.findall(r"\('(\w+)', (\d+), '(\w+)',\s*\$\$(.*?)\$\$\)", seed):
+        rules.setdefault(table, []).append((int(order), predicate, code))
+    return {table: [(predicate, code) for _, predicate, code in sorted(table_rules)]
+            for table, table_rules in rules.items()}
+
+DQ_RULES = load_dq_rules()
+
+# Silver: (table, business key, columns, hash columns, validation rules, dedup order)
+# Same rules (COMMON.DQ_RULES), hashes and deduplication as the SILVER.LOAD_* procedures (BACKFILL path).
+SILVER_TABLES = [
+    ("products", "product_id",
+     ["product_id", "name", "category", "brand", "price", "currency", "status", "created_at", "updated_at"],
+     [("name", "''"), ("category", "''"), ("brand", "''"), ("price", "'0'"), ("currency", "''"), ("status", "''")],
+     DQ_RULES["products"],
+     "updated_at DESC, ingestion_ts DESC"),
+    ("customers", "customer_id",
+     ["customer_id", "email", "first_name", "last_name", "phone", "status", "created_at", "updated_at"],
+     [("email", "''"), ("first_name", "''"), ("last_name", "''"), ("phone", "''"), ("status", "''")],
+     DQ_RULES["customers"],
+     "updated_at DESC, ingestion_ts DESC"),
+    ("addresses", "address_id",
+     ["address_id", "customer_id", "type", "street", "city", "postal_code", "country", "is_default",
+      "created_at", "updated_at"],
+     [("type", "''"), ("street", "''"), ("city", "''"), ("postal_code", "''"), ("country", "''"),
+      ("is_default", "'false'")],
+     DQ_RULES["addresses"],
+     "updated_at DESC, ingestion_ts DESC"),
+    ("orders", "order_id",
+     ["order_id", "customer_id", "order_status", "order_total_amount", "currency", "created_at", "updated_at"],
+     [("order_status", "''"), ("order_total_amount", "'0'"), ("currency", "''")],
+     DQ_RULES["orders"],
+     "updated_at DESC, ingestion_ts DESC"),
+    ("order_items", "order_item_id",
+     ["order_item_id", "order_id", "product_id", "quantity", "unit_price", "created_at"],
+     [("product_id", "''"), ("quantity", "''"), ("unit_price", "''")],
+     DQ_RULES["order_items"],
+     "ingestion_ts DESC"),
+]
+
+# Gold: (table, statement), same shape as the GOLD.LOAD_* procedures (BACKFILL path)
+GOLD_TABLES = [
+    ("dim_products", """
+        CREATE TABLE gold_dim_products AS
+        SELECT -1 AS product_key, -1 AS product_id, 'Unknown Product' AS name, 'Unknown' AS category,
+               'Unknown' AS brand, 0::DECIMAL(18,2) AS price, 'EUR' AS currency, 'Unknown' AS status,
+               '0' AS hash_value, TIMESTAMP '1900-01-01' AS valid_from, TIMESTAMP '9999-12-31' AS valid_to,
+               TRUE AS is_current
+        UNION ALL
+        SELECT ROW_NUMBER() OVER (ORDER BY product_id), product_id, name, category, brand, price, currency,
+               status, hash_value, COALESCE(created_at, now()::TIMESTAMP), TIMESTAMP '9999-12-31', TRUE
+        FROM silver_products
+    """),
+    ("dim_customers", """
+        CREATE TABLE gold_dim_customers AS
+        SELECT -1 AS customer_key, -1 AS customer_id, 'Unknown' AS email, 'Unknown' AS first_name,
+               'Unknown' AS last_name, 'Unknown' AS phone, 'Unknown' AS city, 'Unknown' AS country,
+               'Unknown' AS postal_code, 'Unknown' AS street, 'Unknown' AS address_type, 'ACTIVE' AS status,
+               '0' AS hash_value, TIMESTAMP '1900-01-01' AS valid_from, TIMESTAMP '9999-12-31' AS valid_to,
+               TRUE AS is_current
+        UNION ALL
+        SELECT ROW_NUMBER() OVER (ORDER BY c.customer_id), c.customer_id, c.email, c.first_name, c.last_name,
+               c.phone, COALESCE(a.city, 'Unknown'), COALESCE(a.country, 'Unknown'),
+               COALESCE(a.postal_code, 'Unknown'), COALESCE(a.street, 'Unknown'), COALESCE(a.type, 'Unknown'),
+               c.status,
+               sha256(concat_ws('|', COALESCE(c.email, ''), COALESCE(c.first_name, ''), COALESCE(c.last_name, ''),
+                                COALESCE(c.phone, ''), COALESCE(c.status, ''), COALESCE(a.city, ''),
+                                COALESCE(a.country, ''), COALESCE(a.postal_code, ''), COALESCE(a.street, ''),
+                                COALESCE(a.type, ''))),
+               COALESCE(c.created_at, now()::TIMESTAMP), TIMESTAMP '9999-12-31', TRUE
+        FROM silver_customers c
+        LEFT JOIN silver_addresses a ON c.customer_id = a.customer_id AND a.is_default = TRUE
+    """),
+    ("dim_products_current", """
+        CREATE TABLE gold_dim_products_current AS
+        SELECT product_id, product_key, hash_value, valid_from
+        FROM gold_dim_products WHERE is_current AND product_key != -1
+    """),
+    ("dim_customers_current", """
+        CREATE TABLE gold_dim_customers_current AS
+        SELECT customer_id, customer_key, hash_value, valid_from
+        FROM gold_dim_customers WHERE is_current AND customer_key != -1
+    """),
+    ("fact_orders", """
+        CREATE TABLE gold_fact_orders AS
+        SELECT o.order_id,
+               COALESCE(dcc.customer_key, dc.customer_key, -1) AS customer_key,
+               CAST(strftime(o.create_date, '%Y%m%d') AS INTEGER) AS order_date_key,
+               o.order_status, o.order_total_amount, o.currency, o.created_at, o.updated_at
+        FROM silver_orders o
+        LEFT JOIN gold_dim_customers_current dcc
+            ON o.customer_id = dcc.customer_id AND o.created_at >= dcc.valid_from
+        LEFT JOIN gold_dim_customers dc
+            ON dcc.customer_key IS NULL AND o.customer_id = dc.customer_id AND NOT dc.is_current
+            AND o.created_at >= dc.valid_from AND o.created_at < dc.valid_to
+    """),
+    ("fact_sales", """
+        CREATE TABLE gold_fact_sales AS
+        SELECT oi.order_item_id, oi.order_id,
+               COALESCE(dpc.product_key, dp.product_key, -1) AS product_key,
+               COALESCE(dcc.customer_key, dc.customer_key, -1) AS customer_key,
+               CAST(strftime(oi.create_date, '%Y%m%d') AS INTEGER) AS order_date_key,
+               oi.quantity, oi.unit_price, oi.quantity * oi.unit_price AS total_line_amount, o.currency
+        FROM silver_order_items oi
+        LEFT JOIN silver_orders o ON oi.order_id = o.order_id
+        LEFT JOIN gold_dim_products_current dpc
+            ON oi.product_id = dpc.product_id AND oi.created_at >= dpc.valid_from
+        LEFT JOIN gold_dim_products dp
+            ON dpc.product_key IS NULL AND oi.product_id = dp.product_id AND NOT dp.is_current
+            AND oi.created_at >= dp.valid_from AND oi.created_at < dp.valid_to
+        LEFT JOIN gold_dim_customers_current dcc
+            ON o.customer_id = dcc.customer_id AND o.created_at >= dcc.valid_from
+        LEFT JOIN gold_dim_customers dc
+            ON dcc.customer_key IS NULL AND o.customer_id = dc.customer_id AND NOT dc.is_current
+            AND o.created_at >= dc.valid_from AND o.created_at < dc.valid_to
+    """),
+    ("agg_daily_product_sales", """
+        CREATE TABLE gold_agg_daily_product_sales AS
+        SELECT f.order_date_key AS date_key, p.product_id,
+               arg_max(p.name, p.product_key) AS product_name,
+               arg_max(p.category, p.product_key) AS category,
+               arg_max(p.brand, p.product_key) AS brand,
+               f.currency,
+               COUNT(DISTINCT f.order_id) AS order_count, COUNT(*) AS line_count,
+               SUM(f.quantity) AS units_sold, SUM(f.total_line_amount) AS revenue
+        FROM gold_fact_sales f
+        JOIN gold_dim_products p ON f.product_key = p.product_key
+        GROUP BY f.order_date_key, p.product_id, f.currency
+    """),
+]
+
+# ==========================================
+# HELPER FUNCTIONS
+# ==========================================
+
+def git_revision():
+    """Commit of the benchmarked code (None outside a git checkout)."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def metric_total(snapshot, name, field=None):
+    """Sum of a counter (field=None) or of a histogram field ("sum" / "count") over all label sets."""
+    if field is None:
+        return sum(value for n, _, value in snapshot["counters"] if n == name)
+    return sum(hist[field] for n, _, hist in snapshot["histograms"] if n == name)
+
+def run_manifest(storage):
+    """Rows of the manifest of the last generator run in `storage` (file paths relative to the data root)."""
+    state = json.loads(storage.download(STATE_FILE_PATH))
+    path = f"{RUN_MANIFEST_FOLDER}/{BASE_DATE.strftime('%Y/%m/%d')}/run_{state['last_run_id']}.ndjson"
+    return [json.loads(line) for line in storage.download(path).splitlines() if line.strip()]
+
+def local_files(storage, manifest, backend, local_root, download_dir):
+    """
+    {table: [local file paths]} of the core tables. Files of the local backend are read in place;
+    remote files are downloaded first (not part of the measured transform time).
+    """
+    files = {}
+    for row in manifest:
+        if row["table_name"] not in CORE_TABLES:
+            continue
+        remote_path = f"{REMOTE_ROOT_FOLDER}/{row['file_path']}"
+        if backend == "local":
+            local_path = os.path.join(local_root, remote_path)
+        else:
+            local_path = os.path.join(download_dir, remote_path)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, "wb") as f:
+                data = storage.download(remote_path)
+                f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        files.setdefault(row["table_name"], []).append((local_path, row["file_format"]))
+    return files
+
+def bronze_statement(table, files):
+    """Raw files of one table into a Bronze table with the audit columns (COPY INTO equivalent)."""
+    paths = ", ".join(f"'{path}'" for path, _ in files)
+    if files[0][1] == "parquet":
+        reader = f"read_parquet([{paths}], filename = true)"
+    else:
+        reader = f"read_json([{paths}], format = 'auto', filename = true)"
+    return f"""
+        CREATE TABLE bronze_{table} AS
+        SELECT * EXCLUDE (filename), filename AS source_file, now()::TIMESTAMP AS ingestion_ts
+        FROM {reader}
+    """
+
+def silver_statements(table, key, columns, hash_columns, rules, dedup_order):
+    """Validation (failed rows to dq_errors) and deduplication of one table into Silver."""
+    checks = " ".join(f"WHEN {condition} THEN '{error}'" for condition, error in rules)
+    hashed = ", ".join(f"COALESCE(CAST({column} AS VARCHAR), {default})" for column, default in hash_columns)
+    return [
+        f"""
+        CREATE TEMP TABLE {table}_dq_stage AS
+        SELECT {', '.join(columns)}, CAST(created_at AS DATE) AS create_date,
+               sha256(concat_ws('|', {hashed})) AS hash_value, source_file, ingestion_ts,
+               CASE {checks} END AS dq_error
+        FROM bronze_{table}
+        """,
+        f"""
+        INSERT INTO dq_errors
+        SELECT '{table}', CAST({key} AS VARCHAR), dq_error FROM {table}_dq_stage WHERE dq_error IS NOT NULL
+        """,
+        f"""
+        CREATE TABLE silver_{table} AS
+        SELECT * EXCLUDE (dq_error) FROM {table}_dq_stage
+        WHERE dq_error IS NULL
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY {dedup_order}) = 1
+        ORDER BY {key}
+        """,
+    ]
+
+def run_transform(files, threads=None):
+    """
+    Runs Bronze -> Silver -> Gold for the core tables on an in-memory DuckDB database.
+    Returns {stage: {"seconds": ..., "rows": {table: rows}}}.
+    """
+    import duckdb
+
+    conn = duckdb.connect()
+    if threads:
+        conn.execute(f"SET threads = {int(threads)}")
+    conn.execute("CREATE TABLE dq_errors (table_name VARCHAR, record_key VARCHAR, error_type VARCHAR)")
+
+    stages = [
+        ("bronze", [(table, [bronze_statement(table, files[table])]) for table in CORE_TABLES]),
+        ("silver", [(spec[0], silver_statements(*spec)) for spec in SILVER_TABLES]),
+        ("gold", [(table, [sql]) for table, sql in GOLD_TABLES]),
+    ]
+    results = {}
+    try:
+        for stage, tables in stages:
+            with span("transform_stage", log_level=None, stage=stage) as stage_span:
+                for table, statements in tables:
+                    with span("transform_table", detail=table, stage=stage):
+                        for sql in statements:
+                            conn.execute(sql)
+            rows = {table: conn.execute(f"SELECT COUNT(*) FROM {stage}_{table}").fetchone()[0]
+                    for table, _ in tables}
+            results[stage] = {"seconds": round(stage_span.seconds, 4), "rows": rows}
+            logger.info(f"Transform {stage:<6} {stage_span.seconds:>8.2f} s  {sum(rows.values()):>12,} rows")
+        results["silver"]["dq_errors"] = conn.execute("SELECT COUNT(*) FROM dq_errors").fetchone()[0]
+    finally:
+        conn.close()
+    return results
+
+def benchmark_scale(args, scale, work_dir):
+    """Generates one scale factor into fresh storage, transforms it and returns its result row."""
+    customers = CUSTOMERS_PER_BATCH * scale
+    orders = ORDERS_PER_BATCH * scale
+    local_root = os.path.join(work_dir, f"scale_{scale}")
+    logger.info(f"=== Scale {scale}x: {args.batches} batches of {customers} customers / {orders} orders ===")
+
+    metrics.snapshot(reset=True)
+    run_generator([
+        "--backend", args.backend, "--local-root", local_root, "--format", args.format,
+        "--batches", str(args.batches), "--customers-per-batch", str(customers),
+        "--orders-per-batch", str(orders), "--workers", str(args.workers), "--seed", str(args.seed),
+        "--base-date", BASE_DATE.isoformat(), "--profile", args.profile,
+    ])
+    generated = metrics.snapshot(reset=True)
+
+    storage = create_backend(args.backend, local_root=local_root)
+    files = local_files(storage, run_manifest(storage), args.backend, local_root, os.path.join(local_root, "download"))
+    transform = None if args.skip_transform else run_transform(files, args.threads)
+
+    rows = metric_total(generated, "generator_batch_generate_rows_total")
+    generate_seconds = metric_total(generated, "generator_batch_generate_seconds", "sum")
+    run_seconds = metric_total(generated, "generator_run_seconds", "sum")
+    serialized_bytes = metric_total(generated, "upload_file_bytes_total")
+    upload_seconds = metric_total(generated, "upload_file_seconds", "sum")
+    return {
+        "scale": scale,
+        "customers_per_batch": customers,
+        "orders_per_batch": orders,
+        "generator": {
+            "rows": rows,
+            "generate_seconds": round(generate_seconds, 4),
+            "rows_per_second": round(rows / generate_seconds) if generate_seconds else None,
+            "run_seconds": round(run_seconds, 4),
+        },
+        "upload": {
+            "files": int(metric_total(generated, "upload_file_seconds", "count")),
+            "bytes": serialized_bytes,
+            "seconds": round(upload_seconds, 4),
+            "bytes_per_second": round(serialized_bytes / upload_seconds) if upload_seconds else None,
+            "retries": metric_total(generated, "upload_retries_total"),
+        },
+        "transform": transform,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Offline end-to-end benchmark: generator -> storage -> local Bronze/Silver/Gold transform (DuckDB).")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Multiples of CUSTOMERS_PER_BATCH / ORDERS_PER_BATCH, e.g. 1 10 100")
+    parser.add_argument("--batches", type=int, default=BATCHES)
+    parser.add_argument("--workers", type=int, default=1, help="Generator processes")
+    parser.add_argument("--format", choices=sorted(FORMATS), default=DEFAULT_FORMAT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--profile", default=WORKLOAD_PROFILE,
+                        help="Generator workload profile (name or JSON file, see workload_profiles.py)")
+    parser.add_argument("--backend", choices=["azure", "local"], default="local",
+                        help="Storage the generator writes to: local filesystem or Azurite "
+                             "(azure; uses AZURE_STORAGE_CONNECTION_STRING)")
+    parser.add_argument("--work-dir", help="Folder for the generated data (default: a temporary folder, removed at the end)")
+    parser.add_argument("--threads", type=int, help="DuckDB threads (default: all cores)")
+    parser.add_argument("--skip-transform", action="store_true", help="Only measure generation and upload")
+    parser.add_argument("--output", help="NDJSON file the results are appended to (one row per scale)")
+    return parser.parse_args(argv)
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="pipeline_benchmark_")
+    run = {"benchmark_ts": datetime.now().isoformat(timespec="seconds"), "git_revision": git_revision(),
+           "backend": args.backend, "format": args.format, "batches": args.batches, "workers": args.workers,
+           "seed": args.seed, "profile": args.profile}
+
+    results = []
+    try:
+        for scale in args.scales:
+            results.append(dict(run, **benchmark_scale(args, scale, work_dir)))
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    logger.info(f"{'scale':>6} {'rows':>10} {'gen rows/s':>11} {'MB':>8} {'upload MB/s':>12} "
+                f"{'bronze s':>9} {'silver s':>9} {'gold s':>8}")
+    for r in results:
+        stages = r["transform"] or {}
+        stage_seconds = "".join(f" {stages[s]['seconds'] if s in stages else '-':>{w}}"
+                                for s, w in (("bronze", 9), ("silver", 9), ("gold", 8)))
+        upload_rate = r["upload"]["bytes_per_second"] or 0
+        logger.info(f"{r['scale']:>5}x {r['generator']['rows']:>10,} {r['generator']['rows_per_second'] or 0:>11,} "
+                    f"{r['upload']['bytes'] / 1024 / 1024:>8.1f} {upload_rate / 1024 / 1024:>12.1f}{stage_seconds}")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(r) + "\n" for r in results)
+        logger.info(f"Results appended to {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        sys.exit(1)
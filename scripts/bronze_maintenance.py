@@ -0,0 +1,238 @@
+import argparse
+import json
+import logging
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from common_logger import logger, metrics, span
+from etl_orchestrator import snowflake_connect
+from oltp_data_generator import REMOTE_ROOT_FOLDER
+from storage_backends import BlobNotFound, LOCAL_STORAGE_ROOT, create_backend
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+
+# Archived files keep their path below this folder: inside the stage root (a replay can COPY them
+# from @adls_stage/_archive/...), but outside every ADLS_PATH, so PREFIX loads no longer list them.
+ARCHIVE_FOLDER = f"{REMOTE_ROOT_FOLDER}/_archive"
+
+MAINTENANCE_WORKERS = 16      # parallel blob moves / deletes
+STALENESS_WARN_DAYS = 3       # streams going stale within this many days fail the run
+LOG_CHUNK_FILES = 1000        # file names per ETL_LOGS event
+
+# FILE_RETENTION_ACTION -> STEP_NAME of the ETL_LOGS events listing the handled files
+FILE_ACTIONS = {"ARCHIVE": "ARCHIVE_FILES", "PURGE": "PURGE_FILES"}
+
+CONFIG_QUERY = """
+    SELECT TABLE_NAME, ADLS_PATH, FILE_RETENTION_DAYS, UPPER(COALESCE(FILE_RETENTION_ACTION, 'ARCHIVE')),
+           UPPER(COALESCE(LOAD_STRATEGY, 'PREFIX'))
+    FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+    WHERE IS_ACTIVE = TRUE
+      AND FILE_RETENTION_DAYS IS NOT NULL
+    ORDER BY CONFIG_ID
+"""
+
+# File ledgers by LOAD_STRATEGY: (table, file name column). Both keep the load time and the
+# archived / purged state of every file; unlike ETL_LOGS they are never purged.
+FILE_LEDGERS = {
+    "MANIFEST": ("ECOMMERCE.COMMON.INGESTION_MANIFEST", "FILE_PATH"),
+    "PREFIX": ("ECOMMERCE.COMMON.BRONZE_FILE_LEDGER", "FILE_NAME"),
+}
+
+# Files loaded before the retention period and not archived / purged yet
+DUE_FILES_QUERY = """
+    SELECT DISTINCT {file_column}
+    FROM {ledger}
+    WHERE LOWER(TABLE_NAME) = LOWER(%s)
+      AND LOADED_AT < DATEADD(day, -%s, CURRENT_TIMESTAMP())
+      AND FILE_ACTION_AT IS NULL
+"""
+
+MARK_FILES_QUERY = """
+    UPDATE {ledger}
+    SET FILE_ACTION = %s, FILE_ACTION_AT = CURRENT_TIMESTAMP()
+    WHERE LOWER(TABLE_NAME) = LOWER(%s)
+      AND FILE_ACTION_AT IS NULL
+      AND {file_column} IN (SELECT f.VALUE::STRING FROM TABLE(FLATTEN(INPUT => PARSE_JSON(%s))) f)
+"""
+
+# ==========================================
+# HELPER FUNCTIONS
+# ==========================================
+
+def stage_path(file_name, adls_path):
+    """
+    Path below the stage root of a file reported by COPY INTO, which is either stage-relative
+    ('orders_raw/...') or a full URL ('azure://<account>/<container>/data/orders_raw/...').
+    None when the name does not contain the table's ADLS_PATH.
+    """
+    if file_name.startswith(adls_path):
+        return file_name
+    position = file_name.rfind("/" + adls_path)
+    return file_name[position + 1:] if position >= 0 else None
+
+def process_files(storage, action, paths, workers):
+    """
+    Archives (moves below ARCHIVE_FOLDER) or purges the files {file name: stage path} in parallel.
+    Files that no longer exist count as handled. Returns (handled file names, {file name: error}).
+    """
+    def handle(path):
+        source = f"{REMOTE_ROOT_FOLDER}/{path}"
+        try:
+            if action == "ARCHIVE":
+                storage.move(source, f"{ARCHIVE_FOLDER}/{path}")
+            else:
+                storage.delete(source)
+        except BlobNotFound:
+            metrics.inc("bronze_maintenance_missing_files_total", action=action)
+
+    handled, errors = [], {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maintenance") as executor:
+        futures = {name: executor.submit(handle, path) for name, path in paths.items()}
+        for name, future in futures.items():
+            try:
+                future.result()
+                handled.append(name)
+            except Exception as e:
+                errors[name] = str(e)
+    return handled, errors
+
+def mark_files(cursor, strategy, table, action, files):
+    """Records the archived / purged files in the table's file ledger, LOG_CHUNK_FILES names per UPDATE."""
+    ledger, file_column = FILE_LEDGERS[strategy]
+    sql = MARK_FILES_QUERY.format(ledger=ledger, file_column=file_column)
+    for start in range(0, len(files), LOG_CHUNK_FILES):
+        cursor.execute(sql, (action, table, json.dumps(files[start:start + LOG_CHUNK_FILES])))
+
+def log_files_event(cursor, run_id, table, step, status, message, files, error_count, seconds):
+    """ETL_LOGS events of one table, LOG_CHUNK_FILES file names per event (ADDITIONAL_INFO:files)."""
+    for start in range(0, max(len(files), 1), LOG_CHUNK_FILES):
+        chunk = files[start:start + LOG_CHUNK_FILES]
+        cursor.execute(
+            "CALL ECOMMERCE.COMMON.LOG_EVENT(%s, 'BRONZE', 'MAINTAIN_BRONZE', %s, %s, %s, %s, %s, %s, %s, "
+            "NULL, NULL, PARSE_JSON(%s))",
+            (run_id, table.upper(), step, status, message, len(chunk), error_count, round(seconds, 3),
+             json.dumps({"files": chunk, "archive_folder": ARCHIVE_FOLDER if step == "ARCHIVE_FILES" else None})),
+        )
+
+def maintain_files(cursor, storage, run_id, workers, dry_run=False):
+    """
+    Archives / purges the loaded files of every table past its FILE_RETENTION_DAYS, taken from the
+    table's file ledger (FILE_LEDGERS), and records them there. Returns False on errors.
+    """
+    ok = True
+    cursor.execute(CONFIG_QUERY)
+    for table, adls_path, retention_days, action, strategy in cursor.fetchall():
+        if action not in FILE_ACTIONS:
+            logger.error(f"{table}: unknown FILE_RETENTION_ACTION '{action}' (use {' or '.join(FILE_ACTIONS)})")
+            ok = False
+            continue
+        if strategy not in FILE_LEDGERS:
+            logger.error(f"{table}: unknown LOAD_STRATEGY '{strategy}' (use {' or '.join(FILE_LEDGERS)})")
+            ok = False
+            continue
+
+        ledger, file_column = FILE_LEDGERS[strategy]
+        cursor.execute(DUE_FILES_QUERY.format(ledger=ledger, file_column=file_column), (table, retention_days))
+        paths = {name: stage_path(name, adls_path) for (name,) in cursor.fetchall()}
+        unknown = sorted(name for name, path in paths.items() if path is None)
+        if unknown:
+            logger.warning(f"{table}: {len(unknown)} loaded file(s) outside {adls_path} left untouched, e.g. {unknown[0]}")
+        paths = {name: path for name, path in paths.items() if path is not None}
+
+        if dry_run or not paths:
+            logger.info(f"{table}: {len(paths)} file(s) loaded more than {retention_days} days ago to "
+                        f"{action.lower()}{' (dry run)' if dry_run and paths else ''}")
+            continue
+
+        with span("bronze_maintenance_files", log_level=logging.INFO, detail=table, action=action) as s:
+            handled, errors = process_files(storage, action, paths, workers)
+            s.count("files", len(handled))
+        step = FILE_ACTIONS[action]
+        if handled:
+            mark_files(cursor, strategy, table, action, handled)
+            log_files_event(cursor, run_id, table, step, "SUCCESS", f"Loaded files {action.lower()}d",
+                            handled, 0, s.seconds)
+        if errors:
+            name, error = next(iter(errors.items()))
+            logger.error(f"{table}: {len(errors)} file(s) could not be {action.lower()}d, e.g. {name}: {error}")
+            log_files_event(cursor, run_id, table, step, "FAIL", error, sorted(errors), len(errors), s.seconds)
+            ok = False
+    return ok
+
+def check_streams(cursor, run_id, warn_days):
+    """Logs the result of COMMON.CHECK_STREAM_STALENESS. Returns False when a stream is (going) stale."""
+    cursor.execute("CALL ECOMMERCE.COMMON.CHECK_STREAM_STALENESS(%s, %s)", (run_id, warn_days))
+    result = json.loads(cursor.fetchone()[0])
+    for stream in result["stale"]:
+        logger.error(f"Stream {stream} is stale: reload its consumer with --load-mode BACKFILL")
+    for stream in result["warn"]:
+        logger.warning(f"Stream {stream['stream']} goes stale at {stream['stale_after']}")
+    logger.info(f"{result['streams']} streams checked")
+    return not (result["stale"] or result["warn"])
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bronze lifecycle: archives / purges loaded source files, prunes consumed Bronze rows "
+                    "and checks stream staleness (retention settings in BRONZE_INGESTION_CONFIG)."
+    )
+    parser.add_argument("--run-id", default=None, help="Run id of the ETL_LOGS events (default: new UUID)")
+    parser.add_argument("--backend", choices=["azure", "local"], default="azure",
+                        help="Storage of the source files: Azure Blob Storage / Azurite or local filesystem")
+    parser.add_argument("--local-root", default=LOCAL_STORAGE_ROOT, help="Root folder of the local backend")
+    parser.add_argument("--workers", type=int, default=MAINTENANCE_WORKERS, help="Parallel file moves / deletes")
+    parser.add_argument("--warn-days", type=int, default=STALENESS_WARN_DAYS,
+                        help="Fail when a stream goes stale within this many days")
+    parser.add_argument("--skip-files", action="store_true", help="Leave the source files untouched")
+    parser.add_argument("--skip-tables", action="store_true",
+                        help="Do not prune Bronze tables (BRONZE.MAINTAIN_BRONZE_MASTER is not called)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only report due files and stream staleness; nothing is moved, deleted or pruned")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_id = args.run_id or str(uuid.uuid4())
+    logger.info(f"Bronze maintenance run {run_id}{' (dry run)' if args.dry_run else ''}")
+
+    ok = True
+    connection = snowflake_connect()
+    try:
+        cursor = connection.cursor()
+
+        # 1. SOURCE FILES (before the tables: the files stay the replayable copy of pruned rows)
+        if not args.skip_files:
+            storage = None if args.dry_run else create_backend(args.backend, local_root=args.local_root,
+                                                               pool_size=args.workers)
+            ok = maintain_files(cursor, storage, run_id, args.workers, args.dry_run)
+
+        # 2. BRONZE ROWS & STREAMS (the master checks the streams itself and fails on stale ones)
+        if args.dry_run or args.skip_tables:
+            ok = check_streams(cursor, run_id, args.warn_days) and ok
+        else:
+            try:
+                cursor.execute("CALL ECOMMERCE.BRONZE.MAINTAIN_BRONZE_MASTER(%s, %s)", (run_id, args.warn_days))
+                logger.info(cursor.fetchone()[0])
+            except Exception as e:
+                logger.error(f"Bronze table maintenance failed: {e}")
+                ok = False
+    finally:
+        connection.close()
+
+    if not ok:
+        logger.error(f"Bronze maintenance run {run_id} finished with errors (see ETL_LOGS)")
+        sys.exit(1)
+    logger.info(f"Bronze maintenance run {run_id} finished")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"Bronze maintenance failed: {e}")
+        sys.exit(1)
@@ -1,7 +1,35 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
 import sys
+import threading
+import time
+from contextlib import ContextDecorator
+from datetime import datetime, timezone
 import colorlog
 
+# ==========================================
+# CONFIGURATION
+# ==========================================
+LOG_FORMAT = os.getenv("LOG_FORMAT", "color").lower()     # color | json
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+METRICS_FILE = os.getenv("METRICS_FILE")                   # written at exit: *.prom = Prometheus textfile, else JSON
+
+# Upper bounds (seconds / bytes / rows, depending on the histogram) of the histogram buckets
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+
+# Attributes every LogRecord has; anything else was passed with `extra=` and goes to the JSON output
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# ==========================================
+# FORMATTERS
+# ==========================================
+
 # define log format
 # %(log_color)s - sets the color based on the log level
 log_format = "%(log_color)s%(asctime)s [%(levelname)s] %(message)s"
@@ -20,14 +48,56 @@ formatter = colorlog.ColoredFormatter(
     }
 )
 
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, process, thread and the `extra=` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.processName,
+            "thread": record.threadName,
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+# ==========================================
+# HANDLERS (non-blocking)
+# ==========================================
+
 # handler for stdout
 handler = logging.StreamHandler(sys.stdout)
-handler.setFormatter(formatter)
+handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else formatter)
+
+# Callers only put records on a queue; a listener thread formats and writes them,
+# so logging never blocks generation loops or upload threads on stdout.
+log_queue = queue.SimpleQueue()
+listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)   # flushes the records still queued
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Keep the record as is (the default merges args and exception into the message,
+        # which would hide them from JsonFormatter); only make it safe to pass to the thread.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
 
 # logging configuration
 logging.basicConfig(
-    level=logging.INFO,
-    handlers=[handler]  # use custom handler with color formatter
+    level=LOG_LEVEL,
+    handlers=[_QueueHandler(log_queue)]  # use the queue; the listener writes with the formatter above
 )
 
 # =================================================================
@@ -38,4 +108,193 @@ logging.getLogger("azure.core.pipeline.policies.http_logging_policy").setLevel(l
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 # custom logger
-logger = logging.getLogger("AzureSnowflakePipeline")
\ No newline at end of file
+logger = logging.getLogger("AzureSnowflakePipeline")
+
+# ==========================================
+# METRICS
+# ==========================================
+
+class Metrics:
+    """
+    Counters and histograms of this process (thread-safe), keyed by name and labels.
+
+    Worker processes send theirs to the coordinator with snapshot(reset=True) / merge().
+    Names follow the Prometheus conventions: counters end in _total, durations in _seconds.
+    """
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = {"count": 0, "sum": 0.0, "min": value, "max": value,
+                                                "buckets": [0] * (len(self.buckets) + 1)}
+            hist["count"] += 1
+            hist["sum"] += value
+            hist["min"] = min(hist["min"], value)
+            hist["max"] = max(hist["max"], value)
+            hist["buckets"][next((i for i, bound in enumerate(self.buckets) if value <= bound),
+                                 len(self.buckets))] += 1
+
+    def snapshot(self, reset=False):
+        """Picklable copy of all values: {"counters": [...], "histograms": [...]}."""
+        with self._lock:
+            snap = {
+                "counters": [(name, labels, value) for (name, labels), value in self._counters.items()],
+                "histograms": [(name, labels, copy.deepcopy(hist)) for (name, labels), hist in self._histograms.items()],
+            }
+            if reset:
+                self._counters.clear()
+                self._histograms.clear()
+        return snap
+
+    def merge(self, snap):
+        """Adds a snapshot (e.g. of a worker process) to this registry."""
+        with self._lock:
+            for name, labels, value in snap["counters"]:
+                key = (name, tuple(labels))
+                self._counters[key] = self._counters.get(key, 0) + value
+            for name, labels, other in snap["histograms"]:
+                key = (name, tuple(labels))
+                hist = self._histograms.get(key)
+                if hist is None:
+                    self._histograms[key] = copy.deepcopy(other)
+                    continue
+                hist["count"] += other["count"]
+                hist["sum"] += other["sum"]
+                hist["min"] = min(hist["min"], other["min"])
+                hist["max"] = max(hist["max"], other["max"])
+                hist["buckets"] = [a + b for a, b in zip(hist["buckets"], other["buckets"])]
+
+    def to_json(self):
+        """Summary per metric: counters as values, histograms as count / sum / avg / min / max."""
+        snap = self.snapshot()
+        return {
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for name, labels, value in sorted(snap["counters"])],
+            "histograms": [{"name": name, "labels": dict(labels), "count": hist["count"],
+                            "sum": hist["sum"], "avg": hist["sum"] / hist["count"],
+                            "min": hist["min"], "max": hist["max"]}
+                           for name, labels, hist in sorted(snap["histograms"], key=lambda h: h[:2])],
+        }
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (node_exporter textfile collector)."""
+        def series(name, labels, extra=()):
+            pairs = [f'{key}="{value}"' for key, value in (*labels, *extra)]
+            return f"{name}{{{','.join(pairs)}}}" if pairs else name
+
+        snap = self.snapshot()
+        lines = []
+        for name in sorted({name for name, _, _ in snap["counters"]}):
+            lines.append(f"# TYPE {name} counter")
+            lines += [f"{series(name, labels)} {value}" for n, labels, value in snap["counters"] if n == name]
+        for name in sorted({name for name, _, _ in snap["histograms"]}):
+            lines.append(f"# TYPE {name} histogram")
+            for n, labels, hist in snap["histograms"]:
+                if n != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), hist["buckets"]):
+                    cumulative += count
+                    lines.append(f"{series(name + '_bucket', labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{series(name + '_sum', labels)} {hist['sum']}")
+                lines.append(f"{series(name + '_count', labels)} {hist['count']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Writes the metrics to `path` (Prometheus textfile for *.prom, JSON otherwise)."""
+        content = self.to_prometheus() if path.endswith(".prom") else json.dumps(self.to_json(), indent=2)
+        # textfile collectors may read at any time: write next to the target and rename
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+metrics = Metrics()
+
+
+class span(ContextDecorator):
+    """
+    Times a block or, used as a decorator, every call of a function.
+
+    Observes the histogram `<name>_seconds` (and counts `<name>_errors_total` on exceptions)
+    with the given labels, and logs the duration at `log_level` (None = no log line).
+    Amounts handled in the span are added with count(), e.g. s.count("bytes", size), which
+    adds to `<name>_<unit>_total` and puts the throughput per second into the log line.
+    `detail` only goes to the log line, not to the metric labels.
+
+        with span("deploy_file", file="01.sql", log_level=logging.INFO) as s:
+            ...
+            s.count("statements", n)
+    """
+
+    def __init__(self, name, log_level=logging.DEBUG, detail=None, **labels):
+        self.name = name
+        self.log_level = log_level
+        self.detail = detail
+        self.labels = labels
+        self.amounts = {}
+        self.seconds = None
+
+    def _recreate_cm(self):
+        # a fresh instance per decorated call (calls may overlap in threads)
+        return span(self.name, self.log_level, self.detail, **self.labels)
+
+    def count(self, unit, value):
+        self.amounts[unit] = self.amounts.get(unit, 0) + value
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self._start
+        metrics.observe(f"{self.name}_seconds", self.seconds, **self.labels)
+        for unit, value in self.amounts.items():
+            metrics.inc(f"{self.name}_{unit}_total", value, **self.labels)
+        if exc_type is not None:
+            metrics.inc(f"{self.name}_errors_total", **self.labels)
+
+        if self.log_level is not None and logger.isEnabledFor(self.log_level):
+            rates = "".join(f", {value:,.0f} {unit} ({value / self.seconds:,.0f}/s)"
+                            for unit, value in self.amounts.items() if self.seconds > 0)
+            labels = "".join(f" {key}={value}" for key, value in self.labels.items())
+            detail = f" {self.detail}" if self.detail else ""
+            outcome = "failed after" if exc_type is not None else "took"
+            logger.log(self.log_level, f"{self.name}{labels}{detail} {outcome} {self.seconds:.3f}s{rates}",
+                       extra={"span": self.name, "seconds": round(self.seconds, 6), **self.labels,
+                              **{f"{unit}_count": value for unit, value in self.amounts.items()}})
+        return False
+
+
+def export_metrics(path=METRICS_FILE):
+    """Writes the metrics of this process to `path` (default METRICS_FILE; nothing if unset)."""
+    if path:
+        metrics.export(path)
+        logger.info(f"Metrics written to {path}")
+
+def _export_metrics_at_exit():
+    # Only the main process exports; worker processes hand their metrics over with snapshot().
+    # Checked at exit: spawned workers import this module before their parent is known.
+    if multiprocessing.parent_process() is None:
+        export_metrics()
+
+# Registered after listener.stop, so it runs before it (atexit is LIFO) and its log line is written.
+atexit.register(_export_metrics_at_exit)
@@ -1,14 +1,18 @@
+import argparse
+import hashlib
 import os
 import sys
 import subprocess
 import time
 import re
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 import snowflake.connector
 from snowflake.connector.errors import ProgrammingError
 from snowflake.connector.util_text import split_statements
 from io import StringIO
-from common_logger import logger
+from common_logger import logger, span
 
 # Constant list of SQL files to execute
 SQL_FILES = [
@@ -19,6 +23,27 @@ SQL_FILES = [
 # Predefined Role ID for 'Storage Blob Data Contributor'
 ROLE_ID_STORAGE_BLOB_DATA_CONTRIBUTOR = os.getenv("ROLE_ID_STORAGE_BLOB_DATA_CONTRIBUTOR")
 
+# Deployment ledger: content hash per deployed statement, unchanged statements are skipped
+DEPLOY_LEDGER_TABLE = "ECOMMERCE.COMMON.DEPLOY_LEDGER"
+LEDGER_ROLE = "SYSADMIN"
+
+# Statement actions of a deployment plan
+USE, NEW, CHANGED, UNCHANGED = "USE", "NEW", "CHANGED", "UNCHANGED"
+
+USE_PATTERN = re.compile(r"^USE\s+(ROLE|WAREHOUSE|DATABASE|SCHEMA)\s+(\S+?)\s*;?$", re.IGNORECASE)
+OBJECT_PATTERN = re.compile(
+    r"^CREATE\s+(?:OR\s+REPLACE\s+)?(?:SECURE\s+|TRANSIENT\s+)?"
+    r"(DATABASE|SCHEMA|WAREHOUSE|TABLE|VIEW|STREAM|STAGE|FILE\s+FORMAT|STORAGE\s+INTEGRATION|"
+    r"PROCEDURE|FUNCTION|TASK|SEQUENCE|ROLE|USER|MASKING\s+POLICY)\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w.$\"]+)",
+    re.IGNORECASE
+)
+
+# Concurrent deployment: statements without dependencies between them run in parallel
+DEPLOY_CONCURRENCY = int(os.getenv("DEPLOY_CONCURRENCY", "8"))
+NAME_PATTERN = re.compile(r"\bECOMMERCE(?:\.\w+){0,2}", re.IGNORECASE)
+DML_PATTERN = re.compile(r"^(ALTER|INSERT|MERGE|DELETE|UPDATE|TRUNCATE|COPY)\b", re.IGNORECASE)
+GRANT_PATTERN = re.compile(r"^(GRANT|REVOKE)\b", re.IGNORECASE)
+
 def get_credentials():
     """
     Fetch Snowflake credentials from environment variables.
@@ -165,30 +190,272 @@ def configure_azure_storage_access():
     logger.error("FAILED to grant role via Azure CLI.")
     return False
 
-def execute_sql_file(conn, file_path, replacements):
+def read_statements(file_path, replacements):
+    """
+    Reads a SQL file, replaces the placeholders and splits it into statements.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        sql_content = f.read()
+
+    # Apply replacements
+    for key, value in replacements.items():
+        sql_content = sql_content.replace(key, value)
+
+    statements = []
+    for item in split_statements(StringIO(sql_content), remove_comments=True):
+        if isinstance(item, tuple): stmt = item[0]
+        else: stmt = item
+        if stmt and stmt.strip():
+            statements.append(stmt.strip())
+    return statements
+
+def plan_statements(statements, ledger):
+    """
+    Compares the statements of a file with the ledger ({statement key: hash}).
+    Returns one step per statement: {stmt, key, hash, action, context}.
+
+    The key is the created object (e.g. 'PROCEDURE ECOMMERCE.GOLD.LOAD_DIM_PRODUCTS') or, for
+    other statements, the statement hash. The hash includes the USE context (role, warehouse)
+    the statement runs under. Statements acting on objects created earlier in the file (ALTER,
+    GRANT, DML) also hash those objects' hashes, so they run again when an object they use is
+    re-created (e.g. ALTER TASK ... RESUME after CREATE OR REPLACE TASK).
+    """
+    context = {}
+    occurrences = {}
+    created = {}
+    plan = []
+    for stmt in statements:
+        use = USE_PATTERN.match(stmt)
+        if use:
+            context[use.group(1).upper()] = use.group(2).upper()
+            plan.append({"stmt": stmt, "key": None, "hash": None, "action": USE, "context": dict(context)})
+            continue
+
+        digest = hashlib.sha256(f"{sorted(context.items())}\n{stmt}".encode("utf-8")).hexdigest()
+        obj = OBJECT_PATTERN.match(stmt)
+        if obj:
+            key = f"{' '.join(obj.group(1).upper().split())} {obj.group(2).upper()}"
+            created[obj.group(2).upper()] = digest
+        else:
+            key = f"STATEMENT {digest[:32]}"
+            names = {name.upper() for name in NAME_PATTERN.findall(stmt)}
+            used = sorted(
+                created[name] for name in created
+                # unqualified objects (integration, warehouse, role, user) referenced by name
+                if name in names or ("." not in name and re.search(rf"\b{re.escape(name)}\b", stmt, re.IGNORECASE))
+            )
+            if used:
+                digest = hashlib.sha256(f"{digest}\n{used}".encode("utf-8")).hexdigest()
+        occurrences[key] = occurrences.get(key, 0) + 1
+        if occurrences[key] > 1:
+            key = f"{key} #{occurrences[key]}"
+
+        if key not in ledger: action = NEW
+        elif ledger[key] != digest: action = CHANGED
+        else: action = UNCHANGED
+        plan.append({"stmt": stmt, "key": key, "hash": digest, "action": action, "context": dict(context)})
+    return plan
+
+def use_context(cursor, context, session):
+    """Issues the USE statements needed to bring the session (dict, updated in place) to `context`."""
+    for kind, value in context.items():
+        if session.get(kind) != value:
+            cursor.execute(f"USE {kind} {value}")
+            session[kind] = value
+
+def classify_statement(stmt):
+    """
+    Returns (kind, reads, writes) of a statement. kind is CREATE, DML, GRANT or OTHER;
+    reads / writes are the ECOMMERCE objects it uses / creates or modifies.
+    """
+    names = {name.upper() for name in NAME_PATTERN.findall(stmt)}
+    obj = OBJECT_PATTERN.match(stmt)
+    if obj:
+        target = obj.group(2).upper()
+        return "CREATE", names - {target}, {target}
+    if GRANT_PATTERN.match(stmt):
+        return "GRANT", names, set()
+    if DML_PATTERN.match(stmt):
+        return "DML", set(), names
+    return "OTHER", names, set()
+
+def _with_parents(names):
+    """Adds the database / schema of every object name (ECOMMERCE.GOLD.X -> ECOMMERCE.GOLD, ECOMMERCE)."""
+    scope = set(names)
+    for name in names:
+        parts = name.split(".")
+        scope.update(".".join(parts[:i]) for i in range(1, len(parts)))
+    return scope
+
+def statement_dependencies(steps):
+    """
+    For every step, the indexes of the earlier steps it has to wait for:
+    - schema / database before the objects in it, tables before the streams and views on them
+      (a statement waits for earlier statements creating or modifying what it uses)
+    - statements modifying the same object keep their order
+    - grants wait for every earlier statement; later statements wait for the grants
+    - unknown statements (SELECT, CALL, ...) are full barriers
+    """
+    info = []
+    for step in steps:
+        kind, reads, writes = classify_statement(step["stmt"])
+        info.append((kind, reads, writes, _with_parents(reads | writes), step["stmt"]))
+
+    dependencies = []
+    for i, (kind_b, reads_b, writes_b, scope_b, stmt_b) in enumerate(info):
+        depends_on = set()
+        for j, (kind_a, reads_a, writes_a, _, _) in enumerate(info[:i]):
+            if "OTHER" in (kind_a, kind_b):
+                conflict = True
+            elif kind_b == "GRANT":
+                conflict = kind_a != "GRANT"
+            elif kind_a == "GRANT":
+                conflict = True
+            else:
+                conflict = bool(writes_a & scope_b or reads_a & writes_b) or any(
+                    # unqualified objects (integration, warehouse, role, user) referenced by name
+                    "." not in name and re.search(rf"\b{re.escape(name)}\b", stmt_b, re.IGNORECASE)
+                    for name in writes_a
+                )
+            if conflict:
+                depends_on.add(j)
+        dependencies.append(depends_on)
+    return dependencies
+
+def deploy_levels(steps):
+    """Groups steps into levels; a step only depends on steps of earlier levels."""
+    levels = []
+    for i, depends_on in enumerate(statement_dependencies(steps)):
+        levels.append(1 + max((levels[j] for j in depends_on), default=-1))
+    grouped = [[] for _ in range(max(levels, default=-1) + 1)]
+    for step, level in zip(steps, levels):
+        grouped[level].append(step)
+    return grouped
+
+def _execute_statement(conn, step):
+    cursor = conn.cursor()
+    try:
+        with span("deploy_statement", detail=step["key"], kind=classify_statement(step["stmt"])[0]):
+            cursor.execute(step["stmt"])
+    finally:
+        cursor.close()
+
+def execute_plan(conn, plan, session, concurrency=DEPLOY_CONCURRENCY):
+    """
+    Executes the NEW and CHANGED statements of a plan. USE statements are only issued
+    before statements that actually run; they are barriers, since the session context
+    is shared by all cursors. Between them, the statements run level by level
+    (see deploy_levels), each level on up to `concurrency` cursors.
+    Stops after the first level with errors; every failed statement is reported.
+    Returns (deployed steps, success flag).
+    """
+    segments = []
+    for step in plan:
+        if step["action"] in (USE, UNCHANGED):
+            continue
+        if segments and segments[-1][0] == step["context"]:
+            segments[-1][1].append(step)
+        else:
+            segments.append((step["context"], [step]))
+
+    deployed = []
+    cursor = conn.cursor()
+    try:
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix="deploy") as executor:
+            for context, steps in segments:
+                try:
+                    use_context(cursor, context, session)
+                except ProgrammingError as e:
+                    logger.error(f"SQL ERROR (USE {context}): {e}")
+                    return deployed, False
+
+                for level in deploy_levels(steps):
+                    futures = {executor.submit(_execute_statement, conn, step): step for step in level}
+                    wait(futures)
+
+                    failed = False
+                    for future, step in futures.items():
+                        error = future.exception()
+                        if error is None:
+                            deployed.append(step)
+                        else:
+                            logger.error(f"SQL ERROR ({step['key']}): {error}")
+                            failed = True
+                    if failed:
+                        return deployed, False
+    finally:
+        cursor.close()
+    return deployed, True
+
+def load_ledger(cursor, session):
+    """
+    Returns {statement key: hash} of the deployed statements.
+    Empty when the ledger does not exist yet (first deployment).
+    """
+    try:
+        use_context(cursor, {"ROLE": LEDGER_ROLE}, session)
+        cursor.execute(f"SELECT STATEMENT_KEY, STATEMENT_HASH FROM {DEPLOY_LEDGER_TABLE}")
+        return {key: digest for key, digest in cursor.fetchall()}
+    except ProgrammingError:
+        logger.info("Deploy ledger not found. All statements will be deployed.")
+        return {}
+
+def record_deployments(cursor, steps, source_file, session):
+    """
+    Upserts the hashes of the deployed statements into the ledger (one MERGE per file).
+    """
+    if not steps:
+        return
+    values = ", ".join(["(%s, %s, %s)"] * len(steps))
+    params = [value for step in steps for value in (step["key"], step["hash"], source_file)]
+
+    use_context(cursor, {"ROLE": LEDGER_ROLE}, session)
+    cursor.execute(f"""
+        MERGE INTO {DEPLOY_LEDGER_TABLE} l
+        USING (
+            SELECT column1 AS STATEMENT_KEY, column2 AS STATEMENT_HASH, column3 AS SOURCE_FILE
+            FROM VALUES {values}
+        ) s
+        ON l.STATEMENT_KEY = s.STATEMENT_KEY
+        WHEN MATCHED THEN UPDATE SET
+            STATEMENT_HASH = s.STATEMENT_HASH,
+            SOURCE_FILE = s.SOURCE_FILE,
+            DEPLOYED_AT = CURRENT_TIMESTAMP(),
+            DEPLOYED_BY = CURRENT_USER()
+        WHEN NOT MATCHED THEN INSERT (STATEMENT_KEY, STATEMENT_HASH, SOURCE_FILE)
+            VALUES (s.STATEMENT_KEY, s.STATEMENT_HASH, s.SOURCE_FILE)
+    """, params)
+
+def summarize_plan(plan):
+    return {action: sum(1 for step in plan if step["action"] == action) for action in (NEW, CHANGED, UNCHANGED)}
+
+def execute_sql_file(conn, file_path, replacements, ledger, session, concurrency=DEPLOY_CONCURRENCY):
     """
     Executes a SQL file against the Snowflake connection.
     Replaces placeholders in the SQL file with provided replacements.
+    Statements recorded in the ledger with the same hash are skipped.
     """    
     logger.info(f"Processing: {file_path}")
     cursor = conn.cursor()
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            sql_content = f.read()
-
-        # Apply replacements
-        for key, value in replacements.items():
-            sql_content = sql_content.replace(key, value)
-
-        # Split and execute statements
-        for item in split_statements(StringIO(sql_content), remove_comments=True):
-            if isinstance(item, tuple): stmt = item[0]
-            else: stmt = item
-            if stmt and stmt.strip():
-                try: cursor.execute(stmt)
-                except ProgrammingError as e:
-                    logger.error(f"SQL ERROR: {e}")
-                    return False
+        plan = plan_statements(read_statements(file_path, replacements), ledger)
+        counts = summarize_plan(plan)
+        logger.info(f"{counts[NEW]} new, {counts[CHANGED]} changed, {counts[UNCHANGED]} unchanged (skipped) statements")
+
+        with span("deploy_file", log_level=logging.INFO, file=os.path.basename(file_path)) as s:
+            deployed, ok = execute_plan(conn, plan, session, concurrency)
+            s.count("statements", len(deployed))
+        try:
+            record_deployments(cursor, deployed, file_path, session)
+        except ProgrammingError as e:
+            # e.g. the ledger table was not created because the file failed before it
+            logger.warning(f"Deploy ledger not updated: {e}")
+        if not ok:
+            return False
+
+        # Leave the session as the file left it (as if every USE statement had run)
+        if plan:
+            use_context(cursor, plan[-1]["context"], session)
         
         logger.info(f"Success: {file_path}")
         
@@ -217,7 +484,28 @@ def execute_sql_file(conn, file_path, replacements):
     finally:
         cursor.close()
 
-def main():
+def plan_deployment(replacements, ledger):
+    """
+    Lists the statements which would be executed (NEW / CHANGED) without changing anything.
+    """
+    for sql_file in SQL_FILES:
+        plan = plan_statements(read_statements(sql_file, replacements), ledger)
+        counts = summarize_plan(plan)
+        logger.info(f"{sql_file}: {counts[NEW]} new, {counts[CHANGED]} changed, {counts[UNCHANGED]} unchanged")
+        for step in plan:
+            if step["action"] in (NEW, CHANGED):
+                logger.info(f"  {step['action']:<8} {step['key']}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Deploys the Snowflake objects of SQL_FILES.")
+    parser.add_argument("--plan", action="store_true", help="Only list the statements which would be executed")
+    parser.add_argument("--full", action="store_true", help="Ignore the deploy ledger and execute every statement")
+    parser.add_argument("--concurrency", type=int, default=DEPLOY_CONCURRENCY,
+                        help="Statements executed at the same time (1 = serial)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     replacements = get_replacements()
     creds = get_credentials()
     
@@ -229,8 +517,20 @@ def main():
     try:
         conn = snowflake.connector.connect(**creds)
         logger.info("Connected!")
+
+        session = {}
+        cursor = conn.cursor()
+        try:
+            ledger = {} if args.full else load_ledger(cursor, session)
+        finally:
+            cursor.close()
+
+        if args.plan:
+            plan_deployment(replacements, ledger)
+            return
+
         for sql_file in SQL_FILES:
-            if not execute_sql_file(conn, sql_file, replacements):
+            if not execute_sql_file(conn, sql_file, replacements, ledger, session, args.concurrency):
                 logger.error("Deployment failed.")
                 sys.exit(1)
         logger.info("DEPLOYMENT FINISHED SUCCESSFULLY.")
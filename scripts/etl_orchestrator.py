@@ -0,0 +1,394 @@
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from common_logger import logger
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+SNOWFLAKE_ACCOUNT = os.getenv("SNOWFLAKE_ACCOUNT")
+ETL_USER = os.getenv("SNOWFLAKE_ETL_USER", "ETL_USER")
+ETL_PASSWORD = os.getenv("SNOWFLAKE_ETL_PASSWORD")
+ETL_WAREHOUSE = os.getenv("SNOWFLAKE_ETL_WAREHOUSE", "ETL_WH")
+ETL_ROLE = os.getenv("SNOWFLAKE_ETL_ROLE", "ETL_ROLE")
+
+DEFAULT_CONCURRENCY = int(os.getenv("ETL_CONCURRENCY", "4"))
+LAYERS = ["BRONZE", "SILVER", "GOLD"]
+
+# LOAD_MODE argument of the Silver/Gold procedures (see 02_REGISTER_PROCEDURES.sql)
+INCREMENTAL, AUTO, BACKFILL = "INCREMENTAL", "AUTO", "BACKFILL"
+LOAD_MODES = [INCREMENTAL, AUTO, BACKFILL]
+
+# Procedures of the Medallion layers (ECOMMERCE.<node>) and what they need.
+# node: (input streams, upstream nodes)
+# A node is skipped when none of its input streams has data; nodes without
+# input streams always run.
+PIPELINE_DAG = {
+    "BRONZE.LOAD_BRONZE_MASTER": ([], []),
+
+    "SILVER.LOAD_PRODUCTS": (["BRONZE.products_stream"], ["BRONZE.LOAD_BRONZE_MASTER"]),
+    "SILVER.LOAD_CUSTOMERS": (["BRONZE.customers_stream"], ["BRONZE.LOAD_BRONZE_MASTER"]),
+    "SILVER.LOAD_ADDRESSES": (["BRONZE.addresses_stream"], ["BRONZE.LOAD_BRONZE_MASTER", "SILVER.LOAD_CUSTOMERS"]),
+    "SILVER.LOAD_ORDERS": (["BRONZE.orders_stream"], ["SILVER.LOAD_CUSTOMERS", "SILVER.LOAD_ADDRESSES"]),
+    "SILVER.LOAD_ORDER_ITEMS": (["BRONZE.order_items_stream"], ["SILVER.LOAD_ORDERS", "SILVER.LOAD_PRODUCTS"]),
+    "SILVER.LOAD_ORDER_STATUS_HISTORY": (["BRONZE.order_status_history_stream"], ["SILVER.LOAD_ORDERS"]),
+    "SILVER.LOAD_PAYMENTS": (["BRONZE.payments_stream"], ["SILVER.LOAD_ORDERS"]),
+    "SILVER.LOAD_SHIPMENTS": (["BRONZE.shipments_stream"], ["SILVER.LOAD_ORDERS"]),
+
+    "GOLD.LOAD_DIM_PRODUCTS": (["SILVER.products_stream"], ["SILVER.LOAD_PRODUCTS"]),
+    "GOLD.LOAD_DIM_CUSTOMERS": (["SILVER.customers_stream", "SILVER.addresses_stream"],
+                                ["SILVER.LOAD_CUSTOMERS", "SILVER.LOAD_ADDRESSES"]),
+    "GOLD.LOAD_FACT_ORDERS": (["SILVER.orders_stream"], ["SILVER.LOAD_ORDERS", "GOLD.LOAD_DIM_CUSTOMERS"]),
+    "GOLD.LOAD_FACT_SALES": (["SILVER.order_items_stream"],
+                             ["SILVER.LOAD_ORDER_ITEMS", "SILVER.LOAD_ORDERS",
+                              "GOLD.LOAD_DIM_PRODUCTS", "GOLD.LOAD_DIM_CUSTOMERS"]),
+    "GOLD.LOAD_FACT_SHIPMENTS": (["SILVER.shipments_stream"],
+                                 ["SILVER.LOAD_SHIPMENTS", "SILVER.LOAD_ORDERS", "GOLD.LOAD_DIM_CUSTOMERS"]),
+    "GOLD.LOAD_FACT_PAYMENTS": (["SILVER.payments_stream"],
+                                ["SILVER.LOAD_PAYMENTS", "SILVER.LOAD_ORDERS", "GOLD.LOAD_DIM_CUSTOMERS"]),
+    "GOLD.LOAD_FACT_ORDER_STATUS_HISTORY": (["SILVER.order_status_history_stream"],
+                                            ["SILVER.LOAD_ORDER_STATUS_HISTORY"]),
+    "GOLD.LOAD_GOLD_AGGREGATES": (["GOLD.fact_orders_stream", "GOLD.fact_sales_stream",
+                                   "GOLD.fact_shipments_stream", "GOLD.fact_payments_stream"],
+                                  ["GOLD.LOAD_FACT_ORDERS", "GOLD.LOAD_FACT_SALES",
+                                   "GOLD.LOAD_FACT_SHIPMENTS", "GOLD.LOAD_FACT_PAYMENTS"]),
+}
+
+# Node results
+SUCCESS = "SUCCESS"
+SKIPPED = "SKIPPED"
+FAILED = "FAILED"
+UPSTREAM_FAILED = "UPSTREAM_FAILED"
+
+
+# ==========================================
+# DAG HELPERS
+# ==========================================
+
+def select_layers(dag, layers):
+    """Keeps the nodes of `layers`. Dependencies on dropped nodes are treated as already satisfied."""
+    kept = {node for node in dag if node.split(".")[0] in layers}
+    return {node: (streams, [up for up in upstream if up in kept])
+            for node, (streams, upstream) in dag.items() if node in kept}
+
+def topological_order(dag):
+    """Returns the nodes in dependency order. Raises ValueError on unknown or cyclic dependencies."""
+    for node, (_, upstream) in dag.items():
+        unknown = [up for up in upstream if up not in dag]
+        if unknown:
+            raise ValueError(f"{node} depends on unknown node(s): {unknown}")
+
+    remaining = {node: set(upstream) for node, (_, upstream) in dag.items()}
+    order = []
+    while remaining:
+        ready = sorted(node for node, upstream in remaining.items() if not upstream)
+        if not ready:
+            raise ValueError(f"Dependency cycle between: {sorted(remaining)}")
+        for node in ready:
+            del remaining[node]
+            for upstream in remaining.values():
+                upstream.discard(node)
+        order.extend(ready)
+    return order
+
+def critical_path(dag, durations):
+    """Longest path through the DAG weighted by `durations` (seconds). Returns (seconds, [nodes])."""
+    finish = {}
+    previous = {}
+    for node in topological_order(dag):
+        upstream = dag[node][1]
+        start_after = max(upstream, key=lambda up: finish[up], default=None)
+        previous[node] = start_after
+        finish[node] = (finish[start_after] if start_after else 0.0) + durations.get(node, 0.0)
+
+    if not finish:
+        return 0.0, []
+    node = max(finish, key=finish.get)
+    total = finish[node]
+    path = []
+    while node:
+        path.append(node)
+        node = previous[node]
+    return total, path[::-1]
+
+
+# ==========================================
+# WAREHOUSE CONNECTIONS
+# ==========================================
+
+def snowflake_connect():
+    """Opens an autocommit session as ETL_USER. Every node runs in its own session / transaction."""
+    import snowflake.connector
+
+    return snowflake.connector.connect(
+        account=SNOWFLAKE_ACCOUNT,
+        user=ETL_USER,
+        password=ETL_PASSWORD,
+        warehouse=ETL_WAREHOUSE,
+        role=ETL_ROLE,
+        autocommit=True,
+    )
+
+
+class ConnectionPool:
+    """Hands out at most `size` connections, opened lazily with `connect()` and reused between nodes."""
+
+    def __init__(self, connect, size):
+        self.connect = connect
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        conn = self._take()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def _take(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._opened) < self.size:
+                conn = self.connect()
+                self._opened.append(conn)
+                return conn
+        return self._idle.get()
+
+    def close(self):
+        for conn in self._opened:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.warning(f"Failed to close connection: {e}")
+        self._opened = []
+
+
+class LocalWarehouse:
+    """
+    Offline stand-in for the Snowflake connection (DB-API subset used by this module).
+
+    Procedure CALLs sleep for their configured duration and may be set up to fail;
+    SYSTEM$STREAM_HAS_DATA answers from `empty_streams`. Every statement is recorded
+    in `statements` as (start, end, sql, params).
+    """
+
+    def __init__(self, durations=None, default_seconds=0.1, failing=(), empty_streams=()):
+        self.durations = durations or {}
+        self.default_seconds = default_seconds
+        self.failing = set(failing)
+        self.empty_streams = set(empty_streams)
+        self.statements = []
+        self._lock = threading.Lock()
+
+    def connect(self):
+        return _LocalConnection(self)
+
+    def execute(self, sql, params):
+        start = time.perf_counter()
+        result = None
+        if "SYSTEM$STREAM_HAS_DATA" in sql:
+            result = (params[0].removeprefix("ECOMMERCE.") not in self.empty_streams,)
+        elif sql.startswith("CALL ECOMMERCE.") and "LOG_EVENT" not in sql:
+            node = sql[len("CALL ECOMMERCE."):sql.index("(")]
+            time.sleep(self.durations.get(node, self.default_seconds))
+            if node in self.failing:
+                raise RuntimeError(f"Simulated failure of {node}")
+            result = (f"{node} COMPLETED SUCCESSFULLY",)
+        with self._lock:
+            self.statements.append((start, time.perf_counter(), sql, params))
+        return result
+
+
+class _LocalConnection:
+    def __init__(self, warehouse):
+        self.warehouse = warehouse
+
+    def cursor(self):
+        return _LocalCursor(self.warehouse)
+
+    def close(self):
+        pass
+
+
+class _LocalCursor:
+    def __init__(self, warehouse):
+        self.warehouse = warehouse
+        self._row = None
+
+    def execute(self, sql, params=None):
+        self._row = self.warehouse.execute(sql, params)
+        return self
+
+    def fetchone(self):
+        return self._row
+
+    def close(self):
+        pass
+
+
+# ==========================================
+# NODE EXECUTION
+# ==========================================
+
+def log_event(cursor, run_id, node, step, status, message, duration=0):
+    layer, process = node.split(".")
+    cursor.execute(
+        "CALL ECOMMERCE.COMMON.LOG_EVENT(%s, %s, %s, NULL, %s, %s, %s, 0, 0, %s, NULL, NULL, NULL)",
+        (run_id, layer, process, step, status, message, round(duration, 3)),
+    )
+
+def pending_streams(cursor, streams):
+    """Input streams which currently have change records."""
+    pending = []
+    for stream in streams:
+        row = cursor.execute("SELECT SYSTEM$STREAM_HAS_DATA(%s)", (f"ECOMMERCE.{stream}",)).fetchone()
+        if row and row[0]:
+            pending.append(stream)
+    return pending
+
+def run_node(pool, run_id, node, streams, load_mode=INCREMENTAL):
+    """
+    Runs one procedure on a pooled session. The procedures open their own transaction and
+    log through COMMON.LOG_EVENT; here only skipped nodes are logged.
+
+    Empty input streams only skip a node in INCREMENTAL mode: a backfill reads the whole
+    source table. Bronze has no load mode.
+    """
+    start = time.perf_counter()
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            if load_mode == INCREMENTAL and streams and not pending_streams(cursor, streams):
+                log_event(cursor, run_id, node, "SKIP", SKIPPED, "No new data in input streams")
+                return SKIPPED, time.perf_counter() - start, None
+            if node.startswith("BRONZE."):
+                cursor.execute(f"CALL ECOMMERCE.{node}(%s)", (run_id,))
+            else:
+                cursor.execute(f"CALL ECOMMERCE.{node}(%s, %s)", (run_id, load_mode))
+            return SUCCESS, time.perf_counter() - start, None
+        except Exception as e:
+            return FAILED, time.perf_counter() - start, str(e)
+        finally:
+            cursor.close()
+
+def execute_dag(dag, run, concurrency):
+    """
+    Runs every node as soon as all of its upstream nodes succeeded or were skipped, up to
+    `concurrency` nodes at a time. `run(node)` returns (status, seconds, error).
+
+    A failed node does not stop independent branches; its downstream nodes are marked
+    UPSTREAM_FAILED and not run. Returns {node: (status, seconds, error)}.
+    """
+    topological_order(dag)  # validate before starting anything
+
+    results = {}
+    waiting = {node: set(upstream) for node, (_, upstream) in dag.items()}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dag") as executor:
+        while waiting or running:
+            for node in sorted(waiting):
+                upstream = waiting[node]
+                if any(results.get(up, (None,))[0] in (FAILED, UPSTREAM_FAILED) for up in upstream):
+                    del waiting[node]
+                    results[node] = (UPSTREAM_FAILED, 0.0, None)
+                    logger.warning(f"{node}: not run, an upstream node failed")
+                elif all(up in results for up in upstream):
+                    del waiting[node]
+                    running[executor.submit(run, node)] = node
+                    logger.info(f"{node}: started")
+
+            if not running:
+                continue  # nodes marked UPSTREAM_FAILED may unblock more of the same
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                results[node] = future.result()
+                status, seconds, error = results[node]
+                if status == FAILED:
+                    logger.error(f"{node}: {status} after {seconds:.2f}s - {error}")
+                else:
+                    logger.info(f"{node}: {status} in {seconds:.2f}s")
+
+    return results
+
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Runs the Medallion procedures as a dependency graph, independent branches in parallel."
+    )
+    parser.add_argument("--run-id", default=None, help="Pipeline run id (default: new UUID)")
+    parser.add_argument("--layers", nargs="+", choices=LAYERS, default=LAYERS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Nodes (and warehouse sessions) running at the same time")
+    parser.add_argument("--load-mode", type=str.upper, choices=LOAD_MODES, default=INCREMENTAL,
+                        help="Silver/Gold load mode: MERGE of the streams (INCREMENTAL), rebuild from the "
+                             "whole source tables (BACKFILL) or BACKFILL of empty targets only (AUTO)")
+    parser.add_argument("--local", action="store_true",
+                        help="Run against the offline warehouse stand-in instead of Snowflake")
+    parser.add_argument("--local-seconds", type=float, default=0.2,
+                        help="Simulated duration of every procedure (--local)")
+    parser.add_argument("--local-fail", nargs="*", default=[], metavar="NODE",
+                        help="Procedures failing in the stand-in (--local)")
+    parser.add_argument("--local-empty", nargs="*", default=[], metavar="STREAM",
+                        help="Streams without data in the stand-in, e.g. BRONZE.payments_stream (--local)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_id = args.run_id or str(uuid.uuid4())
+    dag = select_layers(PIPELINE_DAG, args.layers)
+
+    if args.local:
+        warehouse = LocalWarehouse(default_seconds=args.local_seconds,
+                                   failing=args.local_fail, empty_streams=args.local_empty)
+        connect = warehouse.connect
+    else:
+        connect = snowflake_connect
+
+    logger.info(f"Run {run_id}: {len(dag)} nodes ({', '.join(args.layers)}), concurrency {args.concurrency}, "
+                f"load mode {args.load_mode}")
+
+    pool = ConnectionPool(connect, args.concurrency)
+    start = time.perf_counter()
+    try:
+        results = execute_dag(dag, lambda node: run_node(pool, run_id, node, dag[node][0], args.load_mode),
+                              args.concurrency)
+    finally:
+        pool.close()
+    elapsed = time.perf_counter() - start
+
+    durations = {node: seconds for node, (_, seconds, _) in results.items()}
+    path_seconds, path = critical_path(dag, durations)
+    logger.info(f"Finished in {elapsed:.2f}s (sequential {sum(durations.values()):.2f}s, "
+                f"critical path {path_seconds:.2f}s: {' -> '.join(path)})")
+
+    failed = sorted(node for node, (status, _, _) in results.items() if status in (FAILED, UPSTREAM_FAILED))
+    if failed:
+        logger.error(f"{len(failed)} node(s) failed or not run: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"Orchestrator failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,605 @@
+import numpy as np
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+ORDER_FLOW = np.array(["CREATED", "PAID", "SHIPPED", "DELIVERED"])
+EMAIL_DOMAINS = np.array(["gmail.com", "outlook.com", "hotmail.com", "yahoo.com", "icloud.com"])
+PAYMENT_PROVIDERS = np.array(["VISA", "PAYPAL"])
+
+# Number of pre-generated Faker values per attribute.
+# Batches sample from these pools instead of calling Faker once per row.
+FAKER_POOL_SIZE = 5000
+
+ONE_HOUR = np.timedelta64(1, "h")
+ONE_DAY = np.timedelta64(1, "D")
+
+
+# ==========================================
+# VALUE POOLS & CATALOG
+# ==========================================
+
+def build_value_pools(fake, size=FAKER_POOL_SIZE):
+    """Pre-generates Faker values which are later sampled by index."""
+    return {
+        "first_name": np.array([fake.first_name() for _ in range(size)]),
+        "last_name": np.array([fake.last_name() for _ in range(size)]),
+        "user_name": np.array([fake.user_name() for _ in range(size)]),
+        "street": np.array([fake.street_address() for _ in range(size)]),
+        "city": np.array([fake.city() for _ in range(size)]),
+        "postal_code": np.array([fake.postcode() for _ in range(size)]),
+        "country": np.array([fake.country_code() for _ in range(size)]),
+    }
+
+def build_products(catalog, created_at):
+    """Builds the product table (columnar) from (name, category, brand, price) tuples."""
+    names, categories, brands, prices = zip(*catalog)
+    n = len(catalog)
+    ts = np.full(n, np.datetime64(created_at, "s"))
+    return {
+        "product_id": np.arange(1, n + 1),
+        "name": np.array(names),
+        "category": np.array(categories),
+        "brand": np.array(brands),
+        "price": np.array(prices, dtype=float),
+        "currency": np.full(n, "EUR"),
+        "status": np.full(n, "ACTIVE"),
+        "created_at": ts,
+        "updated_at": ts,
+    }
+
+
+# ==========================================
+# BATCH GENERATION
+# ==========================================
+
+def _sample(rng, pool, n):
+    return pool[rng.integers(0, len(pool), n)]
+
+def _phone_numbers(rng, n):
+    """Vectorized '+CC NNN NNN NNN' phone numbers."""
+    parts = [rng.integers(10, 100, n).astype(str)] + [rng.integers(100, 1000, n).astype(str) for _ in range(3)]
+    phone = np.char.add("+", parts[0])
+    for part in parts[1:]:
+        phone = np.char.add(np.char.add(phone, " "), part)
+    return phone
+
+def build_order_timeline(rng, order_ids, order_date, status_idx):
+    """
+    Builds the order-keyed status timeline of a batch.
+    Row i belongs to order_ids[i] and ends in ORDER_FLOW[status_idx[i]]; `step_ts[i, k]` is the
+    timestamp at which the order reached ORDER_FLOW[k] (NaT when the step was not reached).
+    `order_ids` must be contiguous, so every lookup is a constant-time offset (see timeline_rows()).
+    """
+    n_orders = len(order_ids)
+    n_steps = len(ORDER_FLOW)
+
+    gaps = np.cumsum(rng.integers(2, 13, (n_orders, n_steps)), axis=1) * ONE_HOUR
+
+    step_ts = np.empty((n_orders, n_steps), dtype="datetime64[s]")
+    step_ts[:, 0] = order_date
+    step_ts[:, 1:] = order_date[:, None] + gaps[:, :-1]
+    step_ts[np.arange(n_steps)[None, :] > status_idx[:, None]] = np.datetime64("NaT")
+
+    return {
+        "order_id": order_ids,
+        "status_idx": status_idx,
+        "step_ts": step_ts,
+        "updated_at": order_date + gaps[np.arange(n_orders), status_idx],
+    }
+
+def timeline_rows(timeline, order_ids):
+    """Maps order ids to their timeline rows (O(1) per order)."""
+    return np.asarray(order_ids) - timeline["order_id"][0]
+
+def status_changed_at(timeline, order_ids, status):
+    """Returns the timestamp at which each order reached `status` (NaT if it did not)."""
+    step = int(np.flatnonzero(ORDER_FLOW == status)[0])
+    return timeline["step_ts"][timeline_rows(timeline, order_ids), step]
+
+def derive_status_history(timeline, history_id_seq):
+    """One history row per reached step, grouped by order in ORDER_FLOW order."""
+    reached = ~np.isnat(timeline["step_ts"])
+    n_history = int(reached.sum())
+    return {
+        "status_history_id": history_id_seq + np.arange(n_history),
+        "order_id": np.repeat(timeline["order_id"], reached.sum(axis=1)),
+        "status": np.broadcast_to(ORDER_FLOW, reached.shape)[reached],
+        "changed_at": timeline["step_ts"][reached],
+    }
+
+def derive_payments(rng, timeline, total_amount, payment_id_seq):
+    """One successful payment per order that reached PAID."""
+    paid = timeline["status_idx"] >= 1
+    n_payments = int(paid.sum())
+    order_ids = timeline["order_id"][paid]
+    payment_ts = status_changed_at(timeline, order_ids, "CREATED") + np.timedelta64(15, "m")
+    return {
+        "payment_id": payment_id_seq + np.arange(n_payments),
+        "order_id": order_ids,
+        "provider": _sample(rng, PAYMENT_PROVIDERS, n_payments),
+        "payment_status": np.full(n_payments, "SUCCESS"),
+        "amount": total_amount[paid],
+        "created_at": payment_ts,
+        "updated_at": payment_ts,
+    }
+
+def derive_shipments(timeline, shipment_id_seq):
+    """One shipment per order that reached SHIPPED; timestamps come from the order's own history."""
+    shipped = timeline["status_idx"] >= 2
+    n_shipments = int(shipped.sum())
+    order_ids = timeline["order_id"][shipped]
+    ship_ts = status_changed_at(timeline, order_ids, "SHIPPED")
+    delivered_ts = status_changed_at(timeline, order_ids, "DELIVERED")
+    return {
+        "shipment_id": shipment_id_seq + np.arange(n_shipments),
+        "order_id": order_ids,
+        "carrier": np.full(n_shipments, "DHL"),
+        "shipment_status": ORDER_FLOW[timeline["status_idx"][shipped]],
+        "shipped_at": ship_ts,
+        "delivered_at": delivered_ts,
+        "updated_at": np.where(np.isnat(delivered_ts), ship_ts, delivered_ts),
+    }
+
+def zipf_ranks(rng, n, population, exponent):
+    """
+    Draws n ranks in [0, population) with P(rank k) ~ 1 / (k + 1) ** exponent (0 = uniform).
+    Inverse CDF of the continuous power law, so no table over the population is built.
+    """
+    u = rng.random(n)
+    if abs(exponent - 1.0) < 1e-9:
+        x = np.power(population + 1.0, u)
+    else:
+        a = 1.0 - exponent
+        x = np.power(1.0 + u * (np.power(population + 1.0, a) - 1.0), 1.0 / a)
+    return np.minimum(x.astype(np.int64) - 1, population - 1)
+
+def order_timestamps(rng, after, hourly_weights=None):
+    """
+    Order timestamps after the `after` timestamps: 1-48 hours later, or with `hourly_weights`
+    (24 relative volumes) on one of the two following days at an hour drawn from the weights.
+    """
+    n = len(after)
+    if hourly_weights is None:
+        return after + rng.integers(1, 49, n) * ONE_HOUR
+    weights = np.asarray(hourly_weights, dtype=float)
+    hours = rng.choice(24, n, p=weights / weights.sum())
+    day = after.astype("datetime64[D]") + rng.integers(1, 3, n) * ONE_DAY
+    return day.astype("datetime64[s]") + hours * ONE_HOUR + rng.integers(0, 3600, n) * np.timedelta64(1, "s")
+
+def plan_batch(rng, n_customers, n_orders):
+    """
+    Draws the values of a batch which decide its row counts (final order status, items per order).
+    They are the first draws of generate_batch(), so the id ranges of a batch can be reserved
+    up front by drawing only its plan from an identically seeded generator.
+    """
+    return {
+        "n_customers": n_customers,
+        "n_orders": n_orders,
+        "status_idx": rng.integers(0, len(ORDER_FLOW), n_orders),
+        "items_count": rng.integers(1, 5, n_orders),
+    }
+
+def plan_row_counts(plan):
+    """Number of ids each sequence of the state consumes for a planned batch."""
+    status_idx = plan["status_idx"]
+    return {
+        "customer_id_seq": plan["n_customers"],
+        "address_id_seq": plan["n_customers"],
+        "order_id_seq": plan["n_orders"],
+        "order_item_id_seq": int(plan["items_count"].sum()),
+        "payment_id_seq": int((status_idx >= 1).sum()),
+        "shipment_id_seq": int((status_idx >= 2).sum()),
+        "history_id_seq": int((status_idx + 1).sum()),
+    }
+
+def advance_state(state, counts):
+    """Returns a copy of the state with every sequence moved past `counts` ids."""
+    new_state = dict(state)
+    for seq, count in counts.items():
+        new_state[seq] = state[seq] + count
+    return new_state
+
+def generate_batch(rng, pools, products, state, base_date, n_customers, n_orders, profile=None):
+    """
+    Generates one transaction batch as columns.
+    Sequences are taken from `state` (see get_initial_state()) and a copy of the
+    state with advanced sequences is returned together with the batch.
+    `profile` (see workload_profiles.py) shapes product / customer popularity, order times
+    and currencies; without one every choice is uniform and all orders are in EUR.
+    """
+    profile = profile or {}
+    plan = plan_batch(rng, n_customers, n_orders)
+    base_ts = np.datetime64(base_date, "s")
+
+    # --- CUSTOMERS & ADDRESSES ---
+    customer_ids = state["customer_id_seq"] + np.arange(n_customers)
+    address_ids = state["address_id_seq"] + np.arange(n_customers)
+
+    # Customers created recently
+    cust_created = base_ts - rng.integers(0, 31, n_customers) * ONE_DAY
+
+    emails = np.char.add(
+        np.char.add(_sample(rng, pools["user_name"], n_customers), "@"),
+        _sample(rng, EMAIL_DOMAINS, n_customers)
+    )
+
+    customers = {
+        "customer_id": customer_ids,
+        "email": emails,
+        "first_name": _sample(rng, pools["first_name"], n_customers),
+        "last_name": _sample(rng, pools["last_name"], n_customers),
+        "phone": _phone_numbers(rng, n_customers),
+        "status": np.full(n_customers, "ACTIVE"),
+        "created_at": cust_created,
+        "updated_at": cust_created,
+    }
+
+    addresses = {
+        "address_id": address_ids,
+        "customer_id": customer_ids,
+        "type": np.full(n_customers, "SHIPPING"),
+        "street": _sample(rng, pools["street"], n_customers),
+        "city": _sample(rng, pools["city"], n_customers),
+        "postal_code": _sample(rng, pools["postal_code"], n_customers),
+        "country": _sample(rng, pools["country"], n_customers),
+        "is_default": np.ones(n_customers, dtype=bool),
+        "created_at": cust_created,
+        "updated_at": cust_created,
+    }
+
+    # --- ORDERS ---
+    order_ids = state["order_id_seq"] + np.arange(n_orders)
+    cust_idx = rng.integers(0, n_customers, n_orders)
+    order_customer = customer_ids[cust_idx]
+    order_after = cust_created[cust_idx]
+    if profile.get("returning_customer_share") and state["customer_id_seq"] > 1:
+        # Orders of customers from earlier batches / runs, the longest-registered ones ordering most.
+        # They were created before base_date, so these orders are placed after it.
+        returning = np.flatnonzero(rng.random(n_orders) < profile["returning_customer_share"])
+        order_customer[returning] = 1 + zipf_ranks(rng, len(returning), state["customer_id_seq"] - 1,
+                                                   profile["customer_skew"])
+        order_after[returning] = base_ts
+    order_date = order_timestamps(rng, order_after, profile.get("hourly_weights"))
+
+    # Status flow: per-order timeline of ORDER_FLOW transitions
+    timeline = build_order_timeline(rng, order_ids, order_date, plan["status_idx"])
+    final_idx = timeline["status_idx"]
+
+    # --- ORDER ITEMS ---
+    items_count = plan["items_count"]
+    n_items = int(items_count.sum())
+    item_order_pos = np.repeat(np.arange(n_orders), items_count)
+    n_products = len(products["product_id"])
+    if profile.get("product_skew"):
+        # best sellers are a fixed shuffle of the catalog, the same in every batch and run
+        popularity = np.random.default_rng([profile["catalog_seed"], 1]).permutation(n_products)
+        prod_idx = popularity[zipf_ranks(rng, n_items, n_products, profile["product_skew"])]
+    else:
+        prod_idx = rng.integers(0, n_products, n_items)
+    quantity = rng.integers(1, 3, n_items)
+    unit_price = products["price"][prod_idx]
+    currency = np.full(n_orders, "EUR")
+    if set(profile.get("currencies", ["EUR"])) != {"EUR"}:
+        # catalog prices are EUR; orders in other currencies get converted item prices
+        codes = np.array(list(profile["currencies"]))
+        shares, factors = np.array(list(profile["currencies"].values()), dtype=float).T
+        currency_idx = rng.choice(len(codes), n_orders, p=shares / shares.sum())
+        unit_price = np.round(unit_price * factors[currency_idx[item_order_pos]], 2)
+        currency = codes[currency_idx]
+    total_amount = np.round(np.bincount(item_order_pos, weights=quantity * unit_price, minlength=n_orders), 2)
+
+    order_items = {
+        "order_item_id": state["order_item_id_seq"] + np.arange(n_items),
+        "order_id": order_ids[item_order_pos],
+        "product_id": products["product_id"][prod_idx],
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "created_at": order_date[item_order_pos],
+    }
+
+    orders = {
+        "order_id": order_ids,
+        "customer_id": order_customer,
+        "order_status": ORDER_FLOW[final_idx],
+        "order_total_amount": total_amount,
+        "currency": currency,
+        "created_at": order_date,
+        "updated_at": timeline["updated_at"],
+    }
+
+    # --- STATUS HISTORY, PAYMENTS & SHIPMENTS (derived from the timeline) ---
+    history = derive_status_history(timeline, state["history_id_seq"])
+    payments = derive_payments(rng, timeline, total_amount, state["payment_id_seq"])
+    shipments = derive_shipments(timeline, state["shipment_id_seq"])
+
+    new_state = advance_state(state, plan_row_counts(plan))
+
+    batch = {
+        "customers": customers,
+        "addresses": addresses,
+        "orders": orders,
+        "order_items": order_items,
+        "payments": payments,
+        "shipments": shipments,
+        "order_status_history": history,
+    }
+    return batch, new_state
+
+
+# ==========================================
+# CDC WORKLOAD (changes to rows of earlier runs)
+# ==========================================
+
+# Open orders carried between runs: one row per order that has not reported DELIVERED yet.
+# status_idx is the order's actual ORDER_FLOW step, reported_idx the last step written to the raw
+# files (lower while a change is held back as late-arriving). The *_at columns are the step timestamps.
+OPEN_ORDER_COLUMNS = {
+    "order_id": "int64",
+    "customer_id": "int64",
+    "order_total_amount": "float64",
+    "currency": "str",
+    "status_idx": "int64",
+    "reported_idx": "int64",
+    "shipment_id": "int64",
+    "created_at": "datetime64[s]",
+    "paid_at": "datetime64[s]",
+    "shipped_at": "datetime64[s]",
+    "delivered_at": "datetime64[s]",
+}
+STEP_COLUMNS = ["created_at", "paid_at", "shipped_at", "delivered_at"]   # timestamp of each ORDER_FLOW step
+
+# Customers (with their default address) whose profile can change in later runs
+CUSTOMER_POOL_COLUMNS = {
+    "customer_id": "int64",
+    "email": "str",
+    "first_name": "str",
+    "last_name": "str",
+    "phone": "str",
+    "status": "str",
+    "created_at": "datetime64[s]",
+    "address_id": "int64",
+    "type": "str",
+    "street": "str",
+    "city": "str",
+    "postal_code": "str",
+    "country": "str",
+}
+
+def take_rows(columns, idx):
+    return {name: column[idx] for name, column in columns.items()}
+
+def concat_tables(*tables):
+    """Concatenates columnar tables with the same columns."""
+    return {name: np.concatenate([table[name] for table in tables]) for name in tables[0]}
+
+def columns_to_json(columns):
+    return {name: python_values(column) for name, column in columns.items()}
+
+def columns_from_json(doc, schema):
+    """Columnar table from its JSON form (see columns_to_json()); missing documents give an empty table."""
+    doc = doc or {}
+    return {name: np.array(doc.get(name, []), dtype=dtype) for name, dtype in schema.items()}
+
+def inject_duplicates(rng, columns, rate):
+    """Appends an exact copy of about `rate` of the rows (re-delivered records)."""
+    duplicated = np.flatnonzero(rng.random(row_count(columns)) < rate)
+    if not len(duplicated):
+        return columns
+    return concat_tables(columns, take_rows(columns, duplicated))
+
+def change_prices(rng, products, rate, changed_at):
+    """Moves the price of about `rate` of the products by -20%..+20%. Returns the new product table."""
+    n = len(products["product_id"])
+    changed = rng.random(n) < rate
+    factor = rng.uniform(0.8, 1.2, n)
+    return dict(
+        products,
+        price=np.where(changed, np.round(products["price"] * factor, 2), products["price"]),
+        updated_at=np.where(changed, np.datetime64(changed_at, "s"), products["updated_at"]),
+    )
+
+def step_index(statuses):
+    """Position of each status in ORDER_FLOW."""
+    return (np.asarray(statuses)[:, None] == ORDER_FLOW[None, :]).argmax(axis=1)
+
+def open_orders_from_batch(batch):
+    """Open-order rows of the orders of a new batch that did not reach DELIVERED (all their steps are reported)."""
+    orders = batch["orders"]
+    history = batch["order_status_history"]
+    shipments = batch["shipments"]
+    n_orders = len(orders["order_id"])
+    first_id = orders["order_id"][0] if n_orders else 0
+
+    status_idx = step_index(orders["order_status"])
+    steps = np.full((n_orders, len(ORDER_FLOW)), np.datetime64("NaT"), dtype="datetime64[s]")
+    steps[history["order_id"] - first_id, step_index(history["status"])] = history["changed_at"]
+    shipment_id = np.zeros(n_orders, dtype="int64")
+    shipment_id[shipments["order_id"] - first_id] = shipments["shipment_id"]
+
+    is_open = status_idx < len(ORDER_FLOW) - 1
+    return take_rows({
+        "order_id": orders["order_id"],
+        "customer_id": orders["customer_id"],
+        "order_total_amount": orders["order_total_amount"],
+        "currency": orders["currency"],
+        "status_idx": status_idx,
+        "reported_idx": status_idx,
+        "shipment_id": shipment_id,
+        **{column: steps[:, k] for k, column in enumerate(STEP_COLUMNS)},
+    }, is_open)
+
+def customer_pool_from_batch(rng, batch, size):
+    """A random sample of `size` new customers of a batch (with their address) for the customer pool."""
+    customers = batch["customers"]
+    addresses = batch["addresses"]
+    picked = np.sort(rng.choice(len(customers["customer_id"]), min(size, len(customers["customer_id"])), replace=False))
+    return {
+        **{name: customers[name][picked] for name in
+           ["customer_id", "email", "first_name", "last_name", "phone", "status", "created_at"]},
+        **{name: addresses[name][picked] for name in
+           ["address_id", "type", "street", "city", "postal_code", "country"]},
+    }
+
+def plan_changes(rng, open_orders, late_rate):
+    """
+    Draws how far every open order advances in this batch (0 .. remaining steps) and which of the
+    advanced orders are held back as late-arriving (reported in a later run with their original
+    timestamps). These are the first draws of generate_changes(), like plan_batch() for generate_batch().
+    """
+    status_idx = open_orders["status_idx"]
+    advance = rng.integers(0, len(ORDER_FLOW) - status_idx)
+    late = rng.random(len(status_idx)) < late_rate
+    new_status = status_idx + advance
+    return {
+        "status_idx": new_status,
+        "reported_idx": np.where(late, open_orders["reported_idx"], new_status),
+    }
+
+def change_row_counts(open_orders, changes):
+    """Number of ids each sequence of the state consumes for planned changes (see plan_changes())."""
+    before, after = open_orders["reported_idx"], changes["reported_idx"]
+    return {
+        "payment_id_seq": int(((before < 1) & (after >= 1)).sum()),
+        "shipment_id_seq": int(((before < 2) & (after >= 2)).sum()),
+        "history_id_seq": int((after - before).sum()),
+    }
+
+def generate_changes(rng, pools, open_orders, customers, state, base_date, rates):
+    """
+    Generates the change records of one batch: status changes of the given open orders (order,
+    status history, payment and shipment rows, same ids as before except for new payments / shipments)
+    and email / address changes of the given pooled customers.
+    Returns (tables, open orders after the batch, customers after the batch, state with advanced sequences).
+    """
+    changes = plan_changes(rng, open_orders, rates["late_rate"])
+    base_ts = np.datetime64(base_date, "s")
+    n_open = len(open_orders["order_id"])
+
+    # --- ORDER STATUS CHANGES ---
+    before_status = open_orders["status_idx"]
+    after_status = changes["status_idx"]
+    # A step reached now happens within the day before base_date, and never before the previous step
+    steps = np.stack([open_orders[column] for column in STEP_COLUMNS], axis=1)
+    for k in range(1, len(ORDER_FLOW)):
+        reached = np.flatnonzero((before_status < k) & (after_status >= k))
+        steps[reached, k] = np.maximum(steps[reached, k - 1] + rng.integers(2, 13, len(reached)) * ONE_HOUR,
+                                       base_ts - rng.integers(1, 25, len(reached)) * ONE_HOUR)
+
+    before, after = open_orders["reported_idx"], changes["reported_idx"]
+    reported = np.flatnonzero(after > before)
+    step_no = np.arange(len(ORDER_FLOW))[None, :]
+    new_steps = (step_no > before[:, None]) & (step_no <= after[:, None])
+
+    orders = {
+        "order_id": open_orders["order_id"][reported],
+        "customer_id": open_orders["customer_id"][reported],
+        "order_status": ORDER_FLOW[after[reported]],
+        "order_total_amount": open_orders["order_total_amount"][reported],
+        "currency": open_orders["currency"][reported],
+        "created_at": open_orders["created_at"][reported],
+        "updated_at": steps[reported, after[reported]],
+    }
+    n_history = int(new_steps.sum())
+    history = {
+        "status_history_id": state["history_id_seq"] + np.arange(n_history),
+        "order_id": np.repeat(open_orders["order_id"], new_steps.sum(axis=1)),
+        "status": np.broadcast_to(ORDER_FLOW, new_steps.shape)[new_steps],
+        "changed_at": steps[new_steps],
+    }
+
+    paid = np.flatnonzero((before < 1) & (after >= 1))
+    payment_ts = open_orders["created_at"][paid] + np.timedelta64(15, "m")
+    payments = {
+        "payment_id": state["payment_id_seq"] + np.arange(len(paid)),
+        "order_id": open_orders["order_id"][paid],
+        "provider": _sample(rng, PAYMENT_PROVIDERS, len(paid)),
+        "payment_status": np.full(len(paid), "SUCCESS"),
+        "amount": open_orders["order_total_amount"][paid],
+        "created_at": payment_ts,
+        "updated_at": payment_ts,
+    }
+
+    # New shipments get ids; a shipment reaching DELIVERED is an update of its existing row
+    shipment_id = open_orders["shipment_id"].copy()
+    new_shipment = (before < 2) & (after >= 2)
+    shipment_id[new_shipment] = state["shipment_id_seq"] + np.arange(int(new_shipment.sum()))
+    shipped = np.flatnonzero(new_shipment | ((before == 2) & (after == 3)))
+    delivered_ts = np.where(after[shipped] == 3, steps[shipped, 3], np.datetime64("NaT"))
+    shipments = {
+        "shipment_id": shipment_id[shipped],
+        "order_id": open_orders["order_id"][shipped],
+        "carrier": np.full(len(shipped), "DHL"),
+        "shipment_status": ORDER_FLOW[after[shipped]],
+        "shipped_at": steps[shipped, 2],
+        "delivered_at": delivered_ts,
+        "updated_at": np.where(np.isnat(delivered_ts), steps[shipped, 2], delivered_ts),
+    }
+
+    still_open = after < len(ORDER_FLOW) - 1
+    open_after = take_rows(dict(
+        open_orders,
+        status_idx=after_status,
+        reported_idx=after,
+        shipment_id=shipment_id,
+        **{column: steps[:, k] for k, column in enumerate(STEP_COLUMNS)},
+    ), still_open)
+
+    # --- CUSTOMER PROFILE & ADDRESS CHANGES ---
+    n_pool = len(customers["customer_id"])
+    email_changed = rng.random(n_pool) < rates["customer_update_rate"]
+    address_changed = rng.random(n_pool) < rates["address_update_rate"]
+    changed_at = np.maximum(base_ts - rng.integers(0, 24, n_pool) * ONE_HOUR, customers["created_at"] + ONE_HOUR)
+
+    new_emails = np.char.add(np.char.add(_sample(rng, pools["user_name"], n_pool), "@"),
+                             _sample(rng, EMAIL_DOMAINS, n_pool))
+    customers = dict(customers, email=np.where(email_changed, new_emails, customers["email"]))
+    for column in ["street", "city", "postal_code", "country"]:
+        customers[column] = np.where(address_changed, _sample(rng, pools[column], n_pool), customers[column])
+    n_moved = int(address_changed.sum())
+
+    changed_customers = take_rows(customers, email_changed)
+    changed_addresses = take_rows(customers, address_changed)
+    tables = {
+        "customers": {
+            **{name: changed_customers[name] for name in
+               ["customer_id", "email", "first_name", "last_name", "phone", "status", "created_at"]},
+            "updated_at": changed_at[email_changed],
+        },
+        "addresses": {
+            **{name: changed_addresses[name] for name in
+               ["address_id", "customer_id", "type", "street", "city", "postal_code", "country"]},
+            "is_default": np.ones(n_moved, dtype=bool),
+            "created_at": changed_addresses["created_at"],
+            "updated_at": changed_at[address_changed],
+        },
+        "orders": orders,
+        "payments": payments,
+        "shipments": shipments,
+        "order_status_history": history,
+    }
+    new_state = advance_state(state, change_row_counts(open_orders, changes))
+    return tables, open_after, customers, new_state
+
+
+# ==========================================
+# ROW MATERIALISATION
+# ==========================================
+
+def python_values(column):
+    """Converts a column into a list of JSON-native values (ISO strings for timestamps, None for NaT)."""
+    if np.issubdtype(column.dtype, np.datetime64):
+        values = np.datetime_as_string(column, unit="s").astype(object)
+        values[np.isnat(column)] = None
+        return values.tolist()
+    return column.tolist()
+
+def row_count(columns):
+    return len(next(iter(columns.values())))
+
+def iter_rows(columns):
+    """Yields the rows of a columnar table as dictionaries (same schema as the raw JSON files)."""
+    names = list(columns)
+    values = [python_values(col) for col in columns.values()]
+    for row in zip(*values):
+        yield dict(zip(names, row))
@@ -1,31 +1,93 @@
+import argparse
 import json
-import os
-import random
-import time
+import logging
+import multiprocessing
 import sys
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta
+import numpy as np
 from faker import Faker
-from common_logger import logger
-
-# --- AZURE IMPORTS ---
-from azure.identity import DefaultAzureCredential
-from azure.storage.blob import BlobServiceClient, ContentSettings
-from azure.core.exceptions import ResourceNotFoundError
+from common_logger import logger, metrics, span
+from oltp_batch_engine import (
+    build_value_pools, build_products, generate_batch,
+    plan_batch, plan_row_counts, advance_state, row_count, python_values,
+    CUSTOMER_POOL_COLUMNS, OPEN_ORDER_COLUMNS, change_prices, change_row_counts, columns_from_json,
+    columns_to_json, concat_tables, customer_pool_from_batch, generate_changes, inject_duplicates,
+    open_orders_from_batch, plan_changes, take_rows
+)
+from raw_formats import DEFAULT_FORMAT, FORMATS, content_type, encoder_for, file_extension
+from state_store import StateLocked, StateStore
+from storage_backends import LOCAL_STORAGE_ROOT, create_backend
+from upload_pipeline import UploadPipeline, UPLOAD_WORKERS, MAX_PENDING_UPLOADS
+from workload_profiles import PROFILES, load_profile, product_catalog, volume_factor
 
 # ==========================================
 # CONFIGURATION
 # ==========================================
-STORAGE_ACCOUNT_NAME = os.getenv("AZURE_STORAGE_ACCOUNT")
-CONTAINER_NAME = os.getenv("AZURE_CONTAINER_NAME")
 REMOTE_ROOT_FOLDER = "data"
 STATE_FILE_PATH = "state/generator_state.json"
+BATCH_MANIFEST_FOLDER = "state/manifests"   # one manifest per committed batch (outside the Bronze stage)
+
+# Per-run manifests of the files written to the raw landing zone (read by LOAD_BRONZE_MASTER).
+# Stored below the stage root and never deleted, so any run can be replayed.
+RUN_MANIFEST_FOLDER = f"{REMOTE_ROOT_FOLDER}/_manifests"
 
 # Generation parameters
 BATCHES = 5
 CUSTOMERS_PER_BATCH = 300
 ORDERS_PER_BATCH = 500
 
-fake = Faker()
+# Shape of the data (catalog size, popularity skew, order times, seasonal volume, currencies):
+# a name from workload_profiles.PROFILES or a JSON file. "default" keeps the small uniform EUR workload.
+WORKLOAD_PROFILE = "default"
+
+# Generator processes. Every batch is a shard with its own id ranges and seed,
+# so the output for a given --seed does not depend on the number of workers.
+WORKERS = 1
+
+# CDC workload (--cdc): besides new rows, every run changes rows of earlier runs. The open orders,
+# a pool of customers and the product prices are carried between runs in CDC_STATE_FOLDER.
+CDC_STATE_FOLDER = "state/cdc"
+CDC_LATE_RATE = 0.05             # share of order status changes written one run late (original timestamps)
+CDC_DUPLICATE_RATE = 0.01        # share of rows written twice
+CDC_CUSTOMER_UPDATE_RATE = 0.05  # share of pooled customers changing their email per run
+CDC_ADDRESS_UPDATE_RATE = 0.02   # share of pooled customers moving per run
+CDC_PRICE_CHANGE_RATE = 0.1      # share of products changing their price per run
+CDC_CUSTOMER_POOL = 2000         # customers kept for profile changes; about a quarter is replaced per run
+CDC_MAX_OPEN_ORDERS = 100000     # older open orders are dropped from the carry-over (never completed)
+
+# Raw landing folders: (ADLS folder, file prefix, batch table)
+RAW_OUTPUTS = [
+    ("customers_raw", "customers", "customers"),
+    ("addresses_raw", "addresses", "addresses"),
+    ("orders_raw", "orders", "orders"),
+    ("order_items_raw", "items", "order_items"),
+    ("payments_raw", "payments", "payments"),
+    ("shipments_raw", "shipments", "shipments"),
+    ("order_status_history_raw", "history", "order_status_history"),
+]
+
+PRODUCT_CATALOG = [
+    ("iPhone 15 Pro", "Electronics", "Apple", 1199.00),
+    ("Samsung Galaxy S24", "Electronics", "Samsung", 999.00),
+    ("MacBook Pro 16", "Electronics", "Apple", 2499.00),
+    ("AirPods Pro", "Electronics", "Apple", 249.00),
+    ("PlayStation 5", "Electronics", "Sony", 499.00),
+    ("Xbox Series X", "Electronics", "Microsoft", 499.00),
+    ("Nintendo Switch OLED", "Electronics", "Nintendo", 349.00),
+    ("LG OLED TV 55", "Electronics", "LG", 1499.00),
+    ("Samsung 4K Monitor", "Electronics", "Samsung", 399.00),
+    ("Logitech MX Master 3", "Electronics", "Logitech", 99.00),
+    ("Razer BlackWidow V3", "Electronics", "Razer", 139.00),
+    ("Sony WH-1000XM5", "Electronics", "Sony", 349.00),
+    ("Dyson V15 Detect", "Home", "Dyson", 649.00),
+    ("Nespresso Vertuo", "Home", "Nespresso", 179.00),
+    ("Nike Air Zoom", "Sports", "Nike", 139.00),
+    ("Adidas Ultraboost", "Sports", "Adidas", 189.00),
+    ("Ray-Ban Aviator", "Fashion", "Ray-Ban", 189.00),
+    ("Kindle Paperwhite", "Electronics", "Amazon", 139.00),
+]
+PRODUCTS_CREATED_AT = datetime(2024, 1, 1)
 
 # ==========================================
 # HELPER FUNCTIONS
@@ -44,293 +106,525 @@ def get_initial_state():
         "last_run_ts": "2024-01-01T00:00:00"
     }
 
-def load_state(blob_service_client):
-    """Downloads state JSON from Azure Blob Storage or returns default."""
-    try:
-        blob_client = blob_service_client.get_blob_client(container=CONTAINER_NAME, blob=STATE_FILE_PATH)
-        download = blob_client.download_blob()
-        state_data = json.loads(download.readall())
-        logger.info(f"Loaded existing state from Azure. Resuming Order ID from: {state_data.get('order_id_seq')}")
-        return state_data
-    except ResourceNotFoundError:
-        logger.info("State file not found in Azure. Starting fresh (seq=1).")
-        return get_initial_state()
-    except Exception as e:
-        logger.warning(f"Failed to load state: {e}. Defaulting to fresh state.")
-        return get_initial_state()
+def sequences(state):
+    """Only the *_id_seq counters of a state document."""
+    return {key: value for key, value in state.items() if key.endswith("_id_seq")}
+
+def new_run(args, state, seed, base_date, backfill=False):
+    """
+    Describes a generator run. It is stored in the state as `pending_run` until every batch
+    is committed, so an interrupted run can be re-planned and resumed with identical ids and files.
+    Batch sizes are scaled by the profile's volume factor of the base date (weekday, season, peak days).
+    """
+    factor = volume_factor(args.workload_profile, base_date)
+    return {
+        "run_id": base_date.strftime("%Y%m%d_%H_%M_%S"),
+        "seed": seed,
+        "base_date": base_date.isoformat(),
+        "batches": args.batches,
+        "customers_per_batch": max(1, round(args.customers_per_batch * factor)),
+        "orders_per_batch": max(1, round(args.orders_per_batch * factor)),
+        "profile": args.workload_profile,
+        "format": args.format,
+        "table_formats": args.table_formats,
+        "start_state": sequences(state),
+        "committed_batches": [],
+        "backfill": backfill,
+        "cdc": {
+            "late_rate": args.late_rate,
+            "duplicate_rate": args.duplicate_rate,
+            "customer_update_rate": args.customer_update_rate,
+            "address_update_rate": args.address_update_rate,
+            "price_change_rate": args.price_change_rate,
+        } if args.cdc else None,
+    }
 
-def save_state(blob_service_client, state):
-    """Uploads updated state JSON to Azure Blob Storage."""
+def backfill_days(args, state):
+    """
+    Base dates of a --backfill-start/--backfill-end range: one run per day, at midnight.
+    Days already finished by an interrupted backfill of the same range are left out.
+    """
+    progress = state.get("backfill") or {}
+    same_range = (progress.get("start"), progress.get("end")) == (args.backfill_start.isoformat(),
+                                                                  args.backfill_end.isoformat())
+    done_through = progress.get("done_through") if same_range else None
+
+    days = []
+    day = args.backfill_start
+    while day <= args.backfill_end:
+        if done_through is None or day.isoformat() > done_through:
+            days.append(datetime.combine(day, time.min))
+        day += timedelta(days=1)
+    return days, done_through
+
+def commit_batch(store, storage, state, shard, files, carry=None):
+    """
+    Commits one uploaded batch as a unit: writes its manifest, then checkpoints the state.
+    A batch without a checkpoint is regenerated (identically) when the run is resumed.
+    In CDC mode the batch's carry-over (see add_changes()) is written before the manifest.
+    """
+    run = state["pending_run"]
+    batch_no = shard["batch_no"]
+    with span("generator_batch_commit"):
+        if carry is not None:
+            storage.upload(f"{BATCH_MANIFEST_FOLDER}/{run['run_id']}/batch_{batch_no:04d}_cdc.json", json.dumps(carry))
+        manifest = {
+            "run_id": run["run_id"],
+            "batch_no": batch_no,
+            "id_ranges": {seq: [shard["state"][seq], shard["next_state"][seq]] for seq in sequences(shard["state"])},
+            "files": files,
+            "committed_at": datetime.now().isoformat(),
+        }
+        storage.upload(f"{BATCH_MANIFEST_FOLDER}/{run['run_id']}/batch_{batch_no:04d}.json", json.dumps(manifest, indent=2))
+
+        run["committed_batches"] = sorted(set(run["committed_batches"]) | {batch_no})
+        store.commit(state)
+    logger.info(f"Committed Batch {batch_no}/{run['batches']} ({len(run['committed_batches'])} committed)")
+
+def partition_path(run_date):
+    """Hourly partition folder of a run: yyyy/mm/dd/hh."""
+    return run_date.strftime("%Y/%m/%d/%H")
+
+def upload_raw_file(uploads, folder, partition, file_stem, columns, file_format):
+    """
+    Queues a columnar table on the upload pipeline (non-blocking unless the pipeline is full).
+    Rows are encoded chunk by chunk while the file is uploaded.
+    """
+    blob_path = f"{REMOTE_ROOT_FOLDER}/{folder}/{partition}/{file_stem}{file_extension(file_format)}"
+    return uploads.submit(blob_path, encoder_for(columns, file_format), content_type=content_type(file_format))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generates synthetic OLTP data and uploads it to the raw landing zone.")
+    parser.add_argument("--backend", choices=["azure", "local"], default="azure",
+                        help="Storage backend: Azure Blob Storage / Azurite (azure) or local filesystem (local)")
+    parser.add_argument("--local-root", default=LOCAL_STORAGE_ROOT, help="Root folder of the local backend")
+    parser.add_argument("--format", choices=sorted(FORMATS), default=DEFAULT_FORMAT,
+                        help="Raw file format of all tables (recorded in the run manifest; PREFIX loads use FILE_FORMAT of BRONZE_INGESTION_CONFIG)")
+    parser.add_argument("--table-format", action="append", default=[], metavar="TABLE=FORMAT",
+                        help="Per-table format override, e.g. --table-format orders=parquet (repeatable)")
+    parser.add_argument("--batches", type=int, default=BATCHES)
+    parser.add_argument("--customers-per-batch", type=int, default=CUSTOMERS_PER_BATCH)
+    parser.add_argument("--orders-per-batch", type=int, default=ORDERS_PER_BATCH)
+    parser.add_argument("--profile", default=WORKLOAD_PROFILE,
+                        help=f"Workload profile: {', '.join(sorted(PROFILES))} or the path of a JSON file "
+                             "overriding keys of workload_profiles.DEFAULT_PROFILE")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="Generator processes (batches are generated and uploaded as independent shards)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output (random when omitted)")
+    parser.add_argument("--base-date", type=datetime.fromisoformat,
+                        help="Reference timestamp of the generated data, ISO format (default: now)")
+    parser.add_argument("--backfill-start", type=date.fromisoformat,
+                        help="Historical backfill: first day (ISO date); writes one run per day instead of one run now")
+    parser.add_argument("--backfill-end", type=date.fromisoformat,
+                        help="Historical backfill: last day, inclusive (default: --backfill-start)")
+    parser.add_argument("--cdc", action="store_true",
+                        help="CDC workload: also advance open orders of earlier runs, change customer emails / "
+                             "addresses and product prices, and write late-arriving and duplicate records")
+    parser.add_argument("--late-rate", type=float, default=CDC_LATE_RATE,
+                        help="--cdc: share of order status changes written one run late")
+    parser.add_argument("--duplicate-rate", type=float, default=CDC_DUPLICATE_RATE,
+                        help="--cdc: share of rows written twice")
+    parser.add_argument("--customer-update-rate", type=float, default=CDC_CUSTOMER_UPDATE_RATE,
+                        help="--cdc: share of pooled customers changing their email per run")
+    parser.add_argument("--address-update-rate", type=float, default=CDC_ADDRESS_UPDATE_RATE,
+                        help="--cdc: share of pooled customers changing their address per run")
+    parser.add_argument("--price-change-rate", type=float, default=CDC_PRICE_CHANGE_RATE,
+                        help="--cdc: share of products changing their price per run")
+    parser.add_argument("--upload-workers", type=int, default=UPLOAD_WORKERS, help="Parallel uploads")
+    parser.add_argument("--max-pending-uploads", type=int, default=MAX_PENDING_UPLOADS,
+                        help="Uploads in flight before generation waits (backpressure)")
+    args = parser.parse_args(argv)
+
+    known_tables = {"products"} | {table for _, _, table in RAW_OUTPUTS}
+    args.table_formats = {}
+    for item in args.table_format:
+        table, _, file_format = item.partition("=")
+        if table not in known_tables or file_format not in FORMATS:
+            parser.error(f"invalid --table-format '{item}' (tables: {sorted(known_tables)}, formats: {sorted(FORMATS)})")
+        args.table_formats[table] = file_format
+
+    if args.backfill_end and not args.backfill_start:
+        parser.error("--backfill-end requires --backfill-start")
+    if args.backfill_start:
+        if args.base_date:
+            parser.error("--base-date cannot be combined with --backfill-start (every day is its own base date)")
+        args.backfill_end = args.backfill_end or args.backfill_start
+        if args.backfill_end < args.backfill_start:
+            parser.error("--backfill-end is before --backfill-start")
+    for rate in ["late_rate", "duplicate_rate", "customer_update_rate", "address_update_rate", "price_change_rate"]:
+        if not 0 <= getattr(args, rate) <= 1:
+            parser.error(f"--{rate.replace('_', '-')} must be between 0 and 1")
     try:
-        blob_client = blob_service_client.get_blob_client(container=CONTAINER_NAME, blob=STATE_FILE_PATH)
-        blob_client.upload_blob(json.dumps(state, indent=2, default=str), overwrite=True)
-        logger.info("State saved successfully to Azure!")
-    except Exception as e:
-        logger.error(f"Failed to save state to Azure: {e}")
-        raise e
+        args.workload_profile = load_profile(args.profile)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+def publish_run_manifest(storage, run, products_file):
+    """
+    Publishes the manifest of a finished run: one NDJSON row per raw file, with paths relative
+    to the stage root. Rows are rebuilt from the batch manifests, so a re-published manifest
+    (e.g. after a crash right before the final checkpoint) has identical content.
+    """
+    files = [dict(products_file, batch_no=0)]
+    for batch_no in range(1, run["batches"] + 1):
+        batch_manifest = json.loads(storage.download(f"{BATCH_MANIFEST_FOLDER}/{run['run_id']}/batch_{batch_no:04d}.json"))
+        files.extend(dict(f, batch_no=batch_no) for f in batch_manifest["files"])
+
+    rows = [
+        {
+            "run_id": run["run_id"],
+            "table_name": f["table"],
+            "file_path": f["path"][len(REMOTE_ROOT_FOLDER) + 1:],
+            "file_bytes": f["bytes"],
+            "file_format": run["table_formats"].get(f["table"], run["format"]),
+            "batch_no": f["batch_no"],
+        }
+        for f in files
+    ]
+    run_date = datetime.fromisoformat(run["base_date"])
+    manifest_path = f"{RUN_MANIFEST_FOLDER}/{run_date.strftime('%Y/%m/%d')}/run_{run['run_id']}.ndjson"
+    storage.upload(manifest_path, "".join(json.dumps(row) + "\n" for row in rows), content_type="application/x-ndjson")
+    logger.info(f"Published run manifest {manifest_path} ({len(rows)} files)")
+
+def load_cdc_job(storage, state, run, products):
+    """
+    Change parameters of a CDC run: its rates, the carry-over of the previous CDC run (open orders,
+    pooled customers) and the run's product table (`products` with the previous prices, some of them changed now).
+    The state keeps pointing to the previous carry-over until the run is finished, so a resumed
+    run gets the same input.
+    """
+    carry = json.loads(storage.download(state["cdc_state"])) if state.get("cdc_state") else {}
+    previous = carry.get("products")
+    if previous and len(previous["price"]) == row_count(products):
+        products = dict(products, price=np.array(previous["price"], dtype=float),
+                        updated_at=np.array(previous["updated_at"], dtype="datetime64[s]"))
+    products = change_prices(np.random.default_rng([run["seed"], 0]), products, run["cdc"]["price_change_rate"],
+                             datetime.fromisoformat(run["base_date"]))
+    return dict(
+        run["cdc"],
+        products=products,
+        open_orders=columns_from_json(carry.get("open_orders"), OPEN_ORDER_COLUMNS),
+        customers=columns_from_json(carry.get("customers"), CUSTOMER_POOL_COLUMNS),
+    )
+
+def save_cdc_state(storage, run, products):
+    """
+    Combines the carry-over of every batch of a finished CDC run into the input of the next one.
+    Written as a new file per run (the previous one stays valid until the state points here).
+    Returns its path.
+    """
+    parts = [json.loads(storage.download(f"{BATCH_MANIFEST_FOLDER}/{run['run_id']}/batch_{batch_no:04d}_cdc.json"))
+             for batch_no in range(1, run["batches"] + 1)]
+    open_orders = concat_tables(*[columns_from_json(part["open_orders"], OPEN_ORDER_COLUMNS) for part in parts])
+    customers = concat_tables(*[columns_from_json(part["customers"], CUSTOMER_POOL_COLUMNS) for part in parts])
+
+    # Ids grow over time: the oldest open orders / customers are dropped first
+    open_orders = take_rows(open_orders, np.sort(np.argsort(open_orders["order_id"])[-CDC_MAX_OPEN_ORDERS:]))
+    customers = take_rows(customers, np.sort(np.argsort(customers["customer_id"])[-CDC_CUSTOMER_POOL:]))
+
+    path = f"{CDC_STATE_FOLDER}/{run['run_id']}.json"
+    storage.upload(path, json.dumps({
+        "run_id": run["run_id"],
+        "open_orders": columns_to_json(open_orders),
+        "customers": columns_to_json(customers),
+        "products": {"price": products["price"].tolist(), "updated_at": python_values(products["updated_at"])},
+    }))
+    logger.info(f"CDC carry-over: {row_count(open_orders)} open orders, {row_count(customers)} pooled customers")
+    return path
 
-def upload_json_to_azure(blob_service_client, folder, filename, data):
-    """Uploads data to Azure Blob Storage in JSON format. Raises error on failure."""
+# ==========================================
+# SHARDED GENERATION
+# ==========================================
 
-    blob_path = f"{REMOTE_ROOT_FOLDER}/{folder}/{filename}"
+def shard_rng(seed, batch_no):
+    """Random generator of one batch, derived from the run seed only."""
+    return np.random.default_rng([seed, batch_no])
+
+def cdc_rng(seed, batch_no):
+    """Random generator of the change records of one batch (independent of the batch's own draws)."""
+    return np.random.default_rng([seed, batch_no, 1])
+
+def cdc_slice(columns, batches, batch_no):
+    """The rows of a carried-over table changed by one batch (every batch gets a contiguous share)."""
+    return take_rows(columns, np.array_split(np.arange(row_count(columns)), batches)[batch_no - 1])
+
+def plan_shards(state, seed, batches, n_customers, n_orders, cdc=None):
+    """
+    Reserves contiguous id ranges for every batch.
+    Only the plan of each batch is drawn here (see plan_batch(), plan_changes()); the shard re-draws
+    the same plan from the same seed, so its ids end exactly where the next shard's range begins.
+    Returns the shard tasks and the state after the last shard.
+    """
+    shards = []
+    for batch_no in range(1, batches + 1):
+        plan = plan_batch(shard_rng(seed, batch_no), n_customers, n_orders)
+        next_state = advance_state(state, plan_row_counts(plan))
+        if cdc:
+            open_orders = cdc_slice(cdc["open_orders"], batches, batch_no)
+            changes = plan_changes(cdc_rng(seed, batch_no), open_orders, cdc["late_rate"])
+            next_state = advance_state(next_state, change_row_counts(open_orders, changes))
+        shards.append({"batch_no": batch_no, "state": state, "next_state": next_state})
+        state = next_state
+    return shards, state
+
+class ShardContext:
+    """Per-process generation context: Faker value pools and the product table of the run."""
+
+    def __init__(self, seed, products):
+        shard_fake = Faker()
+        shard_fake.seed_instance(seed)
+        self.pools = build_value_pools(shard_fake)
+        self.products = products
+
+def add_changes(ctx, job, batch_no, batch, state):
+    """
+    CDC mode: adds the change records of the batch's share of open orders and pooled customers
+    to its new rows and writes some rows twice. Returns the batch, the state after it and the
+    carry-over of the batch: its open orders and pooled customers afterwards (JSON form).
+    """
+    cdc = job["cdc"]
+    rng = cdc_rng(job["seed"], batch_no)
+    changes, open_orders, customers, state = generate_changes(
+        rng, ctx.pools, cdc_slice(cdc["open_orders"], job["batches"], batch_no),
+        cdc_slice(cdc["customers"], job["batches"], batch_no), state, job["base_date"], cdc
+    )
+    new_customers = customer_pool_from_batch(rng, batch, max(1, CDC_CUSTOMER_POOL // (4 * job["batches"])))
+    carry = {
+        "open_orders": columns_to_json(concat_tables(open_orders, open_orders_from_batch(batch))),
+        "customers": columns_to_json(concat_tables(customers, new_customers)),
+    }
+    metrics.inc("generator_cdc_changes_total", sum(row_count(columns) for columns in changes.values()))
 
-    try:
-        blob_client = blob_service_client.get_blob_client(container=CONTAINER_NAME, blob=blob_path)
-        
-        # Serialize to JSON string -> bytes
-        json_data = json.dumps(data, indent=2, default=str)
-    
-        blob_client.upload_blob(
-            json_data, 
-            overwrite=True,
-            content_settings=ContentSettings(content_type='application/json')
+    batch = {
+        table: inject_duplicates(rng, concat_tables(columns, changes[table]) if table in changes else columns,
+                                 cdc["duplicate_rate"])
+        for table, columns in batch.items()
+    }
+    return batch, state, carry
+
+def generate_shard(ctx, uploads, job, shard):
+    """
+    Generates one batch inside its reserved id ranges and queues its files.
+    Returns the upload futures and the CDC carry-over of the batch (None outside CDC mode).
+    """
+    batch_no = shard["batch_no"]
+    file_suffix = f"{job['run_ts']}_{batch_no:04d}"
+    logger.info(f"Processing Batch {batch_no}/{job['batches']} ({file_suffix})...")
+
+    # Whole batch is generated as columns (customers, addresses, orders, items, payments, shipments, history)
+    with span("generator_batch_generate", detail=f"batch {batch_no}") as s:
+        batch, end_state = generate_batch(
+            shard_rng(job["seed"], batch_no), ctx.pools, ctx.products, shard["state"], job["base_date"],
+            job["customers_per_batch"], job["orders_per_batch"], job["profile"]
         )
-            
-    except Exception as e:
-        logger.error(f"CRITICAL: Upload failed for {filename}: {e}")
-        raise e
-
-def generate_email():
-    domains = ["gmail.com", "outlook.com", "hotmail.com", "yahoo.com", "icloud.com"]
-    return f"{fake.user_name()}@{random.choice(domains)}"
-
-def generate_phone():
-    return f"+{random.randint(10,99)} {random.randint(100,999)} {random.randint(100,999)} {random.randint(100,999)}"
-
-
-
+        carry = None
+        if job["cdc"]:
+            batch, end_state, carry = add_changes(ctx, job, batch_no, batch, end_state)
+        s.count("rows", sum(row_count(columns) for columns in batch.values()))
+    if end_state != shard["next_state"]:
+        raise RuntimeError(f"Batch {batch_no} left its reserved id ranges: {end_state} != {shard['next_state']}")
+
+    futures = [
+        upload_raw_file(uploads, folder, job["partition"], f"{prefix}_{file_suffix}", batch[table],
+                        job["table_formats"].get(table, job["format"]))
+        for folder, prefix, table in RAW_OUTPUTS
+    ]
+    return futures, carry
+
+def shard_files(futures):
+    """Results of a shard's upload futures, tagged with their Bronze table."""
+    return [{"table": table, **future.result()} for (_, _, table), future in zip(RAW_OUTPUTS, futures)]
+
+# Worker process globals (set once per process by _init_worker)
+_worker_ctx = None
+_worker_storage = None
+_worker_job = None
+
+def _init_worker(job):
+    global _worker_ctx, _worker_storage, _worker_job
+    _worker_job = job
+    _worker_ctx = ShardContext(job["seed"], job["products"])
+    _worker_storage = create_backend(job["backend"], local_root=job["local_root"], pool_size=job["upload_workers"])
+
+def _run_shard_in_worker(shard):
+    """
+    Process pool entry point. Uploads of the shard are finished before the task returns.
+    Returns the files, the CDC carry-over and the metrics recorded for the shard (merged by the coordinator).
+    """
+    with UploadPipeline(_worker_storage, workers=_worker_job["upload_workers"],
+                        max_pending=_worker_job["max_pending_uploads"]) as uploads:
+        futures, carry = generate_shard(_worker_ctx, uploads, _worker_job, shard)
+    return shard_files(futures), carry, metrics.snapshot(reset=True)
+
+def run_shards_in_pool(job, shards, workers, on_batch_done):
+    """Generates the shards on a process pool; on_batch_done(shard, files, carry) runs as each shard finishes."""
+    # spawn: worker processes must not inherit the coordinator's upload threads
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_init_worker, initargs=(job,)) as pool:
+        futures = {pool.submit(_run_shard_in_worker, shard): shard for shard in shards}
+        for future in as_completed(futures):
+            files, carry, worker_metrics = future.result()
+            metrics.merge(worker_metrics)
+            on_batch_done(futures[future], files, carry)
+
+def run_shards_in_process(ctx, uploads, job, shards, on_batch_done):
+    """
+    Generates the shards in this process. Uploads of batch N overlap with generation of
+    batch N+1; a batch is reported as done once all of its uploads have finished.
+    """
+    in_flight = []
+    for shard in shards:
+        in_flight.append((shard, *generate_shard(ctx, uploads, job, shard)))
+        while in_flight and all(future.done() for future in in_flight[0][1]):
+            done_shard, futures, carry = in_flight.pop(0)
+            on_batch_done(done_shard, shard_files(futures), carry)
+
+    uploads.drain()
+    for shard, futures, carry in in_flight:
+        on_batch_done(shard, shard_files(futures), carry)
 
 # ==========================================
 # MAIN EXECUTION
 # ==========================================
 
-def main():
+def generate_run(args, storage, store, state, run):
+    """Generates, uploads and publishes one run (new or resumed). Returns the state after the run."""
+    # runs planned before workload profiles existed have none (= the default profile)
+    profile = run.get("profile") or load_profile("default")
+    products = build_products(product_catalog(profile, PRODUCT_CATALOG), PRODUCTS_CREATED_AT)
+    cdc = load_cdc_job(storage, state, run, products) if run.get("cdc") else None
+    if cdc:
+        products = cdc["products"]
+        logger.info(f"CDC run: changing {row_count(cdc['open_orders'])} open orders and "
+                    f"{row_count(cdc['customers'])} pooled customers of earlier runs")
+    shards, end_state = plan_shards(
+        run["start_state"], run["seed"], run["batches"], run["customers_per_batch"], run["orders_per_batch"], cdc
+    )
+    if "pending_run" not in state:
+        # Reserve the whole run before the first upload
+        state = dict(state, **sequences(end_state), pending_run=run)
+        store.commit(state)
+    logger.info(f"Run {run['run_id']} seed: {run['seed']} "
+                f"(use --seed {run['seed']} --base-date {run['base_date']} to reproduce)")
+    logger.info(f"{run['batches']} batches of {run['customers_per_batch']} customers / "
+                f"{run['orders_per_batch']} orders, catalog of {row_count(products)} products")
+
+    # Everything a shard needs; must stay picklable for the worker processes
+    job = {
+        "seed": run["seed"],
+        "base_date": datetime.fromisoformat(run["base_date"]),
+        "run_ts": run["run_id"],
+        "partition": partition_path(datetime.fromisoformat(run["base_date"])),
+        "batches": run["batches"],
+        "customers_per_batch": run["customers_per_batch"],
+        "orders_per_batch": run["orders_per_batch"],
+        "format": run["format"],
+        "table_formats": run["table_formats"],
+        "backend": args.backend,
+        "local_root": args.local_root,
+        "upload_workers": args.upload_workers,
+        "max_pending_uploads": args.max_pending_uploads,
+        "profile": profile,
+        "products": products,
+        "cdc": cdc,
+    }
+    todo = [shard for shard in shards if shard["batch_no"] not in run["committed_batches"]]
+
+    files_uploaded, bytes_uploaded = 0, 0
+
+    def on_batch_done(shard, files, carry):
+        nonlocal files_uploaded, bytes_uploaded
+        files_uploaded += len(files)
+        bytes_uploaded += sum(f["bytes"] for f in files)
+        metrics.inc("generator_batches_total")
+        run_span.count("files", len(files))
+        run_span.count("bytes", sum(f["bytes"] for f in files))
+        commit_batch(store, storage, state, shard, files, carry)
+
+    # Generation and upload of the batch files until the last upload has finished
+    run_span = span("generator_run", log_level=logging.INFO, detail=f"run {run['run_id']}",
+                    workers=args.workers, backend=args.backend)
+    uploads = UploadPipeline(storage, workers=args.upload_workers, max_pending=args.max_pending_uploads)
+    with run_span, uploads:
+
+        # 4. STATIC DATA GENERATION (CATALOG)
+        ctx = ShardContext(run["seed"], products)
+        logger.info(f"Uploading Product Catalog ({row_count(products)} items)...")
+        products_upload = upload_raw_file(uploads, "products_raw", job["partition"], f"products_{run['run_id']}",
+                                          ctx.products, run["table_formats"].get("products", run["format"]))
+
+        # 5. TRANSACTION GENERATION (checkpoint after every batch)
+        logger.info(f"Starting Incremental Transaction Generation "
+                    f"({len(todo)} of {run['batches']} batches, {args.workers} workers)...")
+
+        if args.workers > 1:
+            run_shards_in_pool(job, todo, args.workers, on_batch_done)
+        else:
+            run_shards_in_process(ctx, uploads, job, todo, on_batch_done)
+
+    # All uploads have finished here (the pipelines drain on exit)
+    files_uploaded += 1
+    bytes_uploaded += products_upload.result()["bytes"]
+    logger.info(f"Uploaded {files_uploaded} files ({bytes_uploaded / 1024 / 1024:.1f} MB).")
+
+    # 6. PUBLISH RUN MANIFEST & FINISH RUN
+    publish_run_manifest(storage, run, dict(products_upload.result(), table="products"))
+    if cdc:
+        state["cdc_state"] = save_cdc_state(storage, run, cdc["products"])
+    state.pop("pending_run")
+    if run.get("backfill"):
+        state.setdefault("backfill", {})["done_through"] = run["base_date"][:10]
+    state["last_run_ts"] = datetime.now().isoformat()
+    state["last_run_id"] = run["run_id"]
+    store.commit(state)
+    logger.info(f"State saved successfully to {storage.name}!")
+    return state
+
+def main(argv=None):
+    args = parse_args(argv)
     try:
-        # 1. CONNECT TO AZURE
-        logger.info(f"Connecting to Azure Storage: {STORAGE_ACCOUNT_NAME}...")
-        credential = DefaultAzureCredential()
-        account_url = f"https://{STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
-        blob_service_client = BlobServiceClient(account_url=account_url, credential=credential)
-        logger.info("Connected to Azure via Identity!")
-
-        # 2. LOAD STATE
-        current_state = load_state(blob_service_client)
-
-        # Extract sequences
-        customer_id_seq = current_state["customer_id_seq"]
-        address_id_seq = current_state["address_id_seq"]
-        order_id_seq = current_state["order_id_seq"]
-        order_item_id_seq = current_state["order_item_id_seq"]
-        payment_id_seq = current_state["payment_id_seq"]
-        shipment_id_seq = current_state["shipment_id_seq"]
-        history_id_seq = current_state["history_id_seq"]
-
-        base_date = datetime.now()
-
-
-        # 3. STATIC DATA GENERATION (CATALOG)
-        PRODUCT_CATALOG = [
-            ("iPhone 15 Pro", "Electronics", "Apple", 1199.00),
-            ("Samsung Galaxy S24", "Electronics", "Samsung", 999.00),
-            ("MacBook Pro 16", "Electronics", "Apple", 2499.00),
-            ("AirPods Pro", "Electronics", "Apple", 249.00),
-            ("PlayStation 5", "Electronics", "Sony", 499.00),
-            ("Xbox Series X", "Electronics", "Microsoft", 499.00),
-            ("Nintendo Switch OLED", "Electronics", "Nintendo", 349.00),
-            ("LG OLED TV 55", "Electronics", "LG", 1499.00),
-            ("Samsung 4K Monitor", "Electronics", "Samsung", 399.00),
-            ("Logitech MX Master 3", "Electronics", "Logitech", 99.00),
-            ("Razer BlackWidow V3", "Electronics", "Razer", 139.00),    
-            ("Sony WH-1000XM5", "Electronics", "Sony", 349.00),
-            ("Dyson V15 Detect", "Home", "Dyson", 649.00),
-            ("Nespresso Vertuo", "Home", "Nespresso", 179.00),
-            ("Nike Air Zoom", "Sports", "Nike", 139.00),
-            ("Adidas Ultraboost", "Sports", "Adidas", 189.00),
-            ("Ray-Ban Aviator", "Fashion", "Ray-Ban", 189.00),
-            ("Kindle Paperwhite", "Electronics", "Amazon", 139.00),
-        ]
-
-        products = []
-        for i, (name, cat, brand, price) in enumerate(PRODUCT_CATALOG):
-            products.append({
-                "product_id": i + 1,
-                "name": name,
-                "category": cat,
-                "brand": brand,
-                "price": price,
-                "currency": "EUR",
-                "status": "ACTIVE",
-                "created_at": datetime(2024, 1, 1),
-                "updated_at": datetime(2024, 1, 1),
-            })
-
-        products_ts = datetime.now().strftime("%Y%m%d_%H_%M_%S")
-        logger.info(f"Uploading Product Catalog ({len(products)} items)...")
-        upload_json_to_azure(blob_service_client, "products_raw", f"products_{products_ts}.json", products)
-
-
-        # 4. TRANSACTION GENERATION LOOP
-        logger.info(f"Starting Incremental Transaction Generation ({BATCHES} batches)...")
-        ORDER_FLOW = ["CREATED", "PAID", "SHIPPED", "DELIVERED"]
-
-        for batch in range(1, BATCHES + 1):
-
-            timestamp_str = datetime.now().strftime("%Y%m%d_%H_%M_%S")
-            logger.info(f"Processing Batch {batch}/{BATCHES} with TS: {timestamp_str}...")
-            
-            # --- CUSTOMERS & ADDRESSES ---
-            batch_customers = []
-            batch_addresses = []
-            
-            for _ in range(CUSTOMERS_PER_BATCH):
-                # Customers created recently
-                cust_created = base_date - timedelta(days=random.randint(0, 30))
-                
-                # Customer
-                batch_customers.append({
-                    "customer_id": customer_id_seq,
-                    "email": generate_email(),
-                    "first_name": fake.first_name(),
-                    "last_name": fake.last_name(),
-                    "phone": generate_phone(),
-                    "status": "ACTIVE",
-                    "created_at": cust_created,
-                    "updated_at": cust_created
-                })
-                
-                # Address
-                batch_addresses.append({
-                    "address_id": address_id_seq,
-                    "customer_id": customer_id_seq,
-                    "type": "SHIPPING",
-                    "street": fake.street_address(),
-                    "city": fake.city(),
-                    "postal_code": fake.postcode(),
-                    "country": fake.country_code(),
-                    "is_default": True,
-                    "created_at": cust_created,
-                    "updated_at": cust_created
-                })
-                
-                customer_id_seq += 1
-                address_id_seq += 1
-
-            # --- ORDERS & TRANSACTIONS ---
-            batch_orders = []
-            batch_items = []
-            batch_payments = []
-            batch_shipments = []
-            batch_history = []
-            
-            for _ in range(ORDERS_PER_BATCH):
-                cust = random.choice(batch_customers)
-                order_date = cust["created_at"] + timedelta(hours=random.randint(1, 48))
-                
-                # Determine Status Flow
-                final_status = random.choice(ORDER_FLOW)
-                status_steps = ORDER_FLOW[:ORDER_FLOW.index(final_status) + 1]
-                
-                # Generate Status History
-                current_ts = order_date
-                for step in status_steps:
-                    batch_history.append({
-                        "status_history_id": history_id_seq,
-                        "order_id": order_id_seq,
-                        "status": step,
-                        "changed_at": current_ts
-                    })
-                    history_id_seq += 1
-                    current_ts += timedelta(hours=random.randint(2, 12))
-                
-                final_ts = current_ts
-                
-                # Create Order Items
-                items_count = random.randint(1, 4)
-                total_amount = 0
-                for _ in range(items_count):
-                    prod = random.choice(products)
-                    qty = random.randint(1, 2)
-                    line_total = qty * prod["price"]
-                    total_amount += line_total
-                    
-                    batch_items.append({
-                        "order_item_id": order_item_id_seq,
-                        "order_id": order_id_seq,
-                        "product_id": prod["product_id"],
-                        "quantity": qty,
-                        "unit_price": prod["price"],
-                        "created_at": order_date
-                    })
-                    order_item_id_seq += 1
-                    
-                # Create Order Header
-                batch_orders.append({
-                    "order_id": order_id_seq,
-                    "customer_id": cust["customer_id"],
-                    "order_status": final_status,
-                    "order_total_amount": round(total_amount, 2),
-                    "currency": "EUR",
-                    "created_at": order_date,
-                    "updated_at": final_ts
-                })
-                
-                # Payment
-                if final_status in ["PAID", "SHIPPED", "DELIVERED"]:
-                    batch_payments.append({
-                        "payment_id": payment_id_seq,
-                        "order_id": order_id_seq,
-                        "provider": random.choice(["VISA", "PAYPAL"]),
-                        "payment_status": "SUCCESS",
-                        "amount": round(total_amount, 2),
-                        "created_at": order_date + timedelta(minutes=15),
-                        "updated_at": order_date + timedelta(minutes=15)
-                    })
-                    payment_id_seq += 1
-                    
-                # Shipment
-                if final_status in ["SHIPPED", "DELIVERED"]:
-                    ship_ts = next(h["changed_at"] for h in batch_history if h["status"] == "SHIPPED")
-                    del_ts = next((h["changed_at"] for h in batch_history if h["status"] == "DELIVERED"), None)
-                    
-                    batch_shipments.append({
-                        "shipment_id": shipment_id_seq,
-                        "order_id": order_id_seq,
-                        "carrier": "DHL",
-                        "shipment_status": final_status,
-                        "shipped_at": ship_ts,
-                        "delivered_at": del_ts,
-                        "updated_at": del_ts if del_ts else ship_ts
-                    })
-                    shipment_id_seq += 1
-                    
-                order_id_seq += 1
-
-            # --- UPLOAD BATCH  ---
-            upload_json_to_azure(blob_service_client, "customers_raw", f"customers_{timestamp_str}.json", batch_customers)
-            upload_json_to_azure(blob_service_client, "addresses_raw", f"addresses_{timestamp_str}.json", batch_addresses)
-            upload_json_to_azure(blob_service_client, "orders_raw", f"orders_{timestamp_str}.json", batch_orders)
-            upload_json_to_azure(blob_service_client, "order_items_raw", f"items_{timestamp_str}.json", batch_items)
-            upload_json_to_azure(blob_service_client, "payments_raw", f"payments_{timestamp_str}.json", batch_payments)
-            upload_json_to_azure(blob_service_client, "shipments_raw", f"shipments_{timestamp_str}.json", batch_shipments)
-            upload_json_to_azure(blob_service_client, "order_status_history_raw", f"history_{timestamp_str}.json", batch_history)
-
-            time.sleep(1)
-
-        # 5. SAVE STATE
-        new_state = {
-            "customer_id_seq": customer_id_seq,
-            "address_id_seq": address_id_seq,
-            "order_id_seq": order_id_seq,
-            "order_item_id_seq": order_item_id_seq,
-            "payment_id_seq": payment_id_seq,
-            "shipment_id_seq": shipment_id_seq,
-            "history_id_seq": history_id_seq,
-            "last_run_ts": datetime.now().isoformat()
-        }
-        save_state(blob_service_client, new_state)
-
-        logger.info(f"SUCCESS: Data generation finished. Next Order ID will be: {order_id_seq}")
-
+        # 1. CONNECT TO STORAGE
+        storage = create_backend(args.backend, local_root=args.local_root, pool_size=args.upload_workers)
+
+        # 2. LOCK & LOAD STATE (the lease keeps other generator runs out until we finish)
+        with StateStore(storage, STATE_FILE_PATH, get_initial_state) as store:
+            state = store.load()
+            logger.info(f"Loaded state from {storage.name}. Next Order ID: {state.get('order_id_seq')}")
+
+            # 3. RESUME THE PENDING RUN or RESERVE ID RANGES (one shard per batch) OF NEW RUNS
+            run = state.get("pending_run")
+            if run:
+                logger.warning(f"Resuming interrupted run {run['run_id']}: "
+                               f"{len(run['committed_batches'])}/{run['batches']} batches already committed. "
+                               "Generation arguments of the pending run are used.")
+                state = generate_run(args, storage, store, state, run)
+
+            if args.backfill_start:
+                # Historical days, oldest first; an interrupted backfill continues after its last finished day
+                days, done_through = backfill_days(args, state)
+                state["backfill"] = {"start": args.backfill_start.isoformat(), "end": args.backfill_end.isoformat(),
+                                     "done_through": done_through}
+                logger.info(f"Backfill {args.backfill_start} .. {args.backfill_end}: {len(days)} day(s) to generate")
+                for base_date in days:
+                    # Derived from the date, so a resumed backfill generates the same days as an uninterrupted one
+                    seed = (args.seed + (base_date.date() - args.backfill_start).days if args.seed is not None
+                            else int(np.random.SeedSequence().entropy % 2**63))
+                    state = generate_run(args, storage, store, state, new_run(args, state, seed, base_date, backfill=True))
+                state.pop("backfill")
+                store.commit(state)
+            elif not run:
+                base_date = args.base_date or datetime.now()
+                seed = args.seed if args.seed is not None else int(np.random.SeedSequence().entropy % 2**63)
+                state = generate_run(args, storage, store, state, new_run(args, state, seed, base_date))
+
+        logger.info(f"SUCCESS: Data generation finished. Next Order ID will be: {state['order_id_seq']}")
+
+    except StateLocked as e:
+        logger.error(f"FATAL ERROR in Data Generator: {e}")
+        logger.error("Another generator run is active. Stopping execution.")
+        sys.exit(1)
     except Exception as e:
         logger.error(f"FATAL ERROR in Data Generator: {e}")
         logger.error("Stopping execution to prevent ADF trigger.")
@@ -338,4 +632,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,379 @@
+import argparse
+import csv
+import json
+import os
+import statistics
+import sys
+from datetime import datetime
+from common_logger import logger
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+QUERY_TAG_APP = "ECOMMERCE_ETL"     # "app" of the tags set by COMMON.SET_QUERY_TAG
+
+DEFAULT_DAYS = 7                    # INFORMATION_SCHEMA.QUERY_HISTORY keeps 7 days
+DEFAULT_BASELINE_RUNS = 7
+DEFAULT_MIN_HISTORY = 3
+DEFAULT_THRESHOLD = 0.5             # flag when 50% worse than the baseline
+DEFAULT_MIN_SECONDS = 5.0           # ... and, for durations, at least this many seconds slower
+DEFAULT_MIN_ROWS = 10000            # per-row metrics are only compared for steps with this many rows
+DEFAULT_TREND_RUNS = 10
+
+# Metrics compared against the baseline: metric -> True if higher is worse
+REGRESSION_METRICS = {
+    "duration_sec": True,
+    "rows_per_sec": False,
+    "bytes_per_row": True,
+    "spilled_bytes": True,
+}
+PER_ROW_METRICS = ("rows_per_sec", "bytes_per_row")
+
+LOGS_QUERY = """
+    SELECT PIPELINE_RUN_ID, LAYER, PROCESS_NAME, TARGET_TABLE, STEP_NAME, STATUS,
+           ROWS_AFFECTED, DURATION_SEC, CREATED_AT, ADDITIONAL_INFO:query_ids AS QUERY_IDS
+    FROM ECOMMERCE.COMMON.ETL_LOGS
+    WHERE CREATED_AT >= DATEADD(day, -%s, CURRENT_TIMESTAMP())
+"""
+
+HISTORY_QUERY = """
+    SELECT QUERY_ID, QUERY_TAG, START_TIME, TOTAL_ELAPSED_TIME, EXECUTION_TIME, COMPILATION_TIME,
+           BYTES_SCANNED, PARTITIONS_SCANNED, PARTITIONS_TOTAL, ROWS_PRODUCED,
+           BYTES_SPILLED_TO_LOCAL_STORAGE, BYTES_SPILLED_TO_REMOTE_STORAGE,
+           QUEUED_OVERLOAD_TIME, QUEUED_PROVISIONING_TIME, QUEUED_REPAIR_TIME
+    FROM TABLE(ECOMMERCE.INFORMATION_SCHEMA.QUERY_HISTORY_BY_USER(
+        USER_NAME => CURRENT_USER(),
+        END_TIME_RANGE_START => DATEADD(day, -%s, CURRENT_TIMESTAMP()),
+        RESULT_LIMIT => 10000))
+    WHERE QUERY_TAG LIKE '%%' || %s || '%%'
+"""
+
+# ==========================================
+# INPUT HELPERS
+# ==========================================
+
+def read_records(path):
+    """Reads an exported result set (.csv with header, .json array or .jsonl/.ndjson). Keys are upper-cased."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            records = list(csv.DictReader(f))
+        elif path.endswith((".jsonl", ".ndjson")):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = json.load(f)
+    return [{key.upper(): value for key, value in record.items()} for record in records]
+
+def write_records(path, records):
+    """Writes records as CSV with header (the format read back by read_records)."""
+    columns = list(records[0]) if records else []
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(records)
+
+def number(value):
+    """Exported numbers arrive as strings, empty strings or NULLs."""
+    if value in (None, ""):
+        return 0.0
+    return float(value)
+
+def timestamp(value):
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+
+def query_ids(value):
+    """The query_ids logged by a step: a list, or its JSON text in exports and VARIANT results."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value) if value.strip() else None
+        except ValueError:
+            return []
+    return [str(query_id) for query_id in value or [] if query_id]
+
+def fetch_from_snowflake(days):
+    """Reads ETL_LOGS and the tagged query history of ETL_USER from Snowflake."""
+    from etl_orchestrator import snowflake_connect
+
+    connection = snowflake_connect()
+    try:
+        cursor = connection.cursor()
+        result = []
+        for sql, params in ((LOGS_QUERY, (days,)), (HISTORY_QUERY, (days, f'"app":"{QUERY_TAG_APP}"'))):
+            cursor.execute(sql, params)
+            columns = [column[0].upper() for column in cursor.description]
+            result.append([dict(zip(columns, row)) for row in cursor.fetchall()])
+        return result
+    finally:
+        connection.close()
+
+# ==========================================
+# REPORT HELPERS
+# ==========================================
+
+def step_key(run_id, layer, process, target):
+    return (run_id or "", (layer or "").upper(), (process or "").upper(), (target or "").upper())
+
+def summarize_logs(logs):
+    """
+    Collapses ETL_LOGS events into one entry per step: {(run_id, layer, process, target): step}.
+    START events are skipped; a step is FAIL if any of its events failed. "query_ids" are
+    the IDs of the statements the step logged (ADDITIONAL_INFO:query_ids).
+    """
+    steps = {}
+    for event in logs:
+        if event.get("STATUS") == "START":
+            continue
+        key = step_key(event.get("PIPELINE_RUN_ID"), event.get("LAYER"),
+                       event.get("PROCESS_NAME"), event.get("TARGET_TABLE"))
+        step = steps.setdefault(key, {"status": "SUCCESS", "rows": 0.0, "duration_sec": 0.0,
+                                      "started_at": timestamp(event["CREATED_AT"]), "query_ids": []})
+        step["rows"] += number(event.get("ROWS_AFFECTED"))
+        step["duration_sec"] = max(step["duration_sec"], number(event.get("DURATION_SEC")))
+        step["started_at"] = min(step["started_at"], timestamp(event["CREATED_AT"]))
+        step["query_ids"] += query_ids(event.get("QUERY_IDS"))
+        if event.get("STATUS") == "FAIL":
+            step["status"] = "FAIL"
+    return steps
+
+def query_step(query, owners, owner_steps):
+    """
+    Step of a query: the step that logged its query ID, else the step in its tag. The tag
+    is only trusted for steps without logged IDs: ASYNC children of a master share its
+    session, so a query can carry the tag a sibling set last.
+    """
+    key = owners.get(query.get("QUERY_ID"))
+    if key:
+        return key, "query_id"
+    try:
+        tag = json.loads(query.get("QUERY_TAG") or "")
+    except ValueError:
+        return None, None
+    if not isinstance(tag, dict) or tag.get("app") != QUERY_TAG_APP:
+        return None, None
+    key = step_key(tag.get("run_id"), tag.get("layer"), tag.get("process"), tag.get("target"))
+    if key in owner_steps:
+        return None, None
+    return key, "query_tag"
+
+def summarize_history(history, steps):
+    """Sums the query history per step of summarize_logs: {(run_id, layer, process, target): totals}."""
+    owners = {query_id: key for key, step in steps.items() for query_id in step["query_ids"]}
+    owner_steps = set(owners.values())
+    totals = {}
+    for query in history:
+        key, attribution = query_step(query, owners, owner_steps)
+        if key is None:
+            continue
+
+        total = totals.setdefault(key, {"queries": 0, "elapsed_sec": 0.0, "compile_sec": 0.0,
+                                        "bytes_scanned": 0.0, "partitions_scanned": 0.0,
+                                        "partitions_total": 0.0, "spilled_bytes": 0.0,
+                                        "queued_sec": 0.0, "slowest_query_id": None, "slowest_sec": -1.0,
+                                        "attribution": attribution})
+        elapsed = number(query.get("TOTAL_ELAPSED_TIME")) / 1000
+        total["queries"] += 1
+        total["elapsed_sec"] += elapsed
+        total["compile_sec"] += number(query.get("COMPILATION_TIME")) / 1000
+        total["bytes_scanned"] += number(query.get("BYTES_SCANNED"))
+        total["partitions_scanned"] += number(query.get("PARTITIONS_SCANNED"))
+        total["partitions_total"] += number(query.get("PARTITIONS_TOTAL"))
+        total["spilled_bytes"] += (number(query.get("BYTES_SPILLED_TO_LOCAL_STORAGE"))
+                                   + number(query.get("BYTES_SPILLED_TO_REMOTE_STORAGE")))
+        total["queued_sec"] += (number(query.get("QUEUED_OVERLOAD_TIME"))
+                                + number(query.get("QUEUED_PROVISIONING_TIME"))
+                                + number(query.get("QUEUED_REPAIR_TIME"))) / 1000
+        if elapsed > total["slowest_sec"]:
+            total["slowest_sec"] = elapsed
+            total["slowest_query_id"] = query.get("QUERY_ID")
+    return totals
+
+def build_steps(logs, history):
+    """Joins the logged steps with their query history and derives the throughput metrics."""
+    logged = summarize_logs(logs)
+    totals = summarize_history(history, logged)
+    steps = []
+    for key, step in logged.items():
+        run_id, layer, process, target = key
+        total = totals.get(key, {})
+        rows, seconds = step["rows"], step["duration_sec"]
+        partitions_total = total.get("partitions_total", 0.0)
+        steps.append({
+            "run_id": run_id,
+            "step": ".".join(part for part in (layer, process, target if target != process else "") if part),
+            "status": step["status"],
+            "started_at": step["started_at"],
+            "rows": rows,
+            "duration_sec": seconds,
+            "rows_per_sec": rows / seconds if seconds else None,
+            "queries": total.get("queries", 0),
+            "bytes_scanned": total.get("bytes_scanned"),
+            "bytes_per_row": total["bytes_scanned"] / rows if total and rows else None,
+            "pruned_pct": 100 * (1 - total["partitions_scanned"] / partitions_total) if partitions_total else None,
+            "spilled_bytes": total.get("spilled_bytes"),
+            "queued_sec": total.get("queued_sec"),
+            "compile_sec": total.get("compile_sec"),
+            "slowest_query_id": total.get("slowest_query_id"),
+            "attribution": total.get("attribution"),
+        })
+    return steps
+
+def order_runs(steps):
+    """Run ids ordered by the start of their first step."""
+    starts = {}
+    for step in steps:
+        starts[step["run_id"]] = min(starts.get(step["run_id"], step["started_at"]), step["started_at"])
+    return sorted(starts, key=starts.get)
+
+def flag_regressions(steps, runs, baseline_runs, min_history, threshold, min_seconds,
+                     min_rows=DEFAULT_MIN_ROWS):
+    """
+    Compares every successful step with the median of the same step in the `baseline_runs`
+    previous runs. Per-row metrics are only compared between runs with at least `min_rows`
+    rows. Sets step["baseline"] and returns the list of regressions.
+    """
+    position = {run_id: i for i, run_id in enumerate(runs)}
+    history = {}
+    for step in sorted(steps, key=lambda s: position[s["run_id"]]):
+        if step["status"] == "SUCCESS":
+            history.setdefault(step["step"], []).append(step)
+
+    regressions = []
+    for name, runs_of_step in history.items():
+        for i, step in enumerate(runs_of_step):
+            previous = runs_of_step[max(0, i - baseline_runs):i]
+            step["baseline"] = {}
+            for metric, higher_is_worse in REGRESSION_METRICS.items():
+                if metric in PER_ROW_METRICS and step["rows"] < min_rows:
+                    continue
+                values = [p[metric] for p in previous
+                          if p[metric] is not None and (metric not in PER_ROW_METRICS or p["rows"] >= min_rows)]
+                if len(values) < min_history or step[metric] is None:
+                    continue
+                baseline = statistics.median(values)
+                step["baseline"][metric] = baseline
+
+                if higher_is_worse:
+                    worse = step[metric] > baseline * (1 + threshold) and step[metric] > 0
+                else:
+                    worse = step[metric] < baseline / (1 + threshold)
+                if metric == "duration_sec":
+                    worse = worse and step[metric] - baseline >= min_seconds
+                if worse:
+                    regressions.append({"run_id": step["run_id"], "step": name, "metric": metric,
+                                        "value": step[metric], "baseline": baseline,
+                                        "ratio": step[metric] / baseline if baseline else None,
+                                        "slowest_query_id": step["slowest_query_id"]})
+    return regressions
+
+def fmt(value, spec=",.0f", scale=1):
+    return "-" if value is None else format(value / scale, spec)
+
+def log_run(run_id, steps):
+    logger.info(f"Run {run_id}: {len(steps)} steps")
+    logger.info(f"{'STEP':<40} {'STATUS':<7} {'ROWS':>11} {'SEC':>8} {'ROWS/S':>10} {'MB SCAN':>9} "
+                f"{'B/ROW':>8} {'PRUNED%':>7} {'SPILL MB':>8} {'QUEUE S':>7} {'VS BASE':>7}")
+    for step in sorted(steps, key=lambda s: s["started_at"]):
+        baseline = step.get("baseline", {}).get("duration_sec")
+        versus = f"x{step['duration_sec'] / baseline:.2f}" if baseline else "-"
+        logger.info(f"{step['step']:<40} {step['status']:<7} {fmt(step['rows']):>11} "
+                    f"{fmt(step['duration_sec'], '.2f'):>8} {fmt(step['rows_per_sec']):>10} "
+                    f"{fmt(step['bytes_scanned'], ',.1f', 1024 ** 2):>9} {fmt(step['bytes_per_row']):>8} "
+                    f"{fmt(step['pruned_pct'], '.1f'):>7} {fmt(step['spilled_bytes'], ',.1f', 1024 ** 2):>8} "
+                    f"{fmt(step['queued_sec'], '.1f'):>7} {versus:>7}")
+
+def log_trends(steps, runs, trend_runs):
+    """One line per step with its durations over the last `trend_runs` runs (oldest first)."""
+    recent = runs[-trend_runs:]
+    durations = {}
+    for step in steps:
+        if step["run_id"] in recent:
+            durations.setdefault(step["step"], {})[step["run_id"]] = step["duration_sec"]
+    logger.info(f"Duration trend (seconds) over the last {len(recent)} runs:")
+    for name in sorted(durations):
+        logger.info(f"{name:<40} " + " ".join(f"{fmt(durations[name].get(run_id), '.1f'):>7}" for run_id in recent))
+
+# ==========================================
+# MAIN EXECUTION
+# ==========================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Per-step throughput, trends and regressions of the ETL runs (ETL_LOGS + query history)."
+    )
+    parser.add_argument("--logs", help="Exported ETL_LOGS (.csv, .json or .jsonl)")
+    parser.add_argument("--history", help="Exported QUERY_HISTORY of the tagged ETL queries (.csv, .json or .jsonl)")
+    parser.add_argument("--snowflake", action="store_true", help="Read ETL_LOGS and query history from Snowflake")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="History window read with --snowflake")
+    parser.add_argument("--export-dir", help="Write what was read with --snowflake as CSV for offline runs")
+    parser.add_argument("--run-id", help="Run to report (default: latest run)")
+    parser.add_argument("--baseline-runs", type=int, default=DEFAULT_BASELINE_RUNS,
+                        help="Previous runs whose median is the baseline of a step")
+    parser.add_argument("--min-history", type=int, default=DEFAULT_MIN_HISTORY,
+                        help="Previous runs needed before a step is compared")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change against the baseline that is flagged (0.5 = 50%%)")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Smallest slowdown in seconds flagged as a duration regression")
+    parser.add_argument("--min-rows", type=int, default=DEFAULT_MIN_ROWS,
+                        help="Smallest row count of a step whose rows/s and bytes/row are compared")
+    parser.add_argument("--trend-runs", type=int, default=DEFAULT_TREND_RUNS)
+    parser.add_argument("--output", help="Optional path of a JSON file with all steps and regressions")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with 1 when the reported run has regressions")
+    args = parser.parse_args(argv)
+    if not args.snowflake and not (args.logs and args.history):
+        parser.error("either --snowflake or both --logs and --history are required")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.snowflake:
+        logs, history = fetch_from_snowflake(args.days)
+        if args.export_dir:
+            os.makedirs(args.export_dir, exist_ok=True)
+            write_records(os.path.join(args.export_dir, "etl_logs.csv"), logs)
+            write_records(os.path.join(args.export_dir, "query_history.csv"), history)
+            logger.info(f"Exported {len(logs)} log events and {len(history)} queries to {args.export_dir}")
+    else:
+        logs, history = read_records(args.logs), read_records(args.history)
+
+    steps = build_steps(logs, history)
+    if not steps:
+        logger.warning("No ETL steps found")
+        return
+    runs = order_runs(steps)
+    run_id = args.run_id or runs[-1]
+    if run_id not in runs:
+        raise ValueError(f"Run {run_id} not found in ETL_LOGS")
+
+    regressions = flag_regressions(steps, runs, args.baseline_runs, args.min_history,
+                                   args.threshold, args.min_seconds, args.min_rows)
+
+    log_run(run_id, [step for step in steps if step["run_id"] == run_id])
+    log_trends(steps, runs, args.trend_runs)
+
+    run_regressions = [r for r in regressions if r["run_id"] == run_id]
+    for r in run_regressions:
+        logger.warning(f"Regression in {r['step']}: {r['metric']} {r['value']:,.2f} vs baseline "
+                       f"{r['baseline']:,.2f} (slowest query {r['slowest_query_id']})")
+    logger.info(f"{len(run_regressions)} regression(s) in run {run_id}, "
+                f"{len(regressions)} over all {len(runs)} runs")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"run_id": run_id, "runs": runs, "steps": steps, "regressions": regressions},
+                      f, indent=2, default=str)
+        logger.info(f"Results written to {args.output}")
+
+    if args.fail_on_regression and run_regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"Performance report failed: {e}")
+        sys.exit(1)
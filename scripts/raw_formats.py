@@ -0,0 +1,158 @@
+import json
+import zlib
+import numpy as np
+from oltp_batch_engine import python_values, row_count
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+# Rows encoded per chunk. Only one chunk per upload is materialised at a time,
+# so memory stays flat regardless of the batch size.
+CHUNK_ROWS = 10000
+
+# Parquet row group size. Snowflake scans Parquet files row group by row group;
+# groups of ~128k rows (a few MB compressed for our tables) keep the loader
+# parallel without producing tiny groups with large per-group overhead.
+PARQUET_ROW_GROUP_ROWS = 128 * 1024
+PARQUET_COMPRESSION = "snappy"
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+FORMATS = {
+    # format: (file extension, content type)
+    "ndjson": (".ndjson", "application/x-ndjson"),
+    "ndjson.gz": (".ndjson.gz", "application/gzip"),
+    "ndjson.zst": (".ndjson.zst", "application/zstd"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "json": (".json", "application/json"),
+}
+DEFAULT_FORMAT = "ndjson"
+
+# Compact separators: no indentation / whitespace in raw files
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+# ==========================================
+# COLUMN ENCODING
+# ==========================================
+
+def iter_json_lines(columns, chunk_rows=CHUNK_ROWS):
+    """Yields lists of compact JSON documents (one per row), `chunk_rows` rows at a time."""
+    names = list(columns)
+    n_rows = row_count(columns)
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        values = [python_values(col[start:stop]) for col in columns.values()]
+        yield [_encoder.encode(dict(zip(names, row))) for row in zip(*values)]
+
+
+# ==========================================
+# FILE ENCODERS (byte chunks)
+# ==========================================
+
+def encode_ndjson(columns, chunk_rows=CHUNK_ROWS):
+    """Newline-delimited JSON: one compact object per line."""
+    for lines in iter_json_lines(columns, chunk_rows):
+        lines.append("")
+        yield "\n".join(lines).encode("utf-8")
+
+def encode_json_array(columns, chunk_rows=CHUNK_ROWS):
+    """Compact JSON array (legacy layout for fileformat_json / STRIP_OUTER_ARRAY)."""
+    yield b"["
+    separator = ""
+    for lines in iter_json_lines(columns, chunk_rows):
+        yield (separator + ",".join(lines)).encode("utf-8")
+        separator = ","
+    yield b"]"
+
+def encode_ndjson_gzip(columns, chunk_rows=CHUNK_ROWS):
+    """Gzip-compressed NDJSON (streamed, one gzip member)."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in encode_ndjson(columns, chunk_rows):
+        yield compressor.compress(chunk)
+    yield compressor.flush()
+
+def encode_ndjson_zstd(columns, chunk_rows=CHUNK_ROWS):
+    """Zstandard-compressed NDJSON (streamed, one frame). Requires `zstandard`."""
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    for chunk in encode_ndjson(columns, chunk_rows):
+        yield compressor.compress(chunk)
+    yield compressor.flush()
+
+
+class _ChunkSink:
+    """Minimal writable file object collecting bytes until they are taken by the encoder."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.closed = False
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+def _arrow_column(column):
+    import pyarrow as pa
+
+    if np.issubdtype(column.dtype, np.datetime64):
+        return pa.array(column, mask=np.isnat(column))
+    return pa.array(column)
+
+def encode_parquet(columns, row_group_rows=PARQUET_ROW_GROUP_ROWS):
+    """
+    Parquet file written one row group at a time (bytes are yielded after every group).
+    Timestamps are stored as logical TIMESTAMP columns (fileformat_parquet uses USE_LOGICAL_TYPE).
+    Requires `pyarrow`.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    names = list(columns)
+    n_rows = row_count(columns)
+    sink = _ChunkSink()
+    writer = None
+    for start in range(0, max(n_rows, 1), row_group_rows):
+        stop = min(start + row_group_rows, n_rows)
+        table = pa.table([_arrow_column(col[start:stop]) for col in columns.values()], names=names)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema, compression=PARQUET_COMPRESSION)
+        writer.write_table(table, row_group_size=row_group_rows)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "ndjson.gz": encode_ndjson_gzip,
+    "ndjson.zst": encode_ndjson_zstd,
+    "parquet": encode_parquet,
+    "json": encode_json_array,
+}
+
+def file_extension(file_format):
+    return FORMATS[file_format][0]
+
+def content_type(file_format):
+    return FORMATS[file_format][1]
+
+def encoder_for(columns, file_format=DEFAULT_FORMAT):
+    """
+    Returns a zero-argument callable producing the byte chunks of the file.
+    A callable (not a generator) is returned so that retries can re-encode from the start.
+    """
+    encode = ENCODERS[file_format]
+    return lambda: encode(columns)
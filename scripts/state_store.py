@@ -0,0 +1,104 @@
+import json
+import threading
+from common_logger import logger
+from storage_backends import LeaseConflict, PreconditionFailed
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+LEASE_DURATION = 60         # seconds (Blob Storage allows 15-60 or infinite)
+LEASE_RENEW_INTERVAL = 20   # seconds between background renewals
+
+
+class StateLocked(Exception):
+    """Raised when another generator run holds the state lease."""
+
+
+class StateStore:
+    """
+    Generator state document protected by a blob lease and ETag conditional writes.
+
+    While the store is open, the state blob is leased (and the lease renewed in the
+    background), so a second generator cannot write it. Every commit() is an
+    If-Match write on the ETag of the last read/write, so even a writer that lost
+    its lease can never overwrite a newer state.
+    """
+
+    def __init__(self, storage, path, initial_state, lease_duration=LEASE_DURATION,
+                 renew_interval=LEASE_RENEW_INTERVAL):
+        self.storage = storage
+        self.path = path
+        self.initial_state = initial_state
+        self.lease_duration = lease_duration
+        self.renew_interval = renew_interval
+
+        self.lease_id = None
+        self.etag = None
+        self._lock = threading.Lock()
+        self._stop_renewal = threading.Event()
+        self._renewal_thread = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        """Creates the state document if missing and takes the lease."""
+        try:
+            self.storage.upload_conditional(self.path, self._serialize(self.initial_state()), etag=None)
+            logger.info("State file not found. Created fresh state (seq=1).")
+        except (PreconditionFailed, LeaseConflict):
+            pass  # already exists (and possibly leased, see below)
+
+        try:
+            self.lease_id = self.storage.acquire_lease(self.path, self.lease_duration)
+        except LeaseConflict as e:
+            raise StateLocked(f"Generator state is locked by another run ({e})") from e
+
+        self._stop_renewal.clear()
+        self._renewal_thread = threading.Thread(target=self._renew_loop, name="state-lease", daemon=True)
+        self._renewal_thread.start()
+        logger.info(f"Acquired state lease on {self.storage.name}:{self.path}")
+
+    def close(self):
+        if self.lease_id is None:
+            return
+        self._stop_renewal.set()
+        self._renewal_thread.join()
+        try:
+            self.storage.release_lease(self.path, self.lease_id)
+        except Exception as e:
+            logger.warning(f"Failed to release state lease (expires in {self.lease_duration}s): {e}")
+        self.lease_id = None
+
+    def load(self):
+        """Reads the state document. Unreadable state is an error, never a silent reset."""
+        data, etag = self.storage.download_versioned(self.path)
+        state = json.loads(data)
+        with self._lock:
+            self.etag = etag
+        return state
+
+    def commit(self, state):
+        """Conditional write (If-Match last ETag, under the lease)."""
+        with self._lock:
+            self.etag = self.storage.upload_conditional(
+                self.path, self._serialize(state), etag=self.etag, lease_id=self.lease_id
+            )
+
+    def _renew_loop(self):
+        while not self._stop_renewal.wait(self.renew_interval):
+            try:
+                self.storage.renew_lease(self.path, self.lease_id)
+            except Exception as e:
+                # The next commit() fails on the lost lease / changed ETag
+                logger.error(f"CRITICAL: Failed to renew state lease: {e}")
+                return
+
+    @staticmethod
+    def _serialize(state):
+        return json.dumps(state, indent=2, default=str)
+
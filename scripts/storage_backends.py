@@ -0,0 +1,385 @@
+import os
+import json
+import time
+import uuid
+import base64
+import hashlib
+from pathlib import Path
+from common_logger import logger
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+STORAGE_ACCOUNT_NAME = os.getenv("AZURE_STORAGE_ACCOUNT")
+CONTAINER_NAME = os.getenv("AZURE_CONTAINER_NAME")
+
+# Set to use Azurite (or any account key / SAS connection) instead of DefaultAzureCredential
+CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+
+# Default root folder of the local-filesystem backend
+LOCAL_STORAGE_ROOT = os.getenv("LOCAL_STORAGE_ROOT", "local_storage")
+
+# Block size for streamed (chunked) block-blob uploads
+BLOCK_SIZE = 4 * 1024 * 1024
+
+# Polling interval while a server-side blob copy (move) is pending
+COPY_POLL_SECONDS = 0.5
+
+
+class BlobNotFound(Exception):
+    """Raised by every backend when the requested blob/file does not exist."""
+
+class PreconditionFailed(Exception):
+    """Raised when a conditional write loses against another writer (ETag mismatch / blob already exists)."""
+
+class LeaseConflict(Exception):
+    """Raised when a blob is leased by someone else or the lease was lost."""
+
+
+# ==========================================
+# AZURE BLOB STORAGE (Azure / Azurite)
+# ==========================================
+
+class AzureBlobBackend:
+    """Blob container backend. One client (and HTTP connection pool) is shared by all uploads."""
+
+    name = "azure"
+
+    def __init__(self, container_client):
+        self.container_client = container_client
+
+    def upload(self, path, data, content_type="application/json"):
+        from azure.storage.blob import ContentSettings
+
+        self.container_client.upload_blob(
+            path,
+            data,
+            overwrite=True,
+            content_settings=ContentSettings(content_type=content_type)
+        )
+
+    def upload_stream(self, path, chunks, content_type="application/json"):
+        """
+        Streams byte chunks into a block blob (stage_block + commit_block_list).
+        At most one BLOCK_SIZE buffer is held in memory. Returns the number of bytes written.
+        """
+        from azure.storage.blob import BlobBlock, ContentSettings
+
+        blob_client = self.container_client.get_blob_client(path)
+        block_ids = []
+        total_bytes = 0
+
+        def stage(buffer):
+            block_id = base64.b64encode(uuid.uuid4().hex.encode()).decode()
+            blob_client.stage_block(block_id, bytes(buffer))
+            block_ids.append(BlobBlock(block_id=block_id))
+
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+            total_bytes += len(chunk)
+            if len(buffer) >= BLOCK_SIZE:
+                stage(buffer)
+                buffer.clear()
+        if buffer or not block_ids:
+            stage(buffer)
+
+        blob_client.commit_block_list(block_ids, content_settings=ContentSettings(content_type=content_type))
+        return total_bytes
+
+    def download(self, path):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            return self.container_client.download_blob(path).readall()
+        except ResourceNotFoundError as e:
+            raise BlobNotFound(path) from e
+
+    def move(self, source, target):
+        """Server-side copy of `source` to `target` (same container), then deletes `source`."""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        source_client = self.container_client.get_blob_client(source)
+        target_client = self.container_client.get_blob_client(target)
+        try:
+            status = target_client.start_copy_from_url(source_client.url)["copy_status"]
+        except ResourceNotFoundError as e:
+            raise BlobNotFound(source) from e
+        while status == "pending":
+            time.sleep(COPY_POLL_SECONDS)
+            status = target_client.get_blob_properties().copy.status
+        if status != "success":
+            raise IOError(f"Copy of {source} to {target} ended with status '{status}'")
+        source_client.delete_blob()
+
+    def delete(self, path):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            self.container_client.delete_blob(path)
+        except ResourceNotFoundError as e:
+            raise BlobNotFound(path) from e
+
+    def download_versioned(self, path):
+        """Returns (data, etag)."""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            downloader = self.container_client.download_blob(path)
+            return downloader.readall(), downloader.properties.etag
+        except ResourceNotFoundError as e:
+            raise BlobNotFound(path) from e
+
+    def upload_conditional(self, path, data, etag=None, lease_id=None, content_type="application/json"):
+        """
+        Writes only if the blob still has `etag` (or does not exist yet when etag is None).
+        Returns the new ETag.
+        """
+        from azure.core import MatchConditions
+        from azure.core.exceptions import HttpResponseError, ResourceExistsError, ResourceModifiedError
+        from azure.storage.blob import ContentSettings
+
+        kwargs = {"content_settings": ContentSettings(content_type=content_type), "lease": lease_id}
+        if etag is None:
+            kwargs["overwrite"] = False
+        else:
+            kwargs.update(overwrite=True, etag=etag, match_condition=MatchConditions.IfNotModified)
+
+        try:
+            result = self.container_client.get_blob_client(path).upload_blob(data, **kwargs)
+        except (ResourceExistsError, ResourceModifiedError) as e:
+            raise PreconditionFailed(path) from e
+        except HttpResponseError as e:
+            if "Lease" in str(e.error_code):
+                raise LeaseConflict(f"{path}: {e.error_code}") from e
+            if e.status_code == 412:
+                raise PreconditionFailed(path) from e
+            raise
+        return result["etag"]
+
+    def acquire_lease(self, path, duration):
+        """Takes an exclusive write lease on an existing blob. Returns the lease id."""
+        from azure.core.exceptions import HttpResponseError
+
+        try:
+            return self.container_client.get_blob_client(path).acquire_lease(lease_duration=duration).id
+        except HttpResponseError as e:
+            if e.status_code == 409:
+                raise LeaseConflict(f"{path} is leased by another writer") from e
+            raise
+
+    def _lease_client(self, path, lease_id):
+        from azure.storage.blob import BlobLeaseClient
+
+        return BlobLeaseClient(self.container_client.get_blob_client(path), lease_id=lease_id)
+
+    def renew_lease(self, path, lease_id):
+        from azure.core.exceptions import HttpResponseError
+
+        try:
+            self._lease_client(path, lease_id).renew()
+        except HttpResponseError as e:
+            raise LeaseConflict(f"{path}: lease lost ({e.error_code})") from e
+
+    def release_lease(self, path, lease_id):
+        self._lease_client(path, lease_id).release()
+
+
+def _pooled_transport(pool_size):
+    """HTTP transport whose connection pool is large enough for `pool_size` parallel uploads."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from azure.core.pipeline.transport import RequestsTransport
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(session=session, session_owner=True)
+
+def create_azure_backend(pool_size=10):
+    """Connects to Azure Storage (managed identity / CLI login) or to Azurite when a connection string is set."""
+    from azure.storage.blob import BlobServiceClient
+
+    transport = _pooled_transport(pool_size)
+    if CONNECTION_STRING:
+        logger.info("Connecting to Blob Storage via connection string (Azurite/local)...")
+        service_client = BlobServiceClient.from_connection_string(CONNECTION_STRING, transport=transport)
+    else:
+        from azure.identity import DefaultAzureCredential
+
+        logger.info(f"Connecting to Azure Storage: {STORAGE_ACCOUNT_NAME}...")
+        account_url = f"https://{STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
+        service_client = BlobServiceClient(account_url=account_url, credential=DefaultAzureCredential(), transport=transport)
+
+    logger.info("Connected to Blob Storage!")
+    return AzureBlobBackend(service_client.get_container_client(CONTAINER_NAME))
+
+
+# ==========================================
+# LOCAL FILESYSTEM (offline runs & benchmarks)
+# ==========================================
+
+class _FileLock:
+    """Cross-process mutex: a lock file created with O_EXCL (portable, no fcntl)."""
+
+    def __init__(self, lock_file, timeout):
+        self.lock_file = lock_file
+        self.timeout = timeout
+
+    def __enter__(self):
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                os.close(os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not lock {self.lock_file}")
+                time.sleep(0.01)
+
+    def __exit__(self, exc_type, exc, tb):
+        os.remove(self.lock_file)
+
+class LocalFileBackend:
+    """
+    Writes blobs as files below `root`, using the blob path as relative file path.
+    ETags (content hashes) and leases (`<file>.lease` sidecars) are emulated, so the
+    state store behaves as on Blob Storage - also across processes.
+    """
+
+    name = "local"
+    LOCK_TIMEOUT = 10   # seconds to wait for the per-file lock
+
+    def __init__(self, root=LOCAL_STORAGE_ROOT):
+        self.root = Path(root)
+
+    def _file(self, path):
+        return self.root / path
+
+    @staticmethod
+    def _etag(data):
+        return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+    def _sidecar(self, path, suffix):
+        target = self._file(path)
+        return target.with_name(target.name + suffix)
+
+    def _locked(self, path):
+        return _FileLock(self._sidecar(path, ".lock"), self.LOCK_TIMEOUT)
+
+    def _active_lease(self, path):
+        lease_file = self._sidecar(path, ".lease")
+        try:
+            lease = json.loads(lease_file.read_text())
+        except FileNotFoundError:
+            return lease_file, None
+        if lease["expires_at"] < time.time():
+            return lease_file, None
+        return lease_file, lease
+
+    def upload(self, path, data, content_type="application/json"):
+        target = self._file(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file first, so readers never see a partial file
+        tmp = target.with_name(target.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        os.replace(tmp, target)
+
+    def upload_stream(self, path, chunks, content_type="application/json"):
+        """Writes byte chunks to the file as they are produced. Returns the number of bytes written."""
+        target = self._file(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        total_bytes = 0
+        tmp = target.with_name(target.name + ".tmp")
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                total_bytes += len(chunk)
+        os.replace(tmp, target)
+        return total_bytes
+
+    def download(self, path):
+        try:
+            return self._file(path).read_bytes()
+        except FileNotFoundError as e:
+            raise BlobNotFound(path) from e
+
+    def download_versioned(self, path):
+        """Returns (data, etag)."""
+        data = self.download(path)
+        return data, self._etag(data)
+
+    def move(self, source, target):
+        target_file = self._file(target)
+        target_file.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(self._file(source), target_file)
+        except FileNotFoundError as e:
+            raise BlobNotFound(source) from e
+
+    def delete(self, path):
+        try:
+            self._file(path).unlink()
+        except FileNotFoundError as e:
+            raise BlobNotFound(path) from e
+
+    def upload_conditional(self, path, data, etag=None, lease_id=None, content_type="application/json"):
+        """
+        Writes only if the file still has `etag` (or does not exist yet when etag is None).
+        Returns the new ETag.
+        """
+        data = data.encode("utf-8") if isinstance(data, str) else data
+        with self._locked(path):
+            _, lease = self._active_lease(path)
+            if lease is not None and lease["lease_id"] != lease_id:
+                raise LeaseConflict(f"{path} is leased by another writer")
+            try:
+                current_etag = self._etag(self._file(path).read_bytes())
+            except FileNotFoundError:
+                current_etag = None
+            if current_etag != etag:
+                raise PreconditionFailed(path)
+            self.upload(path, data, content_type=content_type)
+        return self._etag(data)
+
+    def acquire_lease(self, path, duration):
+        """Takes an exclusive write lease on an existing file. Returns the lease id."""
+        with self._locked(path):
+            if not self._file(path).exists():
+                raise BlobNotFound(path)
+            lease_file, lease = self._active_lease(path)
+            if lease is not None:
+                raise LeaseConflict(f"{path} is leased by another writer")
+            lease_id = str(uuid.uuid4())
+            lease_file.write_text(json.dumps({"lease_id": lease_id, "expires_at": time.time() + duration,
+                                              "duration": duration}))
+        return lease_id
+
+    def renew_lease(self, path, lease_id):
+        with self._locked(path):
+            lease_file, lease = self._active_lease(path)
+            if lease is None or lease["lease_id"] != lease_id:
+                raise LeaseConflict(f"{path}: lease lost")
+            lease["expires_at"] = time.time() + lease["duration"]
+            lease_file.write_text(json.dumps(lease))
+
+    def release_lease(self, path, lease_id):
+        with self._locked(path):
+            lease_file, lease = self._active_lease(path)
+            if lease is not None and lease["lease_id"] == lease_id:
+                lease_file.unlink()
+
+
+def create_backend(kind, local_root=LOCAL_STORAGE_ROOT, pool_size=10):
+    """Factory used by the scripts: 'azure' (Azure or Azurite) or 'local'."""
+    if kind == "azure":
+        return create_azure_backend(pool_size=pool_size)
+    if kind == "local":
+        logger.info(f"Using local filesystem storage: {os.path.abspath(local_root)}")
+        return LocalFileBackend(local_root)
+    raise ValueError(f"Unknown storage backend: {kind}")
@@ -0,0 +1,114 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from common_logger import logger, metrics, span
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+UPLOAD_WORKERS = 8          # parallel uploads (threads sharing one storage client)
+MAX_PENDING_UPLOADS = 32    # queued + running uploads before submit() blocks (backpressure)
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 0.5      # seconds, doubled on every attempt (full jitter)
+
+
+class UploadPipeline:
+    """
+    Uploads files on a bounded thread pool while the caller keeps generating data.
+
+    submit() returns immediately unless MAX_PENDING_UPLOADS uploads are already
+    in flight, in which case it blocks until a slot is free. Failed uploads are
+    retried with exponential backoff and jitter; the first permanent failure is
+    raised from the next submit() or from drain().
+    """
+
+    def __init__(self, backend, workers=UPLOAD_WORKERS, max_pending=MAX_PENDING_UPLOADS,
+                 max_retries=MAX_RETRIES, base_delay=RETRY_BASE_DELAY):
+        self.backend = backend
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = set()
+        self._lock = threading.Lock()
+        self._error = None
+
+        self.files_uploaded = 0
+        self.bytes_uploaded = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.drain()
+        self.close()
+
+    def submit(self, path, data, content_type="application/json"):
+        """
+        Queues an upload. Blocks while the pipeline is full.
+        The returned future resolves to {"path", "bytes"} of the uploaded file.
+        `data` is either bytes/str or a zero-argument callable returning an iterable of
+        byte chunks, which is then streamed by the upload thread (see raw_formats.encoder_for()).
+        str data is uploaded UTF-8 encoded, so "bytes" is the stored size.
+        """
+        self._raise_if_failed()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._upload_with_retry, path, data, content_type)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def drain(self):
+        """Waits for all queued uploads. Raises the first upload error."""
+        with self._lock:
+            pending = list(self._futures)
+        wait(pending)
+        self._raise_if_failed()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _on_done(self, future):
+        with self._lock:
+            self._futures.discard(future)
+            if not future.cancelled() and future.exception() is not None and self._error is None:
+                self._error = future.exception()
+        self._slots.release()
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise self._error
+
+    def _upload_with_retry(self, path, data, content_type):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with span("upload_file", detail=path) as s:
+                    if callable(data):
+                        size = self.backend.upload_stream(path, data(), content_type=content_type)
+                    else:
+                        self.backend.upload(path, data, content_type=content_type)
+                        size = len(data)
+                    s.count("bytes", size)
+                with self._lock:
+                    self.files_uploaded += 1
+                    self.bytes_uploaded += size
+                return {"path": path, "bytes": size}
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"CRITICAL: Upload failed for {path} after {attempt} attempts: {e}")
+                    raise
+                delay = random.uniform(0, self.base_delay * 2 ** (attempt - 1))
+                metrics.inc("upload_retries_total")
+                logger.warning(f"Upload of {path} failed (attempt {attempt}/{self.max_retries}): {e}. Retrying in {delay:.2f}s")
+                time.sleep(delay)
@@ -0,0 +1,117 @@
+import json
+import os
+import numpy as np
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+
+# Shape of the generated data. Every key can be overridden by a named profile or a JSON file;
+# the defaults reproduce the original generator (small catalog, uniform choices, EUR only).
+DEFAULT_PROFILE = {
+    "catalog_size": 18,                 # products: the fixed catalog, then generated SKUs
+    "catalog_seed": 0,                  # seed of the generated SKUs and of the popularity order (same in every run)
+    "product_skew": 0.0,                # Zipf exponent of product popularity (0 = uniform)
+    "returning_customer_share": 0.0,    # share of orders placed by customers of earlier batches / runs
+    "customer_skew": 0.0,               # Zipf exponent of returning-customer popularity (0 = uniform)
+    "hourly_weights": None,             # 24 relative order volumes per hour of day (None = any hour)
+    "weekday_factors": None,            # 7 volume factors, Monday first
+    "month_factors": None,              # 12 volume factors, January first
+    "peak_days": {},                    # {"MM-DD": volume factor}, e.g. sales events
+    "currencies": {"EUR": [1.0, 1.0]},  # currency: [share of orders, price factor vs. the EUR catalog price]
+}
+
+PROFILES = {
+    "default": {},
+    # Production-like shape: large catalog, hot products and customers, evening peaks,
+    # weekend and Q4 peaks, orders in three currencies
+    "production": {
+        "catalog_size": 5000,
+        "product_skew": 1.1,
+        "returning_customer_share": 0.6,
+        "customer_skew": 1.0,
+        "hourly_weights": [2, 1, 1, 1, 1, 2, 4, 6, 8, 9, 10, 11, 12, 11, 10, 10, 11, 13, 15, 16, 15, 12, 8, 4],
+        "weekday_factors": [0.9, 0.9, 0.95, 1.0, 1.1, 1.25, 1.2],
+        "month_factors": [0.85, 0.8, 0.9, 0.9, 0.95, 0.95, 0.9, 0.9, 1.0, 1.05, 1.4, 1.8],
+        "peak_days": {"11-28": 3.0, "11-29": 4.0, "12-02": 2.5},
+        "currencies": {"EUR": [0.6, 1.0], "USD": [0.3, 1.08], "GBP": [0.1, 0.85]},
+    },
+}
+
+# Generated SKUs: category -> (product types, brands, median EUR price)
+SKU_CATEGORIES = {
+    "Electronics": (["Headphones", "Monitor", "Laptop", "Speaker", "Camera", "Tablet", "Charger"],
+                    ["Sony", "Samsung", "LG", "Apple", "Logitech", "Anker", "Lenovo"], 180.0),
+    "Home": (["Lamp", "Blender", "Vacuum", "Kettle", "Pan Set", "Air Purifier"],
+             ["Dyson", "Philips", "Bosch", "Tefal", "IKEA"], 90.0),
+    "Sports": (["Running Shoes", "Yoga Mat", "Dumbbells", "Bike Helmet", "Backpack"],
+               ["Nike", "Adidas", "Puma", "Decathlon", "Under Armour"], 60.0),
+    "Fashion": (["Sunglasses", "Jacket", "Sneakers", "Watch", "Handbag"],
+                ["Ray-Ban", "Levi's", "Zara", "Casio", "Guess"], 75.0),
+    "Beauty": (["Perfume", "Face Cream", "Hair Dryer", "Shaver"],
+               ["L'Oreal", "Nivea", "Braun", "Chanel"], 40.0),
+    "Toys": (["Building Set", "Puzzle", "Board Game", "RC Car"],
+             ["LEGO", "Ravensburger", "Hasbro", "Mattel"], 35.0),
+}
+
+# ==========================================
+# PROFILES
+# ==========================================
+
+def load_profile(name_or_path):
+    """
+    Returns a complete profile: a name from PROFILES or the path of a JSON file with any
+    subset of the DEFAULT_PROFILE keys. Raises ValueError for unknown names / keys.
+    """
+    if name_or_path in PROFILES:
+        overrides = PROFILES[name_or_path]
+    elif os.path.isfile(name_or_path):
+        with open(name_or_path, encoding="utf-8") as f:
+            overrides = json.load(f)
+    else:
+        raise ValueError(f"Unknown workload profile '{name_or_path}' (built-in: {sorted(PROFILES)}, or a JSON file)")
+
+    unknown = set(overrides) - set(DEFAULT_PROFILE)
+    if unknown:
+        raise ValueError(f"Unknown workload profile keys: {sorted(unknown)}")
+    profile = dict(DEFAULT_PROFILE, **overrides)
+    for key, length in (("hourly_weights", 24), ("weekday_factors", 7), ("month_factors", 12)):
+        if profile[key] is not None and len(profile[key]) != length:
+            raise ValueError(f"Workload profile '{key}' needs {length} values")
+    if abs(sum(share for share, _ in profile["currencies"].values()) - 1) > 1e-6:
+        raise ValueError("Workload profile 'currencies' shares must add up to 1")
+    return profile
+
+def volume_factor(profile, day):
+    """Order volume of a day relative to the configured batch sizes (weekday x month x peak day)."""
+    factor = 1.0
+    if profile["weekday_factors"]:
+        factor *= profile["weekday_factors"][day.weekday()]
+    if profile["month_factors"]:
+        factor *= profile["month_factors"][day.month - 1]
+    return factor * profile["peak_days"].get(day.strftime("%m-%d"), 1.0)
+
+def product_catalog(profile, base_catalog):
+    """
+    (name, category, brand, price) tuples: `base_catalog`, extended with generated SKUs up to
+    `catalog_size`. The SKUs only depend on catalog_seed, so every run and worker sees the same catalog.
+    """
+    n_generated = profile["catalog_size"] - len(base_catalog)
+    if n_generated <= 0:
+        return list(base_catalog)
+
+    rng = np.random.default_rng([profile["catalog_seed"], 0])
+    categories = list(SKU_CATEGORIES)
+    category_idx = rng.integers(0, len(categories), n_generated)
+    type_draw = rng.integers(0, 1 << 30, n_generated)
+    brand_draw = rng.integers(0, 1 << 30, n_generated)
+    price_factor = rng.lognormal(0.0, 0.6, n_generated)
+
+    catalog = list(base_catalog)
+    for i in range(n_generated):
+        category = categories[category_idx[i]]
+        types, brands, median_price = SKU_CATEGORIES[category]
+        brand = brands[brand_draw[i] % len(brands)]
+        name = f"{brand} {types[type_draw[i] % len(types)]} SKU-{len(base_catalog) + i + 1:06d}"
+        catalog.append((name, category, brand, max(4.99, round(median_price * price_factor[i]) - 0.01)))
+    return catalog
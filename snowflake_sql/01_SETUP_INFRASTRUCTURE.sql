@@ -34,6 +34,9 @@ CREATE STORAGE INTEGRATION IF NOT EXISTS azure_adls_integration
 --DESC STORAGE INTEGRATION azure_adls_integration;
 
 GRANT USAGE ON INTEGRATION azure_adls_integration TO ROLE SYSADMIN;
+
+-- Scheduled maintenance tasks (COMMON.PURGE_ETL_LOGS_TASK, BRONZE.MAINTAIN_BRONZE_TASK) are owned by SYSADMIN
+GRANT EXECUTE TASK ON ACCOUNT TO ROLE SYSADMIN;
 USE ROLE SYSADMIN;
 
 
@@ -52,7 +55,7 @@ CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.ETL_LOGS (
     TARGET_TABLE        STRING,
     STEP_NAME           STRING,
     
-    STATUS              STRING      COMMENT 'START, SUCCESS, or FAIL',
+    STATUS              STRING      COMMENT 'START, SUCCESS, WARN or FAIL',
     MESSAGE             STRING,
     ERROR_CODE          STRING,
     ERROR_STACK         STRING,
@@ -72,9 +75,15 @@ CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.ETL_LOGS (
     CREATED_AT          TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
     CONSTRAINT PK_etl_logs PRIMARY KEY (LOG_ID)
 )
---CLUSTER BY (CREATED_AT, PIPELINE_RUN_ID)
+CLUSTER BY (TO_DATE(CREATED_AT), PIPELINE_RUN_ID)
+DATA_RETENTION_TIME_IN_DAYS = 1
 COMMENT = 'Centralized ETL logs. 1-day retention for cost savings.';
 
+-- Log queries filter on recent days and on one run. Rows older than the retention of
+-- COMMON.PURGE_ETL_LOGS are deleted by COMMON.PURGE_ETL_LOGS_TASK (see 02_REGISTER_PROCEDURES.sql).
+ALTER TABLE ECOMMERCE.COMMON.ETL_LOGS CLUSTER BY (TO_DATE(CREATED_AT), PIPELINE_RUN_ID);
+ALTER TABLE ECOMMERCE.COMMON.ETL_LOGS SET DATA_RETENTION_TIME_IN_DAYS = 1;
+
 
 
 CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.DQ_ERRORS (
@@ -103,20 +112,161 @@ CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG (
     TABLE_NAME      STRING      COMMENT 'Target table in Bronze',
     ADLS_PATH       STRING      COMMENT 'Source path in ADLS',
     IS_ACTIVE       BOOLEAN DEFAULT TRUE    COMMENT 'Enable/Disable Flag',
+    FILE_FORMAT     STRING DEFAULT 'ECOMMERCE.BRONZE.fileformat_ndjson'    COMMENT 'File format used by COPY INTO',
+    FILE_PATTERN    STRING      COMMENT 'Regex of files to load (NULL = all files in ADLS_PATH)',
+    LOAD_STRATEGY   STRING DEFAULT 'MANIFEST'    COMMENT 'MANIFEST (files of new run manifests) or PREFIX (COPY scan of ADLS_PATH)',
+    MAX_CONCURRENCY NUMBER DEFAULT 4    COMMENT 'Bronze tables loaded in parallel (lowest value of the active rows is used)',
+    TYPED_COLUMNS   STRING      COMMENT 'Payload fields projected into typed Bronze columns at COPY (<column>:<type>,...)',
+    FILE_RETENTION_DAYS   NUMBER                    COMMENT 'Loaded source files older than this are archived / purged (NULL = keep)',
+    FILE_RETENTION_ACTION STRING DEFAULT 'ARCHIVE'  COMMENT 'ARCHIVE (move below _archive/) or PURGE (delete) loaded source files',
+    ROW_RETENTION_DAYS    NUMBER                    COMMENT 'Bronze rows consumed by Silver and older than this are pruned (NULL = keep)',
+    ROW_RETENTION_ACTION  STRING DEFAULT 'COMPACT'  COMMENT 'COMPACT (keep the latest version per key) or DELETE (all pruned rows)',
     CREATED_AT      TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
 )
 COMMENT = 'Config table for dynamic Bronze ingestion loop.';
 
-INSERT INTO ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG (TABLE_NAME, ADLS_PATH) 
-VALUES 
-('orders', 'orders_raw/'),
-('order_items', 'order_items_raw/'),
-('order_status_history', 'order_status_history_raw/'),
-('payments', 'payments_raw/'),
-('shipments', 'shipments_raw/'),
-('products', 'products_raw/'),
-('customers', 'customers_raw/'),
-('addresses', 'addresses_raw/');
+-- Upgrade of existing deployments
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    FILE_FORMAT STRING DEFAULT 'ECOMMERCE.BRONZE.fileformat_ndjson' COMMENT 'File format used by COPY INTO';
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    FILE_PATTERN STRING COMMENT 'Regex of files to load (NULL = all files in ADLS_PATH)';
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    LOAD_STRATEGY STRING DEFAULT 'MANIFEST' COMMENT 'MANIFEST (files of new run manifests) or PREFIX (COPY scan of ADLS_PATH)';
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    MAX_CONCURRENCY NUMBER DEFAULT 4 COMMENT 'Bronze tables loaded in parallel (lowest value of the active rows is used)';
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    TYPED_COLUMNS STRING COMMENT 'Payload fields projected into typed Bronze columns at COPY (<column>:<type>,...)';
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    FILE_RETENTION_DAYS NUMBER COMMENT 'Loaded source files older than this are archived / purged (NULL = keep)';
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    FILE_RETENTION_ACTION STRING DEFAULT 'ARCHIVE' COMMENT 'ARCHIVE (move below _archive/) or PURGE (delete) loaded source files';
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    ROW_RETENTION_DAYS NUMBER COMMENT 'Bronze rows consumed by Silver and older than this are pruned (NULL = keep)';
+ALTER TABLE ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG ADD COLUMN IF NOT EXISTS
+    ROW_RETENTION_ACTION STRING DEFAULT 'COMPACT' COMMENT 'COMPACT (keep the latest version per key) or DELETE (all pruned rows)';
+
+-- Remove duplicated entries left by earlier (INSERT based) deployments
+DELETE FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+WHERE CONFIG_ID NOT IN (
+    SELECT MIN(CONFIG_ID) FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG GROUP BY TABLE_NAME
+);
+
+-- Idempotent seed (IS_ACTIVE is left untouched on existing entries)
+-- Per-table format selection: the generator writes ndjson / ndjson.gz / ndjson.zst / parquet
+-- (see --format and --table-format); switch FILE_FORMAT and FILE_PATTERN together, e.g.
+-- ('orders', 'orders_raw/', 'ECOMMERCE.BRONZE.fileformat_parquet', '.*[.]parquet')
+-- TYPED_COLUMNS must exist on the Bronze table (see "Typed columns" in the BRONZE SCHEMA section).
+-- Retention (FILE_RETENTION_*, ROW_RETENTION_*) is not part of the seed and is off by default (NULL days = keep):
+-- enable it per table with UPDATE, e.g. SET ROW_RETENTION_DAYS = 30, FILE_RETENTION_DAYS = 30 WHERE TABLE_NAME = 'orders'.
+-- ROW_RETENTION_ACTION = 'COMPACT' uses the first TYPED_COLUMNS entry as key and the second as version.
+MERGE INTO ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG c
+USING (
+    SELECT column1 AS TABLE_NAME, column2 AS ADLS_PATH, column3 AS FILE_FORMAT, column4 AS FILE_PATTERN,
+           column5 AS LOAD_STRATEGY, column6 AS TYPED_COLUMNS
+    FROM VALUES
+    ('orders', 'orders_raw/', 'ECOMMERCE.BRONZE.fileformat_ndjson', '.*[.]ndjson([.](gz|zst))?', 'MANIFEST', 'order_id:NUMBER,updated_at:TIMESTAMP_NTZ'),
+    ('order_items', 'order_items_raw/', 'ECOMMERCE.BRONZE.fileformat_ndjson', '.*[.]ndjson([.](gz|zst))?', 'MANIFEST', 'order_item_id:NUMBER'),
+    ('order_status_history', 'order_status_history_raw/', 'ECOMMERCE.BRONZE.fileformat_ndjson', '.*[.]ndjson([.](gz|zst))?', 'MANIFEST', 'status_history_id:NUMBER,changed_at:TIMESTAMP_NTZ'),
+    ('payments', 'payments_raw/', 'ECOMMERCE.BRONZE.fileformat_ndjson', '.*[.]ndjson([.](gz|zst))?', 'MANIFEST', 'payment_id:NUMBER,updated_at:TIMESTAMP_NTZ'),
+    ('shipments', 'shipments_raw/', 'ECOMMERCE.BRONZE.fileformat_ndjson', '.*[.]ndjson([.](gz|zst))?', 'MANIFEST', 'shipment_id:NUMBER,updated_at:TIMESTAMP_NTZ'),
+    ('products', 'products_raw/', 'ECOMMERCE.BRONZE.fileformat_ndjson', '.*[.]ndjson([.](gz|zst))?', 'MANIFEST', 'product_id:NUMBER,updated_at:TIMESTAMP_NTZ'),
+    ('customers', 'customers_raw/', 'ECOMMERCE.BRONZE.fileformat_ndjson', '.*[.]ndjson([.](gz|zst))?', 'MANIFEST', 'customer_id:NUMBER,updated_at:TIMESTAMP_NTZ'),
+    ('addresses', 'addresses_raw/', 'ECOMMERCE.BRONZE.fileformat_ndjson', '.*[.]ndjson([.](gz|zst))?', 'MANIFEST', 'address_id:NUMBER,updated_at:TIMESTAMP_NTZ')
+) s
+ON c.TABLE_NAME = s.TABLE_NAME
+WHEN MATCHED THEN UPDATE SET
+    c.ADLS_PATH = s.ADLS_PATH,
+    c.FILE_FORMAT = s.FILE_FORMAT,
+    c.FILE_PATTERN = s.FILE_PATTERN,
+    c.LOAD_STRATEGY = s.LOAD_STRATEGY,
+    c.TYPED_COLUMNS = s.TYPED_COLUMNS
+WHEN NOT MATCHED THEN
+    INSERT (TABLE_NAME, ADLS_PATH, FILE_FORMAT, FILE_PATTERN, LOAD_STRATEGY, TYPED_COLUMNS)
+    VALUES (s.TABLE_NAME, s.ADLS_PATH, s.FILE_FORMAT, s.FILE_PATTERN, s.LOAD_STRATEGY, s.TYPED_COLUMNS);
+
+
+-- Files announced by generator run manifests (ADLS: data/_manifests/yyyy/mm/dd/run_<run_id>.ndjson).
+-- LOAD_STRATEGY = 'MANIFEST' copies exactly the pending files listed here instead of scanning ADLS_PATH.
+-- Manifest files are never deleted, so a run can be replayed from ADLS.
+CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.INGESTION_MANIFEST (
+    MANIFEST_ID     NUMBER AUTOINCREMENT,
+    MANIFEST_FILE   STRING      COMMENT 'Run manifest the entry was registered from',
+    RUN_ID          STRING      COMMENT 'Generator run ID',
+    TABLE_NAME      STRING      COMMENT 'Target table in Bronze',
+    FILE_PATH       STRING      COMMENT 'File path relative to the stage root',
+    FILE_BYTES      NUMBER,
+    FILE_FORMAT     STRING      COMMENT 'Format written by the generator (ndjson, parquet, ...)',
+    BATCH_NO        NUMBER      COMMENT 'Generator batch (0 = product catalog)',
+    REGISTERED_AT   TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    LOAD_RUN_ID     STRING      COMMENT 'Pipeline run of the last load attempt',
+    LOADED_AT       TIMESTAMP_NTZ   COMMENT 'NULL = pending for LOAD_BRONZE_MASTER',
+    ATTEMPTS        NUMBER      DEFAULT 0 COMMENT 'Load attempts; pending files are retried up to MAX_LOAD_ATTEMPTS',
+    LAST_STATUS     STRING      COMMENT 'COPY status of the last attempt (LOADED, PARTIALLY_LOADED, LOAD_FAILED, NOT_REPORTED)',
+    LAST_ERROR      STRING      COMMENT 'First error reported by the COPY for the file',
+    FILE_ACTION     STRING      COMMENT 'ARCHIVE / PURGE applied by scripts/bronze_maintenance.py',
+    FILE_ACTION_AT  TIMESTAMP_NTZ   COMMENT 'NULL = source file still in place',
+    CONSTRAINT PK_ingestion_manifest PRIMARY KEY (MANIFEST_ID)
+)
+COMMENT = 'Raw files published by the generator and their Bronze load status.';
+
+ALTER TABLE ECOMMERCE.COMMON.INGESTION_MANIFEST ADD COLUMN IF NOT EXISTS
+    FILE_ACTION STRING COMMENT 'ARCHIVE / PURGE applied by scripts/bronze_maintenance.py';
+ALTER TABLE ECOMMERCE.COMMON.INGESTION_MANIFEST ADD COLUMN IF NOT EXISTS
+    FILE_ACTION_AT TIMESTAMP_NTZ COMMENT 'NULL = source file still in place';
+ALTER TABLE ECOMMERCE.COMMON.INGESTION_MANIFEST ADD COLUMN IF NOT EXISTS
+    ATTEMPTS NUMBER DEFAULT 0 COMMENT 'Load attempts; pending files are retried up to MAX_LOAD_ATTEMPTS';
+ALTER TABLE ECOMMERCE.COMMON.INGESTION_MANIFEST ADD COLUMN IF NOT EXISTS
+    LAST_STATUS STRING COMMENT 'COPY status of the last attempt (LOADED, PARTIALLY_LOADED, LOAD_FAILED, NOT_REPORTED)';
+ALTER TABLE ECOMMERCE.COMMON.INGESTION_MANIFEST ADD COLUMN IF NOT EXISTS
+    LAST_ERROR STRING COMMENT 'First error reported by the COPY for the file';
+
+
+-- Files loaded by LOAD_STRATEGY = 'PREFIX' (no manifest entry), written by LOAD_BRONZE_TABLE.
+-- scripts/bronze_maintenance.py archives / purges them by LOADED_AT. Unlike ETL_LOGS, this table
+-- is never purged, so file retention does not depend on the log retention.
+CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.BRONZE_FILE_LEDGER (
+    TABLE_NAME      STRING      COMMENT 'Target table in Bronze',
+    FILE_NAME       STRING      COMMENT 'File as reported by COPY INTO (stage URL)',
+    LOAD_RUN_ID     STRING      COMMENT 'Pipeline run which loaded the file',
+    LOADED_AT       TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    FILE_ACTION     STRING      COMMENT 'ARCHIVE / PURGE applied by scripts/bronze_maintenance.py',
+    FILE_ACTION_AT  TIMESTAMP_NTZ   COMMENT 'NULL = source file still in place'
+)
+COMMENT = 'Source files loaded without a manifest and their retention status.';
+
+-- One-off: PREFIX loads logged before the ledger existed (ETL_LOGS processed_files)
+INSERT INTO ECOMMERCE.COMMON.BRONZE_FILE_LEDGER (TABLE_NAME, FILE_NAME, LOAD_RUN_ID, LOADED_AT)
+SELECT LOWER(l.TARGET_TABLE), f.VALUE::STRING, ANY_VALUE(l.PIPELINE_RUN_ID), MIN(l.CREATED_AT)
+FROM ECOMMERCE.COMMON.ETL_LOGS l, LATERAL FLATTEN(INPUT => l.ADDITIONAL_INFO:processed_files) f
+WHERE l.LAYER = 'BRONZE' AND l.PROCESS_NAME = 'LOAD_BRONZE' AND l.STEP_NAME = 'COPY' AND l.STATUS = 'SUCCESS'
+  AND l.ADDITIONAL_INFO:load_strategy::STRING = 'INGEST_COPY'
+  AND NOT EXISTS (
+      SELECT 1 FROM ECOMMERCE.COMMON.BRONZE_FILE_LEDGER b
+      WHERE b.TABLE_NAME = LOWER(l.TARGET_TABLE) AND b.FILE_NAME = f.VALUE::STRING
+  )
+GROUP BY LOWER(l.TARGET_TABLE), f.VALUE::STRING;
+
+
+-- Written by scripts/deploy_snowflake.py: statements whose hash is unchanged are skipped on the next deploy.
+CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.DEPLOY_LEDGER (
+    STATEMENT_KEY   STRING      COMMENT 'Deployed object (e.g. PROCEDURE ECOMMERCE.BRONZE.LOAD_BRONZE_MASTER) or statement hash',
+    STATEMENT_HASH  STRING      COMMENT 'SHA-256 of the statement after placeholder substitution (incl. role context)',
+    SOURCE_FILE     STRING,
+    DEPLOYED_AT     TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    DEPLOYED_BY     STRING DEFAULT CURRENT_USER(),
+    CONSTRAINT PK_deploy_ledger PRIMARY KEY (STATEMENT_KEY)
+)
+COMMENT = 'Content hashes of the deployed SQL statements (incremental deployment).';
+
+
+-- BACKFILL runs of the Silver/Gold procedures read the whole source table instead of its stream.
+-- They advance the stream with an INSERT ... SELECT FROM <stream> WHERE FALSE into this table,
+-- so the next incremental run starts after the backfilled rows. It never holds any rows.
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.COMMON.STREAM_OFFSET_SINK (
+    stream_name     STRING
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Target of the no-op inserts that advance stream offsets after a backfill.';
 
 
 
@@ -128,6 +278,18 @@ CREATE FILE FORMAT IF NOT EXISTS ECOMMERCE.BRONZE.fileformat_json
     TYPE = JSON
     STRIP_OUTER_ARRAY = TRUE;
 
+-- Compact newline-delimited JSON written by the generator (one object per line)
+CREATE FILE FORMAT IF NOT EXISTS ECOMMERCE.BRONZE.fileformat_ndjson
+    TYPE = JSON
+    STRIP_OUTER_ARRAY = FALSE
+    COMPRESSION = AUTO;    -- plain, gzip (.gz) and zstd (.zst)
+
+-- Columnar raw files; timestamps are written as Parquet logical TIMESTAMP types
+CREATE FILE FORMAT IF NOT EXISTS ECOMMERCE.BRONZE.fileformat_parquet
+    TYPE = PARQUET
+    USE_LOGICAL_TYPE = TRUE
+    BINARY_AS_TEXT = FALSE;
+
 CREATE STAGE IF NOT EXISTS ECOMMERCE.BRONZE.adls_stage
     URL = '__STORAGE_URL__data/'
     STORAGE_INTEGRATION = azure_adls_integration
@@ -247,6 +409,25 @@ ON TABLE ECOMMERCE.BRONZE.addresses
 APPEND_ONLY = TRUE
 COMMENT = 'CDC stream for new inserts.';
 
+-- Typed columns (BRONZE_INGESTION_CONFIG.TYPED_COLUMNS), projected from the payload by COPY INTO.
+-- Silver procedures deduplicate on these instead of re-parsing the payload; payload stays for lineage.
+-- NULL for rows loaded before the columns existed.
+ALTER TABLE ECOMMERCE.BRONZE.orders ADD COLUMN IF NOT EXISTS order_id NUMBER;
+ALTER TABLE ECOMMERCE.BRONZE.orders ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP_NTZ;
+ALTER TABLE ECOMMERCE.BRONZE.order_items ADD COLUMN IF NOT EXISTS order_item_id NUMBER;
+ALTER TABLE ECOMMERCE.BRONZE.order_status_history ADD COLUMN IF NOT EXISTS status_history_id NUMBER;
+ALTER TABLE ECOMMERCE.BRONZE.order_status_history ADD COLUMN IF NOT EXISTS changed_at TIMESTAMP_NTZ;
+ALTER TABLE ECOMMERCE.BRONZE.payments ADD COLUMN IF NOT EXISTS payment_id NUMBER;
+ALTER TABLE ECOMMERCE.BRONZE.payments ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP_NTZ;
+ALTER TABLE ECOMMERCE.BRONZE.shipments ADD COLUMN IF NOT EXISTS shipment_id NUMBER;
+ALTER TABLE ECOMMERCE.BRONZE.shipments ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP_NTZ;
+ALTER TABLE ECOMMERCE.BRONZE.products ADD COLUMN IF NOT EXISTS product_id NUMBER;
+ALTER TABLE ECOMMERCE.BRONZE.products ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP_NTZ;
+ALTER TABLE ECOMMERCE.BRONZE.customers ADD COLUMN IF NOT EXISTS customer_id NUMBER;
+ALTER TABLE ECOMMERCE.BRONZE.customers ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP_NTZ;
+ALTER TABLE ECOMMERCE.BRONZE.addresses ADD COLUMN IF NOT EXISTS address_id NUMBER;
+ALTER TABLE ECOMMERCE.BRONZE.addresses ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP_NTZ;
+
 
 
 
@@ -440,6 +621,280 @@ CREATE STREAM IF NOT EXISTS ECOMMERCE.SILVER.addresses_stream
 ON TABLE ECOMMERCE.SILVER.addresses;
 
 
+-- SILVER DQ STAGES
+-- Silver procedures read their Bronze stream once (SILVER.STAGE_DQ_ROWS): failed rows go to COMMON.DQ_ERRORS,
+-- valid typed rows land here and feed the MERGE. Rows are deleted again in the same transaction.
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.SILVER.orders_dq_stage (
+    run_id                STRING          COMMENT 'Pipeline run which staged the row',
+    order_id              NUMBER,
+    customer_id           NUMBER,
+    order_status          STRING,
+    order_total_amount    NUMBER(18,2),
+    currency              STRING,
+    created_at            TIMESTAMP_NTZ,
+    create_date           DATE,
+    updated_at            TIMESTAMP_NTZ,
+    hash_value            STRING,
+    source_file           STRING,
+    ingestion_ts          TIMESTAMP_NTZ   COMMENT 'Bronze ingestion time (deduplication)'
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Validated, typed rows of BRONZE.orders_stream for the current LOAD_ORDERS run (emptied on commit).';
+
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.SILVER.order_items_dq_stage (
+    run_id           STRING          COMMENT 'Pipeline run which staged the row',
+    order_item_id    NUMBER,
+    order_id         NUMBER,
+    product_id       NUMBER,
+    quantity         NUMBER,
+    unit_price       NUMBER(18,2),
+    created_at       TIMESTAMP_NTZ,
+    create_date      DATE,
+    hash_value       STRING,
+    source_file      STRING,
+    ingestion_ts     TIMESTAMP_NTZ   COMMENT 'Bronze ingestion time (deduplication)'
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Validated, typed rows of BRONZE.order_items_stream for the current LOAD_ORDER_ITEMS run (emptied on commit).';
+
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.SILVER.order_status_history_dq_stage (
+    run_id               STRING          COMMENT 'Pipeline run which staged the row',
+    status_history_id    NUMBER,
+    order_id             NUMBER,
+    status               STRING,
+    changed_at           TIMESTAMP_NTZ,
+    source_file          STRING,
+    ingestion_ts         TIMESTAMP_NTZ   COMMENT 'Bronze ingestion time (deduplication)'
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Validated, typed rows of BRONZE.order_status_history_stream for the current LOAD_ORDER_STATUS_HISTORY run (emptied on commit).';
+
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.SILVER.payments_dq_stage (
+    run_id            STRING          COMMENT 'Pipeline run which staged the row',
+    payment_id        NUMBER,
+    order_id          NUMBER,
+    provider          STRING,
+    payment_status    STRING,
+    amount            NUMBER(18,2),
+    created_at        TIMESTAMP_NTZ,
+    create_date       DATE,
+    updated_at        TIMESTAMP_NTZ,
+    hash_value        STRING,
+    source_file       STRING,
+    ingestion_ts      TIMESTAMP_NTZ   COMMENT 'Bronze ingestion time (deduplication)'
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Validated, typed rows of BRONZE.payments_stream for the current LOAD_PAYMENTS run (emptied on commit).';
+
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.SILVER.shipments_dq_stage (
+    run_id             STRING          COMMENT 'Pipeline run which staged the row',
+    shipment_id        NUMBER,
+    order_id           NUMBER,
+    carrier            STRING,
+    shipment_status    STRING,
+    shipped_at         TIMESTAMP_NTZ,
+    ship_date          DATE,
+    delivered_at       TIMESTAMP_NTZ,
+    delivery_date      DATE,
+    updated_at         TIMESTAMP_NTZ,
+    hash_value         STRING,
+    source_file        STRING,
+    ingestion_ts       TIMESTAMP_NTZ   COMMENT 'Bronze ingestion time (deduplication)'
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Validated, typed rows of BRONZE.shipments_stream for the current LOAD_SHIPMENTS run (emptied on commit).';
+
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.SILVER.products_dq_stage (
+    run_id          STRING          COMMENT 'Pipeline run which staged the row',
+    product_id      NUMBER,
+    name            STRING,
+    category        STRING,
+    brand           STRING,
+    price           NUMBER(18,2),
+    currency        STRING,
+    status          STRING,
+    created_at      TIMESTAMP_NTZ,
+    create_date     DATE,
+    updated_at      TIMESTAMP_NTZ,
+    hash_value      STRING,
+    source_file     STRING,
+    ingestion_ts    TIMESTAMP_NTZ   COMMENT 'Bronze ingestion time (deduplication)'
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Validated, typed rows of BRONZE.products_stream for the current LOAD_PRODUCTS run (emptied on commit).';
+
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.SILVER.customers_dq_stage (
+    run_id          STRING          COMMENT 'Pipeline run which staged the row',
+    customer_id     NUMBER,
+    email           STRING,
+    first_name      STRING,
+    last_name       STRING,
+    phone           STRING,
+    status          STRING,
+    created_at      TIMESTAMP_NTZ,
+    create_date     DATE,
+    updated_at      TIMESTAMP_NTZ,
+    hash_value      STRING,
+    source_file     STRING,
+    ingestion_ts    TIMESTAMP_NTZ   COMMENT 'Bronze ingestion time (deduplication)'
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Validated, typed rows of BRONZE.customers_stream for the current LOAD_CUSTOMERS run (emptied on commit).';
+
+CREATE TRANSIENT TABLE IF NOT EXISTS ECOMMERCE.SILVER.addresses_dq_stage (
+    run_id          STRING          COMMENT 'Pipeline run which staged the row',
+    address_id      NUMBER,
+    customer_id     NUMBER,
+    type            STRING,
+    street          STRING,
+    city            STRING,
+    postal_code     STRING,
+    country         STRING,
+    is_default      BOOLEAN,
+    created_at      TIMESTAMP_NTZ,
+    create_date     DATE,
+    updated_at      TIMESTAMP_NTZ,
+    hash_value      STRING,
+    source_file     STRING,
+    ingestion_ts    TIMESTAMP_NTZ   COMMENT 'Bronze ingestion time (deduplication)'
+)
+DATA_RETENTION_TIME_IN_DAYS = 0
+COMMENT = 'Validated, typed rows of BRONZE.addresses_stream for the current LOAD_ADDRESSES run (emptied on commit).';
+
+
+-- SILVER DQ RULES
+-- Read by SILVER.STAGE_DQ_ROWS, which builds the single-pass INSERT ALL of every Silver procedure:
+-- DQ_COLUMNS is the typed projection of a Bronze row into the <table>_dq_stage columns (the first
+-- column is the business key reported in DQ_ERRORS), DQ_RULES the validation predicates over those
+-- columns (lowest RULE_ORDER of the failing rules wins). Both are replaced on deploy: change a rule here.
+CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.DQ_COLUMNS (
+    TARGET_TABLE    STRING      COMMENT 'Silver table (Bronze stream <table>_stream, stage <table>_dq_stage)',
+    COLUMN_ORDER    NUMBER      COMMENT '1 = business key',
+    COLUMN_NAME     STRING      COMMENT 'Column of the DQ stage',
+    EXPRESSION      STRING      COMMENT 'SQL over the Bronze row (payload and typed Bronze columns)'
+)
+COMMENT = 'Typed projection of Bronze rows into the Silver DQ stages.';
+
+CREATE TABLE IF NOT EXISTS ECOMMERCE.COMMON.DQ_RULES (
+    TARGET_TABLE    STRING      COMMENT 'Silver table',
+    RULE_ORDER      NUMBER      COMMENT 'Evaluation order: a row fails with the first matching rule',
+    RULE_CODE       STRING      COMMENT 'DQ_ERRORS.ERROR_TYPE',
+    PREDICATE       STRING      COMMENT 'SQL over the DQ_COLUMNS of the table; TRUE = row fails'
+)
+COMMENT = 'Validation rules of the Silver procedures.';
+
+INSERT OVERWRITE INTO ECOMMERCE.COMMON.DQ_COLUMNS (TARGET_TABLE, COLUMN_ORDER, COLUMN_NAME, EXPRESSION)
+SELECT column1, column2, column3, column4
+FROM VALUES
+    ('orders', 1, 'order_id',                        $$NVL(order_id, payload:order_id::NUMBER)$$),
+    ('orders', 2, 'customer_id',                     $$payload:customer_id::NUMBER$$),
+    ('orders', 3, 'order_status',                    $$payload:order_status::STRING$$),
+    ('orders', 4, 'order_total_amount',              $$payload:order_total_amount::NUMBER(18,2)$$),
+    ('orders', 5, 'currency',                        $$payload:currency::STRING$$),
+    ('orders', 6, 'created_at',                      $$payload:created_at::TIMESTAMP_NTZ$$),
+    ('orders', 7, 'create_date',                     $$CAST(payload:created_at::TIMESTAMP_NTZ AS DATE)$$),
+    ('orders', 8, 'updated_at',                      $$NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ)$$),
+    ('orders', 9, 'hash_value',                      $$SHA2_HEX(CONCAT_WS('|', COALESCE(payload:order_status::STRING, ''), COALESCE(payload:order_total_amount::STRING, '0'), COALESCE(payload:currency::STRING, '')))$$),
+    ('order_items', 1, 'order_item_id',              $$NVL(order_item_id, payload:order_item_id::NUMBER)$$),
+    ('order_items', 2, 'order_id',                   $$payload:order_id::NUMBER$$),
+    ('order_items', 3, 'product_id',                 $$payload:product_id::NUMBER$$),
+    ('order_items', 4, 'quantity',                   $$payload:quantity::NUMBER$$),
+    ('order_items', 5, 'unit_price',                 $$payload:unit_price::NUMBER(18,2)$$),
+    ('order_items', 6, 'created_at',                 $$payload:created_at::TIMESTAMP_NTZ$$),
+    ('order_items', 7, 'create_date',                $$CAST(payload:created_at::TIMESTAMP_NTZ AS DATE)$$),
+    ('order_items', 8, 'hash_value',                 $$SHA2_HEX(CONCAT_WS('|', COALESCE(payload:product_id::STRING, ''), COALESCE(payload:quantity::STRING, ''), COALESCE(payload:unit_price::STRING, '')))$$),
+    ('order_status_history', 1, 'status_history_id', $$NVL(status_history_id, payload:status_history_id::NUMBER)$$),
+    ('order_status_history', 2, 'order_id',          $$payload:order_id::NUMBER$$),
+    ('order_status_history', 3, 'status',            $$payload:status::STRING$$),
+    ('order_status_history', 4, 'changed_at',        $$NVL(changed_at, payload:changed_at::TIMESTAMP_NTZ)$$),
+    ('payments', 1, 'payment_id',                    $$NVL(payment_id, payload:payment_id::NUMBER)$$),
+    ('payments', 2, 'order_id',                      $$payload:order_id::NUMBER$$),
+    ('payments', 3, 'provider',                      $$payload:provider::STRING$$),
+    ('payments', 4, 'payment_status',                $$payload:payment_status::STRING$$),
+    ('payments', 5, 'amount',                        $$payload:amount::NUMBER(18,2)$$),
+    ('payments', 6, 'created_at',                    $$payload:created_at::TIMESTAMP_NTZ$$),
+    ('payments', 7, 'create_date',                   $$CAST(payload:created_at::TIMESTAMP_NTZ AS DATE)$$),
+    ('payments', 8, 'updated_at',                    $$NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ)$$),
+    ('payments', 9, 'hash_value',                    $$SHA2_HEX(CONCAT_WS('|', COALESCE(payload:provider::STRING, ''), COALESCE(payload:payment_status::STRING, ''), COALESCE(payload:amount::STRING, '')))$$),
+    ('shipments', 1, 'shipment_id',                  $$NVL(shipment_id, payload:shipment_id::NUMBER)$$),
+    ('shipments', 2, 'order_id',                     $$payload:order_id::NUMBER$$),
+    ('shipments', 3, 'carrier',                      $$payload:carrier::STRING$$),
+    ('shipments', 4, 'shipment_status',              $$payload:shipment_status::STRING$$),
+    ('shipments', 5, 'shipped_at',                   $$payload:shipped_at::TIMESTAMP_NTZ$$),
+    ('shipments', 6, 'ship_date',                    $$CAST(payload:shipped_at::TIMESTAMP_NTZ AS DATE)$$),
+    ('shipments', 7, 'delivered_at',                 $$payload:delivered_at::TIMESTAMP_NTZ$$),
+    ('shipments', 8, 'delivery_date',                $$CAST(payload:delivered_at::TIMESTAMP_NTZ AS DATE)$$),
+    ('shipments', 9, 'updated_at',                   $$NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ)$$),
+    ('shipments', 10, 'hash_value',                  $$SHA2_HEX(CONCAT_WS('|', COALESCE(payload:carrier::STRING, ''), COALESCE(payload:shipment_status::STRING, ''), COALESCE(payload:shipped_at::TIMESTAMP_NTZ::STRING, '1900-01-01'), COALESCE(payload:delivered_at::TIMESTAMP_NTZ::STRING, '1900-01-01')))$$),
+    ('products', 1, 'product_id',                    $$NVL(product_id, payload:product_id::NUMBER)$$),
+    ('products', 2, 'name',                          $$payload:name::STRING$$),
+    ('products', 3, 'category',                      $$payload:category::STRING$$),
+    ('products', 4, 'brand',                         $$payload:brand::STRING$$),
+    ('products', 5, 'price',                         $$payload:price::NUMBER(18,2)$$),
+    ('products', 6, 'currency',                      $$payload:currency::STRING$$),
+    ('products', 7, 'status',                        $$payload:status::STRING$$),
+    ('products', 8, 'created_at',                    $$payload:created_at::TIMESTAMP_NTZ$$),
+    ('products', 9, 'create_date',                   $$CAST(payload:created_at::TIMESTAMP_NTZ AS DATE)$$),
+    ('products', 10, 'updated_at',                   $$NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ)$$),
+    ('products', 11, 'hash_value',                   $$SHA2_HEX(CONCAT_WS('|', COALESCE(payload:name::STRING, ''), COALESCE(payload:category::STRING, ''), COALESCE(payload:brand::STRING, ''), COALESCE(payload:price::STRING, '0'), COALESCE(payload:currency::STRING, ''), COALESCE(payload:status::STRING, '')))$$),
+    ('customers', 1, 'customer_id',                  $$NVL(customer_id, payload:customer_id::NUMBER)$$),
+    ('customers', 2, 'email',                        $$payload:email::STRING$$),
+    ('customers', 3, 'first_name',                   $$payload:first_name::STRING$$),
+    ('customers', 4, 'last_name',                    $$payload:last_name::STRING$$),
+    ('customers', 5, 'phone',                        $$payload:phone::STRING$$),
+    ('customers', 6, 'status',                       $$payload:status::STRING$$),
+    ('customers', 7, 'created_at',                   $$payload:created_at::TIMESTAMP_NTZ$$),
+    ('customers', 8, 'create_date',                  $$CAST(payload:created_at::TIMESTAMP_NTZ AS DATE)$$),
+    ('customers', 9, 'updated_at',                   $$NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ)$$),
+    ('customers', 10, 'hash_value',                  $$SHA2_HEX(CONCAT_WS('|', COALESCE(payload:email::STRING, ''), COALESCE(payload:first_name::STRING, ''), COALESCE(payload:last_name::STRING, ''), COALESCE(payload:phone::STRING, ''), COALESCE(payload:status::STRING, '')))$$),
+    ('addresses', 1, 'address_id',                   $$NVL(address_id, payload:address_id::NUMBER)$$),
+    ('addresses', 2, 'customer_id',                  $$payload:customer_id::NUMBER$$),
+    ('addresses', 3, 'type',                         $$payload:type::STRING$$),
+    ('addresses', 4, 'street',                       $$payload:street::STRING$$),
+    ('addresses', 5, 'city',                         $$payload:city::STRING$$),
+    ('addresses', 6, 'postal_code',                  $$payload:postal_code::STRING$$),
+    ('addresses', 7, 'country',                      $$payload:country::STRING$$),
+    ('addresses', 8, 'is_default',                   $$payload:is_default::BOOLEAN$$),
+    ('addresses', 9, 'created_at',                   $$payload:created_at::TIMESTAMP_NTZ$$),
+    ('addresses', 10, 'create_date',                 $$CAST(payload:created_at::TIMESTAMP_NTZ AS DATE)$$),
+    ('addresses', 11, 'updated_at',                  $$NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ)$$),
+    ('addresses', 12, 'hash_value',                  $$SHA2_HEX(CONCAT_WS('|', COALESCE(payload:type::STRING, ''), COALESCE(payload:street::STRING, ''), COALESCE(payload:city::STRING, ''), COALESCE(payload:postal_code::STRING, ''), COALESCE(payload:country::STRING, ''), COALESCE(payload:is_default::STRING, 'false')))$$);
+
+INSERT OVERWRITE INTO ECOMMERCE.COMMON.DQ_RULES (TARGET_TABLE, RULE_ORDER, RULE_CODE, PREDICATE)
+SELECT column1, column2, column3, column4
+FROM VALUES
+    ('orders', 1, 'NEGATIVE_AMOUNT',                $$order_total_amount < 0$$),
+    ('orders', 2, 'MISSING_CUSTOMER',               $$customer_id IS NULL$$),
+    ('orders', 3, 'MISSING_DATE',                   $$created_at IS NULL$$),
+    ('orders', 4, 'MISSING_AMOUNT',                 $$order_total_amount IS NULL$$),
+    ('order_items', 1, 'NEGATIVE_UNIT_PRICE',       $$unit_price < 0$$),
+    ('order_items', 2, 'MISSING_PRODUCT',           $$product_id IS NULL$$),
+    ('order_items', 3, 'MISSING_DATE',              $$created_at IS NULL$$),
+    ('order_items', 4, 'MISSING_UNIT_PRICE',        $$unit_price IS NULL$$),
+    ('order_status_history', 1, 'MISSING_ORDER_ID', $$order_id IS NULL$$),
+    ('order_status_history', 2, 'MISSING_STATUS',   $$status IS NULL$$),
+    ('payments', 1, 'MISSING_PAYMENT_STATUS',       $$payment_status IS NULL$$),
+    ('payments', 2, 'MISSING_PROVIDER',             $$provider IS NULL$$),
+    ('payments', 3, 'MISSING_DATE',                 $$created_at IS NULL$$),
+    ('shipments', 1, 'MISSING_CARRIER',             $$carrier IS NULL$$),
+    ('shipments', 2, 'MISSING_SHIPMENT_STATUS',     $$shipment_status IS NULL$$),
+    ('products', 1, 'NEGATIVE_PRICE',               $$price < 0$$),
+    ('products', 2, 'EMPTY_NAME',                   $$TRIM(name) = '' OR name IS NULL$$),
+    ('products', 3, 'MISSING_CURRENCY',             $$currency IS NULL$$),
+    ('products', 4, 'MISSING_DATE',                 $$created_at IS NULL$$),
+    ('products', 5, 'MISSING_PRICE',                $$price IS NULL$$),
+    ('customers', 1, 'INVALID_EMAIL',               $$email NOT LIKE '%@%'$$),
+    ('customers', 2, 'MISSING_FIRST_NAME',          $$first_name IS NULL$$),
+    ('customers', 3, 'MISSING_PHONE',               $$phone IS NULL$$),
+    ('customers', 4, 'MISSING_DATE',                $$created_at IS NULL$$),
+    ('customers', 5, 'MISSING_EMAIL',               $$email IS NULL$$),
+    ('addresses', 1, 'MISSING_CITY',                $$city IS NULL$$),
+    ('addresses', 2, 'MISSING_STREET',              $$street IS NULL$$),
+    ('addresses', 3, 'MISSING_COUNTRY',             $$country IS NULL$$),
+    ('addresses', 4, 'MISSING_CUSTOMER',            $$customer_id IS NULL$$),
+    ('addresses', 5, 'MISSING_DATE',                $$created_at IS NULL$$);
+
+
 --###########################################################################################
 -- GOLD SCHEMA
 --###########################################################################################
@@ -576,6 +1031,53 @@ WHEN NOT MATCHED THEN
 );
 
 
+-- CREATE CURRENT-VERSION KEY LOOKUPS
+-- One row per natural key pointing at the is_current version of the SCD2 dimension.
+-- Fact loads resolve surrogate keys here with an equi-join and only fall back to the
+-- SCD2 range join for late-arriving rows older than the current version.
+CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.dim_products_current (
+    product_id      NUMBER              COMMENT 'Natural Key (PK)',
+    product_key     NUMBER              COMMENT 'Surrogate Key of the current DIM_PRODUCTS version',
+    hash_value      STRING,
+    valid_from      TIMESTAMP_NTZ       COMMENT 'Start of validity of the current version',
+    CONSTRAINT PK_dim_products_current PRIMARY KEY (product_id)
+) --CLUSTER BY (product_id)
+COMMENT = 'Current-version key lookup for DIM_PRODUCTS. Maintained by LOAD_DIM_PRODUCTS.';
+
+CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.dim_customers_current (
+    customer_id     NUMBER              COMMENT 'Natural Key (PK)',
+    customer_key    NUMBER              COMMENT 'Surrogate Key of the current DIM_CUSTOMERS version',
+    hash_value      STRING,
+    valid_from      TIMESTAMP_NTZ       COMMENT 'Start of validity of the current version',
+    CONSTRAINT PK_dim_customers_current PRIMARY KEY (customer_id)
+) --CLUSTER BY (customer_id)
+COMMENT = 'Current-version key lookup for DIM_CUSTOMERS. Maintained by LOAD_DIM_CUSTOMERS.';
+
+
+-- SEED LOOKUPS FROM EXISTING DIMENSIONS (no-op once populated)
+MERGE INTO ECOMMERCE.GOLD.dim_products_current c
+USING (
+    SELECT product_id, product_key, hash_value, valid_from
+    FROM ECOMMERCE.GOLD.dim_products
+    WHERE is_current = TRUE AND product_key != -1
+) d
+ON c.product_id = d.product_id
+WHEN NOT MATCHED THEN
+    INSERT (product_id, product_key, hash_value, valid_from)
+    VALUES (d.product_id, d.product_key, d.hash_value, d.valid_from);
+
+MERGE INTO ECOMMERCE.GOLD.dim_customers_current c
+USING (
+    SELECT customer_id, customer_key, hash_value, valid_from
+    FROM ECOMMERCE.GOLD.dim_customers
+    WHERE is_current = TRUE AND customer_key != -1
+) d
+ON c.customer_id = d.customer_id
+WHEN NOT MATCHED THEN
+    INSERT (customer_id, customer_key, hash_value, valid_from)
+    VALUES (d.customer_id, d.customer_key, d.hash_value, d.valid_from);
+
+
 -- CREATE FACT_ORDERS
 CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.fact_orders (
     fact_order_key      NUMBER AUTOINCREMENT,
@@ -679,6 +1181,118 @@ CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.fact_order_status_history (
 COMMENT = 'Factless Fact Table (Events). Logs every status change event.';
 
 
+-- FACT STREAMS
+-- Feed LOAD_GOLD_AGGREGATES. Fact MERGE updates show up as a DELETE (old values) plus an INSERT
+-- (new values), so both the old and the new date of a changed row are recomputed.
+CREATE STREAM IF NOT EXISTS ECOMMERCE.GOLD.fact_orders_stream
+ON TABLE ECOMMERCE.GOLD.fact_orders;
+
+CREATE STREAM IF NOT EXISTS ECOMMERCE.GOLD.fact_sales_stream
+ON TABLE ECOMMERCE.GOLD.fact_sales;
+
+CREATE STREAM IF NOT EXISTS ECOMMERCE.GOLD.fact_shipments_stream
+ON TABLE ECOMMERCE.GOLD.fact_shipments;
+
+CREATE STREAM IF NOT EXISTS ECOMMERCE.GOLD.fact_payments_stream
+ON TABLE ECOMMERCE.GOLD.fact_payments;
+
+
+-- CREATE AGG_DAILY_PRODUCT_SALES
+CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.agg_daily_product_sales (
+    date_key            NUMBER          COMMENT 'FK to DIM_DATE',
+    date_value          DATE,
+    product_id          NUMBER          COMMENT 'Natural Key of DIM_PRODUCTS',
+    product_name        STRING          COMMENT 'Latest product version sold that day',
+    category            STRING,
+    brand               STRING,
+    currency            STRING,
+
+    order_count         NUMBER          COMMENT 'Metric: Distinct orders',
+    line_count          NUMBER,
+    units_sold          NUMBER,
+    revenue             NUMBER(18,2),
+
+    updated_at          TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT PK_agg_daily_product_sales PRIMARY KEY (date_key, product_id, currency)
+) --CLUSTER BY (date_key)
+COMMENT = 'Aggregate. Grain: One row per Day, Product and Currency. Maintained from FACT_SALES.';
+
+
+-- CREATE AGG_DAILY_CATEGORY_SALES
+CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.agg_daily_category_sales (
+    date_key            NUMBER          COMMENT 'FK to DIM_DATE',
+    date_value          DATE,
+    category            STRING,
+    country             STRING          COMMENT 'Customer country at order time',
+    currency            STRING,
+
+    order_count         NUMBER          COMMENT 'Metric: Distinct orders',
+    customer_count      NUMBER          COMMENT 'Metric: Distinct customers',
+    units_sold          NUMBER,
+    revenue             NUMBER(18,2),
+
+    updated_at          TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT PK_agg_daily_category_sales PRIMARY KEY (date_key, category, country, currency)
+) --CLUSTER BY (date_key)
+COMMENT = 'Aggregate. Grain: One row per Day, Product Category, Country and Currency. Maintained from FACT_SALES.';
+
+
+-- CREATE AGG_DAILY_ORDER_STATUS
+CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.agg_daily_order_status (
+    date_key            NUMBER          COMMENT 'FK to DIM_DATE (order date)',
+    date_value          DATE,
+    order_status        STRING          COMMENT 'Current status of the orders',
+    currency            STRING,
+
+    order_count         NUMBER,
+    order_amount        NUMBER(18,2),
+    avg_order_amount    NUMBER(18,2),
+
+    updated_at          TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT PK_agg_daily_order_status PRIMARY KEY (date_key, order_status, currency)
+) --CLUSTER BY (date_key)
+COMMENT = 'Aggregate (Order Funnel). Grain: One row per Order Day, Status and Currency. Maintained from FACT_ORDERS.';
+
+
+-- CREATE AGG_DAILY_PAYMENTS
+CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.agg_daily_payments (
+    date_key            NUMBER          COMMENT 'FK to DIM_DATE',
+    date_value          DATE,
+    provider            STRING,
+    payment_status      STRING,
+
+    payment_count       NUMBER,
+    order_count         NUMBER          COMMENT 'Metric: Distinct orders',
+    amount              NUMBER(18,2),
+    avg_amount          NUMBER(18,2),
+
+    updated_at          TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT PK_agg_daily_payments PRIMARY KEY (date_key, provider, payment_status)
+) --CLUSTER BY (date_key)
+COMMENT = 'Aggregate. Grain: One row per Day, Provider and Payment Status. Maintained from FACT_PAYMENTS.';
+
+
+-- CREATE AGG_DAILY_SHIPMENTS
+CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.agg_daily_shipments (
+    ship_date_key       NUMBER          COMMENT 'FK to DIM_DATE (-1: not shipped yet)',
+    ship_date           DATE,
+    carrier             STRING,
+    shipment_status     STRING,
+
+    shipment_count      NUMBER,
+    delivered_count     NUMBER,
+    avg_days_to_ship    NUMBER(10,2)    COMMENT 'KPI: Created -> Shipped',
+    p90_days_to_ship    NUMBER(10,2),
+    avg_days_to_deliver NUMBER(10,2)    COMMENT 'KPI: Shipped -> Delivered',
+    p90_days_to_deliver NUMBER(10,2),
+    max_days_to_deliver NUMBER,
+
+    updated_at          TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT PK_agg_daily_shipments PRIMARY KEY (ship_date_key, carrier, shipment_status)
+) --CLUSTER BY (ship_date_key)
+COMMENT = 'Aggregate (Shipping SLA). Grain: One row per Ship Day, Carrier and Status. Maintained from FACT_SHIPMENTS.';
+
+
 
 
 
@@ -717,6 +1331,31 @@ COMMENT = 'Reporting View for Status History.'
 AS 
 SELECT * FROM ECOMMERCE.GOLD.FACT_ORDER_STATUS_HISTORY;
 
+CREATE OR REPLACE VIEW ECOMMERCE.GOLD.V_AGG_DAILY_PRODUCT_SALES
+COMMENT = 'Reporting View for Daily Sales by Product.'
+AS
+SELECT * FROM ECOMMERCE.GOLD.AGG_DAILY_PRODUCT_SALES;
+
+CREATE OR REPLACE VIEW ECOMMERCE.GOLD.V_AGG_DAILY_CATEGORY_SALES
+COMMENT = 'Reporting View for Daily Sales by Category and Country.'
+AS
+SELECT * FROM ECOMMERCE.GOLD.AGG_DAILY_CATEGORY_SALES;
+
+CREATE OR REPLACE VIEW ECOMMERCE.GOLD.V_AGG_DAILY_ORDER_STATUS
+COMMENT = 'Reporting View for the Daily Order Funnel.'
+AS
+SELECT * FROM ECOMMERCE.GOLD.AGG_DAILY_ORDER_STATUS;
+
+CREATE OR REPLACE VIEW ECOMMERCE.GOLD.V_AGG_DAILY_PAYMENTS
+COMMENT = 'Reporting View for Daily Payments.'
+AS
+SELECT * FROM ECOMMERCE.GOLD.AGG_DAILY_PAYMENTS;
+
+CREATE OR REPLACE VIEW ECOMMERCE.GOLD.V_AGG_DAILY_SHIPMENTS
+COMMENT = 'Reporting View for Daily Shipping SLA.'
+AS
+SELECT * FROM ECOMMERCE.GOLD.AGG_DAILY_SHIPMENTS;
+
 
 
 --###########################################################################################
@@ -752,6 +1391,9 @@ GRANT SELECT, INSERT, UPDATE, DELETE, TRUNCATE ON FUTURE TABLES IN SCHEMA ECOMME
 GRANT SELECT, INSERT, UPDATE, DELETE, TRUNCATE ON FUTURE TABLES IN SCHEMA ECOMMERCE.SILVER TO ROLE ETL_ROLE;
 GRANT SELECT, INSERT, UPDATE, DELETE, TRUNCATE ON FUTURE TABLES IN SCHEMA ECOMMERCE.GOLD TO ROLE ETL_ROLE;
 
+-- Session log buffer of the master procedures (COMMON.START_LOG_BUFFER creates a TEMPORARY table)
+GRANT CREATE TABLE ON SCHEMA ECOMMERCE.COMMON TO ROLE ETL_ROLE;
+
 GRANT USAGE ON ALL PROCEDURES IN SCHEMA ECOMMERCE.COMMON TO ROLE ETL_ROLE;
 GRANT USAGE ON ALL PROCEDURES IN SCHEMA ECOMMERCE.BRONZE TO ROLE ETL_ROLE;
 GRANT USAGE ON ALL PROCEDURES IN SCHEMA ECOMMERCE.SILVER TO ROLE ETL_ROLE;
@@ -768,6 +1410,7 @@ GRANT USAGE ON ALL FILE FORMATS IN SCHEMA ECOMMERCE.BRONZE TO ROLE ETL_ROLE;
 
 GRANT SELECT ON ALL STREAMS IN SCHEMA ECOMMERCE.BRONZE TO ROLE ETL_ROLE;
 GRANT SELECT ON ALL STREAMS IN SCHEMA ECOMMERCE.SILVER TO ROLE ETL_ROLE;
+GRANT SELECT ON ALL STREAMS IN SCHEMA ECOMMERCE.GOLD TO ROLE ETL_ROLE;
 
 
 
@@ -26,6 +26,29 @@ EXECUTE AS CALLER
 AS
 $$
 BEGIN
+    -- Buffered mode (START_LOG_BUFFER): the event goes to the session buffer instead of ETL_LOGS.
+    -- FAIL events are always written directly, so they survive the caller's rollback and the
+    -- Bronze master can read them back.
+    IF (GETVARIABLE('ETL_LOG_BUFFER') IS NOT NULL AND P_STATUS != 'FAIL') THEN
+        INSERT INTO ECOMMERCE.COMMON.ETL_LOG_BUFFER (
+            PIPELINE_RUN_ID, LAYER, PROCESS_NAME, TARGET_TABLE, STEP_NAME,
+            STATUS, MESSAGE, ROWS_AFFECTED, ERROR_COUNT, DURATION_SEC,
+            ERROR_CODE, ERROR_STACK, ADDITIONAL_INFO,
+            SNOWFLAKE_QUERY_ID, SESSION_ID, WAREHOUSE_NAME, USER_NAME, ROLE_NAME
+        )
+        SELECT
+            :P_RUN_ID, :P_LAYER, :P_PROCESS_NAME, :P_TARGET_TABLE, :P_STEP_NAME,
+            :P_STATUS, :P_MESSAGE, :P_ROWS_AFFECTED, :P_ERROR_COUNT, :P_DURATION_SEC,
+            :P_ERROR_CODE, :P_ERROR_STACK, :P_ADDITIONAL_INFO,
+            LAST_QUERY_ID(),
+            CURRENT_SESSION(),
+            CURRENT_WAREHOUSE(),
+            CURRENT_USER(),
+            CURRENT_ROLE();
+
+        RETURN 'BUFFERED';
+    END IF;
+
     INSERT INTO ECOMMERCE.COMMON.ETL_LOGS (
         PIPELINE_RUN_ID, LAYER, PROCESS_NAME, TARGET_TABLE, STEP_NAME,
         STATUS, MESSAGE, ROWS_AFFECTED, ERROR_COUNT, DURATION_SEC,
@@ -47,6 +70,166 @@ END;
 $$;
 
 
+-- #####################################################
+-- PROC SET_QUERY_TAG (Query history per run and step)
+-- #####################################################
+-- Tags the statements that follow in the session with the same run / layer / process / target
+-- as their ETL_LOGS events, e.g. {"app":"ECOMMERCE_ETL","run_id":"...","layer":"GOLD",
+-- "process":"FACT_SALES","target":"FACT_SALES"}. scripts/perf_report.py joins QUERY_HISTORY
+-- on this tag to get bytes scanned, pruning, spill and queueing per step. ASYNC children share
+-- their master's session, so the loading procedures also log the SQLID of their statements in
+-- ADDITIONAL_INFO:query_ids; the report prefers these IDs over the tag.
+
+CREATE OR REPLACE PROCEDURE ECOMMERCE.COMMON.SET_QUERY_TAG(
+    P_RUN_ID STRING,
+    P_LAYER STRING,
+    P_PROCESS_NAME STRING,
+    P_TARGET_TABLE STRING
+)
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+    query_tag STRING;
+BEGIN
+    query_tag := TO_JSON(OBJECT_CONSTRUCT(
+        'app',     'ECOMMERCE_ETL',
+        'run_id',  :P_RUN_ID,
+        'layer',   :P_LAYER,
+        'process', :P_PROCESS_NAME,
+        'target',  :P_TARGET_TABLE
+    ));
+
+    EXECUTE IMMEDIATE 'ALTER SESSION SET QUERY_TAG = ''' || REPLACE(:query_tag, '''', '''''') || '''';
+
+    RETURN query_tag;
+END;
+$$;
+
+
+-- #####################################################
+-- PROC START_LOG_BUFFER / FLUSH_LOG_BUFFER (Batched logging of master runs)
+-- #####################################################
+-- A master procedure starts the buffer, LOG_EVENT then collects the events of the session in a
+-- temporary table, and the master writes them to ETL_LOGS with one multi-row insert when it
+-- finishes or fails. Procedures called on their own (etl_orchestrator.py) keep logging directly.
+-- Buffered events of a session that dies before the flush are lost; FAIL events never are.
+
+CREATE OR REPLACE PROCEDURE ECOMMERCE.COMMON.START_LOG_BUFFER()
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+BEGIN
+    -- Created outside of any transaction (DDL commits): masters call this before their children
+    CREATE TEMPORARY TABLE IF NOT EXISTS ECOMMERCE.COMMON.ETL_LOG_BUFFER (
+        EVENT_SEQ           NUMBER AUTOINCREMENT START 1 INCREMENT 1,
+        LOG_UUID            STRING DEFAULT UUID_STRING(),
+        PIPELINE_RUN_ID     STRING,
+        LAYER               STRING,
+        PROCESS_NAME        STRING,
+        TARGET_TABLE        STRING,
+        STEP_NAME           STRING,
+        STATUS              STRING,
+        MESSAGE             STRING,
+        ERROR_CODE          STRING,
+        ERROR_STACK         STRING,
+        ROWS_AFFECTED       NUMBER,
+        ERROR_COUNT         NUMBER,
+        DURATION_SEC        NUMBER(12,3),
+        SNOWFLAKE_QUERY_ID  STRING,
+        SESSION_ID          STRING,
+        WAREHOUSE_NAME      STRING,
+        USER_NAME           STRING,
+        ROLE_NAME           STRING,
+        ADDITIONAL_INFO     VARIANT,
+        CREATED_AT          TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+    );
+
+    EXECUTE IMMEDIATE 'SET ETL_LOG_BUFFER = ''ON''';
+
+    RETURN 'LOG BUFFER STARTED';
+END;
+$$;
+
+
+CREATE OR REPLACE PROCEDURE ECOMMERCE.COMMON.FLUSH_LOG_BUFFER()
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+    rows_cnt NUMBER;
+BEGIN
+    IF (GETVARIABLE('ETL_LOG_BUFFER') IS NULL) THEN
+        RETURN 'LOG BUFFER NOT STARTED';
+    END IF;
+
+    -- Autonomous: masters flush outside of any transaction, also from their EXCEPTION block
+    BEGIN TRANSACTION;
+
+    INSERT INTO ECOMMERCE.COMMON.ETL_LOGS (
+        LOG_UUID, PIPELINE_RUN_ID, LAYER, PROCESS_NAME, TARGET_TABLE, STEP_NAME,
+        STATUS, MESSAGE, ROWS_AFFECTED, ERROR_COUNT, DURATION_SEC,
+        ERROR_CODE, ERROR_STACK, ADDITIONAL_INFO,
+        SNOWFLAKE_QUERY_ID, SESSION_ID, WAREHOUSE_NAME, USER_NAME, ROLE_NAME, CREATED_AT
+    )
+    SELECT
+        LOG_UUID, PIPELINE_RUN_ID, LAYER, PROCESS_NAME, TARGET_TABLE, STEP_NAME,
+        STATUS, MESSAGE, ROWS_AFFECTED, ERROR_COUNT, DURATION_SEC,
+        ERROR_CODE, ERROR_STACK, ADDITIONAL_INFO,
+        SNOWFLAKE_QUERY_ID, SESSION_ID, WAREHOUSE_NAME, USER_NAME, ROLE_NAME, CREATED_AT
+    FROM ECOMMERCE.COMMON.ETL_LOG_BUFFER
+    ORDER BY EVENT_SEQ;
+
+    rows_cnt := SQLROWCOUNT;
+
+    DELETE FROM ECOMMERCE.COMMON.ETL_LOG_BUFFER;
+
+    COMMIT;
+
+    -- Later calls on this session (pooled connections) log directly again
+    EXECUTE IMMEDIATE 'UNSET ETL_LOG_BUFFER';
+
+    RETURN 'LOG BUFFER FLUSHED: ' || :rows_cnt;
+END;
+$$;
+
+
+-- #####################################################
+-- PROC PURGE_ETL_LOGS (Log retention)
+-- #####################################################
+
+CREATE OR REPLACE PROCEDURE ECOMMERCE.COMMON.PURGE_ETL_LOGS(RETENTION_DAYS NUMBER DEFAULT 90)
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+BEGIN
+    -- ETL_LOGS is clustered by day, so only the expired micro-partitions are touched
+    DELETE FROM ECOMMERCE.COMMON.ETL_LOGS
+    WHERE CREATED_AT < DATEADD(day, -:RETENTION_DAYS, CURRENT_DATE());
+
+    RETURN 'ETL_LOGS PURGED: ' || SQLROWCOUNT;
+END;
+$$;
+
+-- Log retention is opt-in: perf_report.py baselines and the run history are read from ETL_LOGS.
+-- Created suspended (also when a deploy replaces it): enable it with
+--   ALTER TASK ECOMMERCE.COMMON.PURGE_ETL_LOGS_TASK RESUME;
+CREATE OR REPLACE TASK ECOMMERCE.COMMON.PURGE_ETL_LOGS_TASK
+    WAREHOUSE = ETL_WH
+    SCHEDULE = 'USING CRON 0 3 * * 0 UTC'
+    COMMENT = 'Weekly purge of ETL_LOGS rows older than 90 days'
+AS
+    CALL ECOMMERCE.COMMON.PURGE_ETL_LOGS(90);
+
+
 
 
 -- ##########################################################################################################
@@ -54,57 +237,275 @@ $$;
 -- ##########################################################################################################
 
 -- ###################################
--- PROC LOAD_BRONZE_MASTER (Loading files)
+-- PROC REGISTER_RUN_MANIFESTS (Pending files of new generator runs)
 -- ###################################
-CREATE OR REPLACE PROCEDURE ECOMMERCE.BRONZE.LOAD_BRONZE_MASTER(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.BRONZE.REGISTER_RUN_MANIFESTS(RUN_ID STRING)
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
 AS
 $$
 DECLARE
-    c1 CURSOR FOR 
-        SELECT TABLE_NAME, ADLS_PATH 
-        FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG 
-        WHERE IS_ACTIVE = TRUE;
+    rows_cnt NUMBER;
+    step_start_ts TIMESTAMP;
+    step_duration NUMBER(12,3);
+BEGIN
+    step_start_ts := CURRENT_TIMESTAMP();
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'BRONZE', 'LOAD_BRONZE', 'INGESTION_MANIFEST');
 
+    -- One small NDJSON file per generator run; COPY load metadata registers each manifest once.
+    COPY INTO ECOMMERCE.COMMON.INGESTION_MANIFEST (
+        MANIFEST_FILE, RUN_ID, TABLE_NAME, FILE_PATH, FILE_BYTES, FILE_FORMAT, BATCH_NO
+    )
+    FROM (
+        SELECT 
+            METADATA$FILENAME,
+            $1:run_id::STRING,
+            $1:table_name::STRING,
+            $1:file_path::STRING,
+            $1:file_bytes::NUMBER,
+            $1:file_format::STRING,
+            $1:batch_no::NUMBER
+        FROM @ECOMMERCE.BRONZE.adls_stage/_manifests/
+    )
+    FILE_FORMAT = (FORMAT_NAME = 'ECOMMERCE.BRONZE.fileformat_ndjson')
+    ON_ERROR = 'CONTINUE';
+
+    rows_cnt := SQLROWCOUNT;
+    step_duration := DATEDIFF('millisecond', :step_start_ts, CURRENT_TIMESTAMP()) / 1000;
+
+    CALL ECOMMERCE.COMMON.LOG_EVENT(
+        :RUN_ID, 'BRONZE', 'LOAD_BRONZE', 'INGESTION_MANIFEST', 'REGISTER_MANIFESTS', 
+        'SUCCESS', 'Run manifests registered', :rows_cnt, 0, :step_duration, NULL, NULL, NULL
+    );
+
+    RETURN 'MANIFESTS REGISTERED: ' || :rows_cnt;
+END;
+$$;
+
+
+-- ###################################
+-- PROC LOAD_BRONZE_TABLE (Loading files of one table)
+-- ###################################
+-- Runs in its own transaction so that tables loaded in parallel commit (or fail) independently.
+-- A failure is logged and reported in the return value instead of raised: the master reads the
+-- FAIL events of the run once all parallel loads are done. MANIFEST files the COPY could not
+-- load are retried up to MAX_LOAD_ATTEMPTS times, then logged as a FAIL event and no longer listed.
+CREATE OR REPLACE PROCEDURE ECOMMERCE.BRONZE.LOAD_BRONZE_TABLE(RUN_ID STRING, TARGET_TABLE STRING)
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
     current_table STRING;
     current_path STRING;
+    current_format STRING;
+    current_pattern STRING;
+    current_strategy STRING;
+    typed_columns STRING;
+    typed_targets STRING;
+    typed_selects STRING;
     sql_command STRING;
     
+    files_list STRING;
+    files_cnt NUMBER;
+    snapshot_ts TIMESTAMP;
+    
     rows_cnt NUMBER;
     step_start_ts TIMESTAMP;
     step_duration NUMBER(12,3);
-    proc_start_ts TIMESTAMP;
-    total_duration NUMBER(12,3);
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    copy_query_id STRING;
     loaded_files_list VARIANT;
+    chunk_files_list VARIANT;
+    failed_files_list VARIANT;
+    chunk_failed_list VARIANT;
+    copy_results VARIANT;
+    chunk_results VARIANT;
+    given_up_files VARIANT;
+    given_up_cnt NUMBER;
+    chunks RESULTSET;
+    chunk_format STRING;
+
+    MAX_LOAD_ATTEMPTS NUMBER := 3;
     
 BEGIN
-    proc_start_ts := CURRENT_TIMESTAMP();
-
-    BEGIN TRANSACTION;
+    step_start_ts := CURRENT_TIMESTAMP();
+    current_table := LOWER(:TARGET_TABLE);
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'BRONZE', 'LOAD_BRONZE', UPPER(:current_table));
+
+    SELECT ADLS_PATH,
+           COALESCE(FILE_FORMAT, 'ECOMMERCE.BRONZE.fileformat_json'),
+           FILE_PATTERN,
+           COALESCE(LOAD_STRATEGY, 'PREFIX'),
+           TYPED_COLUMNS
+    INTO :current_path, :current_format, :current_pattern, :current_strategy, :typed_columns
+    FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+    WHERE LOWER(TABLE_NAME) = :current_table
+    LIMIT 1;
+
+    -- TYPED_COLUMNS 'order_id:NUMBER,updated_at:TIMESTAMP_NTZ' becomes the column list
+    -- ', order_id, updated_at' and the projection ', $1:order_id::NUMBER, $1:updated_at::TIMESTAMP_NTZ'
+    SELECT COALESCE(LISTAGG(', ' || col_name, '') WITHIN GROUP (ORDER BY idx), ''),
+           COALESCE(LISTAGG(', $1:' || col_name || '::' || col_type, '') WITHIN GROUP (ORDER BY idx), '')
+    INTO :typed_targets, :typed_selects
+    FROM (
+        SELECT t.INDEX AS idx,
+               TRIM(SPLIT_PART(t.VALUE, ':', 1)) AS col_name,
+               TRIM(SPLIT_PART(t.VALUE, ':', 2)) AS col_type
+        FROM TABLE(SPLIT_TO_TABLE(COALESCE(:typed_columns, ''), ',')) t
+        WHERE TRIM(t.VALUE) != ''
+    );
 
-    CALL ECOMMERCE.COMMON.LOG_EVENT(:RUN_ID, 'BRONZE', 'MASTER', NULL, 'INIT', 'START', 'Starting Bronze Loop', 0, 0, 0, NULL, NULL, NULL);
-    
-    OPEN c1;
-    FOR record IN c1 DO
-        current_table := record.TABLE_NAME;
-        current_path  := record.ADLS_PATH;
-        
-        step_start_ts := CURRENT_TIMESTAMP();
-        
+    rows_cnt := 0;
+    files_cnt := 0;
+    loaded_files_list := ARRAY_CONSTRUCT();
+    failed_files_list := ARRAY_CONSTRUCT();
+    copy_results := ARRAY_CONSTRUCT();
+    given_up_cnt := 0;
+
+    IF (current_strategy = 'MANIFEST') THEN
+
+        -- Pending files are read (not claimed with an UPDATE) before the transaction starts:
+        -- an UPDATE would lock INGESTION_MANIFEST until COMMIT and serialize the parallel loads.
+        snapshot_ts := CURRENT_TIMESTAMP();
+
+        SELECT COUNT(*)
+        INTO :files_cnt
+        FROM ECOMMERCE.COMMON.INGESTION_MANIFEST
+        WHERE TABLE_NAME = :current_table
+          AND LOADED_AT IS NULL
+          AND COALESCE(ATTEMPTS, 0) < :MAX_LOAD_ATTEMPTS
+          AND REGISTERED_AT <= :snapshot_ts;
+
+        -- Chunks of at most 1000 files (COPY FILES limit) of one file format each: every file is
+        -- read with the format the generator wrote it in (FILE_FORMAT of its manifest entry),
+        -- so a run written with --format parquet loads next to ndjson runs of the same table.
+        chunks := (
+            SELECT format_name,
+                   LISTAGG('''' || FILE_PATH || '''', ',') WITHIN GROUP (ORDER BY FILE_PATH) AS files_list
+            FROM (
+                SELECT FILE_PATH, format_name,
+                       FLOOR((ROW_NUMBER() OVER (PARTITION BY format_name ORDER BY FILE_PATH) - 1) / 1000) AS chunk_no
+                FROM (
+                    SELECT FILE_PATH,
+                           CASE
+                               WHEN FILE_FORMAT IS NULL THEN :current_format
+                               WHEN LOWER(FILE_FORMAT) = 'parquet' THEN 'ECOMMERCE.BRONZE.fileformat_parquet'
+                               WHEN LOWER(FILE_FORMAT) LIKE 'ndjson%' THEN 'ECOMMERCE.BRONZE.fileformat_ndjson'
+                               ELSE :current_format
+                           END AS format_name
+                    FROM ECOMMERCE.COMMON.INGESTION_MANIFEST
+                    WHERE TABLE_NAME = :current_table
+                      AND LOADED_AT IS NULL
+                      AND COALESCE(ATTEMPTS, 0) < :MAX_LOAD_ATTEMPTS
+                      AND REGISTERED_AT <= :snapshot_ts
+                )
+            )
+            GROUP BY format_name, chunk_no
+            ORDER BY format_name, chunk_no
+        );
+        LET c_chunks CURSOR FOR chunks;
+
+        BEGIN TRANSACTION;
+
+        FOR chunk IN c_chunks DO
+            files_list := chunk.files_list;
+            chunk_format := chunk.format_name;
+
+            -- Only the listed files are read: no listing of the table's whole history
+            sql_command := '
+                COPY INTO ECOMMERCE.BRONZE.' || :current_table || ' (payload, source_file' || :typed_targets || ')
+                FROM (
+                    SELECT $1, METADATA$FILENAME' || :typed_selects || '
+                    FROM @ECOMMERCE.BRONZE.adls_stage/
+                )
+                FILES = (' || :files_list || ')
+                FILE_FORMAT = (FORMAT_NAME = ''' || :chunk_format || ''')
+                ON_ERROR = ''CONTINUE''
+            ';
+
+            EXECUTE IMMEDIATE :sql_command;
+            rows_cnt := rows_cnt + SQLROWCOUNT;
+            copy_query_id := SQLID;
+
+            BEGIN
+                SELECT ARRAY_AGG(IFF("status" = 'LOADED', "file", NULL)),
+                       ARRAY_AGG(IFF("status" != 'LOADED', "file", NULL)),
+                       ARRAY_AGG(OBJECT_CONSTRUCT('file', "file", 'status', "status", 'error', "first_error"))
+                INTO :chunk_files_list, :chunk_failed_list, :chunk_results
+                FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+                loaded_files_list := ARRAY_CAT(:loaded_files_list, COALESCE(:chunk_files_list, ARRAY_CONSTRUCT()));
+                failed_files_list := ARRAY_CAT(:failed_files_list, COALESCE(:chunk_failed_list, ARRAY_CONSTRUCT()));
+                copy_results := ARRAY_CAT(:copy_results, COALESCE(:chunk_results, ARRAY_CONSTRUCT()));
+            EXCEPTION
+                WHEN OTHER THEN
+                    NULL;
+            END;
+            query_ids := ARRAY_APPEND(:query_ids, :copy_query_id);
+        END FOR;
+
+        COMMIT;
+
+        -- Short autocommit UPDATE once the data is committed: every listed file counts an attempt
+        -- with the status the COPY reported (NOT_REPORTED: e.g. skipped by the COPY load metadata).
+        -- LOADED and PARTIALLY_LOADED files are done: the load metadata of a partially loaded file
+        -- makes later COPYs skip it, so its rejected rows cannot be retried. LOAD_FAILED and
+        -- unreported files stay pending until MAX_LOAD_ATTEMPTS.
+        -- COPY reports full stage URLs, FILE_PATH is relative to the stage root.
+        UPDATE ECOMMERCE.COMMON.INGESTION_MANIFEST m
+        SET LOAD_RUN_ID = :RUN_ID,
+            ATTEMPTS = COALESCE(m.ATTEMPTS, 0) + 1,
+            LAST_STATUS = COALESCE(r.copy_status, 'NOT_REPORTED'),
+            LAST_ERROR = r.copy_error,
+            LOADED_AT = IFF(r.copy_status IN ('LOADED', 'PARTIALLY_LOADED'), CURRENT_TIMESTAMP(), NULL)
+        FROM (
+            SELECT p.MANIFEST_ID,
+                   MAX(c.VALUE:status::STRING) AS copy_status,
+                   MAX(c.VALUE:error::STRING) AS copy_error
+            FROM ECOMMERCE.COMMON.INGESTION_MANIFEST p
+            LEFT JOIN TABLE(FLATTEN(INPUT => :copy_results)) c
+              ON c.VALUE:file::STRING = p.FILE_PATH OR ENDSWITH(c.VALUE:file::STRING, '/' || p.FILE_PATH)
+            WHERE p.TABLE_NAME = :current_table
+              AND p.LOADED_AT IS NULL
+              AND COALESCE(p.ATTEMPTS, 0) < :MAX_LOAD_ATTEMPTS
+              AND p.REGISTERED_AT <= :snapshot_ts
+            GROUP BY p.MANIFEST_ID
+        ) r
+        WHERE m.MANIFEST_ID = r.MANIFEST_ID;
+
+        -- Files given up in this run: partially loaded, or still failing after MAX_LOAD_ATTEMPTS
+        SELECT COUNT(*),
+               ARRAY_AGG(OBJECT_CONSTRUCT('file', FILE_PATH, 'status', LAST_STATUS,
+                                          'attempts', ATTEMPTS, 'error', LAST_ERROR))
+        INTO :given_up_cnt, :given_up_files
+        FROM ECOMMERCE.COMMON.INGESTION_MANIFEST
+        WHERE TABLE_NAME = :current_table
+          AND LOAD_RUN_ID = :RUN_ID
+          AND (LAST_STATUS = 'PARTIALLY_LOADED'
+               OR (LOADED_AT IS NULL AND ATTEMPTS >= :MAX_LOAD_ATTEMPTS));
+
+    ELSE
+
+        BEGIN TRANSACTION;
+
+        -- PREFIX: lists every file below ADLS_PATH (files written without a manifest)
         sql_command := '
-            COPY INTO ECOMMERCE.BRONZE.' || :current_table || ' (payload, source_file)
+            COPY INTO ECOMMERCE.BRONZE.' || :current_table || ' (payload, source_file' || :typed_targets || ')
             FROM (
-                SELECT $1, METADATA$FILENAME 
+                SELECT $1, METADATA$FILENAME' || :typed_selects || '
                 FROM @ECOMMERCE.BRONZE.adls_stage/' || :current_path || '
             )
+            FILE_FORMAT = (FORMAT_NAME = ''' || :current_format || ''')
+            ' || IFF(:current_pattern IS NULL, '', 'PATTERN = ''' || :current_pattern || '''') || '
             ON_ERROR = ''CONTINUE''
         ';
 
         EXECUTE IMMEDIATE :sql_command;
         rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
 
         BEGIN
             SELECT ARRAY_AGG("file") 
@@ -116,25 +517,165 @@ BEGIN
                 loaded_files_list := [];
         END;
 
-        step_duration := DATEDIFF('millisecond', :step_start_ts, CURRENT_TIMESTAMP()) / 1000;
+        -- File ledger of the retention (scripts/bronze_maintenance.py), committed with the rows
+        INSERT INTO ECOMMERCE.COMMON.BRONZE_FILE_LEDGER (TABLE_NAME, FILE_NAME, LOAD_RUN_ID)
+        SELECT :current_table, f.VALUE::STRING, :RUN_ID
+        FROM TABLE(FLATTEN(INPUT => COALESCE(:loaded_files_list, ARRAY_CONSTRUCT()))) f;
+
+        COMMIT;
+
+    END IF;
+
+    step_duration := DATEDIFF('millisecond', :step_start_ts, CURRENT_TIMESTAMP()) / 1000;
 
-        custom_meta := OBJECT_CONSTRUCT(
-            'load_strategy',   'INGEST_COPY',
-            'source_obj',      '@ECOMMERCE.BRONZE.adls_stage/' || :current_path,
-            'business_key',    'filename',
-            'description',     'Raw file ingestion from ADLS',
-            'processed_files', IFF(:loaded_files_list IS NULL, [], :loaded_files_list)
+    custom_meta := OBJECT_CONSTRUCT(
+        'load_strategy',   IFF(:current_strategy = 'MANIFEST', 'MANIFEST_COPY', 'INGEST_COPY'),
+        'source_obj',      '@ECOMMERCE.BRONZE.adls_stage/' || :current_path,
+        'file_format',     :current_format,
+        'typed_columns',   :typed_columns,
+        'manifest_files',  :files_cnt,
+        'business_key',    'filename',
+        'description',     'Raw file ingestion from ADLS',
+        'processed_files', IFF(:loaded_files_list IS NULL, [], :loaded_files_list),
+        'failed_files',    :failed_files_list,
+        'query_ids',       :query_ids
+    );
+
+    CALL ECOMMERCE.COMMON.LOG_EVENT(
+        :RUN_ID, 'BRONZE', 'LOAD_BRONZE', UPPER(:current_table), 'COPY', 
+        'SUCCESS', 'File Loaded', :rows_cnt, 0, :step_duration, NULL, NULL, :custom_meta
+    );
+
+    -- Given-up files fail the run once (see LOAD_BRONZE_MASTER); INGESTION_MANIFEST keeps their error
+    IF (given_up_cnt > 0) THEN
+        CALL ECOMMERCE.COMMON.LOG_EVENT(
+            :RUN_ID, 'BRONZE', 'LOAD_BRONZE', UPPER(:current_table), 'COPY_FILES',
+            'FAIL', 'Files not loaded: partially loaded or failed ' || :MAX_LOAD_ATTEMPTS || ' times',
+            0, :given_up_cnt, 0, NULL, NULL, OBJECT_CONSTRUCT('files', :given_up_files)
         );
+        RETURN 'FAILED: ' || :given_up_cnt || ' files not loaded';
+    END IF;
+
+    RETURN 'SUCCESS';
 
+EXCEPTION
+    WHEN OTHER THEN
+    
+        ROLLBACK;
+        
+        LET err_code STRING := SQLCODE;
+        LET err_msg STRING := SQLERRM;
+        LET err_state STRING := SQLSTATE;
+        LET err_details VARIANT := OBJECT_CONSTRUCT(
+            'failed_at_table', :current_table,
+            'failed_at_path',  :current_path,
+            'sql_state',       :err_state
+        );
+        
+        step_duration := DATEDIFF('millisecond', :step_start_ts, CURRENT_TIMESTAMP()) / 1000;        
+        
         CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'BRONZE', 'LOAD_BRONZE', UPPER(:current_table), 'COPY', 
-            'SUCCESS', 'File Loaded', :rows_cnt, 0, :step_duration, NULL, NULL, :custom_meta
+            'FAIL', :err_msg, 0, 0, :step_duration, :err_code, :err_state, :err_details
         );
-        
+        RETURN 'FAILED: ' || :err_msg;
+END;
+$$;
+
+
+-- ###################################
+-- PROC LOAD_BRONZE_MASTER (Loading files)
+-- ###################################
+-- Tables are loaded as ASYNC child jobs, MAX_CONCURRENCY (BRONZE_INGESTION_CONFIG) at a time.
+-- Each table commits on its own: a failed table is logged and fails the master at the end,
+-- without rolling back the tables that loaded fine.
+CREATE OR REPLACE PROCEDURE ECOMMERCE.BRONZE.LOAD_BRONZE_MASTER(RUN_ID STRING)
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+    c1 CURSOR FOR 
+        SELECT TABLE_NAME 
+        FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG 
+        WHERE IS_ACTIVE = TRUE
+        ORDER BY CONFIG_ID;
+
+    current_table STRING;
+    max_concurrency NUMBER;
+    running_cnt NUMBER DEFAULT 0;
+    tables_cnt NUMBER DEFAULT 0;
+    failed_cnt NUMBER;
+    failed_tables VARIANT;
+
+    proc_start_ts TIMESTAMP;
+    total_duration NUMBER(12,3);
+
+    bronze_load_failed EXCEPTION (-20001, 'One or more Bronze tables failed to load. See ETL_LOGS of this run.');
+    
+BEGIN
+    proc_start_ts := CURRENT_TIMESTAMP();
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'BRONZE', 'MASTER', NULL);
+
+    -- Events of this batch are written to ETL_LOGS in one insert at the end (FLUSH_LOG_BUFFER)
+    CALL ECOMMERCE.COMMON.START_LOG_BUFFER();
+
+    CALL ECOMMERCE.COMMON.LOG_EVENT(:RUN_ID, 'BRONZE', 'MASTER', NULL, 'INIT', 'START', 'Starting Bronze Loop', 0, 0, 0, NULL, NULL, NULL);
+    
+
+    -- ###################################
+    -- REGISTER NEW RUN MANIFESTS
+    -- ###################################
+    -- Before any table load, so that every table sees the files of the same manifests.
+
+    CALL ECOMMERCE.BRONZE.REGISTER_RUN_MANIFESTS(:RUN_ID);
+
+
+    -- ###################################
+    -- LOAD TABLES (parallel)
+    -- ###################################
+
+    SELECT COALESCE(MIN(MAX_CONCURRENCY), 1)
+    INTO :max_concurrency
+    FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+    WHERE IS_ACTIVE = TRUE;
+
+    max_concurrency := GREATEST(:max_concurrency, 1);
+    
+    OPEN c1;
+    FOR record IN c1 DO
+        current_table := record.TABLE_NAME;
+
+        ASYNC (CALL ECOMMERCE.BRONZE.LOAD_BRONZE_TABLE(:RUN_ID, :current_table));
+        running_cnt := running_cnt + 1;
+        tables_cnt := tables_cnt + 1;
+
+        IF (running_cnt >= max_concurrency) THEN
+            AWAIT ALL;
+            running_cnt := 0;
+        END IF;
     END FOR;
     CLOSE c1;
 
-    COMMIT;
+    AWAIT ALL;
+    current_table := NULL;
+
+    -- Child jobs report failures through LOG_EVENT (see LOAD_BRONZE_TABLE). Only this call's
+    -- events count: a rerun (etl_orchestrator.py --run-id) reuses the RUN_ID of the earlier attempt.
+    SELECT COUNT(*), ARRAY_AGG(TARGET_TABLE)
+    INTO :failed_cnt, :failed_tables
+    FROM ECOMMERCE.COMMON.ETL_LOGS
+    WHERE PIPELINE_RUN_ID = :RUN_ID
+      AND LAYER = 'BRONZE'
+      AND PROCESS_NAME = 'LOAD_BRONZE'
+      AND STATUS = 'FAIL'
+      AND CREATED_AT >= :proc_start_ts;
+
+    IF (failed_cnt > 0) THEN
+        current_table := ARRAY_TO_STRING(:failed_tables, ',');
+        RAISE bronze_load_failed;
+    END IF;
     
 
     -- ###################################
@@ -144,22 +685,22 @@ BEGIN
     total_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     CALL ECOMMERCE.COMMON.LOG_EVENT(
         :RUN_ID, 'BRONZE', 'MASTER', NULL, 'FINISH', 
-        'SUCCESS', 'Bronze Loop Completed', 0, 0, :total_duration, NULL, NULL, NULL
+        'SUCCESS', 'Bronze Loop Completed', 0, 0, :total_duration, NULL, NULL,
+        OBJECT_CONSTRUCT('tables', :tables_cnt, 'max_concurrency', :max_concurrency)
     );
     
+    CALL ECOMMERCE.COMMON.FLUSH_LOG_BUFFER();
+
     RETURN 'BRONZE MASTER LOAD COMPLETED SUCCESSFULLY';
 
 EXCEPTION
     WHEN OTHER THEN
-    
-        ROLLBACK;
         
         LET err_code STRING := SQLCODE;
         LET err_msg STRING := SQLERRM;
         LET err_state STRING := SQLSTATE;
         LET err_details VARIANT := OBJECT_CONSTRUCT(
             'failed_at_table', :current_table,
-            'failed_at_path',  :current_path,
             'sql_state',       :err_state
         );
         
@@ -169,10 +710,385 @@ EXCEPTION
             :RUN_ID, 'BRONZE', 'MASTER', UPPER(:current_table), 'FAILURE', 
             'FAIL', :err_msg, 0, 0, :total_duration, :err_code, :err_state, :err_details
         );
+
+        CALL ECOMMERCE.COMMON.FLUSH_LOG_BUFFER();
+
+        RAISE;
+END;
+$$;
+
+-- ##########################################################################################################
+-- BRONZE MAINTENANCE
+-- ##########################################################################################################
+-- Keeps Bronze tables and stream scans bounded by recent data (ROW_RETENTION_* in BRONZE_INGESTION_CONFIG)
+-- and reports streams before they go stale. Loaded source files are archived / purged by
+-- scripts/bronze_maintenance.py (FILE_RETENTION_*), which calls MAINTAIN_BRONZE_MASTER afterwards.
+-- MAINTAIN_BRONZE_TASK runs the master daily, also when no pipeline runs (suspended until resumed).
+
+-- ###################################
+-- PROC CHECK_STREAM_STALENESS (Streams close to their retention limit)
+-- ###################################
+-- A stream goes stale when its offset is older than the data retention of its table (extended up to
+-- MAX_DATA_EXTENSION_TIME_IN_DAYS), e.g. after two weeks without pipeline runs. Its consumer then
+-- has to re-read the whole source table (LOAD_MODE = 'BACKFILL'). Stale streams are logged as FAIL,
+-- streams going stale within WARN_DAYS as WARN. Returns {"streams": n, "stale": [...], "warn": [...]}.
+CREATE OR REPLACE PROCEDURE ECOMMERCE.COMMON.CHECK_STREAM_STALENESS(RUN_ID STRING, WARN_DAYS NUMBER DEFAULT 3)
+RETURNS VARIANT
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+    streams_cnt NUMBER;
+    stale_streams VARIANT;
+    warn_streams VARIANT;
+    check_status STRING;
+    check_message STRING;
+BEGIN
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'COMMON', 'CHECK_STREAM_STALENESS', NULL);
+
+    SHOW STREAMS IN DATABASE ECOMMERCE;
+
+    -- ARRAY_AGG skips the NULLs of healthy streams
+    SELECT COUNT(*),
+           ARRAY_AGG(IFF("stale" = 'true', "schema_name" || '.' || "name", NULL)),
+           ARRAY_AGG(IFF("stale" != 'true' AND "stale_after" < DATEADD(day, :WARN_DAYS, CURRENT_TIMESTAMP()),
+                         OBJECT_CONSTRUCT('stream', "schema_name" || '.' || "name", 'stale_after', "stale_after"),
+                         NULL))
+    INTO :streams_cnt, :stale_streams, :warn_streams
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+
+    IF (ARRAY_SIZE(:stale_streams) > 0) THEN
+        check_status := 'FAIL';
+        check_message := 'Stale streams: reload their consumers with LOAD_MODE BACKFILL';
+    ELSEIF (ARRAY_SIZE(:warn_streams) > 0) THEN
+        check_status := 'WARN';
+        check_message := 'Streams go stale within ' || :WARN_DAYS || ' days: run the pipeline to consume them';
+    ELSE
+        check_status := 'SUCCESS';
+        check_message := 'No stream goes stale within ' || :WARN_DAYS || ' days';
+    END IF;
+
+    CALL ECOMMERCE.COMMON.LOG_EVENT(
+        :RUN_ID, 'COMMON', 'CHECK_STREAM_STALENESS', NULL, 'CHECK',
+        :check_status, :check_message, :streams_cnt, ARRAY_SIZE(:stale_streams) + ARRAY_SIZE(:warn_streams), 0,
+        NULL, NULL, OBJECT_CONSTRUCT('stale', :stale_streams, 'warn', :warn_streams, 'warn_days', :WARN_DAYS)
+    );
+
+    RETURN OBJECT_CONSTRUCT('streams', :streams_cnt, 'stale', :stale_streams, 'warn', :warn_streams);
+END;
+$$;
+
+
+-- ###################################
+-- PROC PRUNE_BRONZE_TABLE (Row retention of one table)
+-- ###################################
+-- Only rows Silver has consumed are pruned: the watermark is the retention cutoff, or the oldest row
+-- still waiting in the table's (append-only) stream if that is earlier. Deletes are not recorded by
+-- append-only streams, so pruning never produces change records.
+--   COMPACT - deletes rows superseded by a later version of the same key (key / version = first /
+--             second TYPED_COLUMNS entry, ingestion order without a version). A BACKFILL of Silver
+--             from Bronze still yields the current state; the full history stays in the source files.
+--   DELETE  - deletes every row below the watermark.
+-- Like LOAD_BRONZE_TABLE, a failure is logged and returned instead of raised.
+CREATE OR REPLACE PROCEDURE ECOMMERCE.BRONZE.PRUNE_BRONZE_TABLE(RUN_ID STRING, TARGET_TABLE STRING)
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+    current_table STRING;
+    stream_name STRING;
+    retention_days NUMBER;
+    retention_action STRING;
+    typed_columns STRING;
+    key_column STRING;
+    version_column STRING;
+    sql_command STRING;
+
+    cutoff_ts TIMESTAMP_NTZ;
+    pending_ts TIMESTAMP_NTZ;
+    watermark_ts TIMESTAMP_NTZ;
+
+    rows_cnt NUMBER;
+    step_start_ts TIMESTAMP;
+    step_duration NUMBER(12,3);
+    custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+
+BEGIN
+    step_start_ts := CURRENT_TIMESTAMP();
+    current_table := LOWER(:TARGET_TABLE);
+    stream_name := 'ECOMMERCE.BRONZE.' || :current_table || '_stream';
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', UPPER(:current_table));
+
+    SELECT ROW_RETENTION_DAYS,
+           UPPER(COALESCE(ROW_RETENTION_ACTION, 'COMPACT')),
+           TYPED_COLUMNS
+    INTO :retention_days, :retention_action, :typed_columns
+    FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+    WHERE LOWER(TABLE_NAME) = :current_table
+    LIMIT 1;
+
+    IF (retention_days IS NULL) THEN
+        RETURN 'SKIPPED: no ROW_RETENTION_DAYS';
+    END IF;
+
+    -- TYPED_COLUMNS 'order_id:NUMBER,updated_at:TIMESTAMP_NTZ': key order_id, version updated_at
+    key_column := NULLIF(TRIM(SPLIT_PART(SPLIT_PART(COALESCE(:typed_columns, ''), ',', 1), ':', 1)), '');
+    version_column := COALESCE(NULLIF(TRIM(SPLIT_PART(SPLIT_PART(COALESCE(:typed_columns, ''), ',', 2), ':', 1)), ''),
+                               'ingestion_ts');
+
+    IF (retention_action = 'COMPACT' AND key_column IS NULL) THEN
+        CALL ECOMMERCE.COMMON.LOG_EVENT(
+            :RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', UPPER(:current_table), 'PRUNE',
+            'WARN', 'COMPACT needs a key column in TYPED_COLUMNS, table not pruned', 0, 0, 0, NULL, NULL, NULL
+        );
+        RETURN 'SKIPPED: no key column';
+    END IF;
+
+    -- Reading a stream does not move its offset
+    cutoff_ts := DATEADD(day, -:retention_days, CURRENT_TIMESTAMP())::TIMESTAMP_NTZ;
+    SELECT MIN(ingestion_ts) INTO :pending_ts FROM IDENTIFIER(:stream_name);
+    watermark_ts := LEAST(:cutoff_ts, COALESCE(:pending_ts, :cutoff_ts));
+
+    IF (retention_action = 'DELETE') THEN
+        sql_command := 'DELETE FROM ECOMMERCE.BRONZE.' || :current_table || ' WHERE ingestion_ts < ?';
+    ELSE
+        sql_command := '
+            DELETE FROM ECOMMERCE.BRONZE.' || :current_table || ' b
+            USING (
+                SELECT ' || :key_column || ' AS key_value,
+                       ' || :version_column || ' AS keep_version,
+                       ingestion_ts AS keep_ts
+                FROM ECOMMERCE.BRONZE.' || :current_table || '
+                WHERE ' || :key_column || ' IS NOT NULL
+                QUALIFY ROW_NUMBER() OVER (
+                    PARTITION BY ' || :key_column || '
+                    ORDER BY ' || :version_column || ' DESC NULLS LAST, ingestion_ts DESC
+                ) = 1
+            ) k
+            WHERE b.' || :key_column || ' = k.key_value
+              AND b.ingestion_ts < ?
+              AND (b.' || :version_column || ' < k.keep_version OR b.ingestion_ts < k.keep_ts)
+        ';
+    END IF;
+
+    EXECUTE IMMEDIATE :sql_command USING (watermark_ts);
+    rows_cnt := SQLROWCOUNT;
+    query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+    step_duration := DATEDIFF('millisecond', :step_start_ts, CURRENT_TIMESTAMP()) / 1000;
+
+    custom_meta := OBJECT_CONSTRUCT(
+        'retention_action', :retention_action,
+        'retention_days',   :retention_days,
+        'key_column',       IFF(:retention_action = 'COMPACT', :key_column, NULL),
+        'version_column',   IFF(:retention_action = 'COMPACT', :version_column, NULL),
+        'cutoff_ts',        :cutoff_ts,
+        'oldest_pending',   :pending_ts,
+        'watermark_ts',     :watermark_ts,
+        'query_ids',        :query_ids
+    );
+
+    CALL ECOMMERCE.COMMON.LOG_EVENT(
+        :RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', UPPER(:current_table), 'PRUNE',
+        'SUCCESS', 'Consumed rows pruned', :rows_cnt, 0, :step_duration, NULL, NULL, :custom_meta
+    );
+
+    RETURN 'SUCCESS';
+
+EXCEPTION
+    WHEN OTHER THEN
+
+        LET err_code STRING := SQLCODE;
+        LET err_msg STRING := SQLERRM;
+        LET err_state STRING := SQLSTATE;
+        LET err_details VARIANT := OBJECT_CONSTRUCT(
+            'failed_at_table', :current_table,
+            'watermark_ts',    :watermark_ts,
+            'sql_state',       :err_state
+        );
+
+        step_duration := DATEDIFF('millisecond', :step_start_ts, CURRENT_TIMESTAMP()) / 1000;
+
+        CALL ECOMMERCE.COMMON.LOG_EVENT(
+            :RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', UPPER(:current_table), 'PRUNE',
+            'FAIL', :err_msg, 0, 0, :step_duration, :err_code, :err_state, :err_details
+        );
+        RETURN 'FAILED: ' || :err_msg;
+END;
+$$;
+
+
+-- ###################################
+-- PROC MAINTAIN_BRONZE_MASTER (Row retention & stream check)
+-- ###################################
+-- Checks the streams first: a table whose stream is stale is not pruned, as its consumer has to
+-- re-read the whole table. Tables are pruned as ASYNC child jobs, MAX_CONCURRENCY at a time.
+-- Fails (the alert of the scheduled task and of bronze_maintenance.py) when a table could not be
+-- pruned or a stream is stale or goes stale within WARN_DAYS.
+CREATE OR REPLACE PROCEDURE ECOMMERCE.BRONZE.MAINTAIN_BRONZE_MASTER(RUN_ID STRING, WARN_DAYS NUMBER DEFAULT 3)
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+    c1 CURSOR FOR
+        SELECT TABLE_NAME
+        FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+        WHERE IS_ACTIVE = TRUE
+          AND ROW_RETENTION_DAYS IS NOT NULL
+        ORDER BY CONFIG_ID;
+
+    current_table STRING;
+    stream_check VARIANT;
+    max_concurrency NUMBER;
+    running_cnt NUMBER DEFAULT 0;
+    tables_cnt NUMBER DEFAULT 0;
+    skipped_tables VARIANT;
+    failed_cnt NUMBER;
+    failed_tables VARIANT;
+
+    proc_start_ts TIMESTAMP;
+    total_duration NUMBER(12,3);
+
+    bronze_prune_failed EXCEPTION (-20002, 'One or more Bronze tables failed to prune. See ETL_LOGS of this run.');
+    streams_going_stale EXCEPTION (-20003, 'Streams are stale or go stale soon. See CHECK_STREAM_STALENESS in ETL_LOGS of this run.');
+
+BEGIN
+    proc_start_ts := CURRENT_TIMESTAMP();
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', NULL);
+    CALL ECOMMERCE.COMMON.START_LOG_BUFFER();
+
+    CALL ECOMMERCE.COMMON.LOG_EVENT(:RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', NULL, 'INIT', 'START', 'Starting Bronze Maintenance', 0, 0, 0, NULL, NULL, NULL);
+
+
+    -- ###################################
+    -- STREAM STALENESS
+    -- ###################################
+
+    CALL ECOMMERCE.COMMON.CHECK_STREAM_STALENESS(:RUN_ID, :WARN_DAYS);
+    SELECT $1 INTO :stream_check FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+    skipped_tables := ARRAY_CONSTRUCT();
+
+
+    -- ###################################
+    -- PRUNE TABLES (parallel)
+    -- ###################################
+
+    SELECT COALESCE(MIN(MAX_CONCURRENCY), 1)
+    INTO :max_concurrency
+    FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+    WHERE IS_ACTIVE = TRUE;
+
+    max_concurrency := GREATEST(:max_concurrency, 1);
+
+    OPEN c1;
+    FOR record IN c1 DO
+        current_table := record.TABLE_NAME;
+
+        IF (ARRAY_CONTAINS(('BRONZE.' || UPPER(:current_table) || '_STREAM')::VARIANT, :stream_check:stale)) THEN
+            skipped_tables := ARRAY_APPEND(:skipped_tables, :current_table);
+        ELSE
+            ASYNC (CALL ECOMMERCE.BRONZE.PRUNE_BRONZE_TABLE(:RUN_ID, :current_table));
+            running_cnt := running_cnt + 1;
+            tables_cnt := tables_cnt + 1;
+
+            IF (running_cnt >= max_concurrency) THEN
+                AWAIT ALL;
+                running_cnt := 0;
+            END IF;
+        END IF;
+    END FOR;
+    CLOSE c1;
+
+    AWAIT ALL;
+    current_table := NULL;
+
+    IF (ARRAY_SIZE(:skipped_tables) > 0) THEN
+        CALL ECOMMERCE.COMMON.LOG_EVENT(
+            :RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', NULL, 'PRUNE',
+            'WARN', 'Tables with a stale stream not pruned (needed for the BACKFILL)', 0, ARRAY_SIZE(:skipped_tables), 0,
+            NULL, NULL, OBJECT_CONSTRUCT('tables', :skipped_tables)
+        );
+    END IF;
+
+    -- Child jobs report failures through LOG_EVENT (see PRUNE_BRONZE_TABLE), only this call's count
+    SELECT COUNT(*), ARRAY_AGG(TARGET_TABLE)
+    INTO :failed_cnt, :failed_tables
+    FROM ECOMMERCE.COMMON.ETL_LOGS
+    WHERE PIPELINE_RUN_ID = :RUN_ID
+      AND LAYER = 'BRONZE'
+      AND PROCESS_NAME = 'MAINTAIN_BRONZE'
+      AND STEP_NAME = 'PRUNE'
+      AND STATUS = 'FAIL'
+      AND CREATED_AT >= :proc_start_ts;
+
+    IF (failed_cnt > 0) THEN
+        current_table := ARRAY_TO_STRING(:failed_tables, ',');
+        RAISE bronze_prune_failed;
+    END IF;
+
+    IF (ARRAY_SIZE(:stream_check:stale) > 0 OR ARRAY_SIZE(:stream_check:warn) > 0) THEN
+        RAISE streams_going_stale;
+    END IF;
+
+
+    -- ###################################
+    -- FINISH
+    -- ###################################
+
+    total_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
+    CALL ECOMMERCE.COMMON.LOG_EVENT(
+        :RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', NULL, 'FINISH',
+        'SUCCESS', 'Bronze Maintenance Completed', 0, 0, :total_duration, NULL, NULL,
+        OBJECT_CONSTRUCT('tables', :tables_cnt, 'streams', :stream_check:streams, 'max_concurrency', :max_concurrency)
+    );
+
+    CALL ECOMMERCE.COMMON.FLUSH_LOG_BUFFER();
+
+    RETURN 'BRONZE MAINTENANCE COMPLETED SUCCESSFULLY';
+
+EXCEPTION
+    WHEN OTHER THEN
+
+        LET err_code STRING := SQLCODE;
+        LET err_msg STRING := SQLERRM;
+        LET err_state STRING := SQLSTATE;
+        LET err_details VARIANT := OBJECT_CONSTRUCT(
+            'failed_at_table', :current_table,
+            'stream_check',    :stream_check,
+            'sql_state',       :err_state
+        );
+
+        total_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
+
+        CALL ECOMMERCE.COMMON.LOG_EVENT(
+            :RUN_ID, 'BRONZE', 'MAINTAIN_BRONZE', UPPER(:current_table), 'FAILURE',
+            'FAIL', :err_msg, 0, 0, :total_duration, :err_code, :err_state, :err_details
+        );
+
+        CALL ECOMMERCE.COMMON.FLUSH_LOG_BUFFER();
+
         RAISE;
 END;
 $$;
 
+-- Runs without the pipeline, so streams going stale are reported although no load runs.
+-- Raw files are not touched here (storage access): run scripts/bronze_maintenance.py for them.
+-- Created suspended (also when a deploy replaces it): enable it once retention is configured with
+--   ALTER TASK ECOMMERCE.BRONZE.MAINTAIN_BRONZE_TASK RESUME;
+CREATE OR REPLACE TASK ECOMMERCE.BRONZE.MAINTAIN_BRONZE_TASK
+    WAREHOUSE = ETL_WH
+    SCHEDULE = 'USING CRON 0 4 * * * UTC'
+    COMMENT = 'Daily Bronze row retention and stream staleness check (failed runs = stale streams or prune errors)'
+AS
+    CALL ECOMMERCE.BRONZE.MAINTAIN_BRONZE_MASTER('BRONZE_MAINTENANCE_' || TO_CHAR(CURRENT_TIMESTAMP(), 'YYYYMMDD_HH24MISS'), 3);
+
+
 
 
 
@@ -181,11 +1097,138 @@ $$;
 -- SILVER LAYER PROCEDURES
 -- ##########################################################################################################
 
+-- Silver and Gold procedures take an optional LOAD_MODE:
+--   INCREMENTAL (default) - MERGE of the stream changes
+--   BACKFILL              - rebuild of the target from its whole source table with set-based inserts
+--   AUTO                  - BACKFILL when the target is empty, INCREMENTAL otherwise
+-- The single-argument versions they replace are dropped, so CALL <proc>(:RUN_ID) stays unambiguous.
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_ORDERS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_ORDER_ITEMS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_ORDER_STATUS_HISTORY(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_PAYMENTS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_SHIPMENTS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_PRODUCTS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_CUSTOMERS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_ADDRESSES(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.SILVER.LOAD_SILVER_MASTER(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.GOLD.LOAD_DIM_PRODUCTS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.GOLD.LOAD_DIM_CUSTOMERS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.GOLD.LOAD_FACT_ORDERS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.GOLD.LOAD_FACT_SALES(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.GOLD.LOAD_FACT_SHIPMENTS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.GOLD.LOAD_FACT_PAYMENTS(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.GOLD.LOAD_FACT_ORDER_STATUS_HISTORY(STRING);
+DROP PROCEDURE IF EXISTS ECOMMERCE.GOLD.LOAD_GOLD_MASTER(STRING);
+
+-- ###################################
+-- PROC STAGE_DQ_ROWS (Single-pass DQ split of one Bronze stream)
+-- ###################################
+-- Shared by the Silver procedures and run inside their transaction. Reads the Bronze stream once
+-- (BACKFILL: the whole Bronze table, the stream is still read so its offset moves past the rows),
+-- parses each row into the typed columns of COMMON.DQ_COLUMNS and validates them against
+-- COMMON.DQ_RULES: failed rows go to COMMON.DQ_ERRORS, valid rows to SILVER.<table>_dq_stage.
+-- Returns {rows, errors}; the caller merges the staged rows and deletes them afterwards.
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.STAGE_DQ_ROWS(RUN_ID STRING, TARGET_TABLE STRING, RUN_MODE STRING)
+RETURNS VARIANT
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+    current_table STRING;
+    stage_table STRING;
+    key_column STRING;
+    column_list STRING;
+    projection STRING;
+    error_cases STRING;
+    message_cases STRING;
+    sql_command STRING;
+
+    rows_cnt NUMBER;
+    staged_cnt NUMBER;
+
+    dq_columns_missing EXCEPTION (-20004, 'No COMMON.DQ_COLUMNS entries for the Silver table.');
+
+BEGIN
+    current_table := LOWER(:TARGET_TABLE);
+    stage_table := 'ECOMMERCE.SILVER.' || :current_table || '_dq_stage';
+
+    SELECT LISTAGG(COLUMN_NAME, ', ') WITHIN GROUP (ORDER BY COLUMN_ORDER),
+           LISTAGG(EXPRESSION || ' AS ' || COLUMN_NAME, ',\n') WITHIN GROUP (ORDER BY COLUMN_ORDER),
+           MAX(IFF(COLUMN_ORDER = 1, COLUMN_NAME, NULL))
+    INTO :column_list, :projection, :key_column
+    FROM ECOMMERCE.COMMON.DQ_COLUMNS
+    WHERE TARGET_TABLE = :current_table;
+
+    IF (column_list IS NULL) THEN
+        RAISE dq_columns_missing;
+    END IF;
+
+    -- No rules: every row is valid (CASE WHEN FALSE THEN NULL END)
+    SELECT COALESCE(LISTAGG('WHEN ' || PREDICATE || ' THEN ''' || RULE_CODE || '''', '\n') WITHIN GROUP (ORDER BY RULE_ORDER),
+                    'WHEN FALSE THEN NULL'),
+           COALESCE(LISTAGG('WHEN ' || PREDICATE || ' THEN ''Validation failed: ' || REPLACE(PREDICATE, '''', '''''') || '''', '\n')
+                        WITHIN GROUP (ORDER BY RULE_ORDER),
+                    'WHEN FALSE THEN NULL')
+    INTO :error_cases, :message_cases
+    FROM ECOMMERCE.COMMON.DQ_RULES
+    WHERE TARGET_TABLE = :current_table;
+
+    -- Rules are evaluated over the projected columns (outer query), never over same-named
+    -- typed Bronze columns. Literals are selected as columns: INSERT ALL VALUES only take columns.
+    sql_command := '
+        INSERT ALL
+            WHEN dq_error IS NOT NULL THEN
+                INTO ECOMMERCE.COMMON.DQ_ERRORS (
+                    RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
+                )
+                VALUES (run_id, dq_layer, dq_source, dq_target, record_key, payload, dq_error, dq_message)
+            ELSE
+                INTO ' || :stage_table || ' (run_id, ' || :column_list || ', source_file, ingestion_ts)
+                VALUES (run_id, ' || :column_list || ', source_file, ingestion_ts)
+        SELECT
+            ?                                   AS run_id,
+            ''SILVER''                          AS dq_layer,
+            ''' || :current_table || '_stream'' AS dq_source,
+            ''' || :current_table || '''        AS dq_target,
+            TO_VARCHAR(' || :key_column || ')  AS record_key,
+            t.*,
+            CASE ' || :error_cases || ' END     AS dq_error,
+            CASE ' || :message_cases || ' END   AS dq_message
+        FROM (
+            SELECT
+                ' || :projection || ',
+                payload,
+                source_file,
+                ingestion_ts
+            FROM (
+                SELECT * EXCLUDE (metadata$action, metadata$isupdate, metadata$row_id)
+                FROM ECOMMERCE.BRONZE.' || :current_table || '_stream
+                WHERE metadata$action = ''INSERT'' AND ? = ''INCREMENTAL''
+                UNION ALL
+                SELECT *
+                FROM ECOMMERCE.BRONZE.' || :current_table || '
+                WHERE ? = ''BACKFILL''
+            )
+        ) t
+    ';
+
+    EXECUTE IMMEDIATE :sql_command USING (RUN_ID, RUN_MODE, RUN_MODE);
+    rows_cnt := SQLROWCOUNT;
+    LET stage_query_id STRING := SQLID;
+
+    SELECT COUNT(*) INTO :staged_cnt FROM IDENTIFIER(:stage_table) WHERE run_id = :RUN_ID;
+
+    RETURN OBJECT_CONSTRUCT('rows', :rows_cnt, 'errors', :rows_cnt - :staged_cnt, 'query_id', :stage_query_id);
+END;
+$$;
+
+
 -- ###################################
 -- PROC LOAD_SILVER_ORDERS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_ORDERS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_ORDERS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -197,11 +1240,22 @@ DECLARE
     rows_cnt NUMBER;
     error_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'ORDERS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.SILVER.orders;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -209,102 +1263,88 @@ BEGIN
         :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INIT',
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
-    
-    -- Data Quality Checks
-    INSERT INTO ECOMMERCE.COMMON.DQ_ERRORS (
-        RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
-    )
-    SELECT 
-        :RUN_ID, 
-        'SILVER', 
-        'orders_stream', 
-        'orders', 
-        payload:order_id::STRING, 
-        payload, 
-        CASE 
-            WHEN payload:order_total_amount::NUMBER(18,2) < 0 THEN 'NEGATIVE_AMOUNT'
-            WHEN payload:customer_id IS NULL THEN 'MISSING_CUSTOMER'
-            WHEN payload:created_at::TIMESTAMP_NTZ IS NULL THEN 'MISSING_DATE'
-            ELSE 'UNKNOWN'
-        END,
-        'Validation Failed'
-    FROM ECOMMERCE.BRONZE.orders_stream
-    WHERE metadata$action = 'INSERT'
-      AND ( 
-          payload:order_total_amount::NUMBER(18,2) < 0 
-          OR payload:customer_id IS NULL
-          OR payload:created_at::TIMESTAMP_NTZ IS NULL
-      );
-
-    error_cnt := SQLROWCOUNT;
-
-
-    -- Main Merge Logic
-    MERGE INTO ECOMMERCE.SILVER.orders s
-    USING (
+
+    -- Single pass over the stream: typed, validated rows go to the DQ stage read by the MERGE,
+    -- failed rows to DQ_ERRORS (columns and rules: COMMON.DQ_COLUMNS / COMMON.DQ_RULES)
+    CALL ECOMMERCE.SILVER.STAGE_DQ_ROWS(:RUN_ID, 'orders', :run_mode);
+    SELECT $1:errors::NUMBER, ARRAY_APPEND(:query_ids, $1:query_id) INTO :error_cnt, :query_ids
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild: one set-based insert of the deduplicated stage, in clustering order
+        DELETE FROM ECOMMERCE.SILVER.orders;
+
+        INSERT INTO ECOMMERCE.SILVER.orders (
+            order_id, customer_id, order_status, order_total_amount, currency, created_at,
+            create_date, updated_at, hash_value, source_file, ingestion_ts
+        )
         SELECT
-            payload:order_id::NUMBER            AS order_id,
-            payload:customer_id::NUMBER         AS customer_id,
-            payload:order_status::STRING        AS order_status,
-            payload:order_total_amount::NUMBER(18,2) AS order_total_amount,
-            payload:currency::STRING            AS currency,
-            payload:created_at::TIMESTAMP_NTZ   AS created_at,
-            CAST(payload:created_at::TIMESTAMP_NTZ AS DATE) as create_date,
-            payload:updated_at::TIMESTAMP_NTZ   AS updated_at,
-    
-            SHA2_HEX(CONCAT_WS('|',
-                COALESCE(payload:order_status::STRING, ''),
-                COALESCE(payload:order_total_amount::STRING, '0'),
-                COALESCE(payload:currency::STRING, '')
-            )) AS hash_value,
-        
-            source_file
-        FROM ECOMMERCE.BRONZE.orders_stream
-        WHERE metadata$action = 'INSERT'
-          AND NOT (
-              payload:order_total_amount::NUMBER(18,2) < 0 
-              OR payload:customer_id IS NULL
-              OR payload:created_at::TIMESTAMP_NTZ IS NULL
-          )
-        QUALIFY ROW_NUMBER() OVER (
-            PARTITION BY payload:order_id::NUMBER 
-            ORDER BY payload:updated_at::TIMESTAMP_NTZ DESC, ingestion_ts DESC
-        ) = 1
-    ) r
-    ON s.order_id = r.order_id
-    WHEN MATCHED 
-        --AND r.updated_at > s.updated_at 
-        AND r.hash_value != s.hash_value
-    THEN 
-        UPDATE SET 
-        customer_id         = r.customer_id,
-        order_status        = r.order_status,
-        order_total_amount  = r.order_total_amount,
-        currency            = r.currency,
-        hash_value          = r.hash_value,
+            r.order_id, r.customer_id, r.order_status, r.order_total_amount, r.currency,
+            r.created_at, r.create_date, r.updated_at, r.hash_value, r.source_file,
+            CURRENT_TIMESTAMP()
+        FROM (
+            SELECT *
+            FROM ECOMMERCE.SILVER.orders_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY order_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ORDER BY r.order_id;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    ELSE
+        MERGE INTO ECOMMERCE.SILVER.orders s
+        USING (
+            SELECT *
+            FROM ECOMMERCE.SILVER.orders_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY order_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ON s.order_id = r.order_id
+        WHEN MATCHED 
+            --AND r.updated_at > s.updated_at 
+            AND r.hash_value != s.hash_value
+        THEN 
+            UPDATE SET 
+            customer_id         = r.customer_id,
+            order_status        = r.order_status,
+            order_total_amount  = r.order_total_amount,
+            currency            = r.currency,
+            hash_value          = r.hash_value,
         
-        updated_at          = r.updated_at,
-        source_file         = r.source_file,
-        ingestion_ts        = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN 
-    INSERT (
-        order_id, customer_id, order_status, order_total_amount, currency, 
-        created_at, create_date, updated_at, 
-        hash_value, source_file, ingestion_ts
-    )
-    VALUES (
-        r.order_id, r.customer_id, r.order_status, r.order_total_amount, r.currency,
-        r.created_at, r.create_date, r.updated_at, 
-        r.hash_value, r.source_file, CURRENT_TIMESTAMP()
-    );
-    
-    rows_cnt := SQLROWCOUNT;
+            updated_at          = r.updated_at,
+            source_file         = r.source_file,
+            ingestion_ts        = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN 
+        INSERT (
+            order_id, customer_id, order_status, order_total_amount, currency, 
+            created_at, create_date, updated_at, 
+            hash_value, source_file, ingestion_ts
+        )
+        VALUES (
+            r.order_id, r.customer_id, r.order_status, r.order_total_amount, r.currency,
+            r.created_at, r.create_date, r.updated_at, 
+            r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+        );
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
+    DELETE FROM ECOMMERCE.SILVER.orders_dq_stage WHERE run_id = :RUN_ID;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_DEDUP',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_DEDUP'),
+        'load_mode',     :run_mode,
         'source_obj',    'BRONZE.orders_stream',
         'business_key',  'order_id',
-        'description',   'Deduplication based on updated_at'
+        'description',   'Deduplication based on updated_at',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -347,7 +1387,7 @@ $$;
 -- PROC LOAD_SILVER_ORDER_ITEMS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_ORDER_ITEMS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_ORDER_ITEMS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -359,11 +1399,22 @@ DECLARE
     rows_cnt NUMBER;
     error_cnt NUMBER;    
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'ORDER_ITEMS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.SILVER.order_items;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -371,101 +1422,86 @@ BEGIN
         :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INIT',
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
-    
 
-    -- Data Quality Checks
-    INSERT INTO ECOMMERCE.COMMON.DQ_ERRORS (
-        RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
-    )
-    SELECT 
-        :RUN_ID, 
-        'SILVER', 
-        'order_items_stream', 
-        'order_items', 
-        payload:order_item_id::STRING, 
-        payload, 
-        CASE 
-            WHEN payload:unit_price::NUMBER(18,2) < 0 THEN 'NEGATIVE_UNIT_PRICE'
-            WHEN payload:product_id IS NULL THEN 'MISSING_PRODUCT'
-            WHEN payload:created_at::TIMESTAMP_NTZ IS NULL THEN 'MISSING_DATE'
-            ELSE 'UNKNOWN'
-        END,
-        'Validation Failed'
-    FROM ECOMMERCE.BRONZE.order_items_stream
-    WHERE metadata$action = 'INSERT'
-      AND ( 
-          payload:unit_price::NUMBER(18,2) < 0 
-          OR payload:product_id IS NULL
-          OR payload:created_at::TIMESTAMP_NTZ IS NULL
-      );
-
-    error_cnt := SQLROWCOUNT;
-
-
-    MERGE INTO ECOMMERCE.SILVER.order_items s
-    USING (
+    -- Single pass over the stream: typed, validated rows go to the DQ stage read by the MERGE,
+    -- failed rows to DQ_ERRORS (columns and rules: COMMON.DQ_COLUMNS / COMMON.DQ_RULES)
+    CALL ECOMMERCE.SILVER.STAGE_DQ_ROWS(:RUN_ID, 'order_items', :run_mode);
+    SELECT $1:errors::NUMBER, ARRAY_APPEND(:query_ids, $1:query_id) INTO :error_cnt, :query_ids
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild: one set-based insert of the deduplicated stage, in clustering order
+        DELETE FROM ECOMMERCE.SILVER.order_items;
+
+        INSERT INTO ECOMMERCE.SILVER.order_items (
+            order_item_id, order_id, product_id, quantity, unit_price, created_at, create_date,
+            hash_value, source_file, ingestion_ts
+        )
         SELECT
-            payload:order_item_id::NUMBER       as order_item_id,
-            payload:order_id::NUMBER            as order_id,
-            payload:product_id::NUMBER          as product_id,
-            payload:quantity::NUMBER            as quantity,
-            payload:unit_price::NUMBER(18,2)    as unit_price,
-            payload:created_at::TIMESTAMP_NTZ   as created_at,
-            CAST(payload:created_at::TIMESTAMP_NTZ AS DATE) as create_date,
-    
-            SHA2_HEX(CONCAT_WS('|',
-                COALESCE(payload:product_id::STRING, ''),
-                COALESCE(payload:quantity::STRING, ''),
-                COALESCE(payload:unit_price::STRING, '')
-            )) AS hash_value,
-        
-            source_file
-        FROM ECOMMERCE.BRONZE.order_items_stream
-        WHERE metadata$action = 'INSERT'
-          AND NOT (
-              payload:unit_price::NUMBER(18,2) < 0 
-              OR payload:product_id IS NULL
-              OR payload:created_at::TIMESTAMP_NTZ IS NULL
-          )
-        QUALIFY ROW_NUMBER() OVER (
-            PARTITION BY payload:order_item_id::NUMBER 
-            ORDER BY --payload:updated_at::TIMESTAMP_NTZ DESC,
-            ingestion_ts DESC
-        ) = 1
-    ) r
-    ON s.order_item_id = r.order_item_id
-    WHEN MATCHED 
-        --AND r.updated_at > s.updated_at 
-        AND r.hash_value != s.hash_value
-    THEN 
-        UPDATE SET 
-        product_id      = r.product_id,
-        quantity        = r.quantity,
-        unit_price      = r.unit_price,
-        hash_value      = r.hash_value,
+            r.order_item_id, r.order_id, r.product_id, r.quantity, r.unit_price, r.created_at,
+            r.create_date, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+        FROM (
+            SELECT *
+            FROM ECOMMERCE.SILVER.order_items_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY order_item_id
+                ORDER BY ingestion_ts DESC
+            ) = 1
+        ) r
+        ORDER BY r.order_id, r.order_item_id;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    ELSE
+        MERGE INTO ECOMMERCE.SILVER.order_items s
+        USING (
+            SELECT *
+            FROM ECOMMERCE.SILVER.order_items_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY order_item_id
+                ORDER BY ingestion_ts DESC
+            ) = 1
+        ) r
+        ON s.order_item_id = r.order_item_id
+        WHEN MATCHED 
+            --AND r.updated_at > s.updated_at 
+            AND r.hash_value != s.hash_value
+        THEN 
+            UPDATE SET 
+            product_id      = r.product_id,
+            quantity        = r.quantity,
+            unit_price      = r.unit_price,
+            hash_value      = r.hash_value,
         
-       -- updated_at      = r.updated_at,
-        source_file     = r.source_file,
-        ingestion_ts    = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN 
-    INSERT (
-        order_item_id, order_id, product_id, quantity, unit_price, 
-        created_at, create_date, 
-        hash_value, source_file, ingestion_ts
-    )
-    VALUES (
-        r.order_item_id, r.order_id, r.product_id, r.quantity, r.unit_price,
-        r.created_at, r.create_date, 
-        r.hash_value, r.source_file, CURRENT_TIMESTAMP()
-    );
-     
-    rows_cnt := SQLROWCOUNT;
+           -- updated_at      = r.updated_at,
+            source_file     = r.source_file,
+            ingestion_ts    = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN 
+        INSERT (
+            order_item_id, order_id, product_id, quantity, unit_price, 
+            created_at, create_date, 
+            hash_value, source_file, ingestion_ts
+        )
+        VALUES (
+            r.order_item_id, r.order_id, r.product_id, r.quantity, r.unit_price,
+            r.created_at, r.create_date, 
+            r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+        );
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
+    DELETE FROM ECOMMERCE.SILVER.order_items_dq_stage WHERE run_id = :RUN_ID;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_DEDUP',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_DEDUP'),
+        'load_mode',     :run_mode,
         'source_obj',    'BRONZE.order_items_stream',
         'business_key',  'order_item_id',
-        'description',   'Deduplication based on updated_at'
+        'description',   'Deduplication based on ingestion_ts',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -506,7 +1542,7 @@ $$;
 -- PROC LOAD_SILVER_ORDER_STATUS_HISTORY
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_ORDER_STATUS_HISTORY(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_ORDER_STATUS_HISTORY(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -518,11 +1554,22 @@ DECLARE
     rows_cnt NUMBER;
     error_cnt NUMBER;    
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'ORDER_STATUS_HISTORY';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.SILVER.order_status_history;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -530,72 +1577,67 @@ BEGIN
         :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INIT',
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
-    
 
-    
-    -- Data Quality Checks
-    INSERT INTO ECOMMERCE.COMMON.DQ_ERRORS (
-        RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
-    )
-    SELECT 
-        :RUN_ID, 
-        'SILVER', 
-        'order_status_history_stream', 
-        'order_status_history', 
-        payload:status_history_id::STRING, 
-        payload, 
-        CASE 
-            WHEN payload:order_id IS NULL THEN 'MISSING_ORDER_ID'
-            WHEN payload:status IS NULL THEN 'MISSING_STATUS'
-            ELSE 'UNKNOWN'
-        END,
-        'Validation Failed'
-    FROM ECOMMERCE.BRONZE.order_status_history_stream
-    WHERE metadata$action = 'INSERT'
-      AND ( 
-          payload:order_id IS NULL
-          OR payload:status IS NULL
-      );
-
-    error_cnt := SQLROWCOUNT;
-
-
-
-    MERGE INTO ECOMMERCE.SILVER.order_status_history s
-    USING (
-      SELECT
-        payload:status_history_id::NUMBER   as status_history_id,
-        payload:order_id::NUMBER            as order_id,
-        payload:status::STRING              as status,
-        payload:changed_at::TIMESTAMP_NTZ   as changed_at,
-        source_file
-      FROM ECOMMERCE.BRONZE.order_status_history_stream
-    WHERE metadata$action = 'INSERT'
-        AND NOT (
-          payload:order_id IS NULL
-          OR payload:status IS NULL
+    -- Single pass over the stream: typed, validated rows go to the DQ stage read by the MERGE,
+    -- failed rows to DQ_ERRORS (columns and rules: COMMON.DQ_COLUMNS / COMMON.DQ_RULES)
+    CALL ECOMMERCE.SILVER.STAGE_DQ_ROWS(:RUN_ID, 'order_status_history', :run_mode);
+    SELECT $1:errors::NUMBER, ARRAY_APPEND(:query_ids, $1:query_id) INTO :error_cnt, :query_ids
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild: one set-based insert of the deduplicated stage, in clustering order
+        DELETE FROM ECOMMERCE.SILVER.order_status_history;
+
+        INSERT INTO ECOMMERCE.SILVER.order_status_history (
+            status_history_id, order_id, status, changed_at, source_file
         )
-      QUALIFY ROW_NUMBER() OVER (
-        PARTITION BY payload:status_history_id::NUMBER 
-        ORDER BY payload:changed_at::TIMESTAMP_NTZ DESC, ingestion_ts DESC
-      ) = 1 
-    ) r
-    ON s.status_history_id = r.status_history_id
-    WHEN NOT MATCHED THEN 
-      INSERT (
-        status_history_id, order_id, status, changed_at, source_file
-      )
-      VALUES (
-        r.status_history_id, r.order_id, r.status, r.changed_at, r.source_file
-      );
-           
-    rows_cnt := SQLROWCOUNT;
+        SELECT
+            r.status_history_id, r.order_id, r.status, r.changed_at, r.source_file
+        FROM (
+            SELECT *
+            FROM ECOMMERCE.SILVER.order_status_history_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY status_history_id
+                ORDER BY changed_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ORDER BY r.order_id, r.changed_at;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    ELSE
+        MERGE INTO ECOMMERCE.SILVER.order_status_history s
+        USING (
+            SELECT *
+            FROM ECOMMERCE.SILVER.order_status_history_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY status_history_id
+                ORDER BY changed_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ON s.status_history_id = r.status_history_id
+        WHEN NOT MATCHED THEN 
+          INSERT (
+            status_history_id, order_id, status, changed_at, source_file
+          )
+          VALUES (
+            r.status_history_id, r.order_id, r.status, r.changed_at, r.source_file
+          );
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
+    DELETE FROM ECOMMERCE.SILVER.order_status_history_dq_stage WHERE run_id = :RUN_ID;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_INSERT',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_INSERT'),
+        'load_mode',     :run_mode,
         'source_obj',    'BRONZE.order_status_history_stream',
         'business_key',  'status_history_id',
-        'description',   'Transactional log (idempotent insert, no updates)'
+        'description',   'Transactional log (idempotent insert, no updates)',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INSERT',
@@ -638,7 +1680,7 @@ $$;
 -- PROC LOAD_SILVER_PAYMENTS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_PAYMENTS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_PAYMENTS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -650,11 +1692,22 @@ DECLARE
     rows_cnt NUMBER;
     error_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'PAYMENTS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.SILVER.payments;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -662,102 +1715,85 @@ BEGIN
         :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INIT',
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
-    
 
+    -- Single pass over the stream: typed, validated rows go to the DQ stage read by the MERGE,
+    -- failed rows to DQ_ERRORS (columns and rules: COMMON.DQ_COLUMNS / COMMON.DQ_RULES)
+    CALL ECOMMERCE.SILVER.STAGE_DQ_ROWS(:RUN_ID, 'payments', :run_mode);
+    SELECT $1:errors::NUMBER, ARRAY_APPEND(:query_ids, $1:query_id) INTO :error_cnt, :query_ids
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
 
-    -- Data Quality Checks
-    INSERT INTO ECOMMERCE.COMMON.DQ_ERRORS (
-        RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
-    )
-    SELECT 
-        :RUN_ID, 
-        'SILVER', 
-        'payments_stream', 
-        'payments', 
-        payload:payment_id::STRING, 
-        payload, 
-        CASE 
-            WHEN payload:payment_status IS NULL THEN 'MISSING_PAYMENT_STATUS'
-            WHEN payload:provider IS NULL THEN 'MISSING_PROVIDER'
-            WHEN payload:created_at::TIMESTAMP_NTZ IS NULL THEN 'MISSING_DATE'
-            ELSE 'UNKNOWN'
-        END,
-        'Validation Failed'
-    FROM ECOMMERCE.BRONZE.payments_stream
-    WHERE metadata$action = 'INSERT'
-      AND ( 
-          payload:payment_status IS NULL
-          OR payload:provider IS NULL
-          OR payload:created_at::TIMESTAMP_NTZ IS NULL
-      );
-
-    error_cnt := SQLROWCOUNT;
-
-
-
-    MERGE INTO ECOMMERCE.SILVER.payments s
-    USING (
-      SELECT
-        payload:payment_id::NUMBER          as payment_id,
-        payload:order_id::NUMBER            as order_id,
-        payload:provider::STRING            as provider,
-        payload:payment_status::STRING      as payment_status,
-        payload:amount::NUMBER(18,2)        as amount,
-        payload:created_at::TIMESTAMP_NTZ   as created_at,
-        CAST(payload:created_at::TIMESTAMP_NTZ AS DATE) as create_date,
-        payload:updated_at::TIMESTAMP_NTZ   as updated_at,
-    
-        SHA2_HEX(CONCAT_WS('|',
-            COALESCE(payload:provider::STRING, ''),
-            COALESCE(payload:payment_status::STRING, ''),
-            COALESCE(payload:amount::STRING, '')
-        )) AS hash_value,
-    
-        source_file    
-      FROM ECOMMERCE.BRONZE.payments_stream
-        WHERE metadata$action = 'INSERT'
-          AND NOT (
-              payload:payment_status IS NULL
-              OR payload:provider IS NULL
-              OR payload:created_at::TIMESTAMP_NTZ IS NULL
-          )
-      QUALIFY ROW_NUMBER() OVER (
-        PARTITION BY payload:payment_id::NUMBER 
-        ORDER BY payload:updated_at::TIMESTAMP_NTZ DESC, ingestion_ts DESC
-      ) = 1
-    ) r
-    ON s.payment_id = r.payment_id
-    WHEN MATCHED 
-        --AND r.updated_at > s.updated_at 
-        AND r.hash_value != s.hash_value
-    THEN 
-      UPDATE SET 
-        order_id        = r.order_id,
-        provider        = r.provider,
-        payment_status  = r.payment_status,
-        amount          = r.amount,
-        hash_value      = r.hash_value,
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild: one set-based insert of the deduplicated stage, in clustering order
+        DELETE FROM ECOMMERCE.SILVER.payments;
+
+        INSERT INTO ECOMMERCE.SILVER.payments (
+            payment_id, order_id, provider, payment_status, amount, created_at, create_date,
+            updated_at, hash_value, source_file, ingestion_ts
+        )
+        SELECT
+            r.payment_id, r.order_id, r.provider, r.payment_status, r.amount, r.created_at,
+            r.create_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+        FROM (
+            SELECT *
+            FROM ECOMMERCE.SILVER.payments_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY payment_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ORDER BY r.payment_id;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    ELSE
+        MERGE INTO ECOMMERCE.SILVER.payments s
+        USING (
+            SELECT *
+            FROM ECOMMERCE.SILVER.payments_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY payment_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ON s.payment_id = r.payment_id
+        WHEN MATCHED 
+            --AND r.updated_at > s.updated_at 
+            AND r.hash_value != s.hash_value
+        THEN 
+          UPDATE SET 
+            order_id        = r.order_id,
+            provider        = r.provider,
+            payment_status  = r.payment_status,
+            amount          = r.amount,
+            hash_value      = r.hash_value,
         
-        updated_at      = r.updated_at,
-        source_file     = r.source_file,
-        ingestion_ts    = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN 
-      INSERT (
-        payment_id, order_id, provider, payment_status, amount, created_at, create_date,
-        updated_at, hash_value, source_file, ingestion_ts
-      )
-      VALUES (
-        r.payment_id, r.order_id, r.provider, r.payment_status, r.amount, r.created_at, r.create_date,
-        r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
-      );
-           
-    rows_cnt := SQLROWCOUNT;
+            updated_at      = r.updated_at,
+            source_file     = r.source_file,
+            ingestion_ts    = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN 
+          INSERT (
+            payment_id, order_id, provider, payment_status, amount, created_at, create_date,
+            updated_at, hash_value, source_file, ingestion_ts
+          )
+          VALUES (
+            r.payment_id, r.order_id, r.provider, r.payment_status, r.amount, r.created_at, r.create_date,
+            r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+          );
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
+    DELETE FROM ECOMMERCE.SILVER.payments_dq_stage WHERE run_id = :RUN_ID;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_DEDUP',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_DEDUP'),
+        'load_mode',     :run_mode,
         'source_obj',    'BRONZE.payments_stream',
         'business_key',  'payment_id',
-        'description',   'Deduplication based on updated_at'
+        'description',   'Deduplication based on updated_at',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -798,7 +1834,7 @@ $$;
 -- PROC LOAD_SILVER_SHIPMENTS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_SHIPMENTS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_SHIPMENTS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -810,11 +1846,22 @@ DECLARE
     rows_cnt NUMBER;
     error_cnt NUMBER;    
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'SHIPMENTS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.SILVER.shipments;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -822,103 +1869,89 @@ BEGIN
         :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INIT',
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
-    
 
-    -- Data Quality Checks
-    INSERT INTO ECOMMERCE.COMMON.DQ_ERRORS (
-        RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
-    )
-    SELECT 
-        :RUN_ID, 
-        'SILVER', 
-        'shipments_stream', 
-        'shipments', 
-        payload:shipment_id::STRING, 
-        payload, 
-        CASE 
-            WHEN payload:carrier IS NULL THEN 'MISSING_CARRIER'
-            WHEN payload:shipment_status IS NULL THEN 'MISSING_SHIPMENT_STATUS'
-            ELSE 'UNKNOWN'
-        END,
-        'Validation Failed'
-    FROM ECOMMERCE.BRONZE.shipments_stream
-    WHERE metadata$action = 'INSERT'
-      AND ( 
-          payload:carrier IS NULL
-          OR payload:shipment_status IS NULL
-      );
-
-    error_cnt := SQLROWCOUNT;
-
-
-
-    MERGE INTO ECOMMERCE.SILVER.shipments s
-    USING (
-      SELECT
-        payload:shipment_id::NUMBER             as shipment_id,
-        payload:order_id::NUMBER                as order_id,
-        payload:carrier::STRING                 as carrier,
-        payload:shipment_status::STRING         as shipment_status,
-        payload:shipped_at::TIMESTAMP_NTZ       as shipped_at,
-        CAST(payload:shipped_at::TIMESTAMP_NTZ AS DATE) as ship_date,
-        payload:delivered_at::TIMESTAMP_NTZ     as delivered_at,
-        CAST(payload:delivered_at::TIMESTAMP_NTZ AS DATE) as delivery_date,
-        payload:updated_at::TIMESTAMP_NTZ       as updated_at,
-    
-        SHA2_HEX(CONCAT_WS('|',
-            COALESCE(payload:carrier::STRING, ''),
-            COALESCE(payload:shipment_status::STRING, ''),
-            COALESCE(payload:shipped_at::TIMESTAMP_NTZ::STRING, '1900-01-01'),
-            COALESCE(payload:delivered_at::TIMESTAMP_NTZ::STRING, '1900-01-01')
-        )) AS hash_value,
-    
-        source_file
-      FROM ECOMMERCE.BRONZE.shipments_stream
-        WHERE metadata$action = 'INSERT'
-          AND NOT (
-              payload:carrier IS NULL
-              OR payload:shipment_status IS NULL
-          )
-      QUALIFY ROW_NUMBER() OVER (
-        PARTITION BY payload:shipment_id::NUMBER 
-        ORDER BY payload:updated_at::TIMESTAMP_NTZ DESC, ingestion_ts DESC
-      ) = 1
-    ) r
-    ON s.shipment_id = r.shipment_id
-    WHEN MATCHED 
-        --AND r.updated_at > s.updated_at 
-        AND r.hash_value != s.hash_value
-    THEN 
-      UPDATE SET 
-        order_id        = r.order_id,
-        carrier         = r.carrier,
-        shipment_status = r.shipment_status,
-        shipped_at      = r.shipped_at,
-        ship_date       = r.ship_date,
-        delivered_at    = r.delivered_at,
-        delivery_date   = r.delivery_date,
-        hash_value      = r.hash_value,
+    -- Single pass over the stream: typed, validated rows go to the DQ stage read by the MERGE,
+    -- failed rows to DQ_ERRORS (columns and rules: COMMON.DQ_COLUMNS / COMMON.DQ_RULES)
+    CALL ECOMMERCE.SILVER.STAGE_DQ_ROWS(:RUN_ID, 'shipments', :run_mode);
+    SELECT $1:errors::NUMBER, ARRAY_APPEND(:query_ids, $1:query_id) INTO :error_cnt, :query_ids
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild: one set-based insert of the deduplicated stage, in clustering order
+        DELETE FROM ECOMMERCE.SILVER.shipments;
+
+        INSERT INTO ECOMMERCE.SILVER.shipments (
+            shipment_id, order_id, carrier, shipment_status, shipped_at, ship_date, delivered_at,
+            delivery_date, updated_at, hash_value, source_file, ingestion_ts
+        )
+        SELECT
+            r.shipment_id, r.order_id, r.carrier, r.shipment_status, r.shipped_at, r.ship_date,
+            r.delivered_at, r.delivery_date, r.updated_at, r.hash_value, r.source_file,
+            CURRENT_TIMESTAMP()
+        FROM (
+            SELECT *
+            FROM ECOMMERCE.SILVER.shipments_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY shipment_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ORDER BY r.shipment_id;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    ELSE
+        MERGE INTO ECOMMERCE.SILVER.shipments s
+        USING (
+            SELECT *
+            FROM ECOMMERCE.SILVER.shipments_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY shipment_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ON s.shipment_id = r.shipment_id
+        WHEN MATCHED 
+            --AND r.updated_at > s.updated_at 
+            AND r.hash_value != s.hash_value
+        THEN 
+          UPDATE SET 
+            order_id        = r.order_id,
+            carrier         = r.carrier,
+            shipment_status = r.shipment_status,
+            shipped_at      = r.shipped_at,
+            ship_date       = r.ship_date,
+            delivered_at    = r.delivered_at,
+            delivery_date   = r.delivery_date,
+            hash_value      = r.hash_value,
         
-        updated_at      = r.updated_at,
-        source_file     = r.source_file,
-        ingestion_ts    = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN 
-      INSERT (
-        shipment_id, order_id, carrier, shipment_status, shipped_at, ship_date, delivered_at,
-        delivery_date, updated_at, hash_value, source_file, ingestion_ts
-      )
-      VALUES (
-          r.shipment_id, r.order_id, r.carrier, r.shipment_status, r.shipped_at, r.ship_date, r.delivered_at,
-          r.delivery_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
-      );
-           
-    rows_cnt := SQLROWCOUNT;
+            updated_at      = r.updated_at,
+            source_file     = r.source_file,
+            ingestion_ts    = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN 
+          INSERT (
+            shipment_id, order_id, carrier, shipment_status, shipped_at, ship_date, delivered_at,
+            delivery_date, updated_at, hash_value, source_file, ingestion_ts
+          )
+          VALUES (
+              r.shipment_id, r.order_id, r.carrier, r.shipment_status, r.shipped_at, r.ship_date, r.delivered_at,
+              r.delivery_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+          );
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
+    DELETE FROM ECOMMERCE.SILVER.shipments_dq_stage WHERE run_id = :RUN_ID;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_DEDUP',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_DEDUP'),
+        'load_mode',     :run_mode,
         'source_obj',    'BRONZE.shipments_stream',
         'business_key',  'shipment_id',
-        'description',   'Deduplication based on updated_at'
+        'description',   'Deduplication based on updated_at',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -959,7 +1992,7 @@ $$;
 -- PROC LOAD_SILVER_PRODUCTS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_PRODUCTS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_PRODUCTS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -971,11 +2004,22 @@ DECLARE
     rows_cnt NUMBER;
     error_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'PRODUCTS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.SILVER.products;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -983,109 +2027,87 @@ BEGIN
         :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INIT',
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
-    
 
-    -- Data Quality Checks
-    INSERT INTO ECOMMERCE.COMMON.DQ_ERRORS (
-        RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
-    )
-    SELECT 
-        :RUN_ID, 
-        'SILVER', 
-        'products_stream', 
-        'products', 
-        payload:product_id::STRING, 
-        payload, 
-        CASE 
-            WHEN payload:price::NUMBER(18,2) < 0 THEN 'NEGATIVE_PRICE'
-            WHEN TRIM(payload:name::STRING) = '' OR payload:name IS NULL THEN 'EMPTY_NAME'
-            WHEN payload:currency IS NULL THEN 'MISSING_CURRENCY'
-            WHEN payload:created_at::TIMESTAMP_NTZ IS NULL THEN 'MISSING_DATE'
-            ELSE 'UNKNOWN'
-        END,
-        'Validation Failed'
-    FROM ECOMMERCE.BRONZE.products_stream
-    WHERE metadata$action = 'INSERT'
-      AND ( 
-          payload:price::NUMBER(18,2) < 0 
-          OR TRIM(payload:name::STRING) = '' OR payload:name IS NULL
-          OR payload:currency IS NULL
-          OR payload:created_at::TIMESTAMP_NTZ IS NULL
-      );
-
-    error_cnt := SQLROWCOUNT;
-
-
-    MERGE INTO ECOMMERCE.SILVER.products s
-    USING (
-      SELECT
-        payload:product_id::NUMBER          as product_id,
-        payload:name::STRING                as name,
-        payload:category::STRING            as category,
-        payload:brand::STRING               as brand,
-        payload:price::NUMBER(18,2)         as price,
-        payload:currency::STRING            as currency,
-        payload:status::STRING              as status,
-        payload:created_at::TIMESTAMP_NTZ   as created_at,
-        CAST(payload:created_at::TIMESTAMP_NTZ AS DATE) as create_date,
-        payload:updated_at::TIMESTAMP_NTZ   as updated_at,
-        SHA2_HEX(CONCAT_WS('|',
-            COALESCE(payload:name::STRING, ''),
-            COALESCE(payload:category::STRING, ''),
-            COALESCE(payload:brand::STRING, ''),
-            COALESCE(payload:price::STRING, '0'),
-            COALESCE(payload:currency::STRING, ''),
-            COALESCE(payload:status::STRING, '')
-        )) AS hash_value,
-    
-        source_file
-      FROM ECOMMERCE.BRONZE.products_stream
-    WHERE metadata$action = 'INSERT'
-          AND NOT (
-              payload:price::NUMBER(18,2) < 0 
-              OR payload:currency IS NULL
-              OR TRIM(payload:name::STRING) = '' OR payload:name IS NULL
-                OR payload:created_at::TIMESTAMP_NTZ IS NULL
-          )
-      QUALIFY ROW_NUMBER() OVER (
-        PARTITION BY payload:product_id::NUMBER 
-        ORDER BY payload:updated_at::TIMESTAMP_NTZ DESC, ingestion_ts DESC
-      ) = 1
-    ) r
-    ON s.product_id = r.product_id
-    WHEN MATCHED 
-        --AND r.updated_at > s.updated_at 
-        AND r.hash_value != s.hash_value
-    THEN 
-      UPDATE SET 
-        name            = r.name,
-        category        = r.category,
-        brand           = r.brand,
-        price           = r.price,
-        currency        = r.currency,
-        status          = r.status,
-        hash_value      = r.hash_value,
+    -- Single pass over the stream: typed, validated rows go to the DQ stage read by the MERGE,
+    -- failed rows to DQ_ERRORS (columns and rules: COMMON.DQ_COLUMNS / COMMON.DQ_RULES)
+    CALL ECOMMERCE.SILVER.STAGE_DQ_ROWS(:RUN_ID, 'products', :run_mode);
+    SELECT $1:errors::NUMBER, ARRAY_APPEND(:query_ids, $1:query_id) INTO :error_cnt, :query_ids
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild: one set-based insert of the deduplicated stage, in clustering order
+        DELETE FROM ECOMMERCE.SILVER.products;
+
+        INSERT INTO ECOMMERCE.SILVER.products (
+            product_id, name, category, brand, price, currency, status, created_at, create_date,
+            updated_at, hash_value, source_file, ingestion_ts
+        )
+        SELECT
+            r.product_id, r.name, r.category, r.brand, r.price, r.currency, r.status, r.created_at,
+            r.create_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+        FROM (
+            SELECT *
+            FROM ECOMMERCE.SILVER.products_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY product_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ORDER BY r.product_id;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    ELSE
+        MERGE INTO ECOMMERCE.SILVER.products s
+        USING (
+            SELECT *
+            FROM ECOMMERCE.SILVER.products_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY product_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ON s.product_id = r.product_id
+        WHEN MATCHED 
+            --AND r.updated_at > s.updated_at 
+            AND r.hash_value != s.hash_value
+        THEN 
+          UPDATE SET 
+            name            = r.name,
+            category        = r.category,
+            brand           = r.brand,
+            price           = r.price,
+            currency        = r.currency,
+            status          = r.status,
+            hash_value      = r.hash_value,
         
-        updated_at      = r.updated_at,
-        source_file     = r.source_file,
-        ingestion_ts    = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN 
-      INSERT (
-        product_id, name, category, brand, price, currency, status,
-        created_at, create_date, updated_at, hash_value, source_file, ingestion_ts
-      )
-      VALUES (
-          r.product_id, r.name, r.category, r.brand, r.price, r.currency, r.status,
-          r.created_at, r.create_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
-      );
-               
-    rows_cnt := SQLROWCOUNT;
+            updated_at      = r.updated_at,
+            source_file     = r.source_file,
+            ingestion_ts    = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN 
+          INSERT (
+            product_id, name, category, brand, price, currency, status,
+            created_at, create_date, updated_at, hash_value, source_file, ingestion_ts
+          )
+          VALUES (
+              r.product_id, r.name, r.category, r.brand, r.price, r.currency, r.status,
+              r.created_at, r.create_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+          );
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
+    DELETE FROM ECOMMERCE.SILVER.products_dq_stage WHERE run_id = :RUN_ID;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_DEDUP',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_DEDUP'),
+        'load_mode',     :run_mode,
         'source_obj',    'BRONZE.products_stream',
         'business_key',  'product_id',
-        'description',   'Deduplication based on updated_at'
+        'description',   'Deduplication based on updated_at',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -1126,7 +2148,7 @@ $$;
 -- PROC LOAD_SILVER_CUSTOMERS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_CUSTOMERS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_CUSTOMERS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -1138,11 +2160,22 @@ DECLARE
     rows_cnt NUMBER;
     error_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'CUSTOMERS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.SILVER.customers;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -1150,108 +2183,86 @@ BEGIN
         :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INIT',
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
-    
 
-       
-    -- Data Quality Checks
-    INSERT INTO ECOMMERCE.COMMON.DQ_ERRORS (
-        RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
-    )
-    SELECT 
-        :RUN_ID, 
-        'SILVER', 
-        'customers_stream', 
-        'customers', 
-        payload:customer_id::STRING, 
-        payload, 
-        CASE 
-            WHEN payload:email::STRING NOT LIKE '%@%' THEN 'INVALID_EMAIL'
-            WHEN payload:first_name IS NULL THEN 'MISSING_FIRST_NAME'
-            WHEN payload:phone IS NULL THEN 'MISSING_PHONE'
-            WHEN payload:created_at::TIMESTAMP_NTZ IS NULL THEN 'MISSING_DATE'
-            ELSE 'UNKNOWN'
-        END,
-        'Validation Failed'
-    FROM ECOMMERCE.BRONZE.customers_stream
-    WHERE metadata$action = 'INSERT'
-      AND ( 
-            payload:email::STRING NOT LIKE '%@%' 
-            OR payload:first_name IS NULL
-            OR payload:phone IS NULL
-            OR payload:created_at::TIMESTAMP_NTZ IS NULL
-      );
-
-    error_cnt := SQLROWCOUNT;
-
-
-
-    MERGE INTO ECOMMERCE.SILVER.customers s
-    USING (
-      SELECT
-        payload:customer_id::NUMBER             as customer_id,
-        payload:email::STRING                   as email,
-        payload:first_name::STRING              as first_name,
-        payload:last_name::STRING               as last_name,
-        payload:phone::STRING                   as phone,
-        payload:status::STRING                  as status,
-        payload:created_at::TIMESTAMP_NTZ       as created_at,
-        CAST(payload:created_at::TIMESTAMP_NTZ AS DATE) as create_date,
-        payload:updated_at::TIMESTAMP_NTZ       as updated_at,
-        SHA2_HEX(CONCAT_WS('|',
-            COALESCE(payload:email::STRING, ''),
-            COALESCE(payload:first_name::STRING, ''),
-            COALESCE(payload:last_name::STRING, ''),
-            COALESCE(payload:phone::STRING, ''),
-            COALESCE(payload:status::STRING, '')
-        )) AS hash_value,
-    
-        source_file
-      FROM ECOMMERCE.BRONZE.customers_stream
-        WHERE metadata$action = 'INSERT'
-          AND NOT (
-              payload:email::STRING NOT LIKE '%@%' 
-              OR payload:first_name IS NULL
-              OR payload:phone IS NULL
-              OR payload:created_at::TIMESTAMP_NTZ IS NULL
-          )
-      QUALIFY ROW_NUMBER() OVER (
-        PARTITION BY payload:customer_id::NUMBER 
-        ORDER BY payload:updated_at::TIMESTAMP_NTZ DESC, ingestion_ts DESC
-      ) = 1
-    ) r
-    ON s.customer_id = r.customer_id
-    WHEN MATCHED 
-        --AND r.updated_at > s.updated_at 
-        AND r.hash_value != s.hash_value
-    THEN 
-      UPDATE SET 
-        email           = r.email,
-        first_name      = r.first_name,
-        last_name       = r.last_name,
-        phone           = r.phone,
-        status          = r.status,
-        hash_value      = r.hash_value,
+    -- Single pass over the stream: typed, validated rows go to the DQ stage read by the MERGE,
+    -- failed rows to DQ_ERRORS (columns and rules: COMMON.DQ_COLUMNS / COMMON.DQ_RULES)
+    CALL ECOMMERCE.SILVER.STAGE_DQ_ROWS(:RUN_ID, 'customers', :run_mode);
+    SELECT $1:errors::NUMBER, ARRAY_APPEND(:query_ids, $1:query_id) INTO :error_cnt, :query_ids
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild: one set-based insert of the deduplicated stage, in clustering order
+        DELETE FROM ECOMMERCE.SILVER.customers;
+
+        INSERT INTO ECOMMERCE.SILVER.customers (
+            customer_id, email, first_name, last_name, phone, status, created_at, create_date,
+            updated_at, hash_value, source_file, ingestion_ts
+        )
+        SELECT
+            r.customer_id, r.email, r.first_name, r.last_name, r.phone, r.status, r.created_at,
+            r.create_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+        FROM (
+            SELECT *
+            FROM ECOMMERCE.SILVER.customers_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY customer_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ORDER BY r.customer_id;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    ELSE
+        MERGE INTO ECOMMERCE.SILVER.customers s
+        USING (
+            SELECT *
+            FROM ECOMMERCE.SILVER.customers_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY customer_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ON s.customer_id = r.customer_id
+        WHEN MATCHED 
+            --AND r.updated_at > s.updated_at 
+            AND r.hash_value != s.hash_value
+        THEN 
+          UPDATE SET 
+            email           = r.email,
+            first_name      = r.first_name,
+            last_name       = r.last_name,
+            phone           = r.phone,
+            status          = r.status,
+            hash_value      = r.hash_value,
         
-        updated_at      = r.updated_at,
-        source_file     = r.source_file,
-        ingestion_ts    = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN 
-      INSERT (
-        customer_id, email, first_name, last_name, phone, status,
-        created_at, create_date, updated_at, hash_value, source_file, ingestion_ts
-      )
-      VALUES (
-          r.customer_id, r.email, r.first_name, r.last_name, r.phone, r.status, 
-          r.created_at, r.create_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
-      );
-                
-    rows_cnt := SQLROWCOUNT;
+            updated_at      = r.updated_at,
+            source_file     = r.source_file,
+            ingestion_ts    = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN 
+          INSERT (
+            customer_id, email, first_name, last_name, phone, status,
+            created_at, create_date, updated_at, hash_value, source_file, ingestion_ts
+          )
+          VALUES (
+              r.customer_id, r.email, r.first_name, r.last_name, r.phone, r.status, 
+              r.created_at, r.create_date, r.updated_at, r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+          );
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
+    DELETE FROM ECOMMERCE.SILVER.customers_dq_stage WHERE run_id = :RUN_ID;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_DEDUP',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_DEDUP'),
+        'load_mode',     :run_mode,
         'source_obj',    'BRONZE.customers_stream',
         'business_key',  'customer_id',
-        'description',   'Deduplication based on updated_at'
+        'description',   'Deduplication based on updated_at',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -1291,7 +2302,7 @@ $$;
 -- PROC LOAD_SILVER_ADDRESSES
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_ADDRESSES(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_ADDRESSES(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -1303,11 +2314,22 @@ DECLARE
     rows_cnt NUMBER;
     error_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'ADDRESSES';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.SILVER.addresses;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -1315,119 +2337,91 @@ BEGIN
         :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'INIT',
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
-    
 
-     -- Data Quality Checks
-    INSERT INTO ECOMMERCE.COMMON.DQ_ERRORS (
-        RUN_ID, LAYER, SOURCE_OBJECT, TARGET_TABLE, RECORD_KEY, RAW_RECORD, ERROR_TYPE, ERROR_MESSAGE
-    )
-    SELECT 
-        :RUN_ID, 
-        'SILVER', 
-        'addresses_stream', 
-        'addresses', 
-        payload:address_id::STRING, 
-        payload, 
-        CASE 
-            WHEN payload:city IS NULL THEN 'MISSING_CITY'
-            WHEN payload:street IS NULL THEN 'MISSING_STREET'
-            WHEN payload:country IS NULL THEN 'MISSING_COUNTRY'
-            WHEN payload:customer_id IS NULL THEN 'MISSING_CUSTOMER'
-            WHEN payload:created_at::TIMESTAMP_NTZ IS NULL THEN 'MISSING_DATE'
-            ELSE 'UNKNOWN'
-        END,
-        'Validation Failed'
-    FROM ECOMMERCE.BRONZE.addresses_stream
-    WHERE metadata$action = 'INSERT'
-      AND ( 
-            payload:city IS NULL
-            OR payload:street IS NULL
-            OR payload:country IS NULL
-            OR payload:customer_id IS NULL
-            OR payload:created_at::TIMESTAMP_NTZ IS NULL
-      );
-
-    error_cnt := SQLROWCOUNT;
-
-
-
-
-    MERGE INTO ECOMMERCE.SILVER.addresses s
-    USING (
-      SELECT
-        payload:address_id::NUMBER          as address_id,
-        payload:customer_id::NUMBER         as customer_id,
-        payload:type::STRING                as type,
-        payload:street::STRING              as street,
-        payload:city::STRING                as city,
-        payload:postal_code::STRING         as postal_code,
-        payload:country::STRING             as country,
-        payload:is_default::BOOLEAN         as is_default,
-        payload:created_at::TIMESTAMP_NTZ   as created_at,
-        CAST(payload:created_at::TIMESTAMP_NTZ AS DATE) as create_date,
-        payload:updated_at::TIMESTAMP_NTZ   as updated_at,
-    
-        SHA2_HEX(CONCAT_WS('|',
-            COALESCE(payload:type::STRING, ''),
-            COALESCE(payload:street::STRING, ''),
-            COALESCE(payload:city::STRING, ''),
-            COALESCE(payload:postal_code::STRING, ''),
-            COALESCE(payload:country::STRING, ''),
-            COALESCE(payload:is_default::STRING, 'false')
-        )) AS hash_value,
-    
-        source_file
-      FROM ECOMMERCE.BRONZE.addresses_stream
-    WHERE metadata$action = 'INSERT'
-          AND NOT (
-                payload:city IS NULL
-                OR payload:street IS NULL
-                OR payload:country IS NULL
-                OR payload:customer_id IS NULL
-                OR payload:created_at::TIMESTAMP_NTZ IS NULL
-          )
-      QUALIFY ROW_NUMBER() OVER (
-        PARTITION BY payload:address_id::NUMBER 
-        ORDER BY payload:updated_at::TIMESTAMP_NTZ DESC, ingestion_ts DESC
-      ) = 1
-    ) r
-    ON s.address_id = r.address_id
-    WHEN MATCHED 
-        --AND r.updated_at > s.updated_at 
-        AND r.hash_value != s.hash_value
-    THEN 
-      UPDATE SET 
-        customer_id     = r.customer_id,
-        type            = r.type,
-        street          = r.street,
-        city            = r.city,
-        postal_code     = r.postal_code,
-        country         = r.country,
-        is_default      = r.is_default,
-        hash_value      = r.hash_value,
+    -- Single pass over the stream: typed, validated rows go to the DQ stage read by the MERGE,
+    -- failed rows to DQ_ERRORS (columns and rules: COMMON.DQ_COLUMNS / COMMON.DQ_RULES)
+    CALL ECOMMERCE.SILVER.STAGE_DQ_ROWS(:RUN_ID, 'addresses', :run_mode);
+    SELECT $1:errors::NUMBER, ARRAY_APPEND(:query_ids, $1:query_id) INTO :error_cnt, :query_ids
+    FROM TABLE(RESULT_SCAN(LAST_QUERY_ID()));
+
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild: one set-based insert of the deduplicated stage, in clustering order
+        DELETE FROM ECOMMERCE.SILVER.addresses;
+
+        INSERT INTO ECOMMERCE.SILVER.addresses (
+            address_id, customer_id, type, street, city, postal_code, country, is_default,
+            created_at, create_date, updated_at, hash_value, source_file, ingestion_ts
+        )
+        SELECT
+            r.address_id, r.customer_id, r.type, r.street, r.city, r.postal_code, r.country,
+            r.is_default, r.created_at, r.create_date, r.updated_at, r.hash_value, r.source_file,
+            CURRENT_TIMESTAMP()
+        FROM (
+            SELECT *
+            FROM ECOMMERCE.SILVER.addresses_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY address_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ORDER BY r.customer_id, r.address_id;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    ELSE
+        MERGE INTO ECOMMERCE.SILVER.addresses s
+        USING (
+            SELECT *
+            FROM ECOMMERCE.SILVER.addresses_dq_stage
+            WHERE run_id = :RUN_ID
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY address_id
+                ORDER BY updated_at DESC, ingestion_ts DESC
+            ) = 1
+        ) r
+        ON s.address_id = r.address_id
+        WHEN MATCHED 
+            --AND r.updated_at > s.updated_at 
+            AND r.hash_value != s.hash_value
+        THEN 
+          UPDATE SET 
+            customer_id     = r.customer_id,
+            type            = r.type,
+            street          = r.street,
+            city            = r.city,
+            postal_code     = r.postal_code,
+            country         = r.country,
+            is_default      = r.is_default,
+            hash_value      = r.hash_value,
         
-        updated_at      = r.updated_at,
-        source_file     = r.source_file,
-        ingestion_ts    = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN 
-      INSERT (
-          address_id, customer_id, type, street, city, postal_code, 
-          country, is_default, created_at, create_date, updated_at, 
-          hash_value, source_file, ingestion_ts
-      )
-      VALUES (
-          r.address_id, r.customer_id, r.type, r.street, r.city, r.postal_code, 
-          r.country, r.is_default, r.created_at, r.create_date, r.updated_at, 
-          r.hash_value, r.source_file, CURRENT_TIMESTAMP()
-      );
-                
-    rows_cnt := SQLROWCOUNT;
+            updated_at      = r.updated_at,
+            source_file     = r.source_file,
+            ingestion_ts    = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN 
+          INSERT (
+              address_id, customer_id, type, street, city, postal_code, 
+              country, is_default, created_at, create_date, updated_at, 
+              hash_value, source_file, ingestion_ts
+          )
+          VALUES (
+              r.address_id, r.customer_id, r.type, r.street, r.city, r.postal_code, 
+              r.country, r.is_default, r.created_at, r.create_date, r.updated_at, 
+              r.hash_value, r.source_file, CURRENT_TIMESTAMP()
+          );
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
+    DELETE FROM ECOMMERCE.SILVER.addresses_dq_stage WHERE run_id = :RUN_ID;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_DEDUP',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_DEDUP'),
+        'load_mode',     :run_mode,
         'source_obj',    'BRONZE.addresses_stream',
         'business_key',  'address_id',
-        'description',   'Deduplication based on updated_at'
+        'description',   'Deduplication based on updated_at',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'SILVER', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -1468,7 +2462,7 @@ $$;
 -- PROC LOAD_SILVER_MASTER (Cleansed Data to Gold Layer)
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_SILVER_MASTER(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.SILVER.LOAD_SILVER_MASTER(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -1480,6 +2474,10 @@ DECLARE
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'SILVER', 'MASTER', NULL);
+
+    -- Events of this batch are written to ETL_LOGS in one insert at the end (FLUSH_LOG_BUFFER)
+    CALL ECOMMERCE.COMMON.START_LOG_BUFFER();
 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
         :RUN_ID, 'SILVER', 'MASTER', NULL, 'INIT',
@@ -1487,18 +2485,21 @@ BEGIN
     );
 
     -- Load individual Silver Layer tables
-    -- Tables are loaded in specific order to satisfy FK dependencies
-    CALL ECOMMERCE.SILVER.LOAD_PRODUCTS(:RUN_ID);
-    CALL ECOMMERCE.SILVER.LOAD_CUSTOMERS(:RUN_ID);
-    CALL ECOMMERCE.SILVER.LOAD_ADDRESSES(:RUN_ID);
-
-    CALL ECOMMERCE.SILVER.LOAD_ORDERS(:RUN_ID);
+    -- Tables are loaded in dependency waves (see PIPELINE_DAG in scripts/etl_orchestrator.py);
+    -- tables within a wave do not depend on each other and run as ASYNC child jobs.
+    ASYNC (CALL ECOMMERCE.SILVER.LOAD_PRODUCTS(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.SILVER.LOAD_CUSTOMERS(:RUN_ID, :LOAD_MODE));
+    AWAIT ALL;
+
+    CALL ECOMMERCE.SILVER.LOAD_ADDRESSES(:RUN_ID, :LOAD_MODE);
+    CALL ECOMMERCE.SILVER.LOAD_ORDERS(:RUN_ID, :LOAD_MODE);
     
     -- Dependency: Requires Silver Orders to be loaded before Fact Sales.
-    CALL ECOMMERCE.SILVER.LOAD_ORDER_ITEMS(:RUN_ID);
-    CALL ECOMMERCE.SILVER.LOAD_ORDER_STATUS_HISTORY(:RUN_ID);
-    CALL ECOMMERCE.SILVER.LOAD_PAYMENTS(:RUN_ID);
-    CALL ECOMMERCE.SILVER.LOAD_SHIPMENTS(:RUN_ID);
+    ASYNC (CALL ECOMMERCE.SILVER.LOAD_ORDER_ITEMS(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.SILVER.LOAD_ORDER_STATUS_HISTORY(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.SILVER.LOAD_PAYMENTS(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.SILVER.LOAD_SHIPMENTS(:RUN_ID, :LOAD_MODE));
+    AWAIT ALL;
 
 
     -- ###################################
@@ -1511,6 +2512,8 @@ BEGIN
         'SUCCESS', 'Silver Layer Batch Completed', 0, 0, :total_duration, NULL, NULL, NULL
     );
 
+    CALL ECOMMERCE.COMMON.FLUSH_LOG_BUFFER();
+
     RETURN 'SILVER MASTER LOAD COMPLETED SUCCESSFULLY';
 
 EXCEPTION
@@ -1532,6 +2535,8 @@ EXCEPTION
             'FAIL', :err_msg, 0, 0, :total_duration, :err_code, :err_state, :err_details
         );
 
+        CALL ECOMMERCE.COMMON.FLUSH_LOG_BUFFER();
+
         RAISE;
 END;
 $$;
@@ -1549,7 +2554,7 @@ $$;
 -- PROC LOAD_DIM_PRODUCTS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_DIM_PRODUCTS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_DIM_PRODUCTS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -1560,11 +2565,28 @@ DECLARE
     proc_duration NUMBER(12,3);
     rows_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
+
+    existing_cnt NUMBER;
+    pruned_cnt NUMBER;
 
     PROC_NAME STRING := 'DIM_PRODUCTS';
 
+    dim_history_pruned EXCEPTION (-20005, 'BACKFILL would lose SCD2 history: Bronze row retention is enabled for the source. Truncate the dimension first to rebuild it anyway.');
+
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.GOLD.dim_products
+        WHERE product_key != -1;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -1573,45 +2595,174 @@ BEGIN
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
     
-    MERGE INTO ECOMMERCE.GOLD.dim_products t
-    USING (
-        SELECT 
-            s.product_id, s.name, s.category, s.brand, s.price, s.currency, s.status, s.hash_value,
-            s.updated_at AS valid_from, NULL AS join_key
-        FROM ECOMMERCE.SILVER.products_stream s
-        LEFT JOIN ECOMMERCE.GOLD.dim_products t ON s.product_id = t.product_id AND t.is_current = TRUE
-        WHERE t.product_id IS NULL AND s.metadata$action = 'INSERT'
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild of the SCD2 history (the technical -1 record is kept). Silver only holds the
+        -- latest version of a product, Bronze every version loaded: one windowed pass turns the
+        -- Bronze versions into validity ranges. Surrogate keys are reissued, the facts are
+        -- rebuilt by the same BACKFILL run. Once Bronze row retention has pruned versions, an
+        -- existing history can no longer be rebuilt, so the backfill is refused.
+        SELECT COUNT(*) INTO :existing_cnt FROM ECOMMERCE.GOLD.dim_products WHERE product_key != -1;
+        SELECT COUNT(*) INTO :pruned_cnt
+        FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+        WHERE LOWER(TABLE_NAME) = 'products' AND ROW_RETENTION_DAYS IS NOT NULL;
+        IF (existing_cnt > 0 AND pruned_cnt > 0) THEN
+            RAISE dim_history_pruned;
+        END IF;
+
+        DELETE FROM ECOMMERCE.GOLD.dim_products WHERE product_key != -1;
+
+        INSERT INTO ECOMMERCE.GOLD.dim_products (
+            product_id, name, category, brand, price, currency,
+            status, hash_value, valid_from, valid_to, is_current
+        )
+        WITH bronze_versions AS (
+            -- Parsed like SILVER.LOAD_PRODUCTS (COMMON.DQ_COLUMNS), same hash
+            SELECT
+                NVL(product_id, payload:product_id::NUMBER) AS product_key_id,
+                payload:name::STRING AS name,
+                payload:category::STRING AS category,
+                payload:brand::STRING AS brand,
+                payload:price::NUMBER(18,2) AS price,
+                payload:currency::STRING AS currency,
+                payload:status::STRING AS status,
+                SHA2_HEX(CONCAT_WS('|',
+                    COALESCE(payload:name::STRING, ''),
+                    COALESCE(payload:category::STRING, ''),
+                    COALESCE(payload:brand::STRING, ''),
+                    COALESCE(payload:price::STRING, '0'),
+                    COALESCE(payload:currency::STRING, ''),
+                    COALESCE(payload:status::STRING, '')
+                )) AS version_hash,
+                payload:created_at::TIMESTAMP_NTZ AS created_ts,
+                COALESCE(NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ), payload:created_at::TIMESTAMP_NTZ, ingestion_ts) AS changed_ts,
+                payload,
+                ingestion_ts
+            FROM ECOMMERCE.BRONZE.products
+        ),
+        versions AS (
+            -- Valid versions of validated products (rows quarantined in DQ_ERRORS are skipped),
+            -- the last loaded row per timestamp
+            SELECT v.*
+            FROM bronze_versions v
+            JOIN ECOMMERCE.SILVER.products sp ON sp.product_id = v.product_key_id
+            LEFT JOIN ECOMMERCE.COMMON.DQ_ERRORS e
+                ON e.TARGET_TABLE = 'products'
+               AND e.RECORD_KEY = TO_VARCHAR(v.product_key_id)
+               AND e.RAW_RECORD = v.payload
+            WHERE e.ERROR_ID IS NULL
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY v.product_key_id, v.changed_ts ORDER BY v.ingestion_ts DESC) = 1
+        ),
+        changes AS (
+            -- Consecutive versions with the same attributes are one range
+            SELECT *
+            FROM (
+                SELECT versions.*,
+                       LAG(version_hash) OVER (PARTITION BY product_key_id ORDER BY changed_ts) AS previous_hash
+                FROM versions
+            )
+            WHERE previous_hash IS NULL OR previous_hash != version_hash
+        ),
+        ranges AS (
+            SELECT
+                product_key_id, name, category, brand, price, currency, status, version_hash,
+                -- the first range starts at the creation, so facts older than the first load find it
+                IFF(ROW_NUMBER() OVER (PARTITION BY product_key_id ORDER BY changed_ts) = 1,
+                    LEAST(COALESCE(created_ts, changed_ts), changed_ts), changed_ts) AS range_from,
+                LEAD(changed_ts) OVER (PARTITION BY product_key_id ORDER BY changed_ts) AS range_to
+            FROM changes
+
+            UNION ALL
+
+            -- Products without any Bronze row left: one open range from Silver
+            SELECT
+                sp.product_id, sp.name, sp.category, sp.brand, sp.price, sp.currency, sp.status, sp.hash_value,
+                COALESCE(sp.created_at, sp.updated_at), NULL
+            FROM ECOMMERCE.SILVER.products sp
+            WHERE NOT EXISTS (SELECT 1 FROM versions v WHERE v.product_key_id = sp.product_id)
+        )
+        SELECT
+            product_key_id, name, category, brand, price, currency,
+            status, version_hash, range_from, COALESCE(range_to, '9999-12-31'), range_to IS NULL
+        FROM ranges
+        ORDER BY product_key_id, range_from;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        DELETE FROM ECOMMERCE.GOLD.dim_products_current;
+
+        INSERT INTO ECOMMERCE.GOLD.dim_products_current (product_id, product_key, hash_value, valid_from)
+        SELECT product_id, product_key, hash_value, valid_from
+        FROM ECOMMERCE.GOLD.dim_products
+        WHERE is_current = TRUE AND product_key != -1
+        ORDER BY product_id;
+
+        -- Advance the stream past the backfilled rows (reads it, inserts nothing)
+        INSERT INTO ECOMMERCE.COMMON.STREAM_OFFSET_SINK (stream_name)
+        SELECT 'SILVER.products_stream' FROM ECOMMERCE.SILVER.products_stream WHERE FALSE;
+    ELSE
+        MERGE INTO ECOMMERCE.GOLD.dim_products t
+        USING (
+            SELECT 
+                s.product_id, s.name, s.category, s.brand, s.price, s.currency, s.status, s.hash_value,
+                s.updated_at AS valid_from, NULL AS join_key
+            FROM ECOMMERCE.SILVER.products_stream s
+            LEFT JOIN ECOMMERCE.GOLD.dim_products_current c ON s.product_id = c.product_id
+            WHERE c.product_id IS NULL AND s.metadata$action = 'INSERT'
     
-        UNION ALL
+            UNION ALL
     
-        SELECT 
-            s.product_id, s.name, s.category, s.brand, s.price, s.currency, s.status, s.hash_value,
-            s.updated_at AS valid_from, s.product_id AS join_key
-        FROM ECOMMERCE.SILVER.products_stream s
-        JOIN ECOMMERCE.GOLD.dim_products t ON s.product_id = t.product_id AND t.is_current = TRUE
-        WHERE s.hash_value != t.hash_value AND s.metadata$action = 'INSERT'
-    ) src
-    ON t.product_id = src.join_key 
-    AND t.is_current = TRUE
+            SELECT 
+                s.product_id, s.name, s.category, s.brand, s.price, s.currency, s.status, s.hash_value,
+                s.updated_at AS valid_from, c.product_key AS join_key
+            FROM ECOMMERCE.SILVER.products_stream s
+            JOIN ECOMMERCE.GOLD.dim_products_current c ON s.product_id = c.product_id
+            WHERE s.hash_value != c.hash_value AND s.metadata$action = 'INSERT'
+        ) src
+        ON t.product_key = src.join_key
+        AND t.is_current = TRUE
     
-    WHEN MATCHED THEN 
-        UPDATE SET 
-            t.valid_to = src.valid_from,
-            t.is_current = FALSE
+        WHEN MATCHED THEN 
+            UPDATE SET 
+                t.valid_to = src.valid_from,
+                t.is_current = FALSE
             
-    WHEN NOT MATCHED THEN
-        INSERT (product_id, name, category, brand, price, currency,
-                status, hash_value, valid_from, valid_to, is_current)
-        VALUES (src.product_id, src.name, src.category, src.brand, src.price, src.currency,
-                src.status, src.hash_value, src.valid_from, '9999-12-31', TRUE);
-    
-    rows_cnt := SQLROWCOUNT;
+        WHEN NOT MATCHED THEN
+            INSERT (product_id, name, category, brand, price, currency,
+                    status, hash_value, valid_from, valid_to, is_current)
+            VALUES (src.product_id, src.name, src.category, src.brand, src.price, src.currency,
+                    src.status, src.hash_value, src.valid_from, '9999-12-31', TRUE);
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        -- Current-version lookup of the changed products, in the same transaction
+        MERGE INTO ECOMMERCE.GOLD.dim_products_current c
+        USING (
+            SELECT d.product_id, d.product_key, d.hash_value, d.valid_from
+            FROM ECOMMERCE.GOLD.dim_products d
+            JOIN (
+                SELECT DISTINCT product_id FROM ECOMMERCE.SILVER.products_stream WHERE metadata$action = 'INSERT'
+            ) ch ON d.product_id = ch.product_id
+            WHERE d.is_current = TRUE
+        ) d
+        ON c.product_id = d.product_id
+        WHEN MATCHED AND c.product_key != d.product_key THEN
+            UPDATE SET
+                c.product_key = d.product_key,
+                c.hash_value = d.hash_value,
+                c.valid_from = d.valid_from
+        WHEN NOT MATCHED THEN
+            INSERT (product_id, product_key, hash_value, valid_from)
+            VALUES (d.product_id, d.product_key, d.hash_value, d.valid_from);
+    END IF;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_SCD2',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'HISTORY_REBUILD', 'MERGE_SCD2'),
+        'load_mode',     :run_mode,
         'source_obj',    'SILVER.products_stream',
         'business_key',  'product_id',
-        'description',   'Tracking price/status changes history'
+        'description',   'Tracking price/status changes history',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -1651,7 +2802,7 @@ $$;
 -- PROC LOAD_DIM_CUSTOMERS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_DIM_CUSTOMERS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_DIM_CUSTOMERS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -1662,11 +2813,28 @@ DECLARE
     proc_duration NUMBER(12,3);
     rows_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
+
+    existing_cnt NUMBER;
+    pruned_cnt NUMBER;
 
     PROC_NAME STRING := 'DIM_CUSTOMERS';
 
+    dim_history_pruned EXCEPTION (-20005, 'BACKFILL would lose SCD2 history: Bronze row retention is enabled for the source. Truncate the dimension first to rebuild it anyway.');
+
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.GOLD.dim_customers
+        WHERE customer_key != -1;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -1676,24 +2844,165 @@ BEGIN
     );
     
 
-    MERGE INTO ECOMMERCE.GOLD.dim_customers t
-    USING (
-        -- Get the IDs of all customers who have profile OR address changes
-        WITH changed_ids AS (
-            SELECT customer_id FROM ECOMMERCE.SILVER.customers_stream WHERE metadata$action = 'INSERT'
-            UNION
-            SELECT customer_id FROM ECOMMERCE.SILVER.addresses_stream WHERE metadata$action = 'INSERT'
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild of the SCD2 history (the technical -1 record is kept) from every customer and
+        -- default address version Bronze still holds, like LOAD_DIM_PRODUCTS. A customer range
+        -- changes with either side: both version streams are merged on one timeline, each event
+        -- carrying the latest state of the other side. Surrogate keys are reissued, the facts
+        -- are rebuilt by the same BACKFILL run.
+        SELECT COUNT(*) INTO :existing_cnt FROM ECOMMERCE.GOLD.dim_customers WHERE customer_key != -1;
+        SELECT COUNT(*) INTO :pruned_cnt
+        FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG
+        WHERE LOWER(TABLE_NAME) IN ('customers', 'addresses') AND ROW_RETENTION_DAYS IS NOT NULL;
+        IF (existing_cnt > 0 AND pruned_cnt > 0) THEN
+            RAISE dim_history_pruned;
+        END IF;
+
+        DELETE FROM ECOMMERCE.GOLD.dim_customers WHERE customer_key != -1;
+
+        INSERT INTO ECOMMERCE.GOLD.dim_customers (
+            customer_id, email, first_name, last_name, phone, status,
+            city, country, postal_code, street, address_type,
+            hash_value, valid_from, valid_to, is_current
+        )
+        WITH customer_versions AS (
+            -- Parsed like SILVER.LOAD_CUSTOMERS (COMMON.DQ_COLUMNS), quarantined rows skipped
+            SELECT
+                v.customer_key_id,
+                OBJECT_CONSTRUCT_KEEP_NULL(
+                    'email', v.payload:email::STRING,
+                    'first_name', v.payload:first_name::STRING,
+                    'last_name', v.payload:last_name::STRING,
+                    'phone', v.payload:phone::STRING,
+                    'status', v.payload:status::STRING
+                ) AS customer_state,
+                v.payload:created_at::TIMESTAMP_NTZ AS created_ts,
+                v.changed_ts
+            FROM (
+                SELECT
+                    NVL(customer_id, payload:customer_id::NUMBER) AS customer_key_id,
+                    COALESCE(NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ), payload:created_at::TIMESTAMP_NTZ, ingestion_ts) AS changed_ts,
+                    payload,
+                    ingestion_ts
+                FROM ECOMMERCE.BRONZE.customers
+            ) v
+            JOIN ECOMMERCE.SILVER.customers sc ON sc.customer_id = v.customer_key_id
+            LEFT JOIN ECOMMERCE.COMMON.DQ_ERRORS e
+                ON e.TARGET_TABLE = 'customers'
+               AND e.RECORD_KEY = TO_VARCHAR(v.customer_key_id)
+               AND e.RAW_RECORD = v.payload
+            WHERE e.ERROR_ID IS NULL
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY v.customer_key_id, v.changed_ts ORDER BY v.ingestion_ts DESC) = 1
         ),
-        -- Retrieve the current, full record for these customers from the SILVER tables
-        source_data AS (
-            SELECT 
+        address_versions AS (
+            -- Default address versions (parsed like SILVER.LOAD_ADDRESSES), keyed by customer
+            SELECT
+                v.payload:customer_id::NUMBER AS customer_key_id,
+                OBJECT_CONSTRUCT_KEEP_NULL(
+                    'city', v.payload:city::STRING,
+                    'country', v.payload:country::STRING,
+                    'postal_code', v.payload:postal_code::STRING,
+                    'street', v.payload:street::STRING,
+                    'type', v.payload:type::STRING
+                ) AS address_state,
+                v.changed_ts
+            FROM (
+                SELECT
+                    NVL(address_id, payload:address_id::NUMBER) AS address_key_id,
+                    COALESCE(NVL(updated_at, payload:updated_at::TIMESTAMP_NTZ), payload:created_at::TIMESTAMP_NTZ, ingestion_ts) AS changed_ts,
+                    payload,
+                    ingestion_ts
+                FROM ECOMMERCE.BRONZE.addresses
+            ) v
+            LEFT JOIN ECOMMERCE.COMMON.DQ_ERRORS e
+                ON e.TARGET_TABLE = 'addresses'
+               AND e.RECORD_KEY = TO_VARCHAR(v.address_key_id)
+               AND e.RAW_RECORD = v.payload
+            WHERE e.ERROR_ID IS NULL
+              AND v.payload:is_default::BOOLEAN = TRUE
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY customer_key_id, v.changed_ts ORDER BY v.ingestion_ts DESC) = 1
+        ),
+        timeline AS (
+            -- Each event carries the latest state of both sides (an address event at the same
+            -- timestamp as a customer event sorts first, the customer event then holds both)
+            SELECT
+                customer_key_id, changed_ts, is_customer_event, created_ts,
+                LAST_VALUE(customer_state) IGNORE NULLS OVER (
+                    PARTITION BY customer_key_id ORDER BY changed_ts, is_customer_event
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS c,
+                LAST_VALUE(address_state) IGNORE NULLS OVER (
+                    PARTITION BY customer_key_id ORDER BY changed_ts, is_customer_event
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS a
+            FROM (
+                SELECT customer_key_id, changed_ts, TRUE AS is_customer_event, created_ts, customer_state, NULL AS address_state
+                FROM customer_versions
+                UNION ALL
+                SELECT customer_key_id, changed_ts, FALSE, NULL, NULL, address_state
+                FROM address_versions
+            )
+        ),
+        versions AS (
+            -- One state per timestamp, from the customer's first version on
+            SELECT
+                customer_key_id, changed_ts,
+                MIN(created_ts) OVER (PARTITION BY customer_key_id) AS created_ts,
+                c:email::STRING AS email,
+                c:first_name::STRING AS first_name,
+                c:last_name::STRING AS last_name,
+                c:phone::STRING AS phone,
+                c:status::STRING AS status,
+                a:city::STRING AS city,
+                a:country::STRING AS country,
+                a:postal_code::STRING AS postal_code,
+                a:street::STRING AS street,
+                a:type::STRING AS address_type
+            FROM timeline
+            WHERE c IS NOT NULL
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY customer_key_id, changed_ts ORDER BY is_customer_event DESC) = 1
+        ),
+        hashed AS (
+            -- Same hash as the incremental MERGE below
+            SELECT versions.*,
+                SHA2_HEX(CONCAT_WS('|',
+                    COALESCE(email, ''),
+                    COALESCE(first_name, ''),
+                    COALESCE(last_name, ''),
+                    COALESCE(phone, ''),
+                    COALESCE(status, ''),
+                    COALESCE(city, ''),
+                    COALESCE(country, ''),
+                    COALESCE(postal_code, ''),
+                    COALESCE(street, ''),
+                    COALESCE(address_type, '')
+                )) AS version_hash
+            FROM versions
+        ),
+        changes AS (
+            -- Consecutive versions with the same attributes are one range
+            SELECT *
+            FROM (
+                SELECT hashed.*,
+                       LAG(version_hash) OVER (PARTITION BY customer_key_id ORDER BY changed_ts) AS previous_hash
+                FROM hashed
+            )
+            WHERE previous_hash IS NULL OR previous_hash != version_hash
+        ),
+        ranges AS (
+            SELECT
+                customer_key_id, email, first_name, last_name, phone, status,
+                city, country, postal_code, street, address_type, version_hash,
+                -- the first range starts at the creation, so facts older than the first load find it
+                IFF(ROW_NUMBER() OVER (PARTITION BY customer_key_id ORDER BY changed_ts) = 1,
+                    LEAST(COALESCE(created_ts, changed_ts), changed_ts), changed_ts) AS range_from,
+                LEAD(changed_ts) OVER (PARTITION BY customer_key_id ORDER BY changed_ts) AS range_to
+            FROM changes
+
+            UNION ALL
+
+            -- Customers without any Bronze row left: one open range from Silver
+            SELECT
                 c.customer_id, c.email, c.first_name, c.last_name, c.phone, c.status,
-                COALESCE(a.city, 'Unknown') as city,
-                COALESCE(a.country, 'Unknown') as country,
-                COALESCE(a.postal_code, 'Unknown') as postal_code,
-                COALESCE(a.street, 'Unknown') as street,
-                COALESCE(a.type, 'Unknown') as address_type,
-    
+                a.city, a.country, a.postal_code, a.street, a.type,
                 SHA2_HEX(CONCAT_WS('|',
                     COALESCE(c.email, ''),
                     COALESCE(c.first_name, ''),
@@ -1705,62 +3014,150 @@ BEGIN
                     COALESCE(a.postal_code, ''),
                     COALESCE(a.street, ''),
                     COALESCE(a.type, '')
-                )) as hash_value,
-                
-                CURRENT_TIMESTAMP() as updated_at
+                )),
+                COALESCE(c.created_at, CURRENT_TIMESTAMP()), NULL
             FROM ECOMMERCE.SILVER.customers c
-            JOIN changed_ids ch ON c.customer_id = ch.customer_id
-            LEFT JOIN ECOMMERCE.SILVER.addresses a 
+            LEFT JOIN ECOMMERCE.SILVER.addresses a
                 ON c.customer_id = a.customer_id AND a.is_default = TRUE
+            WHERE NOT EXISTS (SELECT 1 FROM customer_versions v WHERE v.customer_key_id = c.customer_id)
         )
-        -- Select the data for new customers
-        SELECT 
-            s.customer_id, s.email, s.first_name, s.last_name, s.phone, s.status,
-            s.city, s.country, s.postal_code, s.street, s.address_type,
-            s.hash_value,
-            s.updated_at as valid_from, 
-            NULL as join_key
-        FROM source_data s
-        LEFT JOIN ECOMMERCE.GOLD.dim_customers t 
-          ON s.customer_id = t.customer_id AND t.is_current = TRUE
-        WHERE t.customer_id IS NULL
-        
+        SELECT
+            customer_key_id, email, first_name, last_name, phone, status,
+            COALESCE(city, 'Unknown'),
+            COALESCE(country, 'Unknown'),
+            COALESCE(postal_code, 'Unknown'),
+            COALESCE(street, 'Unknown'),
+            COALESCE(address_type, 'Unknown'),
+            version_hash, range_from, COALESCE(range_to, '9999-12-31'), range_to IS NULL
+        FROM ranges
+        ORDER BY customer_key_id, range_from;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        DELETE FROM ECOMMERCE.GOLD.dim_customers_current;
+
+        INSERT INTO ECOMMERCE.GOLD.dim_customers_current (customer_id, customer_key, hash_value, valid_from)
+        SELECT customer_id, customer_key, hash_value, valid_from
+        FROM ECOMMERCE.GOLD.dim_customers
+        WHERE is_current = TRUE AND customer_key != -1
+        ORDER BY customer_id;
+
+        -- Advance both streams past the backfilled rows (reads them, inserts nothing)
+        INSERT INTO ECOMMERCE.COMMON.STREAM_OFFSET_SINK (stream_name)
+        SELECT 'SILVER.customers_stream' FROM ECOMMERCE.SILVER.customers_stream WHERE FALSE
         UNION ALL
+        SELECT 'SILVER.addresses_stream' FROM ECOMMERCE.SILVER.addresses_stream WHERE FALSE;
+    ELSE
+        MERGE INTO ECOMMERCE.GOLD.dim_customers t
+        USING (
+            -- Get the IDs of all customers who have profile OR address changes
+            WITH changed_ids AS (
+                SELECT customer_id FROM ECOMMERCE.SILVER.customers_stream WHERE metadata$action = 'INSERT'
+                UNION
+                SELECT customer_id FROM ECOMMERCE.SILVER.addresses_stream WHERE metadata$action = 'INSERT'
+            ),
+            -- Retrieve the current, full record for these customers from the SILVER tables
+            source_data AS (
+                SELECT 
+                    c.customer_id, c.email, c.first_name, c.last_name, c.phone, c.status,
+                    COALESCE(a.city, 'Unknown') as city,
+                    COALESCE(a.country, 'Unknown') as country,
+                    COALESCE(a.postal_code, 'Unknown') as postal_code,
+                    COALESCE(a.street, 'Unknown') as street,
+                    COALESCE(a.type, 'Unknown') as address_type,
+    
+                    SHA2_HEX(CONCAT_WS('|',
+                        COALESCE(c.email, ''),
+                        COALESCE(c.first_name, ''),
+                        COALESCE(c.last_name, ''),
+                        COALESCE(c.phone, ''),
+                        COALESCE(c.status, ''),
+                        COALESCE(a.city, ''),
+                        COALESCE(a.country, ''),
+                        COALESCE(a.postal_code, ''),
+                        COALESCE(a.street, ''),
+                        COALESCE(a.type, '')
+                    )) as hash_value,
+                
+                    CURRENT_TIMESTAMP() as updated_at
+                FROM ECOMMERCE.SILVER.customers c
+                JOIN changed_ids ch ON c.customer_id = ch.customer_id
+                LEFT JOIN ECOMMERCE.SILVER.addresses a 
+                    ON c.customer_id = a.customer_id AND a.is_default = TRUE
+            )
+            -- Select the data for new customers
+            SELECT 
+                s.customer_id, s.email, s.first_name, s.last_name, s.phone, s.status,
+                s.city, s.country, s.postal_code, s.street, s.address_type,
+                s.hash_value,
+                s.updated_at as valid_from, 
+                NULL as join_key
+            FROM source_data s
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current c
+              ON s.customer_id = c.customer_id
+            WHERE c.customer_id IS NULL
         
-        -- Select the data for customers with changed data
-        SELECT 
-            s.customer_id, s.email, s.first_name, s.last_name, s.phone, s.status,
-            s.city, s.country, s.postal_code, s.street, s.address_type,
-            s.hash_value,
-            s.updated_at as valid_from, 
-            s.customer_id as join_key
-        FROM source_data s
-        JOIN ECOMMERCE.GOLD.dim_customers t 
-          ON s.customer_id = t.customer_id 
-          AND t.is_current = TRUE
-        WHERE s.hash_value != t.hash_value
-    ) src
-    -- Join the source data with the existing records in the GOLD table
-    ON t.customer_id = src.join_key AND t.is_current = TRUE
-    WHEN MATCHED THEN 
-        UPDATE SET 
-        t.valid_to = src.valid_from,
-        t.is_current = FALSE
-    WHEN NOT MATCHED THEN
-        INSERT (customer_id, email, first_name, last_name, phone, status, 
-                city, country, postal_code, street, address_type,
-                hash_value, valid_from, valid_to, is_current)
-        VALUES (src.customer_id, src.email, src.first_name, src.last_name, src.phone, src.status,
-                src.city, src.country, src.postal_code, src.street, src.address_type,
-                src.hash_value, src.valid_from, '9999-12-31', TRUE);
+            UNION ALL
         
-    rows_cnt := SQLROWCOUNT;
+            -- Select the data for customers with changed data
+            SELECT 
+                s.customer_id, s.email, s.first_name, s.last_name, s.phone, s.status,
+                s.city, s.country, s.postal_code, s.street, s.address_type,
+                s.hash_value,
+                s.updated_at as valid_from, 
+                c.customer_key as join_key
+            FROM source_data s
+            JOIN ECOMMERCE.GOLD.dim_customers_current c
+              ON s.customer_id = c.customer_id
+            WHERE s.hash_value != c.hash_value
+        ) src
+        -- Join the source data with the existing current records in the GOLD table
+        ON t.customer_key = src.join_key AND t.is_current = TRUE
+        WHEN MATCHED THEN 
+            UPDATE SET 
+            t.valid_to = src.valid_from,
+            t.is_current = FALSE
+        WHEN NOT MATCHED THEN
+            INSERT (customer_id, email, first_name, last_name, phone, status, 
+                    city, country, postal_code, street, address_type,
+                    hash_value, valid_from, valid_to, is_current)
+            VALUES (src.customer_id, src.email, src.first_name, src.last_name, src.phone, src.status,
+                    src.city, src.country, src.postal_code, src.street, src.address_type,
+                    src.hash_value, src.valid_from, '9999-12-31', TRUE);
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        -- Current-version lookup of the changed customers, in the same transaction
+        MERGE INTO ECOMMERCE.GOLD.dim_customers_current c
+        USING (
+            SELECT d.customer_id, d.customer_key, d.hash_value, d.valid_from
+            FROM ECOMMERCE.GOLD.dim_customers d
+            JOIN (
+                SELECT customer_id FROM ECOMMERCE.SILVER.customers_stream WHERE metadata$action = 'INSERT'
+                UNION
+                SELECT customer_id FROM ECOMMERCE.SILVER.addresses_stream WHERE metadata$action = 'INSERT'
+            ) ch ON d.customer_id = ch.customer_id
+            WHERE d.is_current = TRUE
+        ) d
+        ON c.customer_id = d.customer_id
+        WHEN MATCHED AND c.customer_key != d.customer_key THEN
+            UPDATE SET
+                c.customer_key = d.customer_key,
+                c.hash_value = d.hash_value,
+                c.valid_from = d.valid_from
+        WHEN NOT MATCHED THEN
+            INSERT (customer_id, customer_key, hash_value, valid_from)
+            VALUES (d.customer_id, d.customer_key, d.hash_value, d.valid_from);
+    END IF;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_SCD2',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'HISTORY_REBUILD', 'MERGE_SCD2'),
+        'load_mode',     :run_mode,
         'source_obj',    'SILVER.customers_stream, SILVER.addresses',
         'business_key',  'customer_id',
-        'description',   'Tracking email/address changes history'
+        'description',   'Tracking email/address changes history',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -1801,7 +3198,7 @@ $$;
 -- PROC LOAD_FACT_ORDERS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_ORDERS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_ORDERS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -1812,11 +3209,22 @@ DECLARE
     proc_duration NUMBER(12,3);
     rows_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'FACT_ORDERS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.GOLD.fact_orders;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -1825,46 +3233,99 @@ BEGIN
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
     
-    MERGE INTO ECOMMERCE.GOLD.fact_orders t
-    USING (
-        SELECT 
-            o.order_id,
-            COALESCE(dc.customer_key, -1) as customer_key,
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild from the whole Silver table with one set-based insert, in clustering order
+        DELETE FROM ECOMMERCE.GOLD.fact_orders;
+
+        INSERT INTO ECOMMERCE.GOLD.fact_orders (
+            order_id, customer_key, order_date_key, order_status, order_total_amount, currency,
+            created_at, updated_at
+        )
+        SELECT
+            src.order_id, src.customer_key, src.order_date_key, src.order_status,
+            src.order_total_amount, src.currency, src.created_at, src.updated_at
+        FROM (
+            SELECT 
+                o.order_id,
+                COALESCE(dcc.customer_key, dc.customer_key, -1) as customer_key,
+
+                TO_NUMBER(TO_CHAR(o.create_date, 'YYYYMMDD')) as order_date_key,
+
+                o.order_status,
+                o.order_total_amount,
+                o.currency,
+                o.created_at,
+                o.updated_at
+            FROM ECOMMERCE.SILVER.orders o
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current dcc
+                ON o.customer_id = dcc.customer_id
+                AND o.created_at >= dcc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers dc
+                ON dcc.customer_key IS NULL
+                AND o.customer_id = dc.customer_id
+                AND dc.is_current = FALSE
+                AND o.created_at >= dc.valid_from
+                AND o.created_at < dc.valid_to
+        ) src
+        ORDER BY src.order_date_key;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        -- Advance the stream past the backfilled rows (reads it, inserts nothing)
+        INSERT INTO ECOMMERCE.COMMON.STREAM_OFFSET_SINK (stream_name)
+        SELECT 'SILVER.orders_stream' FROM ECOMMERCE.SILVER.orders_stream WHERE FALSE;
+    ELSE
+        MERGE INTO ECOMMERCE.GOLD.fact_orders t
+        USING (
+            SELECT 
+                o.order_id,
+                COALESCE(dcc.customer_key, dc.customer_key, -1) as customer_key,
             
-            TO_NUMBER(TO_CHAR(o.create_date, 'YYYYMMDD')) as order_date_key,
+                TO_NUMBER(TO_CHAR(o.create_date, 'YYYYMMDD')) as order_date_key,
             
-            o.order_status,
-            o.order_total_amount,
-            o.currency,
-            o.created_at,
-            o.updated_at
-        FROM ECOMMERCE.SILVER.orders_stream o
-        LEFT JOIN ECOMMERCE.GOLD.dim_customers dc 
-            ON o.customer_id = dc.customer_id 
-            AND o.created_at >= dc.valid_from 
-            AND o.created_at < dc.valid_to
-        WHERE o.metadata$action = 'INSERT'
-    ) src
-    ON t.order_id = src.order_id
-    WHEN MATCHED THEN
-        UPDATE SET 
-            t.order_status = src.order_status,
-            t.order_total_amount = src.order_total_amount,
-            t.currency = src.currency,
-            t.updated_at = src.updated_at,
-            t.customer_key = src.customer_key,
-            t.ingestion_ts = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN
-        INSERT (order_id, customer_key, order_date_key, order_status, order_total_amount, currency, created_at, updated_at)
-        VALUES (src.order_id, src.customer_key, src.order_date_key, src.order_status, src.order_total_amount, src.currency, src.created_at, src.updated_at);
-        
-    rows_cnt := SQLROWCOUNT;
+                o.order_status,
+                o.order_total_amount,
+                o.currency,
+                o.created_at,
+                o.updated_at
+            FROM ECOMMERCE.SILVER.orders_stream o
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current dcc
+                ON o.customer_id = dcc.customer_id
+                AND o.created_at >= dcc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers dc
+                ON dcc.customer_key IS NULL
+                AND o.customer_id = dc.customer_id
+                AND dc.is_current = FALSE
+                AND o.created_at >= dc.valid_from
+                AND o.created_at < dc.valid_to
+            WHERE o.metadata$action = 'INSERT'
+        ) src
+        ON t.order_id = src.order_id
+        WHEN MATCHED THEN
+            UPDATE SET 
+                t.order_status = src.order_status,
+                t.order_total_amount = src.order_total_amount,
+                t.currency = src.currency,
+                t.updated_at = src.updated_at,
+                t.customer_key = src.customer_key,
+                t.ingestion_ts = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN
+            INSERT (order_id, customer_key, order_date_key, order_status, order_total_amount, currency, created_at, updated_at)
+            VALUES (src.order_id, src.customer_key, src.order_date_key, src.order_status, src.order_total_amount, src.currency, src.created_at, src.updated_at);
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_FACT',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_FACT'),
+        'load_mode',     :run_mode,
         'source_obj',    'SILVER.orders_stream',
         'business_key',  'order_id',
-        'description',   'Accumulating snapshot of orders (updates allowed)'
+        'description',   'Accumulating snapshot of orders (updates allowed)',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -1906,7 +3367,7 @@ $$;
 -- PROC LOAD_FACT_SALES
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_SALES(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_SALES(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -1917,11 +3378,22 @@ DECLARE
     proc_duration NUMBER(12,3);
     rows_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'FACT_SALES';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.GOLD.fact_sales;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -1930,58 +3402,132 @@ BEGIN
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
     
-    MERGE INTO ECOMMERCE.GOLD.fact_sales t
-    USING (
-        SELECT 
-            oi.order_item_id,
-            oi.order_id,
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild from the whole Silver table with one set-based insert, in clustering order
+        DELETE FROM ECOMMERCE.GOLD.fact_sales;
+
+        INSERT INTO ECOMMERCE.GOLD.fact_sales (
+            order_item_id, order_id, product_key, customer_key, order_date_key, quantity,
+            unit_price, total_line_amount, currency
+        )
+        SELECT
+            src.order_item_id, src.order_id, src.product_key, src.customer_key, src.order_date_key,
+            src.quantity, src.unit_price, src.total_line_amount, src.currency
+        FROM (
+            SELECT 
+                oi.order_item_id,
+                oi.order_id,
+
+                COALESCE(dpc.product_key, dp.product_key, -1) as product_key,
+                COALESCE(dcc.customer_key, dc.customer_key, -1) as customer_key,
+                TO_NUMBER(TO_CHAR(oi.create_date, 'YYYYMMDD')) as order_date_key,
+
+                oi.quantity,
+                oi.unit_price,
+                (oi.quantity * oi.unit_price) as total_line_amount,
+                o.currency
+
+            FROM ECOMMERCE.SILVER.order_items oi
+            LEFT JOIN ECOMMERCE.SILVER.orders o ON oi.order_id = o.order_id
+
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_products_current dpc
+                ON oi.product_id = dpc.product_id
+                AND oi.created_at >= dpc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_products dp
+                ON dpc.product_key IS NULL
+                AND oi.product_id = dp.product_id
+                AND dp.is_current = FALSE
+                AND oi.created_at >= dp.valid_from
+                AND oi.created_at < dp.valid_to
+
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current dcc
+                ON o.customer_id = dcc.customer_id
+                AND o.created_at >= dcc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers dc
+                ON dcc.customer_key IS NULL
+                AND o.customer_id = dc.customer_id
+                AND dc.is_current = FALSE
+                AND o.created_at >= dc.valid_from
+                AND o.created_at < dc.valid_to
+        ) src
+        ORDER BY src.order_date_key;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        -- Advance the stream past the backfilled rows (reads it, inserts nothing)
+        INSERT INTO ECOMMERCE.COMMON.STREAM_OFFSET_SINK (stream_name)
+        SELECT 'SILVER.order_items_stream' FROM ECOMMERCE.SILVER.order_items_stream WHERE FALSE;
+    ELSE
+        MERGE INTO ECOMMERCE.GOLD.fact_sales t
+        USING (
+            SELECT 
+                oi.order_item_id,
+                oi.order_id,
             
-            COALESCE(dp.product_key, -1) as product_key,
-            COALESCE(dc.customer_key, -1) as customer_key,
-            TO_NUMBER(TO_CHAR(oi.create_date, 'YYYYMMDD')) as order_date_key,
+                COALESCE(dpc.product_key, dp.product_key, -1) as product_key,
+                COALESCE(dcc.customer_key, dc.customer_key, -1) as customer_key,
+                TO_NUMBER(TO_CHAR(oi.create_date, 'YYYYMMDD')) as order_date_key,
             
-            oi.quantity,
-            oi.unit_price,
-            (oi.quantity * oi.unit_price) as total_line_amount,
-            o.currency
+                oi.quantity,
+                oi.unit_price,
+                (oi.quantity * oi.unit_price) as total_line_amount,
+                o.currency
             
-        FROM ECOMMERCE.SILVER.order_items_stream oi
-        LEFT JOIN ECOMMERCE.SILVER.orders o ON oi.order_id = o.order_id
+            FROM ECOMMERCE.SILVER.order_items_stream oi
+            LEFT JOIN ECOMMERCE.SILVER.orders o ON oi.order_id = o.order_id
         
-        LEFT JOIN ECOMMERCE.GOLD.dim_products dp 
-            ON oi.product_id = dp.product_id 
-            AND oi.created_at >= dp.valid_from 
-            AND oi.created_at < dp.valid_to
-            
-        LEFT JOIN ECOMMERCE.GOLD.dim_customers dc 
-            ON o.customer_id = dc.customer_id 
-            AND o.created_at >= dc.valid_from 
-            AND o.created_at < dc.valid_to
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_products_current dpc
+                ON oi.product_id = dpc.product_id
+                AND oi.created_at >= dpc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_products dp
+                ON dpc.product_key IS NULL
+                AND oi.product_id = dp.product_id
+                AND dp.is_current = FALSE
+                AND oi.created_at >= dp.valid_from
+                AND oi.created_at < dp.valid_to
             
-        WHERE oi.metadata$action = 'INSERT'
-    ) src
-    ON t.order_item_id = src.order_item_id
-    WHEN MATCHED THEN
-        UPDATE SET 
-            t.product_key = src.product_key,
-            t.customer_key = src.customer_key,
-            t.quantity = src.quantity,
-            t.unit_price = src.unit_price,
-            t.total_line_amount = src.total_line_amount,
-            t.ingestion_ts = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN
-        INSERT (order_item_id, order_id, product_key, customer_key, order_date_key, 
-                quantity, unit_price, total_line_amount, currency)
-        VALUES (src.order_item_id, src.order_id, src.product_key, src.customer_key, src.order_date_key,
-                src.quantity, src.unit_price, src.total_line_amount, src.currency);       
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current dcc
+                ON o.customer_id = dcc.customer_id
+                AND o.created_at >= dcc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers dc
+                ON dcc.customer_key IS NULL
+                AND o.customer_id = dc.customer_id
+                AND dc.is_current = FALSE
+                AND o.created_at >= dc.valid_from
+                AND o.created_at < dc.valid_to
             
-    rows_cnt := SQLROWCOUNT;
+            WHERE oi.metadata$action = 'INSERT'
+        ) src
+        ON t.order_item_id = src.order_item_id
+        WHEN MATCHED THEN
+            UPDATE SET 
+                t.product_key = src.product_key,
+                t.customer_key = src.customer_key,
+                t.quantity = src.quantity,
+                t.unit_price = src.unit_price,
+                t.total_line_amount = src.total_line_amount,
+                t.ingestion_ts = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN
+            INSERT (order_item_id, order_id, product_key, customer_key, order_date_key, 
+                    quantity, unit_price, total_line_amount, currency)
+            VALUES (src.order_item_id, src.order_id, src.product_key, src.customer_key, src.order_date_key,
+                    src.quantity, src.unit_price, src.total_line_amount, src.currency);
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_FACT',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_FACT'),
+        'load_mode',     :run_mode,
         'source_obj',    'SILVER.order_items_stream',
         'business_key',  'order_item_id',
-        'description',   'Accumulating snapshot of sales (updates allowed)'
+        'description',   'Accumulating snapshot of sales (updates allowed)',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -2024,7 +3570,7 @@ $$;
 -- PROC LOAD_FACT_SHIPMENTS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_SHIPMENTS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_SHIPMENTS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -2035,11 +3581,22 @@ DECLARE
     proc_duration NUMBER(12,3);
     rows_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'FACT_SHIPMENTS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.GOLD.fact_shipments;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -2048,59 +3605,120 @@ BEGIN
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
     
-    MERGE INTO ECOMMERCE.GOLD.fact_shipments t
-    USING (
-        SELECT 
-            s.shipment_id,
-            s.order_id,
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild from the whole Silver table with one set-based insert, in clustering order
+        DELETE FROM ECOMMERCE.GOLD.fact_shipments;
+
+        INSERT INTO ECOMMERCE.GOLD.fact_shipments (
+            shipment_id, order_id, customer_key, ship_date_key, delivery_date_key, shipped_at,
+            delivered_at, carrier, shipment_status, days_to_ship, days_to_deliver
+        )
+        SELECT
+            src.shipment_id, src.order_id, src.customer_key, src.ship_date_key,
+            src.delivery_date_key, src.shipped_at, src.delivered_at, src.carrier,
+            src.shipment_status, src.days_to_ship, src.days_to_deliver
+        FROM (
+            SELECT 
+                s.shipment_id,
+                s.order_id,
+
+                COALESCE(dcc.customer_key, dc.customer_key, -1) as customer_key,
+                IFF(s.ship_date IS NULL, -1, TO_NUMBER(TO_CHAR(s.ship_date, 'YYYYMMDD'))) as ship_date_key,
+                IFF(s.delivery_date IS NULL, -1, TO_NUMBER(TO_CHAR(s.delivery_date, 'YYYYMMDD'))) as delivery_date_key,
+                s.shipped_at,
+                s.delivered_at,
+
+                s.carrier,
+                s.shipment_status,
+
+                DATEDIFF(day, o.created_at, s.shipped_at) as days_to_ship,
+                DATEDIFF(day, s.shipped_at, s.delivered_at) as days_to_deliver
+
+            FROM ECOMMERCE.SILVER.shipments s
+            LEFT JOIN ECOMMERCE.SILVER.orders o ON s.order_id = o.order_id
+
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current dcc
+                ON o.customer_id = dcc.customer_id
+                AND s.updated_at >= dcc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers dc
+                ON dcc.customer_key IS NULL
+                AND o.customer_id = dc.customer_id
+                AND dc.is_current = FALSE
+                AND s.updated_at >= dc.valid_from
+                AND s.updated_at < dc.valid_to
+        ) src
+        ORDER BY src.ship_date_key;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        -- Advance the stream past the backfilled rows (reads it, inserts nothing)
+        INSERT INTO ECOMMERCE.COMMON.STREAM_OFFSET_SINK (stream_name)
+        SELECT 'SILVER.shipments_stream' FROM ECOMMERCE.SILVER.shipments_stream WHERE FALSE;
+    ELSE
+        MERGE INTO ECOMMERCE.GOLD.fact_shipments t
+        USING (
+            SELECT 
+                s.shipment_id,
+                s.order_id,
             
-            COALESCE(dc.customer_key, -1) as customer_key,
-            IFF(s.ship_date IS NULL, -1, TO_NUMBER(TO_CHAR(s.ship_date, 'YYYYMMDD'))) as ship_date_key,
-            IFF(s.delivery_date IS NULL, -1, TO_NUMBER(TO_CHAR(s.delivery_date, 'YYYYMMDD'))) as delivery_date_key,
-            s.shipped_at,
-            s.delivered_at,
+                COALESCE(dcc.customer_key, dc.customer_key, -1) as customer_key,
+                IFF(s.ship_date IS NULL, -1, TO_NUMBER(TO_CHAR(s.ship_date, 'YYYYMMDD'))) as ship_date_key,
+                IFF(s.delivery_date IS NULL, -1, TO_NUMBER(TO_CHAR(s.delivery_date, 'YYYYMMDD'))) as delivery_date_key,
+                s.shipped_at,
+                s.delivered_at,
             
-            s.carrier,
-            s.shipment_status,
+                s.carrier,
+                s.shipment_status,
             
-            DATEDIFF(day, o.created_at, s.shipped_at) as days_to_ship,
-            DATEDIFF(day, s.shipped_at, s.delivered_at) as days_to_deliver
+                DATEDIFF(day, o.created_at, s.shipped_at) as days_to_ship,
+                DATEDIFF(day, s.shipped_at, s.delivered_at) as days_to_deliver
             
-        FROM ECOMMERCE.SILVER.shipments_stream s
-        LEFT JOIN ECOMMERCE.SILVER.orders o ON s.order_id = o.order_id
+            FROM ECOMMERCE.SILVER.shipments_stream s
+            LEFT JOIN ECOMMERCE.SILVER.orders o ON s.order_id = o.order_id
         
-        LEFT JOIN ECOMMERCE.GOLD.dim_customers dc 
-            ON o.customer_id = dc.customer_id 
-            AND s.updated_at >= dc.valid_from 
-            AND s.updated_at < dc.valid_to
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current dcc
+                ON o.customer_id = dcc.customer_id
+                AND s.updated_at >= dcc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers dc
+                ON dcc.customer_key IS NULL
+                AND o.customer_id = dc.customer_id
+                AND dc.is_current = FALSE
+                AND s.updated_at >= dc.valid_from
+                AND s.updated_at < dc.valid_to
             
-        WHERE s.metadata$action = 'INSERT'
-    ) src
-    ON t.shipment_id = src.shipment_id
-    WHEN MATCHED THEN
-        UPDATE SET 
-            t.shipment_status = src.shipment_status,
-            t.ship_date_key = src.ship_date_key,
-            t.delivery_date_key = src.delivery_date_key,
-            t.days_to_ship = src.days_to_ship,
-            t.days_to_deliver = src.days_to_deliver,
-            t.customer_key = src.customer_key,
-            t.shipped_at = src.shipped_at,
-            t.delivered_at = src.delivered_at,
-            t.ingestion_ts = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN
-        INSERT (shipment_id, order_id, customer_key, ship_date_key, delivery_date_key,
-            shipped_at, delivered_at, carrier, shipment_status, days_to_ship, days_to_deliver)
-        VALUES (src.shipment_id, src.order_id, src.customer_key, src.ship_date_key, src.delivery_date_key,
-            src.shipped_at, src.delivered_at, src.carrier, src.shipment_status, src.days_to_ship, src.days_to_deliver);
-                
-    rows_cnt := SQLROWCOUNT;
+            WHERE s.metadata$action = 'INSERT'
+        ) src
+        ON t.shipment_id = src.shipment_id
+        WHEN MATCHED THEN
+            UPDATE SET 
+                t.shipment_status = src.shipment_status,
+                t.ship_date_key = src.ship_date_key,
+                t.delivery_date_key = src.delivery_date_key,
+                t.days_to_ship = src.days_to_ship,
+                t.days_to_deliver = src.days_to_deliver,
+                t.customer_key = src.customer_key,
+                t.shipped_at = src.shipped_at,
+                t.delivered_at = src.delivered_at,
+                t.ingestion_ts = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN
+            INSERT (shipment_id, order_id, customer_key, ship_date_key, delivery_date_key,
+                shipped_at, delivered_at, carrier, shipment_status, days_to_ship, days_to_deliver)
+            VALUES (src.shipment_id, src.order_id, src.customer_key, src.ship_date_key, src.delivery_date_key,
+                src.shipped_at, src.delivered_at, src.carrier, src.shipment_status, src.days_to_ship, src.days_to_deliver);
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_FACT',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_FACT'),
+        'load_mode',     :run_mode,
         'source_obj',    'SILVER.shipments_stream',
         'business_key',  'shipment_id',
-        'description',   'Accumulating snapshot of shipments (updates allowed)'
+        'description',   'Accumulating snapshot of shipments (updates allowed)',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -2142,7 +3760,7 @@ $$;
 -- PROC LOAD_FACT_PAYMENTS
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_PAYMENTS(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_PAYMENTS(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -2153,11 +3771,22 @@ DECLARE
     proc_duration NUMBER(12,3);
     rows_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'FACT_PAYMENTS';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.GOLD.fact_payments;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -2166,48 +3795,102 @@ BEGIN
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
     
-    MERGE INTO ECOMMERCE.GOLD.fact_payments t
-    USING (
-        SELECT 
-            p.payment_id,
-            p.order_id,
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild from the whole Silver table with one set-based insert, in clustering order
+        DELETE FROM ECOMMERCE.GOLD.fact_payments;
+
+        INSERT INTO ECOMMERCE.GOLD.fact_payments (
+            payment_id, order_id, customer_key, date_key, provider, payment_status, amount
+        )
+        SELECT
+            src.payment_id, src.order_id, src.customer_key, src.date_key, src.provider,
+            src.payment_status, src.amount
+        FROM (
+            SELECT 
+                p.payment_id,
+                p.order_id,
+
+                COALESCE(dcc.customer_key, dc.customer_key, -1) as customer_key,
+
+                TO_NUMBER(TO_CHAR(p.create_date, 'YYYYMMDD')) as date_key,
+                p.provider,
+                p.payment_status,
+                p.amount
+
+            FROM ECOMMERCE.SILVER.payments p
+            LEFT JOIN ECOMMERCE.SILVER.orders o ON p.order_id = o.order_id
+
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current dcc
+                ON o.customer_id = dcc.customer_id
+                AND p.created_at >= dcc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers dc
+                ON dcc.customer_key IS NULL
+                AND o.customer_id = dc.customer_id
+                AND dc.is_current = FALSE
+                AND p.created_at >= dc.valid_from
+                AND p.created_at < dc.valid_to
+        ) src
+        ORDER BY src.date_key;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        -- Advance the stream past the backfilled rows (reads it, inserts nothing)
+        INSERT INTO ECOMMERCE.COMMON.STREAM_OFFSET_SINK (stream_name)
+        SELECT 'SILVER.payments_stream' FROM ECOMMERCE.SILVER.payments_stream WHERE FALSE;
+    ELSE
+        MERGE INTO ECOMMERCE.GOLD.fact_payments t
+        USING (
+            SELECT 
+                p.payment_id,
+                p.order_id,
             
-            COALESCE(dc.customer_key, -1) as customer_key,
+                COALESCE(dcc.customer_key, dc.customer_key, -1) as customer_key,
             
-            TO_NUMBER(TO_CHAR(p.create_date, 'YYYYMMDD')) as date_key,
-            p.provider,
-            p.payment_status,
-            p.amount
+                TO_NUMBER(TO_CHAR(p.create_date, 'YYYYMMDD')) as date_key,
+                p.provider,
+                p.payment_status,
+                p.amount
             
-        FROM ECOMMERCE.SILVER.payments_stream p
-        LEFT JOIN ECOMMERCE.SILVER.orders o ON p.order_id = o.order_id
+            FROM ECOMMERCE.SILVER.payments_stream p
+            LEFT JOIN ECOMMERCE.SILVER.orders o ON p.order_id = o.order_id
         
-        LEFT JOIN ECOMMERCE.GOLD.dim_customers dc 
-            ON o.customer_id = dc.customer_id 
-            AND p.created_at >= dc.valid_from 
-            AND p.created_at < dc.valid_to
+            -- Current version first; only rows older than it (late arrivals) use the SCD2 range join
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers_current dcc
+                ON o.customer_id = dcc.customer_id
+                AND p.created_at >= dcc.valid_from
+            LEFT JOIN ECOMMERCE.GOLD.dim_customers dc
+                ON dcc.customer_key IS NULL
+                AND o.customer_id = dc.customer_id
+                AND dc.is_current = FALSE
+                AND p.created_at >= dc.valid_from
+                AND p.created_at < dc.valid_to
             
-        WHERE p.metadata$action = 'INSERT'
-    ) src
-    ON t.payment_id = src.payment_id
-    WHEN MATCHED THEN
-        UPDATE SET 
-            t.payment_status = src.payment_status,
-            t.amount = src.amount,
-            t.provider = src.provider,
-            t.customer_key = src.customer_key,
-            t.ingestion_ts = CURRENT_TIMESTAMP()
-    WHEN NOT MATCHED THEN
-        INSERT (payment_id, order_id, customer_key, date_key, provider, payment_status, amount)
-        VALUES (src.payment_id, src.order_id, src.customer_key, src.date_key, src.provider, src.payment_status, src.amount);
-                                
-    rows_cnt := SQLROWCOUNT;
+            WHERE p.metadata$action = 'INSERT'
+        ) src
+        ON t.payment_id = src.payment_id
+        WHEN MATCHED THEN
+            UPDATE SET 
+                t.payment_status = src.payment_status,
+                t.amount = src.amount,
+                t.provider = src.provider,
+                t.customer_key = src.customer_key,
+                t.ingestion_ts = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN
+            INSERT (payment_id, order_id, customer_key, date_key, provider, payment_status, amount)
+            VALUES (src.payment_id, src.order_id, src.customer_key, src.date_key, src.provider, src.payment_status, src.amount);
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_FACT',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_FACT'),
+        'load_mode',     :run_mode,
         'source_obj',    'SILVER.payments_stream',
         'business_key',  'payment_id',
-        'description',   'Accumulating snapshot of payments (updates allowed)'
+        'description',   'Accumulating snapshot of payments (updates allowed)',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'MERGE',
@@ -2248,7 +3931,7 @@ $$;
 -- PROC LOAD_FACT_ORDER_STATUS_HISTORY
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_ORDER_STATUS_HISTORY(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_FACT_ORDER_STATUS_HISTORY(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -2259,11 +3942,22 @@ DECLARE
     proc_duration NUMBER(12,3);
     rows_cnt NUMBER;
     custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
 
     PROC_NAME STRING := 'FACT_ORDER_STATUS_HISTORY';
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();    
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the target is empty (first load or rebuilt table)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.GOLD.fact_order_status_history;
+    END IF;
 
     BEGIN TRANSACTION;
 
@@ -2272,29 +3966,59 @@ BEGIN
         'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
     );
     
-    MERGE INTO ECOMMERCE.GOLD.fact_order_status_history t
-    USING (
-        SELECT 
-            h.status_history_id,
-            h.order_id,
-            TO_NUMBER(TO_CHAR(h.changed_at, 'YYYYMMDD')) as date_key,
-            h.changed_at,
-            h.status
-        FROM ECOMMERCE.SILVER.order_status_history_stream h
-        WHERE h.metadata$action = 'INSERT'
-    ) src
-    ON t.status_history_id = src.status_history_id
-    WHEN NOT MATCHED THEN
-        INSERT (status_history_id, order_id, date_key, changed_at_ts, status)
-        VALUES (src.status_history_id, src.order_id, src.date_key, src.changed_at, src.status);
-                                
-    rows_cnt := SQLROWCOUNT;
+    IF (run_mode = 'BACKFILL') THEN
+        -- Rebuild from the whole Silver table with one set-based insert, in clustering order
+        DELETE FROM ECOMMERCE.GOLD.fact_order_status_history;
+
+        INSERT INTO ECOMMERCE.GOLD.fact_order_status_history (
+            status_history_id, order_id, date_key, changed_at_ts, status
+        )
+        SELECT
+            src.status_history_id, src.order_id, src.date_key, src.changed_at, src.status
+        FROM (
+            SELECT 
+                h.status_history_id,
+                h.order_id,
+                TO_NUMBER(TO_CHAR(h.changed_at, 'YYYYMMDD')) as date_key,
+                h.changed_at,
+                h.status
+            FROM ECOMMERCE.SILVER.order_status_history h
+        ) src
+        ORDER BY src.date_key;
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+        -- Advance the stream past the backfilled rows (reads it, inserts nothing)
+        INSERT INTO ECOMMERCE.COMMON.STREAM_OFFSET_SINK (stream_name)
+        SELECT 'SILVER.order_status_history_stream' FROM ECOMMERCE.SILVER.order_status_history_stream WHERE FALSE;
+    ELSE
+        MERGE INTO ECOMMERCE.GOLD.fact_order_status_history t
+        USING (
+            SELECT 
+                h.status_history_id,
+                h.order_id,
+                TO_NUMBER(TO_CHAR(h.changed_at, 'YYYYMMDD')) as date_key,
+                h.changed_at,
+                h.status
+            FROM ECOMMERCE.SILVER.order_status_history_stream h
+            WHERE h.metadata$action = 'INSERT'
+        ) src
+        ON t.status_history_id = src.status_history_id
+        WHEN NOT MATCHED THEN
+            INSERT (status_history_id, order_id, date_key, changed_at_ts, status)
+            VALUES (src.status_history_id, src.order_id, src.date_key, src.changed_at, src.status);
+        rows_cnt := SQLROWCOUNT;
+        query_ids := ARRAY_APPEND(:query_ids, SQLID);
+    END IF;
+
     proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
     custom_meta := OBJECT_CONSTRUCT(
-        'load_strategy', 'MERGE_INSERT',
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'BULK_INSERT', 'MERGE_INSERT'),
+        'load_mode',     :run_mode,
         'source_obj',    'SILVER.order_status_history_stream',
         'business_key',  'status_history_id',
-        'description',   'Transactional log (idempotent insert, no updates)'
+        'description',   'Transactional log (idempotent insert, no updates)',
+        'query_ids',     :query_ids
     ); 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
             :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'INSERT',
@@ -2332,11 +4056,279 @@ $$;
 
 
 
+-- ###################################
+-- PROC LOAD_GOLD_AGGREGATES
+-- ###################################
+
+-- Aggregates are recomputed per affected day: every date key found in a fact stream (old and new
+-- values of updated facts) is deleted and rebuilt from the fact table, so MERGE updates never
+-- double count. BACKFILL rebuilds all days and still consumes the streams.
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_GOLD_AGGREGATES(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+    proc_start_ts TIMESTAMP;
+    proc_duration NUMBER(12,3);
+    rows_cnt NUMBER;
+    product_rows NUMBER;
+    category_rows NUMBER;
+    order_rows NUMBER;
+    payment_rows NUMBER;
+    shipment_rows NUMBER;
+    custom_meta VARIANT;
+    query_ids VARIANT DEFAULT ARRAY_CONSTRUCT();
+    run_mode STRING;
+
+    PROC_NAME STRING := 'GOLD_AGGREGATES';
+
+BEGIN
+    proc_start_ts := CURRENT_TIMESTAMP();
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME);
+
+    -- AUTO: backfill when the aggregates are empty (first load or rebuilt tables)
+    run_mode := UPPER(:LOAD_MODE);
+    IF (run_mode = 'AUTO') THEN
+        SELECT IFF(COUNT(*) = 0, 'BACKFILL', 'INCREMENTAL')
+        INTO :run_mode
+        FROM ECOMMERCE.GOLD.agg_daily_order_status;
+    END IF;
+
+    BEGIN TRANSACTION;
+
+    CALL ECOMMERCE.COMMON.LOG_EVENT(
+        :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'INIT',
+        'START', 'Starting load', 0, 0, 0, NULL, NULL, NULL
+    );
+
+    -- ###################################
+    -- DAILY SALES (FACT_SALES)
+    -- ###################################
+
+    DELETE FROM ECOMMERCE.GOLD.agg_daily_product_sales
+    WHERE :run_mode = 'BACKFILL'
+       OR date_key IN (SELECT order_date_key FROM ECOMMERCE.GOLD.fact_sales_stream);
+
+    INSERT INTO ECOMMERCE.GOLD.agg_daily_product_sales (
+        date_key, date_value, product_id, product_name, category, brand, currency,
+        order_count, line_count, units_sold, revenue
+    )
+    SELECT
+        f.order_date_key,
+        d.date_value,
+        p.product_id,
+        MAX_BY(p.name, p.valid_from),
+        MAX_BY(p.category, p.valid_from),
+        MAX_BY(p.brand, p.valid_from),
+        f.currency,
+
+        COUNT(DISTINCT f.order_id),
+        COUNT(*),
+        SUM(f.quantity),
+        SUM(f.total_line_amount)
+
+    FROM ECOMMERCE.GOLD.fact_sales f
+    JOIN ECOMMERCE.GOLD.dim_date d ON f.order_date_key = d.date_key
+    LEFT JOIN ECOMMERCE.GOLD.dim_products p ON f.product_key = p.product_key
+    WHERE :run_mode = 'BACKFILL'
+       OR f.order_date_key IN (SELECT order_date_key FROM ECOMMERCE.GOLD.fact_sales_stream)
+    GROUP BY f.order_date_key, d.date_value, p.product_id, f.currency
+    ORDER BY f.order_date_key;
+    product_rows := SQLROWCOUNT;
+    query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+    DELETE FROM ECOMMERCE.GOLD.agg_daily_category_sales
+    WHERE :run_mode = 'BACKFILL'
+       OR date_key IN (SELECT order_date_key FROM ECOMMERCE.GOLD.fact_sales_stream);
+
+    INSERT INTO ECOMMERCE.GOLD.agg_daily_category_sales (
+        date_key, date_value, category, country, currency,
+        order_count, customer_count, units_sold, revenue
+    )
+    SELECT
+        f.order_date_key,
+        d.date_value,
+        p.category,
+        c.country,
+        f.currency,
+
+        COUNT(DISTINCT f.order_id),
+        COUNT(DISTINCT c.customer_id),
+        SUM(f.quantity),
+        SUM(f.total_line_amount)
+
+    FROM ECOMMERCE.GOLD.fact_sales f
+    JOIN ECOMMERCE.GOLD.dim_date d ON f.order_date_key = d.date_key
+    LEFT JOIN ECOMMERCE.GOLD.dim_products p ON f.product_key = p.product_key
+    LEFT JOIN ECOMMERCE.GOLD.dim_customers c ON f.customer_key = c.customer_key
+    WHERE :run_mode = 'BACKFILL'
+       OR f.order_date_key IN (SELECT order_date_key FROM ECOMMERCE.GOLD.fact_sales_stream)
+    GROUP BY f.order_date_key, d.date_value, p.category, c.country, f.currency
+    ORDER BY f.order_date_key;
+    category_rows := SQLROWCOUNT;
+    query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+    -- ###################################
+    -- ORDER FUNNEL (FACT_ORDERS)
+    -- ###################################
+
+    DELETE FROM ECOMMERCE.GOLD.agg_daily_order_status
+    WHERE :run_mode = 'BACKFILL'
+       OR date_key IN (SELECT order_date_key FROM ECOMMERCE.GOLD.fact_orders_stream);
+
+    INSERT INTO ECOMMERCE.GOLD.agg_daily_order_status (
+        date_key, date_value, order_status, currency,
+        order_count, order_amount, avg_order_amount
+    )
+    SELECT
+        f.order_date_key,
+        d.date_value,
+        f.order_status,
+        f.currency,
+
+        COUNT(*),
+        SUM(f.order_total_amount),
+        AVG(f.order_total_amount)
+
+    FROM ECOMMERCE.GOLD.fact_orders f
+    JOIN ECOMMERCE.GOLD.dim_date d ON f.order_date_key = d.date_key
+    WHERE :run_mode = 'BACKFILL'
+       OR f.order_date_key IN (SELECT order_date_key FROM ECOMMERCE.GOLD.fact_orders_stream)
+    GROUP BY f.order_date_key, d.date_value, f.order_status, f.currency
+    ORDER BY f.order_date_key;
+    order_rows := SQLROWCOUNT;
+    query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+    -- ###################################
+    -- PAYMENTS (FACT_PAYMENTS)
+    -- ###################################
+
+    DELETE FROM ECOMMERCE.GOLD.agg_daily_payments
+    WHERE :run_mode = 'BACKFILL'
+       OR date_key IN (SELECT date_key FROM ECOMMERCE.GOLD.fact_payments_stream);
+
+    INSERT INTO ECOMMERCE.GOLD.agg_daily_payments (
+        date_key, date_value, provider, payment_status,
+        payment_count, order_count, amount, avg_amount
+    )
+    SELECT
+        f.date_key,
+        d.date_value,
+        f.provider,
+        f.payment_status,
+
+        COUNT(*),
+        COUNT(DISTINCT f.order_id),
+        SUM(f.amount),
+        AVG(f.amount)
+
+    FROM ECOMMERCE.GOLD.fact_payments f
+    JOIN ECOMMERCE.GOLD.dim_date d ON f.date_key = d.date_key
+    WHERE :run_mode = 'BACKFILL'
+       OR f.date_key IN (SELECT date_key FROM ECOMMERCE.GOLD.fact_payments_stream)
+    GROUP BY f.date_key, d.date_value, f.provider, f.payment_status
+    ORDER BY f.date_key;
+    payment_rows := SQLROWCOUNT;
+    query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+    -- ###################################
+    -- SHIPPING SLA (FACT_SHIPMENTS)
+    -- ###################################
+
+    -- Shipments move from ship_date_key -1 (not shipped) to their ship date; the stream holds both keys
+    DELETE FROM ECOMMERCE.GOLD.agg_daily_shipments
+    WHERE :run_mode = 'BACKFILL'
+       OR ship_date_key IN (SELECT ship_date_key FROM ECOMMERCE.GOLD.fact_shipments_stream);
+
+    INSERT INTO ECOMMERCE.GOLD.agg_daily_shipments (
+        ship_date_key, ship_date, carrier, shipment_status,
+        shipment_count, delivered_count, avg_days_to_ship, p90_days_to_ship,
+        avg_days_to_deliver, p90_days_to_deliver, max_days_to_deliver
+    )
+    SELECT
+        f.ship_date_key,
+        d.date_value,
+        f.carrier,
+        f.shipment_status,
+
+        COUNT(*),
+        COUNT_IF(f.delivered_at IS NOT NULL),
+        AVG(f.days_to_ship),
+        PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY f.days_to_ship),
+        AVG(f.days_to_deliver),
+        PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY f.days_to_deliver),
+        MAX(f.days_to_deliver)
+
+    FROM ECOMMERCE.GOLD.fact_shipments f
+    LEFT JOIN ECOMMERCE.GOLD.dim_date d ON f.ship_date_key = d.date_key
+    WHERE :run_mode = 'BACKFILL'
+       OR f.ship_date_key IN (SELECT ship_date_key FROM ECOMMERCE.GOLD.fact_shipments_stream)
+    GROUP BY f.ship_date_key, d.date_value, f.carrier, f.shipment_status
+    ORDER BY f.ship_date_key;
+    shipment_rows := SQLROWCOUNT;
+    query_ids := ARRAY_APPEND(:query_ids, SQLID);
+
+    rows_cnt := product_rows + category_rows + order_rows + payment_rows + shipment_rows;
+
+    proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
+    custom_meta := OBJECT_CONSTRUCT(
+        'load_strategy', IFF(:run_mode = 'BACKFILL', 'FULL_RECOMPUTE', 'RECOMPUTE_AFFECTED_DAYS'),
+        'load_mode',     :run_mode,
+        'source_obj',    ARRAY_CONSTRUCT('GOLD.fact_sales_stream', 'GOLD.fact_orders_stream',
+                                         'GOLD.fact_payments_stream', 'GOLD.fact_shipments_stream'),
+        'rows_per_table', OBJECT_CONSTRUCT(
+            'agg_daily_product_sales',  :product_rows,
+            'agg_daily_category_sales', :category_rows,
+            'agg_daily_order_status',   :order_rows,
+            'agg_daily_payments',       :payment_rows,
+            'agg_daily_shipments',      :shipment_rows
+        ),
+        'description',   'Daily aggregates rebuilt for the days touched by fact changes',
+        'query_ids',     :query_ids
+    );
+    CALL ECOMMERCE.COMMON.LOG_EVENT(
+            :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'RECOMPUTE',
+            'SUCCESS', 'Aggregates Refreshed', :rows_cnt, 0, :proc_duration, NULL, NULL, :custom_meta
+    );
+
+    COMMIT;
+
+EXCEPTION
+    WHEN OTHER THEN
+
+        ROLLBACK;
+
+        LET err_code STRING := SQLCODE;
+        LET err_msg STRING := SQLERRM;
+        LET err_state STRING := SQLSTATE;
+
+        proc_duration := DATEDIFF('millisecond', :proc_start_ts, CURRENT_TIMESTAMP()) / 1000;
+
+        LET err_details VARIANT := OBJECT_CONSTRUCT(
+            'failed_at_step', :PROC_NAME,
+            'sql_state', :err_state
+        );
+
+        CALL ECOMMERCE.COMMON.LOG_EVENT(
+            :RUN_ID, 'GOLD', :PROC_NAME, :PROC_NAME, 'FAILURE',
+            'FAIL', :err_msg, 0, 0, :proc_duration, :err_code, :err_state, :err_details
+        );
+
+        RAISE;
+END;
+$$;
+
+
+
+
+
 -- ###################################
 -- PROC LOAD_GOLD_MASTER (Dimensional modeling)
 -- ###################################
 
-CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_GOLD_MASTER(RUN_ID STRING)
+CREATE OR REPLACE PROCEDURE ECOMMERCE.GOLD.LOAD_GOLD_MASTER(RUN_ID STRING, LOAD_MODE STRING DEFAULT 'INCREMENTAL')
 RETURNS STRING
 LANGUAGE SQL
 EXECUTE AS CALLER
@@ -2348,6 +4340,10 @@ DECLARE
 
 BEGIN
     proc_start_ts := CURRENT_TIMESTAMP();
+    CALL ECOMMERCE.COMMON.SET_QUERY_TAG(:RUN_ID, 'GOLD', 'MASTER', NULL);
+
+    -- Events of this batch are written to ETL_LOGS in one insert at the end (FLUSH_LOG_BUFFER)
+    CALL ECOMMERCE.COMMON.START_LOG_BUFFER();
 
     CALL ECOMMERCE.COMMON.LOG_EVENT(
         :RUN_ID, 'GOLD', 'MASTER', NULL, 'INIT',
@@ -2355,16 +4351,20 @@ BEGIN
     );
 
     -- Load individual Gold Layer tables
-    -- Tables are loaded in specific order to satisfy FK dependencies
-    CALL ECOMMERCE.GOLD.LOAD_DIM_PRODUCTS(:RUN_ID);
-    CALL ECOMMERCE.GOLD.LOAD_DIM_CUSTOMERS(:RUN_ID);
+    -- Dimensions first, then the facts (dimension lookups); each wave runs as ASYNC child jobs.
+    ASYNC (CALL ECOMMERCE.GOLD.LOAD_DIM_PRODUCTS(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.GOLD.LOAD_DIM_CUSTOMERS(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.GOLD.LOAD_FACT_ORDER_STATUS_HISTORY(:RUN_ID, :LOAD_MODE));
+    AWAIT ALL;
 
-    CALL ECOMMERCE.GOLD.LOAD_FACT_ORDERS(:RUN_ID);
-    
-    CALL ECOMMERCE.GOLD.LOAD_FACT_SALES(:RUN_ID);
-    CALL ECOMMERCE.GOLD.LOAD_FACT_SHIPMENTS(:RUN_ID);
-    CALL ECOMMERCE.GOLD.LOAD_FACT_PAYMENTS(:RUN_ID);
-    CALL ECOMMERCE.GOLD.LOAD_FACT_ORDER_STATUS_HISTORY(:RUN_ID);
+    ASYNC (CALL ECOMMERCE.GOLD.LOAD_FACT_ORDERS(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.GOLD.LOAD_FACT_SALES(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.GOLD.LOAD_FACT_SHIPMENTS(:RUN_ID, :LOAD_MODE));
+    ASYNC (CALL ECOMMERCE.GOLD.LOAD_FACT_PAYMENTS(:RUN_ID, :LOAD_MODE));
+    AWAIT ALL;
+
+    -- Daily aggregates from the fact streams, once all facts are loaded
+    CALL ECOMMERCE.GOLD.LOAD_GOLD_AGGREGATES(:RUN_ID, :LOAD_MODE);
 
 
     -- ###################################
@@ -2377,6 +4377,8 @@ BEGIN
         'SUCCESS', 'Gold Layer Batch Completed', 0, 0, :total_duration, NULL, NULL, NULL
     );
 
+    CALL ECOMMERCE.COMMON.FLUSH_LOG_BUFFER();
+
     RETURN 'GOLD MASTER LOAD COMPLETED SUCCESSFULLY';
 
 EXCEPTION
@@ -2398,6 +4400,8 @@ EXCEPTION
             'FAIL', :err_msg, 0, 0, :total_duration, :err_code, :err_state, :err_details
         );
 
+        CALL ECOMMERCE.COMMON.FLUSH_LOG_BUFFER();
+
         RAISE;
 END;
 $$;
\ No newline at end of file
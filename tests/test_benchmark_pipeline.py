@@ -0,0 +1,68 @@
+import json
+import duckdb
+import pytest
+from benchmark_pipeline import CORE_TABLES, SILVER_TABLES, load_dq_rules, main, silver_statements
+
+
+def test_silver_statements_quarantine_and_deduplicate():
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE dq_errors (table_name VARCHAR, record_key VARCHAR, error_type VARCHAR)")
+    conn.execute("""
+        CREATE TABLE bronze_products AS
+        SELECT * FROM (VALUES
+            (1, 'Laptop', 'Electronics', 'Dell', 999.0, 'EUR', 'ACTIVE',
+             TIMESTAMP '2024-06-01 10:00', TIMESTAMP '2024-06-01 10:00', 'f1', TIMESTAMP '2024-06-01 11:00'),
+            (1, 'Laptop', 'Electronics', 'Dell', 899.0, 'EUR', 'ACTIVE',
+             TIMESTAMP '2024-06-01 10:00', TIMESTAMP '2024-06-02 10:00', 'f2', TIMESTAMP '2024-06-02 11:00'),
+            (2, 'Mouse', 'Electronics', 'Logitech', -5.0, 'EUR', 'ACTIVE',
+             TIMESTAMP '2024-06-01 10:00', TIMESTAMP '2024-06-01 10:00', 'f1', TIMESTAMP '2024-06-01 11:00'),
+            (3, 'Desk', 'Home', 'IKEA', 150.0, NULL, 'ACTIVE',
+             TIMESTAMP '2024-06-01 10:00', TIMESTAMP '2024-06-01 10:00', 'f1', TIMESTAMP '2024-06-01 11:00')
+        ) AS t(product_id, name, category, brand, price, currency, status, created_at, updated_at,
+               source_file, ingestion_ts)
+    """)
+    for sql in silver_statements(*next(spec for spec in SILVER_TABLES if spec[0] == "products")):
+        conn.execute(sql)
+
+    assert conn.execute("SELECT product_id, price FROM silver_products").fetchall() == [(1, 899.0)]
+    assert sorted(conn.execute("SELECT record_key, error_type FROM dq_errors").fetchall()) == [
+        ("2", "NEGATIVE_PRICE"), ("3", "MISSING_CURRENCY")]
+
+
+def test_silver_rules_are_the_seeded_dq_rules(tmp_path):
+    assert [spec[0] for spec in SILVER_TABLES] == CORE_TABLES
+    assert load_dq_rules()["products"][:2] == [("price < 0", "NEGATIVE_PRICE"),
+                                                ("TRIM(name) = '' OR name IS NULL", "EMPTY_NAME")]
+
+    # rules are applied in RULE_ORDER, whatever their order in the seed
+    seed = tmp_path / "setup.sql"
+    seed.write_text("""
+        INSERT OVERWRITE INTO ECOMMERCE.COMMON.DQ_RULES (TARGET_TABLE, RULE_ORDER, RULE_CODE, PREDICATE)
+        SELECT column1, column2, column3, column4
+        FROM VALUES
+            ('orders', 2, 'MISSING_CUSTOMER',  $$customer_id IS NULL$$),
+            ('orders', 1, 'NEGATIVE_AMOUNT',   $$order_total_amount < 0$$);
+        INSERT INTO other VALUES ('orders', 3, 'NOT_A_RULE', $$x$$);
+    """, encoding="utf-8")
+    assert load_dq_rules(str(seed)) == {"orders": [("order_total_amount < 0", "NEGATIVE_AMOUNT"),
+                                                   ("customer_id IS NULL", "MISSING_CUSTOMER")]}
+
+
+@pytest.mark.parametrize("raw_format", ["ndjson", "parquet"])
+def test_end_to_end_rows_are_consistent(tmp_path, raw_format):
+    output = tmp_path / "results.ndjson"
+    main(["--scales", "1", "--batches", "1", "--format", raw_format, "--work-dir", str(tmp_path / "work"),
+          "--output", str(output)])
+    [result] = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    bronze, silver, gold = (result["transform"][stage]["rows"] for stage in ("bronze", "silver", "gold"))
+
+    assert result["format"] == raw_format and result["scale"] == 1
+    assert result["generator"]["rows"] > 0 and result["upload"]["files"] > 0
+    assert bronze["orders"] == result["orders_per_batch"]
+    # generated rows pass validation and have unique keys
+    assert silver == bronze and result["transform"]["silver"]["dq_errors"] == 0
+    # dimensions: one row per entity plus the technical -1 record
+    assert gold["dim_products"] == silver["products"] + 1
+    assert gold["dim_customers"] == silver["customers"] + 1
+    assert gold["fact_orders"] == silver["orders"]
+    assert gold["fact_sales"] == silver["order_items"]
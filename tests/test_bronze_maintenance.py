@@ -0,0 +1,61 @@
+import json
+from bronze_maintenance import ARCHIVE_FOLDER, maintain_files
+from storage_backends import LocalFileBackend
+
+
+class FakeCursor:
+    """Answers the config and due-file queries, records the other statements."""
+
+    def __init__(self, config, due_files):
+        self.config = config
+        self.due_files = due_files
+        self.executed = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((" ".join(sql.split()), params))
+        if "FROM ECOMMERCE.COMMON.BRONZE_INGESTION_CONFIG" in sql:
+            self._rows = self.config
+        elif "SELECT DISTINCT" in sql:
+            ledger = "INGESTION_MANIFEST" if "INGESTION_MANIFEST" in sql else "BRONZE_FILE_LEDGER"
+            self._rows = [(name,) for name in self.due_files.get((params[0], ledger), [])]
+        else:
+            self._rows = []
+
+    def fetchall(self):
+        return self._rows
+
+    def statements(self, prefix):
+        return [(sql, params) for sql, params in self.executed if sql.startswith(prefix)]
+
+
+def test_due_files_come_from_the_ledgers_and_are_marked_there(tmp_path):
+    storage = LocalFileBackend(str(tmp_path))
+    storage.upload("data/orders_raw/2024/06/01/orders_1.ndjson", b"{}\n")
+    storage.upload("data/legacy_raw/legacy_1.ndjson", b"{}\n")
+    cursor = FakeCursor(
+        config=[("orders", "orders_raw/", 30, "ARCHIVE", "MANIFEST"),
+                ("legacy", "legacy_raw/", 400, "PURGE", "PREFIX")],
+        due_files={("orders", "INGESTION_MANIFEST"): ["orders_raw/2024/06/01/orders_1.ndjson"],
+                   ("legacy", "BRONZE_FILE_LEDGER"): ["azure://acct/raw/data/legacy_raw/legacy_1.ndjson"]},
+    )
+
+    assert maintain_files(cursor, storage, "run-1", workers=2)
+
+    assert (tmp_path / ARCHIVE_FOLDER / "orders_raw/2024/06/01/orders_1.ndjson").exists()
+    assert not (tmp_path / "data/orders_raw/2024/06/01/orders_1.ndjson").exists()
+    assert not (tmp_path / "data/legacy_raw/legacy_1.ndjson").exists()
+
+    # retention longer than any log retention still works: the due files are read from the ledgers
+    manifest_update, ledger_update = cursor.statements("UPDATE")
+    assert "INGESTION_MANIFEST" in manifest_update[0] and "FILE_PATH IN" in manifest_update[0]
+    assert manifest_update[1][:2] == ("ARCHIVE", "orders")
+    assert json.loads(manifest_update[1][2]) == ["orders_raw/2024/06/01/orders_1.ndjson"]
+    assert "BRONZE_FILE_LEDGER" in ledger_update[0] and ledger_update[1][:2] == ("PURGE", "legacy")
+    assert not any("ETL_LOGS" in sql for sql, _ in cursor.executed)
+
+
+def test_unknown_strategy_fails_without_touching_files(tmp_path):
+    cursor = FakeCursor(config=[("orders", "orders_raw/", 30, "ARCHIVE", "SNOWPIPE")], due_files={})
+    assert not maintain_files(cursor, LocalFileBackend(str(tmp_path)), "run-1", workers=1)
+    assert cursor.statements("UPDATE") == []
@@ -0,0 +1,142 @@
+import threading
+from deploy_snowflake import CHANGED, NEW, UNCHANGED, USE, deploy_levels, execute_plan, plan_statements
+
+STATEMENTS = [
+    "USE ROLE SYSADMIN",
+    "CREATE TABLE IF NOT EXISTS ECOMMERCE.SILVER.orders (order_id NUMBER)",
+    "CREATE OR REPLACE STREAM ECOMMERCE.SILVER.orders_stream ON TABLE ECOMMERCE.SILVER.orders",
+    "ALTER TABLE ECOMMERCE.SILVER.orders SET CHANGE_TRACKING = TRUE",
+]
+
+
+def ledger_of(plan):
+    return {step["key"]: step["hash"] for step in plan if step["action"] != USE}
+
+
+def test_first_deployment_is_all_new():
+    plan = plan_statements(STATEMENTS, {})
+    assert [step["action"] for step in plan] == [USE, NEW, NEW, NEW]
+    assert plan[1]["key"] == "TABLE ECOMMERCE.SILVER.ORDERS"
+    assert plan[2]["key"] == "STREAM ECOMMERCE.SILVER.ORDERS_STREAM"
+    assert plan[3]["key"].startswith("STATEMENT ")
+
+
+def test_redeployment_is_unchanged_and_edits_are_changed():
+    ledger = ledger_of(plan_statements(STATEMENTS, {}))
+    assert {step["action"] for step in plan_statements(STATEMENTS, ledger)} == {USE, UNCHANGED}
+
+    edited = STATEMENTS[:1] + ["CREATE TABLE IF NOT EXISTS ECOMMERCE.SILVER.orders (order_id NUMBER, status STRING)"] \
+        + STATEMENTS[2:]
+    actions = {step["key"]: step["action"] for step in plan_statements(edited, ledger)}
+    assert actions["TABLE ECOMMERCE.SILVER.ORDERS"] == CHANGED
+    assert actions["STREAM ECOMMERCE.SILVER.ORDERS_STREAM"] == UNCHANGED
+
+
+def test_duplicate_statements_get_numbered_keys():
+    grant = "GRANT SELECT ON ALL TABLES IN SCHEMA ECOMMERCE.GOLD TO ROLE ANALYST_ROLE"
+    view = "CREATE OR REPLACE VIEW ECOMMERCE.GOLD.v AS SELECT 1 AS x"
+    plan = plan_statements([grant, view, grant, view.replace("1", "2")], {})
+    keys = [step["key"] for step in plan]
+    assert keys[1] == "VIEW ECOMMERCE.GOLD.V"
+    assert keys[2] == f"{keys[0]} #2"
+    assert keys[3] == "VIEW ECOMMERCE.GOLD.V #2"
+    assert len(set(keys)) == 4
+
+
+def test_use_context_is_part_of_the_hash():
+    stmt = "CREATE OR REPLACE VIEW ECOMMERCE.GOLD.v AS SELECT 1 AS x"
+    ledger = ledger_of(plan_statements(["USE ROLE SYSADMIN", stmt], {}))
+
+    plan = plan_statements(["USE ROLE ACCOUNTADMIN", stmt], ledger)
+    assert plan[1]["action"] == CHANGED
+    assert plan[1]["context"] == {"ROLE": "ACCOUNTADMIN"}
+    assert plan_statements(["use role sysadmin;", stmt], ledger)[1]["action"] == UNCHANGED
+
+
+def test_statements_on_a_recreated_object_run_again():
+    task = ("CREATE OR REPLACE TASK ECOMMERCE.COMMON.PURGE_TASK WAREHOUSE = ETL_WH "
+            "SCHEDULE = 'USING CRON 0 3 * * 0 UTC' AS CALL ECOMMERCE.COMMON.PURGE(90)")
+    resume = "ALTER TASK ECOMMERCE.COMMON.PURGE_TASK RESUME"
+    other = "ALTER TABLE ECOMMERCE.SILVER.orders SET CHANGE_TRACKING = TRUE"
+    ledger = ledger_of(plan_statements([task, resume, other], {}))
+
+    plan = plan_statements([task.replace("90", "30"), resume, other], ledger)
+    # CREATE OR REPLACE leaves the task suspended: the RESUME has to follow it
+    assert [step["action"] for step in plan] == [CHANGED, CHANGED, UNCHANGED]
+    assert plan[1]["key"] in ledger    # same ledger row, updated hash
+    assert {step["action"] for step in plan_statements([task, resume, other], ledger)} == {UNCHANGED}
+
+
+SCHEMA_OBJECTS = [
+    "CREATE SCHEMA IF NOT EXISTS ECOMMERCE.GOLD",
+    "CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.fact_orders (order_id NUMBER)",
+    "CREATE TABLE IF NOT EXISTS ECOMMERCE.GOLD.fact_sales (order_item_id NUMBER)",
+    "CREATE OR REPLACE STREAM ECOMMERCE.GOLD.fact_orders_stream ON TABLE ECOMMERCE.GOLD.fact_orders",
+    "CREATE OR REPLACE VIEW ECOMMERCE.GOLD.v_sales AS SELECT * FROM ECOMMERCE.GOLD.fact_sales",
+    "GRANT SELECT ON ALL TABLES IN SCHEMA ECOMMERCE.GOLD TO ROLE ANALYST_ROLE",
+]
+
+
+class FakeConnection:
+    """Records the executed statements; statements containing a `failing` marker raise."""
+
+    def __init__(self, failing=()):
+        self.failing = failing
+        self.executed = []
+        self._lock = threading.Lock()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if any(marker in sql for marker in self.conn.failing):
+            raise RuntimeError(f"Simulated failure: {sql}")
+        with self.conn._lock:
+            self.conn.executed.append(sql)
+
+    def close(self):
+        pass
+
+
+def level_statements(plan):
+    return [sorted(step["stmt"] for step in level) for level in deploy_levels(plan)]
+
+
+def test_levels_follow_schema_table_stream_grant_order():
+    schema, orders, sales, stream, view, grant = SCHEMA_OBJECTS
+    assert level_statements(plan_statements(SCHEMA_OBJECTS, {})) == [
+        [schema],
+        sorted([orders, sales]),
+        sorted([stream, view]),
+        [grant],
+    ]
+
+
+def test_statements_on_the_same_object_keep_their_order():
+    statements = SCHEMA_OBJECTS[1:2] + ["ALTER TABLE ECOMMERCE.GOLD.fact_orders SET CHANGE_TRACKING = TRUE",
+                                        "INSERT INTO ECOMMERCE.GOLD.fact_orders VALUES (1)"]
+    assert [len(level) for level in deploy_levels(plan_statements(statements, {}))] == [1, 1, 1]
+
+
+def test_execute_plan_skips_unchanged_and_deploys_the_rest():
+    ledger = ledger_of(plan_statements(SCHEMA_OBJECTS[:3], {}))
+    conn = FakeConnection()
+    deployed, ok = execute_plan(conn, plan_statements(SCHEMA_OBJECTS, ledger), {}, concurrency=4)
+    assert ok
+    assert sorted(step["stmt"] for step in deployed) == sorted(SCHEMA_OBJECTS[3:])
+    assert sorted(conn.executed) == sorted(SCHEMA_OBJECTS[3:])
+
+
+def test_execute_plan_stops_after_the_first_failing_level():
+    conn = FakeConnection(failing=["fact_sales (order_item_id"])
+    deployed, ok = execute_plan(conn, plan_statements(["USE ROLE SYSADMIN"] + SCHEMA_OBJECTS, {}), {},
+                                concurrency=4)
+    assert not ok
+    # the failing table's level still finishes, nothing after it runs
+    assert [step["stmt"] for step in deployed] == SCHEMA_OBJECTS[:2]
+    assert conn.executed == ["USE ROLE SYSADMIN"] + SCHEMA_OBJECTS[:2]
@@ -0,0 +1,84 @@
+import pytest
+from etl_orchestrator import (BACKFILL, FAILED, PIPELINE_DAG, SKIPPED, SUCCESS, UPSTREAM_FAILED, ConnectionPool,
+                              LocalWarehouse, critical_path, execute_dag, run_node, select_layers,
+                              topological_order)
+
+DIAMOND = {
+    "BRONZE.A": ([], []),
+    "SILVER.B": (["BRONZE.b_stream"], ["BRONZE.A"]),
+    "SILVER.C": (["BRONZE.c_stream"], ["BRONZE.A"]),
+    "GOLD.D": (["SILVER.d_stream"], ["SILVER.B", "SILVER.C"]),
+}
+
+
+def run_local(dag, load_mode="INCREMENTAL", concurrency=4, **warehouse_args):
+    warehouse = LocalWarehouse(default_seconds=0.01, **warehouse_args)
+    pool = ConnectionPool(warehouse.connect, concurrency)
+    try:
+        results = execute_dag(dag, lambda node: run_node(pool, "test-run", node, dag[node][0], load_mode),
+                              concurrency)
+    finally:
+        pool.close()
+    return results, warehouse
+
+
+def called_nodes(warehouse):
+    return {sql[len("CALL ECOMMERCE."):sql.index("(")] for _, _, sql, _ in warehouse.statements
+            if sql.startswith("CALL ECOMMERCE.") and "LOG_EVENT" not in sql}
+
+
+def test_pipeline_dag_is_acyclic_and_ordered():
+    order = topological_order(PIPELINE_DAG)
+    assert sorted(order) == sorted(PIPELINE_DAG)
+    for node, (_, upstream) in PIPELINE_DAG.items():
+        assert all(order.index(up) < order.index(node) for up in upstream)
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order({"A": ([], ["B"]), "B": ([], ["A"])})
+
+
+def test_select_layers_drops_dependencies_on_other_layers():
+    dag = select_layers(DIAMOND, ["SILVER", "GOLD"])
+    assert dag["SILVER.B"] == (["BRONZE.b_stream"], [])
+    assert "BRONZE.A" not in dag
+
+
+def test_node_with_empty_streams_is_skipped_and_unblocks_downstream():
+    results, warehouse = run_local(DIAMOND, empty_streams={"BRONZE.b_stream"})
+    assert results["SILVER.B"][0] == SKIPPED
+    assert results["GOLD.D"][0] == SUCCESS
+    assert called_nodes(warehouse) == {"BRONZE.A", "SILVER.C", "GOLD.D"}
+
+
+def test_backfill_runs_nodes_with_empty_streams():
+    results, warehouse = run_local(DIAMOND, load_mode=BACKFILL, empty_streams={"BRONZE.b_stream"})
+    assert results["SILVER.B"][0] == SUCCESS
+    assert "SILVER.B" in called_nodes(warehouse)
+
+
+def test_failure_propagates_upstream_failed_but_spares_independent_branches():
+    dag = dict(DIAMOND, **{"GOLD.E": (["SILVER.e_stream"], ["SILVER.C"])})
+    results, warehouse = run_local(dag, failing={"SILVER.B"})
+    assert results["SILVER.B"][0] == FAILED
+    assert "Simulated failure" in results["SILVER.B"][2]
+    assert results["GOLD.D"][0] == UPSTREAM_FAILED
+    assert results["GOLD.E"][0] == SUCCESS
+    assert "GOLD.D" not in called_nodes(warehouse)
+
+
+def test_independent_branches_run_concurrently():
+    results, warehouse = run_local(DIAMOND, durations={"SILVER.B": 0.2, "SILVER.C": 0.2})
+    spans = {sql[len("CALL ECOMMERCE."):sql.index("(")]: (start, end) for start, end, sql, _ in warehouse.statements
+             if sql.startswith("CALL ECOMMERCE.SILVER.")}
+    (b_start, b_end), (c_start, c_end) = spans["SILVER.B"], spans["SILVER.C"]
+    assert b_start < c_end and c_start < b_end
+
+
+def test_critical_path_is_the_longest_branch_not_the_sum():
+    durations = {"BRONZE.A": 1.0, "SILVER.B": 5.0, "SILVER.C": 2.0, "GOLD.D": 1.0}
+    seconds, path = critical_path(DIAMOND, durations)
+    assert seconds == 7.0
+    assert path == ["BRONZE.A", "SILVER.B", "GOLD.D"]
+    assert seconds < sum(durations.values())
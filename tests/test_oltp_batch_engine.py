@@ -0,0 +1,69 @@
+from datetime import datetime
+import numpy as np
+import oltp_batch_engine
+from oltp_batch_engine import build_products, generate_batch, timeline_rows
+
+CATALOG = [("Laptop", "Electronics", "Dell", 999.0), ("Mouse", "Electronics", "Logitech", 25.0),
+           ("Desk", "Home", "IKEA", 150.0)]
+POOLS = {key: np.array([f"{key}_{i}" for i in range(50)])
+         for key in ("first_name", "last_name", "user_name", "street", "city", "postal_code", "country")}
+STATE = {"customer_id_seq": 1, "address_id_seq": 1, "order_id_seq": 1, "order_item_id_seq": 1,
+         "payment_id_seq": 1, "shipment_id_seq": 1, "history_id_seq": 1}
+BASE_DATE = datetime(2024, 6, 1)
+
+
+def make_batch(n_orders, seed=7):
+    products = build_products(CATALOG, BASE_DATE)
+    rng = np.random.default_rng(seed)
+    return generate_batch(rng, POOLS, products, STATE, BASE_DATE, max(1, n_orders // 2), n_orders)[0]
+
+
+def timeline_lookups(monkeypatch, n_orders):
+    """(calls, order ids looked up) of the timeline lookups while generating one batch."""
+    calls = []
+    lookup = oltp_batch_engine.timeline_rows
+    monkeypatch.setattr(oltp_batch_engine, "timeline_rows",
+                        lambda timeline, order_ids: calls.append(len(order_ids)) or lookup(timeline, order_ids))
+    make_batch(n_orders)
+    return len(calls), sum(calls)
+
+
+def test_batch_cost_grows_linearly(monkeypatch):
+    small, large = 4_000, 32_000
+    small_calls, small_ids = timeline_lookups(monkeypatch, small)
+    large_calls, large_ids = timeline_lookups(monkeypatch, large)
+    # one vectorized lookup per derived table, whatever the batch size (the old per-shipment
+    # history scan grew with the shipments), each over at most the orders of the batch
+    assert large_calls == small_calls > 0
+    assert small_ids <= small_calls * small and large_ids <= large_calls * large
+
+
+def test_timeline_lookup_is_an_offset():
+    timeline_ids = np.arange(1_000, 1_010)
+    assert list(timeline_rows({"order_id": timeline_ids}, [1_000, 1_007, 1_009])) == [0, 7, 9]
+
+
+def test_shipment_timestamps_come_from_own_order_history():
+    batch = make_batch(2_000)
+    history, shipments = batch["order_status_history"], batch["shipments"]
+    changed_at = {(order_id, status): ts for order_id, status, ts
+                  in zip(history["order_id"], history["status"], history["changed_at"])}
+
+    assert len(shipments["order_id"]) > 0
+    for order_id, shipped_at, delivered_at in zip(shipments["order_id"], shipments["shipped_at"],
+                                                  shipments["delivered_at"]):
+        assert shipped_at == changed_at[(order_id, "SHIPPED")]
+        if np.isnat(delivered_at):
+            assert (order_id, "DELIVERED") not in changed_at
+        else:
+            assert delivered_at == changed_at[(order_id, "DELIVERED")]
+    # the old scan stamped every shipment with the first SHIPPED row of the batch
+    assert len(np.unique(shipments["shipped_at"])) > 1
+
+
+def test_shipments_only_for_shipped_orders():
+    batch = make_batch(2_000)
+    orders, shipments = batch["orders"], batch["shipments"]
+    shipped = set(orders["order_id"][np.isin(orders["order_status"], ["SHIPPED", "DELIVERED"])])
+    assert set(shipments["order_id"]) == shipped
+    assert len(shipments["order_id"]) == len(shipped)
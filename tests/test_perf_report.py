@@ -0,0 +1,115 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from perf_report import build_steps, flag_regressions, main, order_runs, read_records, write_records
+
+START = datetime(2024, 6, 1, 2, 0)
+
+
+def export_runs(tmp_path, durations, bytes_scanned=None):
+    """ETL_LOGS / QUERY_HISTORY exports of one SILVER.LOAD_ORDERS step per run (1,000 rows each)."""
+    logs, history = [], []
+    for i, seconds in enumerate(durations):
+        run_id, created_at = f"run-{i}", (START + timedelta(days=i)).isoformat()
+        for status, rows, duration in (("START", 0, 0), ("SUCCESS", 1000, seconds)):
+            logs.append({"PIPELINE_RUN_ID": run_id, "LAYER": "SILVER", "PROCESS_NAME": "LOAD_ORDERS",
+                         "TARGET_TABLE": "LOAD_ORDERS", "STEP_NAME": "MERGE", "STATUS": status,
+                         "ROWS_AFFECTED": rows, "DURATION_SEC": duration, "CREATED_AT": created_at})
+        tag = {"app": "ECOMMERCE_ETL", "run_id": run_id, "layer": "SILVER",
+               "process": "LOAD_ORDERS", "target": "LOAD_ORDERS"}
+        history.append({"QUERY_ID": f"q-{i}", "QUERY_TAG": json.dumps(tag), "START_TIME": created_at,
+                        "TOTAL_ELAPSED_TIME": seconds * 1000,
+                        "BYTES_SCANNED": (bytes_scanned or {}).get(i, 1_000_000),
+                        "PARTITIONS_SCANNED": 2, "PARTITIONS_TOTAL": 10})
+    logs_path, history_path = tmp_path / "etl_logs.csv", tmp_path / "query_history.jsonl"
+    write_records(str(logs_path), logs)
+    history_path.write_text("\n".join(json.dumps(query) for query in history), encoding="utf-8")
+    return str(logs_path), str(history_path)
+
+
+def report(tmp_path, durations, min_rows=0, **kwargs):
+    logs_path, history_path = export_runs(tmp_path, durations, **kwargs)
+    steps = build_steps(read_records(logs_path), read_records(history_path))
+    runs = order_runs(steps)
+    return steps, runs, flag_regressions(steps, runs, baseline_runs=5, min_history=3, threshold=0.5, min_seconds=5,
+                                         min_rows=min_rows)
+
+
+def test_exported_steps_are_joined_with_their_queries(tmp_path):
+    steps, runs, _ = report(tmp_path, [10, 12])
+    assert runs == ["run-0", "run-1"]
+    step = steps[1]
+    assert step["step"] == "SILVER.LOAD_ORDERS"
+    assert step["rows"] == 1000 and step["duration_sec"] == 12
+    assert step["rows_per_sec"] == pytest.approx(1000 / 12)
+    assert step["bytes_per_row"] == 1000
+    assert step["pruned_pct"] == 80
+    assert step["slowest_query_id"] == "q-1"
+
+
+def test_slowdown_against_rolling_baseline_is_flagged(tmp_path):
+    steps, _, regressions = report(tmp_path, [10, 11, 9, 10, 12, 30])
+    flagged = {(r["run_id"], r["metric"]) for r in regressions}
+    assert flagged == {("run-5", "duration_sec"), ("run-5", "rows_per_sec")}
+    duration = next(r for r in regressions if r["metric"] == "duration_sec")
+    assert duration["baseline"] == 10       # median of the 5 previous runs
+    assert duration["ratio"] == 3
+    assert duration["slowest_query_id"] == "q-5"
+
+
+def test_baseline_only_uses_the_last_runs(tmp_path):
+    # run-0 is outside the 5-run window of run-6, so its 100s do not raise the baseline
+    steps, _, regressions = report(tmp_path, [100, 10, 10, 10, 10, 10, 30])
+    assert [r["run_id"] for r in regressions if r["metric"] == "duration_sec"] == ["run-6"]
+    assert steps[-1]["baseline"]["duration_sec"] == 10
+
+
+def test_small_or_early_changes_are_not_flagged(tmp_path):
+    # +60% but only 3 seconds slower; run-1 has too little history to be compared
+    _, _, regressions = report(tmp_path, [5, 50, 5, 5, 5, 8])
+    assert [r for r in regressions if r["metric"] == "duration_sec"] == []
+
+
+def test_per_row_metrics_of_small_steps_are_not_flagged(tmp_path):
+    # 1,000 rows: rows/s and bytes/row are noise, only the duration is compared
+    steps, _, regressions = report(tmp_path, [10, 11, 9, 10, 12, 30], min_rows=10_000,
+                                   bytes_scanned={5: 5_000_000})
+    assert [(r["run_id"], r["metric"]) for r in regressions] == [("run-5", "duration_sec")]
+    assert "rows_per_sec" not in steps[-1]["baseline"]
+
+
+def test_queries_are_attributed_by_logged_query_id():
+    # ASYNC children share the master's session: both queries carry the tag customers set last
+    created_at = START.isoformat()
+    tag = json.dumps({"app": "ECOMMERCE_ETL", "run_id": "run-0", "layer": "BRONZE",
+                      "process": "LOAD_BRONZE", "target": "CUSTOMERS"})
+    logs = [{"PIPELINE_RUN_ID": "run-0", "LAYER": "BRONZE", "PROCESS_NAME": "LOAD_BRONZE", "TARGET_TABLE": target,
+             "STEP_NAME": "INGEST_COPY", "STATUS": "SUCCESS", "ROWS_AFFECTED": 100, "DURATION_SEC": 5,
+             "CREATED_AT": created_at, "QUERY_IDS": json.dumps([query_id])}
+            for target, query_id in (("ORDERS", "q-orders"), ("CUSTOMERS", "q-customers"))]
+    history = [{"QUERY_ID": query_id, "QUERY_TAG": tag, "START_TIME": created_at, "TOTAL_ELAPSED_TIME": 4000,
+                "BYTES_SCANNED": scanned}
+               for query_id, scanned in (("q-orders", 3000), ("q-customers", 1000), ("q-unlogged", 9000))]
+
+    steps = {step["step"]: step for step in build_steps(logs, history)}
+    assert steps["BRONZE.LOAD_BRONZE.ORDERS"]["bytes_scanned"] == 3000
+    assert steps["BRONZE.LOAD_BRONZE.CUSTOMERS"]["bytes_scanned"] == 1000
+    assert {step["attribution"] for step in steps.values()} == {"query_id"}
+
+
+def test_bytes_per_row_regression(tmp_path):
+    _, _, regressions = report(tmp_path, [10] * 5, bytes_scanned={4: 5_000_000})
+    assert [(r["run_id"], r["metric"]) for r in regressions] == [("run-4", "bytes_per_row")]
+
+
+def test_main_fails_on_regression_of_the_latest_run(tmp_path):
+    logs_path, history_path = export_runs(tmp_path, [10, 11, 9, 10, 12, 30])
+    output = tmp_path / "report.json"
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--logs", logs_path, "--history", history_path, "--output", str(output), "--fail-on-regression"])
+    assert exit_info.value.code == 1
+    result = json.loads(output.read_text(encoding="utf-8"))
+    assert result["run_id"] == "run-5"
+
+    # an earlier run without regressions passes
+    main(["--logs", logs_path, "--history", history_path, "--run-id", "run-4", "--fail-on-regression"])
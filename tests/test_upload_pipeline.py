@@ -0,0 +1,39 @@
+from storage_backends import LocalFileBackend
+from upload_pipeline import UploadPipeline
+
+
+class FlakyBackend(LocalFileBackend):
+    """Local backend whose first upload of every path fails."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.failed = set()
+
+    def upload(self, path, data, content_type="application/json"):
+        if path not in self.failed:
+            self.failed.add(path)
+            raise ConnectionError("Simulated upload error")
+        super().upload(path, data, content_type=content_type)
+
+
+def test_str_uploads_count_encoded_bytes(tmp_path):
+    backend = LocalFileBackend(str(tmp_path))
+    text = '{"city": "München", "street": "Straße 1"}\n'
+    with UploadPipeline(backend, workers=2) as pipeline:
+        result = pipeline.submit("data/customers.ndjson", text).result()
+        streamed = pipeline.submit("data/orders.ndjson", lambda: iter([b'{"id": 1}\n', b'{"id": 2}\n'])).result()
+
+    stored = (tmp_path / "data" / "customers.ndjson").read_bytes()
+    assert stored == text.encode("utf-8")
+    assert result["bytes"] == len(stored) > len(text)
+    assert streamed["bytes"] == (tmp_path / "data" / "orders.ndjson").stat().st_size
+    assert pipeline.bytes_uploaded == result["bytes"] + streamed["bytes"]
+
+
+def test_retried_upload_is_counted_once(tmp_path):
+    backend = FlakyBackend(str(tmp_path))
+    with UploadPipeline(backend, workers=1, base_delay=0) as pipeline:
+        result = pipeline.submit("data/products.ndjson", "Café\n").result()
+
+    assert result["bytes"] == len("Café\n".encode("utf-8"))
+    assert pipeline.files_uploaded == 1 and pipeline.bytes_uploaded == result["bytes"]